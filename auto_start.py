@@ -12,6 +12,46 @@ import yaml
 import argparse
 from pathlib import Path
 
+from src.docker_api import DockerAPIError, DEFAULT_SOCKET, get_client
+
+
+def list_running_containers(socket_path: str = DEFAULT_SOCKET) -> list:
+    """
+    Liste les conteneurs en cours d'exécution
+    Utilise le client partagé de l'API Docker (socket unix) si le socket est
+    accessible, sinon le binaire docker
+    
+    Returns:
+        list: Liste de tuples (nom_conteneur, image)
+    """
+    if os.path.exists(socket_path):
+        try:
+            return [
+                (container['Names'][0].lstrip('/'), container.get('Image', ''))
+                for container in get_client(socket_path).list_containers()
+                if container.get('Names')
+            ]
+        except DockerAPIError as e:
+            print(f"API Docker indisponible ({e}), utilisation de docker ps")
+            
+    result = subprocess.run(
+        ['docker', 'ps', '--format', '{{.Names}}\t{{.Image}}'],
+        capture_output=True,
+        text=True,
+        timeout=10
+    )
+    
+    if result.returncode != 0:
+        print(f"Erreur lors de l'exécution de docker ps: {result.stderr}")
+        return []
+        
+    containers = []
+    for line in result.stdout.strip().split('\n'):
+        parts = line.split('\t')
+        if len(parts) >= 2 and parts[0].strip():
+            containers.append((parts[0], parts[1]))
+    return containers
+
 
 def get_docker_containers():
     """
@@ -21,35 +61,13 @@ def get_docker_containers():
         dict: Dictionnaire {nom_routeur: nom_conteneur_complet}
     """
     try:
-        result = subprocess.run(
-            ['docker', 'ps', '--format', '{{.Names}}\t{{.Image}}'],
-            capture_output=True,
-            text=True,
-            timeout=10
-        )
-        
-        if result.returncode != 0:
-            print(f"Erreur lors de l'exécution de docker ps: {result.stderr}")
-            return {}
-            
         containers = {}
-        lines = result.stdout.strip().split('\n')
         
         # Patterns pour identifier les routeurs FRR
         router_patterns = ['ABR1', 'ABR2', 'ABR3', 'R1', 'R2', 'R3', 'R4']
         pc_patterns = ['PC1', 'PC2', 'PC3', 'PC4']
         
-        for line in lines:
-            if not line.strip():
-                continue
-                
-            parts = line.split('\t')
-            if len(parts) < 2:
-                continue
-                
-            container_name = parts[0]
-            image_name = parts[1]
-            
+        for container_name, image_name in list_running_containers():
             # Chercher les routeurs FRR
             for router in router_patterns:
                 # Match patterns comme: GNS3.ABR1.uuid, OSPF_Optimisation_lab_env-ABR1-1, etc.
@@ -9,15 +9,28 @@ import time
 import yaml
 import argparse
 import logging
+import asyncio
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple, Union
 from pathlib import Path
 
 # Ajouter le répertoire src au path
 sys.path.insert(0, str(Path(__file__).parent))
 
 from src.router_connection import RouterConnection, MockRouterConnection
-from src.metrics_collector import MetricsCollector, LinkMetrics
+from src.async_connection import AsyncRouterConnection, AsyncMockRouterConnection
+from src.metrics_collector import MetricsCollector, LinkMetrics, LinkMetricsBatch
+from src.commit_engine import CostCommitEngine
+from src.topology import TopologyIndex
+from src.telemetry import TelemetryIngestServer, LocalTelemetryAgent, DEFAULT_PORT
+from src.event_watcher import EventWatcher
+from src.poll_scheduler import AdaptivePollScheduler
+from src.cycle_scheduler import FixedRateScheduler
+from src.metrics_store import MetricsStore
+from src.column_history import ColumnHistoryWriter
 from src.cost_calculator import CostCalculator, OptimizationStrategy, CostCalculationResult
 
 # Configuration du logging
@@ -51,21 +64,102 @@ class OSPFOptimizer:
         if simulation_mode:
             logger.info("Mode simulation activé - pas de connexion réelle aux routeurs")
             self.connection = MockRouterConnection(self.config.get('global', {}))
+            self.async_connection = AsyncMockRouterConnection(self.connection)
         else:
             self.connection = RouterConnection(self.config.get('global', {}))
+            self.async_connection = AsyncRouterConnection(
+                self.config.get('global', {}), sync_connection=self.connection
+            )
             
-        self.metrics_collector = MetricsCollector(self.connection)
+        self.metrics_collector = MetricsCollector(
+            self.connection, self.async_connection, self.config.get('probing'),
+            self.config.get('telemetry'), self.config.get('smoothing'),
+            self.config.get('latency_percentiles')
+        )
         
         # Initialiser le calculateur de coûts
         cost_config = {
             **self.config.get('cost_factors', {}),
-            'thresholds': self.config.get('thresholds', {})
+            'thresholds': self.config.get('thresholds', {}),
+            'input': (self.config.get('smoothing', {}) or {}).get('input', 'raw')
         }
         self.cost_calculator = CostCalculator(cost_config)
+        self.cost_calculator.smoothed_inputs = self.metrics_collector.smoothed_inputs
         
         # Configurer les routeurs
         self._setup_routers()
         
+        # Topologie compilée: index par lien, interface et IP (aucun parcours par cycle)
+        self.topology = TopologyIndex(
+            self.config.get('routers', {}), self.config.get('monitored_links', [])
+        )
+        
+        # Collecte parallèle (1 worker = collecte séquentielle)
+        collection_config = self.config.get('collection', {}) or {}
+        self.max_workers = max(1, int(collection_config.get('max_workers', 1)))
+        self.max_per_router = max(1, int(collection_config.get('max_per_router', 1)))
+        self.use_snapshots = collection_config.get('snapshot', False)
+        self.use_router_state = collection_config.get('router_state', False)
+        
+        # Application transactionnelle des coûts (relecture, vérification, restauration)
+        apply_config = self.config.get('apply', {}) or {}
+        self.commit_engine = None
+        if apply_config.get('transactional', False):
+            self.commit_engine = CostCommitEngine(
+                self.connection, self.async_connection,
+                max_workers=self.max_workers,
+                timeout=apply_config.get('timeout', 15)
+            )
+        # Résultats des changements de coûts appliqués (tous chemins confondus)
+        self.apply_stats = {'applied': 0, 'failed': 0}
+        self._router_slots = {
+            router: threading.BoundedSemaphore(self.max_per_router)
+            for router in self.topology.source_routers
+        }
+        
+        # Télémétrie poussée par des agents dans les conteneurs (optionnelle)
+        self.telemetry_server = None
+        self.telemetry_agents: List[LocalTelemetryAgent] = []
+        self._start_telemetry(self.config.get('telemetry', {}) or {})
+        
+        # Période de collecte propre à chaque lien (polling.adaptive)
+        polling_config = self.config.get('polling', {}) or {}
+        self.poll_scheduler = None
+        self.poll_tick = float(polling_config.get('tick', 1))
+        if polling_config.get('adaptive', False):
+            self.poll_scheduler = AdaptivePollScheduler(self.cost_calculator.thresholds, polling_config)
+            self.poll_scheduler.register(list(self.topology.by_name))
+        
+        # Cycle en pipeline: collecte, calcul et application se chevauchent
+        pipeline_config = self.config.get('pipeline', {}) or {}
+        self.use_pipeline = pipeline_config.get('enabled', False)
+        self.pipeline_queue_size = max(1, int(pipeline_config.get('queue_size', 16)))
+        self.pipeline_apply_batch = max(1, int(pipeline_config.get('apply_batch', 8)))
+        self.pipeline_stats: Dict = {}
+        
+        # Historique persistant des métriques (SQLite, agrégats minute/heure/jour)
+        storage_config = self.config.get('storage', {}) or {}
+        self.metrics_store = None
+        if storage_config.get('enabled', False):
+            self.metrics_store = MetricsStore(storage_config.get('path', 'data/metrics.db'), storage_config)
+        
+        # Historique en fichiers colonnes (mmap) pour le rejeu des stratégies
+        columns_config = self.config.get('column_history', {}) or {}
+        self.column_history = None
+        if columns_config.get('enabled', False):
+            self.column_history = ColumnHistoryWriter(
+                columns_config.get('path', 'data/columns'), columns_config.get('chunk_rows', 65536)
+            )
+        
+        # Cycles ciblés sur événements (démarrés par run_continuous)
+        self.event_watcher = None
+        self._cycle_lock = threading.Lock()
+        
+        # Cadence fixe de run_continuous (arrêt interruptible via _stop_event)
+        self.schedule_config = self.config.get('schedule', {}) or {}
+        self.cycle_scheduler = None
+        self._stop_event = threading.Event()
+        
         # État
         self.running = False
         self.last_optimization = None
@@ -85,22 +179,72 @@ class OSPFOptimizer:
             logger.error(f"Erreur de parsing YAML: {e}")
             raise
             
+    def _start_telemetry(self, telemetry_config: Dict):
+        """
+        Démarre le serveur d'ingestion de la télémétrie et, si local_agents,
+        un agent de remplacement par routeur source dans ce processus
+        """
+        if not telemetry_config.get('enabled', False):
+            return
+            
+        port = telemetry_config.get('udp_port', DEFAULT_PORT)
+        bind = telemetry_config.get('bind', '0.0.0.0')
+        unix_path = telemetry_config.get('unix_socket')
+        self.telemetry_server = TelemetryIngestServer(
+            self.metrics_collector.ingest_telemetry,
+            udp=(bind, port) if port else None, unix_path=unix_path
+        )
+        try:
+            self.telemetry_server.start()
+        except OSError as e:
+            logger.error(f"Serveur de télémétrie indisponible, collecte par exec: {e}")
+            self.telemetry_server.stop()
+            self.telemetry_server = None
+            return
+            
+        if not telemetry_config.get('local_agents', False):
+            return
+        udp_address = self.telemetry_server.address
+        address = ('127.0.0.1', udp_address[1]) if udp_address else unix_path
+        for router in self.topology.source_routers:
+            links = self.topology.links_on(router)
+            interfaces = {
+                link['source_interface']: self.topology.interfaces.get(
+                    (router, link['source_interface']), {}
+                ).get('ip', '')
+                for link in links
+            }
+            targets = list(dict.fromkeys(link['dest_ip'] for link in links if link.get('dest_ip')))
+            agent = LocalTelemetryAgent(
+                router, interfaces, targets, address, self.connection,
+                interval=telemetry_config.get('agent_interval', 5)
+            )
+            agent.start()
+            self.telemetry_agents.append(agent)
+        logger.info(f"{len(self.telemetry_agents)} agents de télémétrie locaux démarrés")
+        
     def _setup_routers(self):
         """Configure les routeurs depuis la configuration"""
         routers = self.config.get('routers', {})
         for name, config in routers.items():
             self.connection.add_router(name, config)
+            if not self.simulation_mode:
+                self.async_connection.add_router(name, config)
             logger.debug(f"Routeur {name} ajouté")
         logger.info(f"{len(routers)} routeurs configurés")
         
-    def collect_metrics(self) -> List[LinkMetrics]:
+    def collect_metrics(self, monitored_links: List[Dict] = None) -> List[LinkMetrics]:
         """
         Collecte les métriques de tous les liens surveillés
         
+        Args:
+            monitored_links: Sous-ensemble de topology.links (cycle ciblé), tous par défaut
+            
         Returns:
             Liste des métriques collectées
         """
-        monitored_links = self.config.get('monitored_links', [])
+        if monitored_links is None:
+            monitored_links = self.topology.links
         
         if not monitored_links:
             logger.warning("Aucun lien configuré pour le monitoring")
@@ -108,44 +252,208 @@ class OSPFOptimizer:
             
         logger.info(f"Collecte des métriques pour {len(monitored_links)} liens...")
         
-        all_metrics = []
-        for link in monitored_links:
-            try:
-                # Enrichir la config du lien avec les infos des routeurs
-                link_config = self._enrich_link_config(link)
-                metrics = self.metrics_collector.collect_link_metrics(link_config)
-                all_metrics.append(metrics)
-                logger.debug(f"Métriques collectées pour {link['name']}")
-            except Exception as e:
-                logger.error(f"Erreur lors de la collecte pour {link['name']}: {e}")
+        try:
+            self._prepare_routers(monitored_links)
+            
+            if self.max_workers > 1:
+                return self._collect_metrics_parallel(monitored_links)
                 
-        return all_metrics
-        
-    def _enrich_link_config(self, link: Dict) -> Dict:
-        """Enrichit la configuration d'un lien avec les IPs des routeurs"""
-        enriched = link.copy()
-        
-        # Obtenir les infos du routeur destination
-        dest_router = link.get('dest_router')
-        dest_interface = link.get('dest_interface')
-        
-        if dest_router in self.config.get('routers', {}):
-            router_config = self.config['routers'][dest_router]
-            for iface in router_config.get('interfaces', []):
-                if iface['name'] == dest_interface:
-                    enriched['dest_ip'] = iface.get('ip', '')
-                    break
+            all_metrics = []
+            for link in monitored_links:
+                metrics = self._collect_link(link)
+                if metrics is not None:
+                    all_metrics.append(metrics)
+                    
+            return all_metrics
+        finally:
+            self.metrics_collector.clear_cycle_cache()
+            
+    def _prepare_routers(self, monitored_links: List[Dict]):
+        """
+        Récupère l'état de chaque routeur source une seule fois pour le cycle:
+        snapshot complet si collection.snapshot, sinon état JSON vtysh si
+        collection.router_state. Les routeurs en échec sont collectés commande par commande.
+        Si la section 'probing' est active, toutes les sondes de latence sont
+        lancées en même temps, pendant cette récupération
+        """
+        if self.metrics_collector.prober is None:
+            self._fetch_router_states(monitored_links)
+            return
+            
+        # Les sondes de latence tournent pendant la récupération des états routeur
+        probing = threading.Thread(
+            target=self.metrics_collector.prefetch_latency,
+            args=(self._probe_targets(monitored_links),),
+            name='probing', daemon=True
+        )
+        probing.start()
+        try:
+            self._fetch_router_states(monitored_links)
+        finally:
+            probing.join()
+            
+    def _probe_targets(self, monitored_links: List[Dict]) -> List[Tuple[str, str]]:
+        """Cibles de latence (routeur source, IP destination) des liens surveillés"""
+        if monitored_links is self.topology.links:
+            return self.topology.probe_targets
+        return list(dict.fromkeys(
+            (link['source_router'], link['dest_ip']) for link in monitored_links if link.get('dest_ip')
+        ))
+        
+    def _fetch_router_states(self, monitored_links: List[Dict]):
+        """Snapshot ou état JSON de chaque routeur source, selon la configuration"""
+        fetch = self._router_fetcher()
+        if fetch is None:
+            return
+        fetch, label = fetch
+        routers = self._polled_routers(monitored_links)
+        if not routers:
+            return
+        
+        if self.max_workers > 1:
+            workers = min(self.max_workers, len(routers))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='snapshot') as executor:
+                taken = list(executor.map(fetch, routers))
+        else:
+            taken = [fetch(router) for router in routers]
+            
+        for router, ok in zip(routers, taken):
+            if not ok:
+                logger.warning(f"{label} indisponible pour {router}, collecte par commande")
+                
+    def _source_routers(self, monitored_links: List[Dict]) -> List[str]:
+        """Routeurs source distincts des liens, dans l'ordre de la configuration"""
+        if monitored_links is self.topology.links:
+            return self.topology.source_routers
+        return list(dict.fromkeys(link['source_router'] for link in monitored_links))
+        
+    def _polled_routers(self, monitored_links: List[Dict]) -> List[str]:
+        """Routeurs source sans télémétrie récente, dont l'état doit être récupéré par exec"""
+        return [router for router in self._source_routers(monitored_links)
+                if not self.metrics_collector.has_fresh_telemetry(router)]
+        
+    def _interface_groups(self, monitored_links: List[Dict]) -> Dict[str, List[int]]:
+        """Positions des liens regroupées par interface source (clé de traffic_cache)"""
+        if monitored_links is self.topology.links:
+            return self.topology.interface_groups
+        groups: Dict[str, List[int]] = {}
+        for index, link in enumerate(monitored_links):
+            groups.setdefault(f"{link['source_router']}:{link['source_interface']}", []).append(index)
+        return groups
+        
+    def _router_fetcher(self, use_async: bool = False):
+        """Fonction de récupération par routeur selon la configuration (None si désactivée)"""
+        collector = self.metrics_collector
+        if self.use_snapshots:
+            return (collector.take_snapshot_async if use_async else collector.take_snapshot), "Snapshot"
+        if self.use_router_state:
+            return (collector.load_router_state_async if use_async else collector.load_router_state), "État JSON"
+        return None
+        
+    def _collect_link(self, link: Dict) -> Optional[LinkMetrics]:
+        """Collecte les métriques d'un lien, None en cas d'erreur"""
+        try:
+            metrics = self.metrics_collector.collect_link_metrics(link)
+            logger.debug(f"Métriques collectées pour {link['name']}")
+            return metrics
+        except Exception as e:
+            logger.error(f"Erreur lors de la collecte pour {link['name']}: {e}")
+            return None
+            
+    def _collect_metrics_parallel(self, monitored_links: List[Dict]) -> List[LinkMetrics]:
+        """
+        Collecte les métriques avec un pool de workers borné
+        
+        Les liens partageant la même interface source sont traités à la suite
+        dans un même worker: les deltas de traffic_cache (clé routeur:interface)
+        restent ainsi calculés dans l'ordre. Le nombre d'exécutions simultanées
+        sur un même routeur est limité par max_per_router.
+        
+        Returns:
+            Liste des métriques, dans l'ordre de monitored_links
+        """
+        groups = self._interface_groups(monitored_links)
+        results: List[Optional[LinkMetrics]] = [None] * len(monitored_links)
+        
+        def collect_group(indexes: List[int]):
+            router = monitored_links[indexes[0]]['source_router']
+            slot = self._router_slots.setdefault(
+                router, threading.BoundedSemaphore(self.max_per_router)
+            )
+            with slot:
+                for index in indexes:
+                    results[index] = self._collect_link(monitored_links[index])
                     
-        return enriched
+        workers = min(self.max_workers, len(groups))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='collect') as executor:
+            wait([executor.submit(collect_group, indexes) for indexes in groups.values()])
+            
+        return [metrics for metrics in results if metrics is not None]
+        
+    async def collect_metrics_async(self) -> List[LinkMetrics]:
+        """
+        Version asynchrone de collect_metrics
+        Tous les liens sont collectés dans la boucle asyncio courante; le nombre
+        de sous-processus en vol est borné par global.async_max_inflight
+        
+        Returns:
+            Liste des métriques, dans l'ordre de monitored_links
+        """
+        monitored_links = self.topology.links
+        
+        if not monitored_links:
+            logger.warning("Aucun lien configuré pour le monitoring")
+            return []
+            
+        logger.info(f"Collecte asynchrone des métriques pour {len(monitored_links)} liens...")
         
-    def calculate_optimal_costs(self, metrics: List[LinkMetrics],
+        async def fetch_router_states():
+            fetch = self._router_fetcher(use_async=True)
+            if fetch is None:
+                return
+            fetch, label = fetch
+            routers = self._polled_routers(monitored_links)
+            taken = await asyncio.gather(*(fetch(router) for router in routers))
+            for router, ok in zip(routers, taken):
+                if not ok:
+                    logger.warning(f"{label} indisponible pour {router}, collecte par commande")
+                    
+        await asyncio.gather(
+            fetch_router_states(),
+            self.metrics_collector.prefetch_latency_async(self._probe_targets(monitored_links))
+        )
+                    
+        # Même regroupement que la collecte parallèle: ordre conservé par interface source
+        groups = self._interface_groups(monitored_links)
+        results: List[Optional[LinkMetrics]] = [None] * len(monitored_links)
+        router_slots: Dict[str, asyncio.Semaphore] = {}
+        
+        async def collect_group(indexes: List[int]):
+            router = monitored_links[indexes[0]]['source_router']
+            slot = router_slots.setdefault(router, asyncio.Semaphore(self.max_per_router))
+            async with slot:
+                for index in indexes:
+                    link = monitored_links[index]
+                    try:
+                        results[index] = await self.metrics_collector.collect_link_metrics_async(link)
+                    except Exception as e:
+                        logger.error(f"Erreur lors de la collecte pour {link['name']}: {e}")
+                        
+        try:
+            await asyncio.gather(*(collect_group(indexes) for indexes in groups.values()))
+        finally:
+            self.metrics_collector.clear_cycle_cache()
+            
+        return [metrics for metrics in results if metrics is not None]
+        
+    def calculate_optimal_costs(self, metrics: Union[List[LinkMetrics], LinkMetricsBatch],
                                 strategy: OptimizationStrategy = OptimizationStrategy.COMPOSITE
                                ) -> List[CostCalculationResult]:
         """
         Calcule les coûts OSPF optimaux pour tous les liens
         
         Args:
-            metrics: Métriques collectées
+            metrics: Métriques collectées (liste ou lot en colonnes)
             strategy: Stratégie d'optimisation
             
         Returns:
@@ -158,6 +466,11 @@ class OSPFOptimizer:
         """
         Applique les changements de coûts OSPF sur les routeurs
         
+        Les changements sont regroupés par routeur: une seule session
+        'configure terminal' par routeur (un seul recalcul SPF), les routeurs
+        étant traités en parallèle. En mode transactionnel (apply.transactional),
+        un échec sur un routeur restaure les coûts initiaux partout.
+        
         Args:
             results: Résultats des calculs
             dry_run: Si True, n'applique pas réellement les changements
@@ -165,38 +478,143 @@ class OSPFOptimizer:
         Returns:
             Nombre de changements appliqués
         """
+        planned = self._planned_changes(results)
+        
+        if dry_run:
+            self._log_dry_run(planned)
+            return 0
+            
+        batches = self._group_by_router(planned)
+        
+        if not batches:
+            return 0
+            
+        if self.commit_engine is not None:
+            return self._report_commit(batches, self.commit_engine.commit(batches))
+            
+        workers = min(self.max_workers, len(batches))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='apply') as executor:
+            outcomes = list(executor.map(
+                lambda item: self.connection.set_ospf_costs(item[0], item[1]), batches.items()
+            ))
+            
+        return self._report_batches(batches, outcomes)
+        
+    async def apply_cost_changes_async(self, results: List[CostCalculationResult],
+                                       dry_run: bool = False) -> int:
+        """
+        Version asynchrone de apply_cost_changes
+        Les lots de tous les routeurs sont envoyés simultanément (via
+        CostCommitEngine.commit_async en mode transactionnel)
+        
+        Returns:
+            Nombre de changements appliqués
+        """
+        planned = self._planned_changes(results)
+        
+        if dry_run:
+            self._log_dry_run(planned)
+            return 0
+            
+        batches = self._group_by_router(planned)
+        
+        if not batches:
+            return 0
+            
+        if self.commit_engine is not None:
+            return self._report_commit(batches, await self.commit_engine.commit_async(batches))
+
+        outcomes = await asyncio.gather(*(
+            self.async_connection.set_ospf_costs(router, changes)
+            for router, changes in batches.items()
+        ))
+        
+        return self._report_batches(batches, outcomes)
+        
+    @staticmethod
+    def _group_by_router(planned: List[tuple]) -> Dict[str, Dict[str, int]]:
+        """Regroupe les changements planifiés en lots {routeur: {interface: coût}}"""
+        batches: Dict[str, Dict[str, int]] = {}
+        for result, router, interface in planned:
+            batches.setdefault(router, {})[interface] = result.calculated_cost
+        return batches
+        
+    @staticmethod
+    def _log_dry_run(planned: List[tuple]):
+        for result, router, interface in planned:
+            logger.info(f"[DRY-RUN] {router}.{interface}: coût {result.current_cost} → "
+                        f"{result.calculated_cost}")
+                
+    def _report_batches(self, batches: Dict[str, Dict[str, int]],
+                        outcomes: List[Dict[str, bool]]) -> int:
+        """Journalise le résultat de chaque interface et retourne le nombre de succès"""
         changes_applied = 0
+        for (router, changes), outcome in zip(batches.items(), outcomes):
+            for interface, new_cost in changes.items():
+                if self._report_change(router, interface, new_cost, outcome.get(interface, False)):
+                    changes_applied += 1
+        return changes_applied
+        
+    def _report_commit(self, batches: Dict[str, Dict[str, int]], commit) -> int:
+        """
+        Journalise le résultat d'un commit transactionnel (CommitResult)
+        
+        Returns:
+            Nombre de changements conservés (0 si le lot a été annulé)
+        """
+        if commit.committed:
+            return self._report_batches(batches, [commit.outcomes[router] for router in batches])
+            
+        failed = ', '.join(commit.failed_routers)
+        for router, changes in batches.items():
+            outcome = commit.outcomes.get(router)
+            if outcome is None:
+                reason = f"lot abandonné, coûts actuels illisibles sur {failed}"
+            elif router in commit.failed_routers:
+                reason = "échec sur ce routeur, lot annulé"
+            else:
+                reason = f"lot annulé après l'échec sur {failed}"
+            if router in commit.rolled_back:
+                reason += ", coûts initiaux restaurés"
+            elif router in commit.rollback_failed:
+                reason += ", restauration incomplète"
+            for interface, new_cost in changes.items():
+                self._report_change(router, interface, new_cost, False, reason)
+        return 0
+        
+    def _planned_changes(self, results: List[CostCalculationResult]) -> List[tuple]:
+        """
+        Sélectionne les résultats à appliquer et résout leur routeur/interface source
+        
+        Returns:
+            Liste de tuples (résultat, routeur, interface)
+        """
+        planned = []
         
         for result in results:
             if not result.should_update:
                 continue
                 
-            # Trouver le lien dans la configuration
-            link_config = None
-            for link in self.config.get('monitored_links', []):
-                if link['name'] == result.link_name:
-                    link_config = link
-                    break
-                    
-            if not link_config:
+            source = self.topology.source_of(result.link_name)
+            if source is None:
                 logger.warning(f"Configuration non trouvée pour {result.link_name}")
                 continue
                 
-            router = link_config['source_router']
-            interface = link_config['source_interface']
-            new_cost = result.calculated_cost
+            planned.append((result, *source))
             
-            if dry_run:
-                logger.info(f"[DRY-RUN] {router}.{interface}: coût {result.current_cost} → {new_cost}")
-            else:
-                success = self.connection.set_ospf_cost(router, interface, new_cost)
-                if success:
-                    changes_applied += 1
-                    logger.info(f"✓ {router}.{interface}: coût modifié à {new_cost}")
-                else:
-                    logger.error(f"✗ Échec de modification du coût sur {router}.{interface}")
-                    
-        return changes_applied
+        return planned
+        
+    def _report_change(self, router: str, interface: str, new_cost: int, success: bool,
+                       reason: str = None) -> bool:
+        """Journalise et comptabilise le résultat d'un changement de coût"""
+        if success:
+            self.apply_stats['applied'] += 1
+            logger.info(f"✓ {router}.{interface}: coût modifié à {new_cost}")
+        else:
+            self.apply_stats['failed'] += 1
+            logger.error(f"✗ Échec de modification du coût sur {router}.{interface}"
+                         + (f" ({reason})" if reason else ""))
+        return success
         
     def optimize_once(self, strategy: OptimizationStrategy = OptimizationStrategy.COMPOSITE,
                       dry_run: bool = False) -> Dict:
@@ -210,6 +628,223 @@ class OSPFOptimizer:
         Returns:
             Résumé de l'optimisation
         """
+        with self._cycle_lock:
+            start_time = self._start_cycle(strategy)
+            
+            if self.use_pipeline:
+                return self._optimize_pipelined(start_time, strategy, dry_run)
+                
+            # 1. Collecter les métriques
+            metrics = self.collect_metrics()
+            if not metrics:
+                return {'error': 'Aucune métrique collectée', 'success': False}
+                
+            # 2-3. Calculer les coûts optimaux et afficher le résumé
+            results, summary = self._evaluate(metrics, strategy)
+            
+            # 4. Appliquer les changements
+            changes = self.apply_cost_changes(results, dry_run)
+            
+            # 5. Mettre à jour l'état
+            return self._finish_cycle(start_time, changes, summary)
+            
+    def _optimize_pipelined(self, start_time: datetime, strategy: OptimizationStrategy,
+                            dry_run: bool) -> Dict:
+        """
+        Cycle en pipeline (section 'pipeline')
+        
+        Étages reliés par des files bornées (queue_size), une file pleine
+        bloquant l'étage précédent:
+        1. Collecte par routeur source en parallèle: état, sondes de latence
+           du seul routeur, puis ses liens; chaque lien mesuré part aussitôt
+        2. Calcul du coût (CostCalculator.calculate_cost), un seul thread
+        3. Application des liens à modifier par petits lots (apply_batch)
+           formés de ce qui attend dans la file (transactionnels si apply.transactional)
+        
+        Returns:
+            Résumé de l'optimisation
+        """
+        monitored_links = self.topology.links
+        if not monitored_links:
+            logger.warning("Aucun lien configuré pour le monitoring")
+            return {'error': 'Aucune métrique collectée', 'success': False}
+            
+        cycle_start = time.monotonic()
+        calc_queue: queue.Queue = queue.Queue(maxsize=self.pipeline_queue_size)
+        apply_queue: queue.Queue = queue.Queue(maxsize=self.pipeline_queue_size)
+        done = object()
+        metrics_list: List[Optional[LinkMetrics]] = [None] * len(monitored_links)
+        results: List[Optional[CostCalculationResult]] = [None] * len(monitored_links)
+        stats = {'first_result_s': None, 'first_apply_s': None, 'apply_batches': 0, 'applied': 0}
+        
+        def calculate():
+            while True:
+                item = calc_queue.get()
+                if item is done:
+                    apply_queue.put(done)
+                    return
+                index, metrics = item
+                try:
+                    # Historique (et statistiques glissantes) avant le calcul, comme _evaluate
+                    self.metrics_collector.record_history(metrics)
+                    result = self.cost_calculator.calculate_cost(metrics, strategy)
+                except Exception as e:
+                    logger.error(f"Erreur de calcul pour {metrics.link_name}: {e}")
+                    continue
+                results[index] = result
+                if stats['first_result_s'] is None:
+                    stats['first_result_s'] = round(time.monotonic() - cycle_start, 3)
+                if result.should_update:
+                    apply_queue.put(result)
+                    
+        def apply():
+            finished = False
+            while not finished:
+                item = apply_queue.get()
+                if item is done:
+                    return
+                batch = [item]
+                # Les changements déjà en attente partent dans le même lot (une session par routeur)
+                while len(batch) < self.pipeline_apply_batch:
+                    try:
+                        item = apply_queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if item is done:
+                        finished = True
+                        break
+                    batch.append(item)
+                if stats['first_apply_s'] is None:
+                    stats['first_apply_s'] = round(time.monotonic() - cycle_start, 3)
+                stats['apply_batches'] += 1
+                try:
+                    stats['applied'] += self.apply_cost_changes(batch, dry_run)
+                except Exception as e:
+                    logger.error(f"Erreur d'application d'un lot de {len(batch)} coûts: {e}")
+                    
+        def emit(index: int, metrics: LinkMetrics):
+            metrics_list[index] = metrics
+            calc_queue.put((index, metrics))
+            
+        stages = [threading.Thread(target=calculate, name='pipeline-calc', daemon=True),
+                  threading.Thread(target=apply, name='pipeline-apply', daemon=True)]
+        for stage in stages:
+            stage.start()
+            
+        logger.info(f"Collecte en pipeline pour {len(monitored_links)} liens...")
+        router_groups: Dict[str, List[List[int]]] = {}
+        for indexes in self._interface_groups(monitored_links).values():
+            router_groups.setdefault(monitored_links[indexes[0]]['source_router'], []).append(indexes)
+            
+        try:
+            workers = min(self.max_workers, len(router_groups))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='pipeline') as executor:
+                for future in [executor.submit(self._collect_router_stage, router, groups,
+                                               monitored_links, emit)
+                               for router, groups in router_groups.items()]:
+                    future.result()
+        finally:
+            calc_queue.put(done)
+            for stage in stages:
+                stage.join()
+            self.metrics_collector.clear_cycle_cache()
+            
+        metrics = [m for m in metrics_list if m is not None]
+        if not metrics:
+            return {'error': 'Aucune métrique collectée', 'success': False}
+        if self.poll_scheduler is not None:
+            self.poll_scheduler.observe(metrics)
+        batch = self._record_history(metrics, in_memory=False)
+        if self.column_history is not None:
+            self.column_history.append_cycle(batch, results)
+            
+        summary = self.cost_calculator.get_optimization_summary([r for r in results if r is not None])
+        self._print_summary(summary)
+        
+        self.pipeline_stats = {**stats, 'total_s': round(time.monotonic() - cycle_start, 3)}
+        logger.info(f"Pipeline: premier coût calculé à {stats['first_result_s']}s, "
+                    f"première application à {stats['first_apply_s']}s "
+                    f"({stats['apply_batches']} lots)")
+        return self._finish_cycle(start_time, stats['applied'], summary)
+        
+    def _collect_router_stage(self, router: str, groups: List[List[int]],
+                              monitored_links: List[Dict], emit):
+        """
+        Étage de collecte d'un routeur source: état et sondes de ce routeur
+        seulement, puis ses liens (max_per_router interfaces à la fois)
+        """
+        collector = self.metrics_collector
+        fetch = self._router_fetcher()
+        if fetch is not None and not collector.has_fresh_telemetry(router):
+            fetch, label = fetch
+            if not fetch(router):
+                logger.warning(f"{label} indisponible pour {router}, collecte par commande")
+                
+        targets = list(dict.fromkeys(
+            (router, monitored_links[index]['dest_ip'])
+            for indexes in groups for index in indexes if monitored_links[index].get('dest_ip')
+        ))
+        collector.prefetch_latency(targets)
+        
+        def collect_group(indexes: List[int]):
+            for index in indexes:
+                metrics = self._collect_link(monitored_links[index])
+                if metrics is not None:
+                    emit(index, metrics)
+                    
+        with ThreadPoolExecutor(max_workers=min(self.max_per_router, len(groups)),
+                                thread_name_prefix=f'pipeline-{router}') as executor:
+            for future in [executor.submit(collect_group, indexes) for indexes in groups]:
+                future.result()
+                
+    def optimize_links(self, link_names: List[str],
+                       strategy: OptimizationStrategy = OptimizationStrategy.COMPOSITE,
+                       dry_run: bool = False) -> Dict:
+        """
+        Cycle ciblé: re-collecte, recalcul et application pour les seuls liens
+        indiqués (déclenché par EventWatcher, entre deux cycles périodiques)
+        
+        Returns:
+            Résumé de l'optimisation
+        """
+        links = [self.topology.link(name) for name in link_names]
+        links = [link for link in links if link is not None]
+        if not links:
+            return {'error': 'Aucun lien surveillé concerné', 'success': False}
+            
+        with self._cycle_lock:
+            start_time = datetime.now()
+            logger.info(f"Cycle ciblé sur {len(links)} liens: {', '.join(link['name'] for link in links)}")
+            
+            metrics = self.collect_metrics(links)
+            if not metrics:
+                return {'error': 'Aucune métrique collectée', 'success': False}
+                
+            results, summary = self._evaluate(metrics, strategy)
+            changes = self.apply_cost_changes(results, dry_run)
+            return self._finish_cycle(start_time, changes, summary)
+        
+    async def optimize_once_async(self, strategy: OptimizationStrategy = OptimizationStrategy.COMPOSITE,
+                                  dry_run: bool = False) -> Dict:
+        """
+        Version asynchrone de optimize_once (collecte et application via asyncio)
+        
+        Returns:
+            Résumé de l'optimisation
+        """
+        start_time = self._start_cycle(strategy)
+        
+        metrics = await self.collect_metrics_async()
+        if not metrics:
+            return {'error': 'Aucune métrique collectée', 'success': False}
+            
+        results, summary = self._evaluate(metrics, strategy)
+        changes = await self.apply_cost_changes_async(results, dry_run)
+        
+        return self._finish_cycle(start_time, changes, summary)
+        
+    def _start_cycle(self, strategy: OptimizationStrategy) -> datetime:
+        """Journalise le début d'un cycle et retourne son heure de départ"""
         start_time = datetime.now()
         
         logger.info("="*60)
@@ -217,22 +852,41 @@ class OSPFOptimizer:
         logger.info(f"Stratégie: {strategy.value}")
         logger.info("="*60)
         
-        # 1. Collecter les métriques
-        metrics = self.collect_metrics()
-        if not metrics:
-            return {'error': 'Aucune métrique collectée', 'success': False}
-            
-        # 2. Calculer les coûts optimaux
-        results = self.calculate_optimal_costs(metrics, strategy)
+        self.connection.begin_cycle()
         
-        # 3. Afficher le résumé
+        return start_time
+        
+    def _evaluate(self, metrics: List[LinkMetrics], strategy: OptimizationStrategy) -> tuple:
+        """Calcule les coûts optimaux et affiche le résumé"""
+        if self.poll_scheduler is not None:
+            # Toute mesure (cycle complet, ciblé ou adaptatif) reporte l'échéance du lien
+            self.poll_scheduler.observe(metrics)
+        batch = self._record_history(metrics)
+        results = self.calculate_optimal_costs(batch, strategy)
+        if self.column_history is not None:
+            self.column_history.append_cycle(batch, results)
         summary = self.cost_calculator.get_optimization_summary(results)
         self._print_summary(summary)
+        return results, summary
+        
+    def _record_history(self, metrics: List[LinkMetrics], in_memory: bool = True) -> LinkMetricsBatch:
+        """
+        Ajoute les mesures d'un cycle à l'historique en mémoire et, si activé,
+        à la base persistante (lot en colonnes: aucun objet par échantillon)
         
-        # 4. Appliquer les changements
-        changes = self.apply_cost_changes(results, dry_run)
+        Args:
+            metrics: Mesures du cycle
+            in_memory: False si elles sont déjà dans l'historique du collecteur (pipeline)
+        """
+        batch = LinkMetricsBatch.from_metrics(metrics)
+        if in_memory:
+            self.metrics_collector.record_batch(batch)
+        if self.metrics_store is not None:
+            self.metrics_store.record_batch(batch)
+        return batch
         
-        # 5. Mettre à jour l'état
+    def _finish_cycle(self, start_time: datetime, changes: int, summary: Dict) -> Dict:
+        """Met à jour l'état de l'optimiseur et construit le résultat du cycle"""
         self.last_optimization = datetime.now()
         self.optimization_count += 1
         
@@ -284,31 +938,102 @@ class OSPFOptimizer:
         
     def run_continuous(self, interval: int = 60, 
                        strategy: OptimizationStrategy = OptimizationStrategy.COMPOSITE,
-                       dry_run: bool = False):
+                       dry_run: bool = False, use_async: bool = False):
         """
         Exécute l'optimisation en continu
         
         Args:
-            interval: Intervalle entre les optimisations (secondes)
+            interval: Période des cycles en secondes (cadence fixe, section 'schedule')
             strategy: Stratégie d'optimisation
             dry_run: Mode simulation
+            use_async: Utilise le chemin asyncio (optimize_once_async)
+            
+        Avec polling.adaptive, chaque lien est mesuré à sa propre période
+        (cycles ciblés synchrones, voir AdaptivePollScheduler); interval ne
+        sert plus qu'à cadencer la réconciliation du cache des coûts
         """
         self.running = True
-        logger.info(f"Démarrage de l'optimisation continue (intervalle: {interval}s)")
+        self._stop_event.clear()
+        self._start_event_watcher(strategy, dry_run)
         
         try:
-            while self.running:
-                self.optimize_once(strategy, dry_run)
-                logger.info(f"Prochaine optimisation dans {interval} secondes...")
-                time.sleep(interval)
+            if self.poll_scheduler is not None:
+                logger.info("Démarrage de l'optimisation continue (période adaptative par lien)")
+                self._run_adaptive(strategy, dry_run, interval)
+                return
+                
+            self.cycle_scheduler = FixedRateScheduler(
+                interval,
+                overrun=self.schedule_config.get('overrun', 'skip'),
+                align=self.schedule_config.get('align', True),
+                stop_event=self._stop_event
+            )
+            logger.info(f"Démarrage de l'optimisation continue (intervalle: {interval}s, "
+                        f"débordement: {self.cycle_scheduler.overrun})")
+            
+            def cycle():
+                if use_async:
+                    with self._cycle_lock:
+                        asyncio.run(self.optimize_once_async(strategy, dry_run))
+                else:
+                    self.optimize_once(strategy, dry_run)
+                    
+            self.cycle_scheduler.run(cycle)
         except KeyboardInterrupt:
             logger.info("Arrêt demandé par l'utilisateur")
         finally:
             self.stop()
             
+    def _run_adaptive(self, strategy: OptimizationStrategy, dry_run: bool, interval: float = 60):
+        """
+        Boucle de run_continuous en mode adaptatif: seuls les liens dus sont mesurés
+        Un cycle du cache des coûts (begin_cycle) est compté toutes les 'interval'
+        secondes, et non à chaque passage: reconcile_every garde la même durée
+        qu'en mode périodique quel que soit polling.tick
+        """
+        cycle_started = None
+        while self.running:
+            due = self.poll_scheduler.due()
+            if due:
+                now = time.monotonic()
+                if cycle_started is None or now - cycle_started >= interval:
+                    cycle_started = now
+                    self.connection.begin_cycle()
+                self.optimize_links(due, strategy, dry_run)
+            self._stop_event.wait(max(self.poll_tick, self.poll_scheduler.next_wakeup()))
+            
+    def _start_event_watcher(self, strategy: OptimizationStrategy, dry_run: bool):
+        """Démarre les déclencheurs sur événements si la section 'events' est active"""
+        events_config = self.config.get('events', {}) or {}
+        if not events_config.get('enabled', False) or self.event_watcher is not None:
+            return
+            
+        def on_trigger(link_names: List[str], reasons: Dict[str, List[str]]):
+            if self.running:
+                self.optimize_links(link_names, strategy, dry_run)
+                
+        self.event_watcher = EventWatcher(self.connection, self.topology, on_trigger, events_config)
+        routers = list(dict.fromkeys(
+            [*self.topology.source_routers, *(link['dest_router'] for link in self.topology.links)]
+        ))
+        self.event_watcher.start([router for router in routers if router in self.connection.routers])
+        
     def stop(self):
         """Arrête l'optimisation et ferme les connexions"""
         self.running = False
+        self._stop_event.set()
+        if self.event_watcher is not None:
+            self.event_watcher.stop()
+            self.event_watcher = None
+        for agent in self.telemetry_agents:
+            agent.stop()
+        if self.telemetry_server is not None:
+            self.telemetry_server.stop()
+        if self.metrics_store is not None:
+            self.metrics_store.flush()
+        if self.column_history is not None:
+            # Libère les projections mémoire et les fichiers (rouverts au besoin par append)
+            self.column_history.close()
         self.connection.disconnect_all()
         logger.info("Optimiseur arrêté")
         
@@ -320,7 +1045,23 @@ class OSPFOptimizer:
             'optimization_count': self.optimization_count,
             'last_optimization': self.last_optimization.isoformat() if self.last_optimization else None,
             'configured_routers': list(self.connection.routers.keys()),
-            'monitored_links': len(self.config.get('monitored_links', []))
+            'monitored_links': len(self.topology),
+            'connection_pool': self.connection.get_pool_stats(),
+            'host_counters': self.connection.get_counter_stats(),
+            'cost_cache': self.connection.get_cost_cache_stats(),
+            'apply': dict(self.apply_stats),
+            'commit': self.commit_engine.get_stats() if self.commit_engine else None,
+            'telemetry': self.telemetry_server.get_stats() if self.telemetry_server else None,
+            'events': self.event_watcher.get_stats() if self.event_watcher else None,
+            'polling': self.poll_scheduler.get_stats() if self.poll_scheduler else None,
+            'schedule': self.cycle_scheduler.get_stats() if self.cycle_scheduler else None,
+            'storage': self.metrics_store.get_stats() if self.metrics_store else None,
+            'column_history': self.column_history.get_stats() if self.column_history else None,
+            'latency_percentiles': {
+                link['name']: self.metrics_collector.get_latency_percentiles(link['name'])
+                for link in self.topology.links
+            },
+            'pipeline': self.pipeline_stats or None
         }
 
 
@@ -371,7 +1112,7 @@ Exemples d'utilisation:
     
     parser.add_argument(
         '--strategy',
-        choices=['composite', 'bandwidth', 'latency'],
+        choices=['composite', 'bandwidth', 'latency', 'latency_p95'],
         default='composite',
         help='Stratégie d\'optimisation (défaut: composite)'
     )
@@ -382,6 +1123,13 @@ Exemples d'utilisation:
         help='Mode verbose (affiche plus de détails)'
     )
     
+    parser.add_argument(
+        '--async', '-a',
+        dest='use_async',
+        action='store_true',
+        help='Utilise le transport asyncio (collecte et application concurrentes dans un seul thread)'
+    )
+    
     parser.add_argument(
         '--web', '-w',
         action='store_true',
@@ -405,7 +1153,8 @@ Exemples d'utilisation:
     strategy_map = {
         'composite': OptimizationStrategy.COMPOSITE,
         'bandwidth': OptimizationStrategy.BANDWIDTH_BASED,
-        'latency': OptimizationStrategy.LATENCY_BASED
+        'latency': OptimizationStrategy.LATENCY_BASED,
+        'latency_p95': OptimizationStrategy.LATENCY_P95
     }
     strategy = strategy_map[args.strategy]
     
@@ -435,9 +1184,12 @@ Exemples d'utilisation:
             app = create_app(optimizer)
             run_server(app, port=args.port, debug=args.verbose)
         elif args.once:
-            optimizer.optimize_once(strategy, args.dry_run)
+            if args.use_async:
+                asyncio.run(optimizer.optimize_once_async(strategy, args.dry_run))
+            else:
+                optimizer.optimize_once(strategy, args.dry_run)
         else:
-            optimizer.run_continuous(args.interval, strategy, args.dry_run)
+            optimizer.run_continuous(args.interval, strategy, args.dry_run, args.use_async)
     except Exception as e:
         logger.error(f"Erreur durant l'exécution: {e}")
         raise
@@ -0,0 +1,80 @@
+#!/bin/sh
+# =============================================================================
+# Agent de télémétrie OSPF Optimizer (conteneurs FRR, sh/busybox)
+#
+# Échantillonne les compteurs d'interface (/proc/net/dev) et sonde les voisins
+# en parallèle, puis pousse un enregistrement compact vers le serveur
+# d'ingestion de l'optimiseur (section 'telemetry' de routers.yaml).
+# Format: voir src/telemetry.py
+#
+# UTILISATION:
+#   telemetry_agent.sh <routeur> <collecteur> [intervalle] [ip_voisin ...]
+#     collecteur: hôte:port (UDP, nc) ou chemin d'un socket unix (socat)
+#
+# DÉPLOIEMENT (depuis l'hôte GNS3, exemple pour ABR1):
+#   docker cp scripts/telemetry_agent.sh <conteneur>:/usr/local/bin/
+#   docker exec -d <conteneur> sh /usr/local/bin/telemetry_agent.sh \
+#       ABR1 172.17.0.1:5515 5 10.0.0.2 10.0.1.2 10.1.1.2 10.1.2.2
+#
+# Variables optionnelles: PROBE_COUNT (3), PROBE_INTERVAL (0.2), PROBE_DEADLINE (2)
+# =============================================================================
+
+ROUTER=$1
+COLLECTOR=$2
+INTERVAL=${3:-5}
+[ -n "$ROUTER" ] && [ -n "$COLLECTOR" ] || {
+    echo "usage: $0 <routeur> <hôte:port|socket> [intervalle] [ip_voisin ...]" >&2
+    exit 1
+}
+shift 2
+[ $# -gt 0 ] && shift
+TARGETS="$*"
+
+PROBE_COUNT=${PROBE_COUNT:-3}
+PROBE_INTERVAL=${PROBE_INTERVAL:-0.2}
+PROBE_DEADLINE=${PROBE_DEADLINE:-2}
+
+# Époque de cette exécution: l'optimiseur écarte tout enregistrement plus
+# ancien que le dernier reçu, y compris ceux d'une exécution précédente
+EPOCH=$(date +%s)
+
+send() {
+    case "$COLLECTOR" in
+        /*) socat -u - UNIX-SENDTO:"$COLLECTOR" ;;
+        *)  nc -u -w 1 "${COLLECTOR%:*}" "${COLLECTOR##*:}" ;;
+    esac
+}
+
+sample() {
+    dir=$(mktemp -d)
+
+    # Sondes lancées en arrière-plan pendant la lecture des compteurs
+    for ip in $TARGETS; do
+        ping -c "$PROBE_COUNT" -i "$PROBE_INTERVAL" -w "$PROBE_DEADLINE" "$ip" > "$dir/$ip" 2>&1 &
+    done
+
+    # Horloge monotone du noyau (deltas de débit côté optimiseur)
+    echo "ospft1 $ROUTER $EPOCH $(cut -d' ' -f1 /proc/uptime)"
+
+    awk 'NR > 2 { sub(":", " "); print $1, $2, $3, $4, $5, $10, $11, $12, $13 }' /proc/net/dev |
+    while read -r iface rxb rxp rxe rxd txb txp txe txd; do
+        [ "$iface" = "lo" ] && continue
+        state=$(cat "/sys/class/net/$iface/operstate" 2>/dev/null || echo down)
+        addr=$(ip -o -4 addr show dev "$iface" 2>/dev/null | awk '{ split($4, a, "/"); print a[1]; exit }')
+        echo "c $iface $state ${addr:--} $rxb $rxp $rxe $rxd $txb $txp $txe $txd"
+    done
+
+    wait
+    for ip in $TARGETS; do
+        sent=$(grep -o '[0-9]* packets transmitted' "$dir/$ip" | cut -d' ' -f1)
+        rtts=$(grep -o 'time[=<][0-9.]*' "$dir/$ip" | cut -c6- | tr '\n' ',' | sed 's/,$//')
+        echo "p $ip ${sent:-$PROBE_COUNT} ${rtts:--}"
+    done
+
+    rm -rf "$dir"
+}
+
+while :; do
+    sample | send
+    sleep "$INTERVAL"
+done
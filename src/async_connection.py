@@ -0,0 +1,394 @@
+"""
+Connexion asynchrone aux routeurs FRRouting
+Même interface que FRRRouterConnection: en docker_exec, les commandes sont des
+sous-processus asyncio (des centaines en vol dans un seul thread); les autres
+méthodes (docker_session, docker_api, ssh) passent par le transport de la
+connexion synchrone, exécuté dans un thread
+"""
+
+import asyncio
+import functools
+import re
+import logging
+from typing import Dict, Optional, List
+
+from .frr_state import STATE_COMMANDS, RouterState, parse_router_state
+from .netns_counters import HostCounterReader, resolve_container_pid
+from .cost_cache import OSPFCostCache
+from .router_connection import (
+    RouterCredentials,
+    MockFRRConnection,
+    SNAPSHOT_COMMAND,
+    parse_proc_net_dev,
+    parse_router_snapshot,
+    build_ping_command,
+    build_multi_ping_command,
+    build_cost_batch_command,
+    parse_cost_batch_output,
+    parse_multi_ping_output,
+    ping_timeout,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncFRRRouterConnection:
+    """
+    Gestionnaire de connexions asynchrone vers les routeurs FRRouting
+    En docker_exec, chaque commande est un sous-processus avec son propre
+    timeout; sinon elle est déléguée à la connexion synchrone
+    """
+
+    def __init__(self, global_config: Dict, cost_cache: OSPFCostCache = None,
+                 sync_connection=None):
+        """
+        Args:
+            global_config: Configuration globale depuis routers.yaml
+            cost_cache: Cache des coûts OSPF partagé avec la connexion synchrone
+            sync_connection: FRRRouterConnection dont le transport (méthodes autres
+                             que docker_exec), le cache des coûts et le lecteur de
+                             compteurs sont partagés; obligatoire hors docker_exec
+
+        Raises:
+            ValueError: Méthode de connexion autre que docker_exec sans sync_connection
+        """
+        self.connection_method = global_config.get('connection_method', 'docker_exec')
+        if self.connection_method != 'docker_exec' and sync_connection is None:
+            raise ValueError(f"Méthode de connexion '{self.connection_method}' non disponible "
+                             f"en asynchrone sans connexion synchrone")
+        self.sync_connection = sync_connection
+        if cost_cache is None and sync_connection is not None:
+            cost_cache = sync_connection.cost_cache
+        self.cost_cache = cost_cache
+        self.timeout = global_config.get('timeout', 30)
+        self.max_inflight = global_config.get('async_max_inflight', 200)
+
+        # Compteurs lus depuis l'hôte (lecture de fichier, pas de sous-processus),
+        # même lecteur (et même cache de PID) que la connexion synchrone
+        self.host_counters = None
+        if sync_connection is not None:
+            self.host_counters = sync_connection.host_counters
+        elif global_config.get('host_counters', False):
+            docker_socket = global_config.get('docker_socket')
+            self.host_counters = HostCounterReader(
+                parse_proc_net_dev,
+                resolver=(lambda container: resolve_container_pid(container, docker_socket))
+                if docker_socket else None
+            )
+
+        # Cache des routeurs configurés
+        self.routers: Dict[str, RouterCredentials] = {}
+
+        # Sémaphore liée à la boucle courante (recréée à chaque asyncio.run)
+        self._inflight: Optional[asyncio.Semaphore] = None
+        self._inflight_loop = None
+
+    def add_router(self, name: str, config: Dict):
+        """Ajoute un routeur à la liste des routeurs gérés"""
+        self.routers[name] = RouterCredentials(
+            hostname=config.get('hostname', name),
+            container_name=config.get('container_name', name)
+        )
+
+    def _get_inflight_semaphore(self) -> asyncio.Semaphore:
+        """Retourne la sémaphore limitant les sous-processus simultanés"""
+        loop = asyncio.get_running_loop()
+        if self._inflight is None or self._inflight_loop is not loop:
+            self._inflight = asyncio.Semaphore(self.max_inflight)
+            self._inflight_loop = loop
+        return self._inflight
+
+    async def _docker_exec(self, router_name: str, command: str,
+                           timeout: float = None) -> Optional[str]:
+        """
+        Exécute une commande dans un conteneur Docker via docker exec
+
+        Args:
+            router_name: Nom du routeur
+            command: Commande à exécuter
+            timeout: Timeout en secondes
+
+        Returns:
+            Sortie de la commande ou None en cas d'erreur
+        """
+        if router_name not in self.routers:
+            return None
+
+        container = self.routers[router_name].container_name
+        timeout = timeout or self.timeout
+
+        async with self._get_inflight_semaphore():
+            try:
+                process = await asyncio.create_subprocess_exec(
+                    'docker', 'exec', container, 'sh', '-c', command,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE
+                )
+            except FileNotFoundError:
+                logger.error("Docker n'est pas installé ou pas dans le PATH")
+                return None
+            except Exception as e:
+                logger.error(f"Erreur docker exec sur {router_name}: {e}")
+                return None
+
+            try:
+                stdout, stderr = await asyncio.wait_for(process.communicate(), timeout)
+            except asyncio.TimeoutError:
+                process.kill()
+                await process.wait()
+                logger.error(f"Timeout lors de l'exécution sur {router_name}")
+                return None
+
+        if process.returncode != 0:
+            logger.warning(f"Commande échouée sur {router_name}: "
+                           f"{stderr.decode(errors='replace')}")
+
+        return stdout.decode(errors='replace')
+
+    async def _delegate_exec(self, router_name: str, command: str,
+                             timeout: float = None) -> Optional[str]:
+        """Exécute une commande via le transport de la connexion synchrone (dans un thread)"""
+        if router_name not in self.routers:
+            return None
+
+        async with self._get_inflight_semaphore():
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, functools.partial(
+                self.sync_connection.execute_command, router_name, command, timeout
+            ))
+
+    async def execute_command(self, router_name: str, command: str,
+                              timeout: float = None) -> Optional[str]:
+        """Exécute une commande shell sur un routeur FRR"""
+        if self.connection_method == 'docker_exec':
+            return await self._docker_exec(router_name, command, timeout)
+        return await self._delegate_exec(router_name, command, timeout)
+
+    async def execute_vtysh(self, router_name: str, commands: List[str],
+                            timeout: float = None) -> Optional[str]:
+        """Exécute des commandes vtysh sur un routeur FRR"""
+        vtysh_cmd = 'vtysh'
+        for cmd in commands:
+            vtysh_cmd += f' -c "{cmd}"'
+
+        return await self.execute_command(router_name, vtysh_cmd, timeout)
+
+    async def get_ospf_neighbors(self, router_name: str) -> Optional[str]:
+        """Récupère les voisins OSPF via vtysh"""
+        return await self.execute_vtysh(router_name, ['show ip ospf neighbor'])
+
+    async def get_ospf_interface(self, router_name: str, interface: str = None) -> Optional[str]:
+        """Récupère les infos OSPF d'une interface"""
+        if interface:
+            return await self.execute_vtysh(router_name, [f'show ip ospf interface {interface}'])
+        return await self.execute_vtysh(router_name, ['show ip ospf interface'])
+
+    async def get_interface_traffic(self, router_name: str, interface: str) -> Dict:
+        """Récupère le trafic d'une interface depuis /proc/net/dev"""
+        if self.host_counters is not None and router_name in self.routers:
+            counters = self.host_counters.read(self.routers[router_name].container_name)
+            if counters is not None:
+                return counters.get(interface, {})
+
+        output = await self.execute_command(router_name, f"cat /proc/net/dev | grep {interface}")
+
+        if not output:
+            return {}
+
+        return parse_proc_net_dev(output).get(interface, {})
+
+    async def get_router_snapshot(self, router_name: str) -> Optional[Dict]:
+        """Récupère le snapshot complet d'un routeur en une exécution"""
+        output = await self.execute_command(router_name, SNAPSHOT_COMMAND)
+
+        if not output:
+            return None
+
+        snapshot = parse_router_snapshot(output)
+        self._observe_state(router_name, snapshot['state'])
+        return snapshot
+
+    async def get_router_state(self, router_name: str) -> Optional[RouterState]:
+        """Récupère l'état JSON vtysh d'un routeur en une invocation"""
+        output = await self.execute_vtysh(router_name, STATE_COMMANDS)
+
+        if not output:
+            return None
+
+        state = parse_router_state(output)
+        self._observe_state(router_name, state)
+        return state
+
+    def _observe_state(self, router_name: str, state: Optional[RouterState]):
+        """Alimente le cache des coûts partagé avec un état JSON fraîchement relu"""
+        if state is None or self.cost_cache is None:
+            return
+        self.cost_cache.observe_neighbors(router_name, state.neighbors)
+        self.cost_cache.store_router(router_name, state.ospf_costs())
+
+    async def ping(self, router_name: str, dest_ip: str, count: int = 5,
+                   interval: float = None, deadline: int = None) -> Optional[str]:
+        """Exécute un ping depuis un routeur (voir FRRRouterConnection.ping)"""
+        return await self.execute_command(
+            router_name, build_ping_command(dest_ip, count, interval, deadline),
+            timeout=ping_timeout(count, interval, deadline)
+        )
+
+    async def ping_many(self, router_name: str, dest_ips: List[str], count: int = 5,
+                        interval: float = None, deadline: int = None) -> Dict[str, str]:
+        """Ping de plusieurs destinations en une exécution (voir FRRRouterConnection.ping_many)"""
+        output = await self.execute_command(
+            router_name, build_multi_ping_command(dest_ips, count, interval, deadline),
+            timeout=ping_timeout(count, interval, deadline)
+        )
+
+        if not output:
+            return {}
+
+        return parse_multi_ping_output(output)
+
+    async def set_ospf_cost(self, router_name: str, interface: str, cost: int) -> bool:
+        """Modifie le coût OSPF d'une interface via vtysh"""
+        commands = [
+            'configure terminal',
+            f'interface {interface}',
+            f'ip ospf cost {cost}',
+            'exit',
+            'exit'
+        ]
+
+        result = await self.execute_vtysh(router_name, commands)
+
+        if result is not None:
+            if self.cost_cache is not None:
+                self.cost_cache.set(router_name, interface, cost)
+            logger.info(f"✓ Coût OSPF de {interface} sur {router_name} modifié à {cost}")
+            return True
+        else:
+            logger.error(f"✗ Échec modification coût OSPF sur {router_name}.{interface}")
+            return False
+
+    async def set_ospf_costs(self, router_name: str, changes: Dict[str, int]) -> Dict[str, bool]:
+        """Modifie plusieurs coûts en une session (voir FRRRouterConnection.set_ospf_costs)"""
+        output = await self.execute_command(router_name, build_cost_batch_command(changes))
+        outcomes = parse_cost_batch_output(output, changes)
+
+        if self.cost_cache is not None:
+            for interface, success in outcomes.items():
+                if success:
+                    self.cost_cache.set(router_name, interface, changes[interface])
+
+        applied = sum(outcomes.values())
+        if applied == len(changes):
+            logger.info(f"✓ {applied} coûts OSPF modifiés sur {router_name} en une session")
+        else:
+            logger.error(f"✗ {len(changes) - applied}/{len(changes)} coûts OSPF non appliqués sur {router_name}")
+        return outcomes
+
+    async def get_ospf_cost(self, router_name: str, interface: str) -> int:
+        """Récupère le coût OSPF actuel d'une interface (0 si non trouvé)"""
+        if self.cost_cache is not None:
+            cached = self.cost_cache.get(router_name, interface)
+            if cached is not None:
+                return cached
+
+        output = await self.get_ospf_interface(router_name, interface)
+
+        if not output:
+            return 0
+
+        cost_match = re.search(r'Cost:\s*(\d+)', output)
+        if cost_match:
+            cost = int(cost_match.group(1))
+            if self.cost_cache is not None:
+                self.cost_cache.store(router_name, interface, cost)
+            return cost
+
+        return 0
+
+    async def disconnect_all(self):
+        """Rien à fermer: sous-processus indépendants, ou connexions de la connexion synchrone"""
+        pass
+
+
+class AsyncMockFRRConnection:
+    """
+    Jumeau asynchrone de MockFRRConnection pour les tests sans Docker
+    Partage l'état simulé (coûts, routeurs) avec la connexion synchrone fournie
+    """
+
+    def __init__(self, mock_connection: MockFRRConnection = None, delay: float = 0.0):
+        """
+        Args:
+            mock_connection: Connexion simulée synchrone à partager (créée sinon)
+            delay: Délai simulé par commande en secondes
+        """
+        self.mock = mock_connection or MockFRRConnection({})
+        self.routers = self.mock.routers
+        self.delay = delay
+
+    def add_router(self, name: str, config: Dict):
+        self.mock.add_router(name, config)
+
+    async def _simulate(self):
+        await asyncio.sleep(self.delay)
+
+    async def execute_command(self, router_name: str, command: str,
+                              timeout: float = None) -> Optional[str]:
+        await self._simulate()
+        return self.mock.execute_command(router_name, command)
+
+    async def execute_vtysh(self, router_name: str, commands: List[str],
+                            timeout: float = None) -> Optional[str]:
+        await self._simulate()
+        return self.mock.execute_vtysh(router_name, commands)
+
+    async def get_ospf_neighbors(self, router_name: str) -> Optional[str]:
+        await self._simulate()
+        return self.mock.get_ospf_neighbors(router_name)
+
+    async def get_ospf_interface(self, router_name: str, interface: str = None) -> Optional[str]:
+        await self._simulate()
+        return self.mock.get_ospf_interface(router_name, interface)
+
+    async def get_interface_traffic(self, router_name: str, interface: str) -> Dict:
+        await self._simulate()
+        return self.mock.get_interface_traffic(router_name, interface)
+
+    async def get_router_snapshot(self, router_name: str) -> Optional[Dict]:
+        await self._simulate()
+        return self.mock.get_router_snapshot(router_name)
+
+    async def get_router_state(self, router_name: str) -> Optional[RouterState]:
+        await self._simulate()
+        return self.mock.get_router_state(router_name)
+
+    async def ping(self, router_name: str, dest_ip: str, count: int = 5,
+                   interval: float = None, deadline: int = None) -> Optional[str]:
+        await self._simulate()
+        return self.mock.ping(router_name, dest_ip, count, interval, deadline)
+
+    async def ping_many(self, router_name: str, dest_ips: List[str], count: int = 5,
+                        interval: float = None, deadline: int = None) -> Dict[str, str]:
+        await self._simulate()
+        return self.mock.ping_many(router_name, dest_ips, count, interval, deadline)
+
+    async def set_ospf_cost(self, router_name: str, interface: str, cost: int) -> bool:
+        await self._simulate()
+        return self.mock.set_ospf_cost(router_name, interface, cost)
+
+    async def set_ospf_costs(self, router_name: str, changes: Dict[str, int]) -> Dict[str, bool]:
+        await self._simulate()
+        return self.mock.set_ospf_costs(router_name, changes)
+
+    async def get_ospf_cost(self, router_name: str, interface: str) -> int:
+        await self._simulate()
+        return self.mock.get_ospf_cost(router_name, interface)
+
+    async def disconnect_all(self):
+        pass
+
+
+# Alias pour compatibilité
+AsyncRouterConnection = AsyncFRRRouterConnection
+AsyncMockRouterConnection = AsyncMockFRRConnection
@@ -0,0 +1,287 @@
+"""
+Historique des liens en fichiers colonnes projetés en mémoire (mmap)
+Un répertoire par lien, un fichier à largeur fixe par colonne (valeurs natives
+float64/int64 contiguës) et un compteur de lignes. Les lecteurs obtiennent des
+vues sans copie (NumPy si disponible, sinon memoryview) sur l'ensemble de
+l'historique, directement exploitables pour rejouer le calcul des coûts
+"""
+
+import os
+import mmap
+import struct
+import bisect
+import threading
+import logging
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Colonnes: nom -> code de type (array/memoryview, 8 octets chacun)
+COLUMNS: Dict[str, str] = {
+    'timestamp': 'd',
+    'latency_ms': 'd',
+    'packet_loss_percent': 'd',
+    'jitter_ms': 'd',
+    'bandwidth_utilization': 'd',
+    'current_cost': 'q',
+    'calculated_cost': 'q',
+}
+ITEM_SIZE = 8
+COUNT_FILE = 'rows'
+COLUMN_SUFFIX = '.col'
+
+
+def _numpy():
+    """Module numpy, None s'il n'est pas installé"""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def _link_directory(root: str, link_name: str) -> str:
+    return os.path.join(root, link_name.replace(os.sep, '_'))
+
+
+class _LinkColumns:
+    """Fichiers ouverts en écriture d'un lien (capacité agrandie par blocs)"""
+
+    def __init__(self, directory: str, chunk_rows: int):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.chunk_rows = chunk_rows
+        count_path = os.path.join(directory, COUNT_FILE)
+        if not os.path.exists(count_path):
+            with open(count_path, 'wb') as f:
+                f.write(struct.pack('q', 0))
+        self._count_file = open(count_path, 'r+b')
+        self._count_map = mmap.mmap(self._count_file.fileno(), ITEM_SIZE)
+        self.rows = struct.unpack_from('q', self._count_map)[0]
+
+        self._files = {}
+        self._maps = {}
+        self._views = {}
+        self.capacity = 0
+        self._map_columns(max(chunk_rows, -(-self.rows // chunk_rows) * chunk_rows))
+
+    def _map_columns(self, capacity: int):
+        """(Re)projette chaque colonne sur 'capacity' lignes"""
+        self._release()
+        for name in COLUMNS:
+            path = os.path.join(self.directory, name + COLUMN_SUFFIX)
+            handle = self._files.get(name) or open(path, 'a+b')
+            if os.fstat(handle.fileno()).st_size < capacity * ITEM_SIZE:
+                handle.truncate(capacity * ITEM_SIZE)
+            self._files[name] = handle
+            self._maps[name] = mmap.mmap(handle.fileno(), capacity * ITEM_SIZE)
+            self._views[name] = memoryview(self._maps[name]).cast(COLUMNS[name])
+        self.capacity = capacity
+
+    def _release(self):
+        for view in self._views.values():
+            view.release()
+        for mapped in self._maps.values():
+            mapped.close()
+        self._views.clear()
+        self._maps.clear()
+
+    def append(self, values: Tuple):
+        """Écrit une ligne (valeurs dans l'ordre de COLUMNS) puis le compteur"""
+        if self.rows >= self.capacity:
+            self._map_columns(self.capacity + self.chunk_rows)
+        for name, value in zip(COLUMNS, values):
+            self._views[name][self.rows] = value
+        self.rows += 1
+        # Compteur écrit en dernier: un lecteur ne voit que des lignes complètes
+        struct.pack_into('q', self._count_map, 0, self.rows)
+
+    def flush(self):
+        for mapped in self._maps.values():
+            mapped.flush()
+        self._count_map.flush()
+
+    def close(self):
+        self.flush()
+        self._release()
+        self._count_map.close()
+        self._count_file.close()
+        for handle in self._files.values():
+            handle.close()
+        self._files.clear()
+
+
+class ColumnHistoryWriter:
+    """
+    Écrit les mesures et coûts calculés de chaque cycle dans les fichiers
+    colonnes (un répertoire par lien sous 'root')
+    """
+
+    def __init__(self, root: str, chunk_rows: int = 65536):
+        """
+        Args:
+            root: Répertoire racine de l'historique
+            chunk_rows: Lignes ajoutées aux fichiers à chaque agrandissement
+        """
+        self.root = root
+        self.chunk_rows = max(1, int(chunk_rows))
+        self._links: Dict[str, _LinkColumns] = {}
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+
+        # Statistiques
+        self.stats = {'rows_written': 0, 'cycles': 0}
+
+    def append(self, link_name: str, timestamp: float, latency_ms: float,
+               packet_loss_percent: float, jitter_ms: float, bandwidth_utilization: float,
+               current_cost: int, calculated_cost: int):
+        """Ajoute une ligne à l'historique d'un lien"""
+        with self._lock:
+            columns = self._links.get(link_name)
+            if columns is None:
+                columns = self._links[link_name] = _LinkColumns(
+                    _link_directory(self.root, link_name), self.chunk_rows
+                )
+            columns.append((timestamp, latency_ms, packet_loss_percent, jitter_ms,
+                            bandwidth_utilization, current_cost, calculated_cost))
+            self.stats['rows_written'] += 1
+
+    def append_cycle(self, batch, results) -> int:
+        """
+        Ajoute les mesures d'un cycle (LinkMetricsBatch) et les coûts calculés
+
+        Args:
+            batch: Mesures du cycle
+            results: CostCalculationResult du cycle (liens sans résultat: coût actuel)
+
+        Returns:
+            Nombre de lignes écrites
+        """
+        calculated = {result.link_name: result.calculated_cost for result in results if result is not None}
+        for index in range(len(batch)):
+            link_name = batch.link_names[index]
+            current_cost = batch.current_ospf_cost[index]
+            self.append(link_name, batch.timestamp[index], batch.latency_ms[index],
+                        batch.packet_loss_percent[index], batch.jitter_ms[index],
+                        batch.bandwidth_utilization[index], current_cost,
+                        calculated.get(link_name, current_cost))
+        self.stats['cycles'] += 1
+        return len(batch)
+
+    def flush(self):
+        """Force l'écriture des pages modifiées sur disque"""
+        with self._lock:
+            for columns in self._links.values():
+                columns.flush()
+
+    def close(self):
+        with self._lock:
+            for columns in self._links.values():
+                columns.close()
+            self._links.clear()
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            rows = {name: columns.rows for name, columns in self._links.items()}
+        return {**self.stats, 'root': self.root, 'links': rows}
+
+
+class ColumnHistoryReader:
+    """
+    Lecture sans copie de l'historique en colonnes
+
+    Les colonnes sont des tableaux NumPy (numpy.frombuffer sur le mmap) si
+    NumPy est installé, sinon des memoryview typées; dans les deux cas aucune
+    ligne n'est copiée ni convertie en objet Python
+    """
+
+    def __init__(self, root: str, use_numpy: bool = True):
+        """
+        Args:
+            root: Répertoire racine écrit par ColumnHistoryWriter
+            use_numpy: False pour forcer les memoryview même si NumPy est installé
+        """
+        self.root = root
+        self.numpy = _numpy() if use_numpy else None
+
+    def links(self) -> List[str]:
+        """Liens présents dans l'historique"""
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(name for name in os.listdir(self.root)
+                      if os.path.isfile(os.path.join(self.root, name, COUNT_FILE)))
+
+    def rows(self, link_name: str) -> int:
+        """Nombre de lignes complètes d'un lien"""
+        path = os.path.join(_link_directory(self.root, link_name), COUNT_FILE)
+        try:
+            with open(path, 'rb') as f:
+                return struct.unpack('q', f.read(ITEM_SIZE))[0]
+        except (OSError, struct.error):
+            return 0
+
+    def columns(self, link_name: str, start: float = None, end: float = None) -> Dict:
+        """
+        Vues sur les colonnes d'un lien, restreintes à [start, end] si précisés
+
+        Returns:
+            Dict {colonne: vue}, vide si le lien n'a pas d'historique
+        """
+        count = self.rows(link_name)
+        if count == 0:
+            return {}
+        directory = _link_directory(self.root, link_name)
+        views = {}
+        for name, code in COLUMNS.items():
+            with open(os.path.join(directory, name + COLUMN_SUFFIX), 'rb') as f:
+                # La projection reste valide après fermeture du fichier
+                mapped = mmap.mmap(f.fileno(), count * ITEM_SIZE, access=mmap.ACCESS_READ)
+            if self.numpy is not None:
+                dtype = self.numpy.float64 if code == 'd' else self.numpy.int64
+                views[name] = self.numpy.frombuffer(mapped, dtype=dtype, count=count)
+            else:
+                views[name] = memoryview(mapped).cast(code)
+
+        first, last = self._bounds(views['timestamp'], start, end)
+        if (first, last) != (0, count):
+            views = {name: view[first:last] for name, view in views.items()}
+        return views
+
+    def _bounds(self, timestamps, start: Optional[float], end: Optional[float]) -> Tuple[int, int]:
+        """Indices de la plage [start, end] (horodatages croissants)"""
+        if self.numpy is not None:
+            first = int(self.numpy.searchsorted(timestamps, start, 'left')) if start is not None else 0
+            last = int(self.numpy.searchsorted(timestamps, end, 'right')) if end is not None else len(timestamps)
+            return first, last
+        first = bisect.bisect_left(timestamps, start) if start is not None else 0
+        last = bisect.bisect_right(timestamps, end) if end is not None else len(timestamps)
+        return first, last
+
+    def replay(self, link_name: str, calculator, strategy=None,
+               start: float = None, end: float = None) -> Dict:
+        """
+        Rejoue le calcul des coûts sur l'historique d'un lien
+
+        Args:
+            link_name: Nom du lien
+            calculator: CostCalculator (seuils et poids à évaluer)
+            strategy: OptimizationStrategy (COMPOSITE par défaut)
+            start, end: Plage d'horodatages (époque, secondes)
+
+        Returns:
+            Dict avec les colonnes timestamp, current_cost, calculated_cost
+            (historique) et replayed_cost (coûts recalculés), vide sans historique
+        """
+        views = self.columns(link_name, start, end)
+        if not views:
+            return {}
+        kwargs = {'strategy': strategy} if strategy is not None else {}
+        replayed = calculator.calculate_cost_columns(
+            views['bandwidth_utilization'], views['latency_ms'], views['packet_loss_percent'], **kwargs
+        )
+        return {
+            'timestamp': views['timestamp'],
+            'current_cost': views['current_cost'],
+            'calculated_cost': views['calculated_cost'],
+            'replayed_cost': replayed,
+        }
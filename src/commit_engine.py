@@ -0,0 +1,238 @@
+"""
+Moteur de commit transactionnel des coûts OSPF sur plusieurs routeurs
+Les coûts actuels des interfaces concernées sont relus, le lot est appliqué
+en parallèle puis vérifié par relecture; si un routeur échoue ou dépasse le
+délai, tous les routeurs touchés sont remis à leur état initial en parallèle
+"""
+
+import time
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CommitResult:
+    """Résultat d'un commit multi-routeurs"""
+    committed: bool
+    outcomes: Dict[str, Dict[str, bool]] = field(default_factory=dict)
+    failed_routers: List[str] = field(default_factory=list)
+    rolled_back: List[str] = field(default_factory=list)
+    rollback_failed: List[str] = field(default_factory=list)
+    latency_ms: float = 0.0
+
+    @property
+    def applied(self) -> int:
+        """Nombre d'interfaces modifiées et conservées"""
+        if not self.committed:
+            return 0
+        return sum(sum(outcome.values()) for outcome in self.outcomes.values())
+
+    def to_dict(self) -> Dict:
+        return {
+            'committed': self.committed,
+            'applied': self.applied,
+            'failed_routers': self.failed_routers,
+            'rolled_back': self.rolled_back,
+            'rollback_failed': self.rollback_failed,
+            'latency_ms': round(self.latency_ms, 1)
+        }
+
+
+class CostCommitEngine:
+    """
+    Applique un lot {routeur: {interface: coût}} de façon tout-ou-rien
+
+    1. Relecture des coûts actuels (un état JSON par routeur, en parallèle);
+       sans cette référence, rien n'est appliqué
+    2. Application en parallèle (set_ospf_costs, vérifiée par relecture)
+    3. Si un routeur échoue ou dépasse 'timeout', restauration concurrente
+       des coûts initiaux sur tous les routeurs touchés
+    """
+
+    def __init__(self, connection_handler, async_connection=None,
+                 max_workers: int = 8, timeout: float = 15):
+        """
+        Args:
+            connection_handler: Connexion synchrone (get_router_state, set_ospf_costs)
+            async_connection: Connexion asynchrone optionnelle (commit_async)
+            max_workers: Routeurs traités simultanément
+            timeout: Délai max de chaque phase (relecture, application, restauration)
+        """
+        self.connection = connection_handler
+        self.async_connection = async_connection
+        self.max_workers = max(1, max_workers)
+        self.timeout = timeout
+
+        # Statistiques
+        self.stats = {'commits': 0, 'aborted': 0, 'rollbacks': 0,
+                      'rollback_failures': 0, 'last_latency_ms': 0.0, 'avg_latency_ms': 0.0}
+        self.last_result: Optional[CommitResult] = None
+
+    def _snapshot_costs(self, state, changes: Dict[str, int]) -> Optional[Dict[str, int]]:
+        """Coûts actuels des interfaces du lot, None si l'un d'eux est inconnu"""
+        if state is None:
+            return None
+        costs = state.ospf_costs()
+        if any(interface not in costs for interface in changes):
+            return None
+        return {interface: costs[interface] for interface in changes}
+
+    def _run_parallel(self, func, items: Dict[str, Dict[str, int]]) -> tuple:
+        """
+        Exécute func(routeur, lot) pour chaque routeur en parallèle
+
+        Returns:
+            Tuple (Dict {routeur: résultat} avec None pour les routeurs en erreur
+            ou hors délai, Dict {routeur: future} des appels encore en cours)
+        """
+        if not items:
+            return {}, {}
+        executor = ThreadPoolExecutor(max_workers=min(self.max_workers, len(items)),
+                                      thread_name_prefix='commit')
+        try:
+            futures = {router: executor.submit(func, router, changes)
+                       for router, changes in items.items()}
+            wait(futures.values(), timeout=self.timeout)
+        finally:
+            executor.shutdown(wait=False)
+
+        results = {}
+        for router, future in futures.items():
+            if not future.done():
+                logger.error(f"Délai de {self.timeout}s dépassé sur {router}")
+                results[router] = None
+            elif future.exception() is not None:
+                logger.error(f"Erreur sur {router}: {future.exception()}")
+                results[router] = None
+            else:
+                results[router] = future.result()
+        pending = {router: future for router, future in futures.items() if not future.done()}
+        return results, pending
+
+    def commit(self, batches: Dict[str, Dict[str, int]]) -> CommitResult:
+        """
+        Applique le lot de façon transactionnelle
+
+        Args:
+            batches: Dict {routeur: {interface: nouveau coût}}
+
+        Returns:
+            CommitResult (committed=False si le lot a été annulé)
+        """
+        start = time.monotonic()
+
+        states, _ = self._run_parallel(
+            lambda router, changes: self.connection.get_router_state(router), batches
+        )
+        originals = {router: self._snapshot_costs(states.get(router), changes)
+                     for router, changes in batches.items()}
+        missing = [router for router, costs in originals.items() if costs is None]
+        if missing:
+            return self._finish(start, CommitResult(committed=False, failed_routers=missing),
+                                aborted=True)
+
+        outcomes, in_flight = self._run_parallel(self.connection.set_ospf_costs, batches)
+        result = self._check(batches, outcomes)
+
+        if not result.committed:
+            def restore(router: str, costs: Dict[str, int]):
+                # Une application hors délai encore en cours ne doit pas écraser la restauration
+                if router in in_flight:
+                    wait([in_flight[router]], timeout=self.timeout)
+                return self.connection.set_ospf_costs(router, costs)
+
+            rollback, _ = self._run_parallel(restore, originals)
+            self._record_rollback(result, originals, rollback)
+
+        return self._finish(start, result)
+
+    async def commit_async(self, batches: Dict[str, Dict[str, int]]) -> CommitResult:
+        """Version asynchrone de commit (nécessite async_connection)"""
+        start = time.monotonic()
+
+        async def run_all(func, items):
+            routers = list(items)
+            results = await asyncio.gather(*(
+                asyncio.wait_for(func(router, items[router]), self.timeout) for router in routers
+            ), return_exceptions=True)
+            for router, outcome in zip(routers, results):
+                if isinstance(outcome, BaseException):
+                    logger.error(f"Erreur ou délai dépassé sur {router}: {outcome!r}")
+            return {router: None if isinstance(outcome, BaseException) else outcome
+                    for router, outcome in zip(routers, results)}
+
+        connection = self.async_connection
+        states = await run_all(lambda router, changes: connection.get_router_state(router), batches)
+        originals = {router: self._snapshot_costs(states.get(router), changes)
+                     for router, changes in batches.items()}
+        missing = [router for router, costs in originals.items() if costs is None]
+        if missing:
+            return self._finish(start, CommitResult(committed=False, failed_routers=missing),
+                                aborted=True)
+
+        outcomes = await run_all(connection.set_ospf_costs, batches)
+        result = self._check(batches, outcomes)
+
+        if not result.committed:
+            rollback = await run_all(connection.set_ospf_costs, originals)
+            self._record_rollback(result, originals, rollback)
+
+        return self._finish(start, result)
+
+    @staticmethod
+    def _check(batches: Dict[str, Dict[str, int]],
+               outcomes: Dict[str, Optional[Dict[str, bool]]]) -> CommitResult:
+        """Le lot est validé si chaque interface de chaque routeur a été vérifiée"""
+        result = CommitResult(committed=True)
+        for router, changes in batches.items():
+            outcome = outcomes.get(router)
+            result.outcomes[router] = outcome if outcome is not None else {
+                interface: False for interface in changes
+            }
+            if outcome is None or not all(outcome.get(interface, False) for interface in changes):
+                result.failed_routers.append(router)
+        result.committed = not result.failed_routers
+        return result
+
+    def _record_rollback(self, result: CommitResult, originals: Dict[str, Dict[str, int]],
+                         rollback: Dict[str, Optional[Dict[str, bool]]]):
+        logger.warning(f"Commit annulé ({', '.join(result.failed_routers)} en échec), "
+                       f"restauration de {len(originals)} routeurs")
+        for router in originals:
+            outcome = rollback.get(router)
+            if outcome is not None and all(outcome.values()):
+                result.rolled_back.append(router)
+            else:
+                result.rollback_failed.append(router)
+                logger.error(f"✗ Restauration incomplète sur {router}, intervention requise")
+
+    def _finish(self, start: float, result: CommitResult, aborted: bool = False) -> CommitResult:
+        result.latency_ms = (time.monotonic() - start) * 1000
+        stats = self.stats
+        stats['commits'] += 1
+        stats['last_latency_ms'] = round(result.latency_ms, 1)
+        stats['avg_latency_ms'] = round(
+            stats['avg_latency_ms'] + (result.latency_ms - stats['avg_latency_ms']) / stats['commits'], 1
+        )
+        if aborted:
+            stats['aborted'] += 1
+            logger.error(f"Coûts actuels illisibles sur {', '.join(result.failed_routers)}, "
+                         f"aucun changement appliqué")
+        if result.rolled_back or result.rollback_failed:
+            stats['rollbacks'] += 1
+        if result.rollback_failed:
+            stats['rollback_failures'] += 1
+        self.last_result = result
+        return result
+
+    def get_stats(self) -> Dict:
+        """Statistiques des commits et détail du dernier"""
+        return {
+            **self.stats,
+            'last': self.last_result.to_dict() if self.last_result else None
+        }
@@ -0,0 +1,130 @@
+"""
+Cache write-through des coûts OSPF pour la couche de connexion
+L'optimiseur étant seul à modifier les coûts, ceux-ci sont servis depuis le
+cache; une réconciliation (relecture sur les routeurs) est déclenchée tous les
+N cycles ou lorsqu'un changement de voisinage OSPF est observé
+"""
+
+import threading
+import logging
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class OSPFCostCache:
+    """
+    Coûts OSPF connus par (routeur, interface)
+
+    Les entrées invalidées sont conservées comme valeurs attendues: à la
+    relecture, un écart signale une modification faite hors de l'optimiseur
+    """
+
+    def __init__(self, reconcile_every: int = 10, enabled: bool = False):
+        """
+        Args:
+            reconcile_every: Réconciliation complète tous les N cycles (0 = jamais)
+            enabled: True pour servir les coûts depuis le cache (False: toujours relus sur le routeur)
+        """
+        self.reconcile_every = reconcile_every
+        self.enabled = enabled
+
+        self.costs: Dict[Tuple[str, str], int] = {}
+        self._expected: Dict[Tuple[str, str], int] = {}
+        self._neighbors: Dict[str, frozenset] = {}
+        self._lock = threading.Lock()
+        self.cycle = 0
+
+        # Statistiques
+        self.stats = {'hits': 0, 'misses': 0, 'writes': 0, 'reconciliations': 0,
+                      'neighbor_changes': 0, 'drift': 0}
+
+    def get(self, router_name: str, interface: str) -> Optional[int]:
+        """Coût en cache, None si absent ou à relire"""
+        with self._lock:
+            cost = self.costs.get((router_name, interface)) if self.enabled else None
+            self.stats['hits' if cost is not None else 'misses'] += 1
+            return cost
+
+    def set(self, router_name: str, interface: str, cost: int):
+        """Enregistre un coût appliqué avec succès par l'optimiseur"""
+        with self._lock:
+            self.costs[(router_name, interface)] = cost
+            self._expected.pop((router_name, interface), None)
+            self.stats['writes'] += 1
+
+    def store(self, router_name: str, interface: str, cost: int):
+        """
+        Enregistre un coût relu sur le routeur, en le comparant à la valeur
+        attendue s'il s'agit d'une réconciliation
+        """
+        key = (router_name, interface)
+        with self._lock:
+            expected = self._expected.pop(key, None)
+            if expected is None:
+                expected = self.costs.get(key)
+            if expected is not None and expected != cost:
+                self.stats['drift'] += 1
+                logger.warning(f"Coût OSPF modifié hors optimiseur sur {router_name}.{interface}: "
+                               f"{expected} → {cost}")
+            self.costs[key] = cost
+
+    def store_router(self, router_name: str, costs: Dict[str, int]):
+        """Enregistre tous les coûts relus d'un routeur (état JSON ou snapshot)"""
+        for interface, cost in costs.items():
+            self.store(router_name, interface, cost)
+
+    def invalidate(self, router_name: str = None):
+        """Marque les coûts d'un routeur (ou de tous) comme à relire"""
+        with self._lock:
+            keys = [key for key in self.costs if router_name is None or key[0] == router_name]
+            for key in keys:
+                self._expected[key] = self.costs.pop(key)
+
+    def observe_neighbors(self, router_name: str, neighbors: Iterable) -> bool:
+        """
+        Compare les voisins OSPF d'un routeur à ceux vus précédemment
+
+        Args:
+            neighbors: Objets ou dicts avec neighbor_id, state et interface
+
+        Returns:
+            True si le voisinage a changé (les coûts du routeur sont alors à relire)
+        """
+        signature = frozenset(
+            (n['neighbor_id'], n['state'], n['interface']) if isinstance(n, dict)
+            else (n.neighbor_id, n.state, n.interface)
+            for n in neighbors
+        )
+        with self._lock:
+            previous = self._neighbors.get(router_name)
+            self._neighbors[router_name] = signature
+        if previous is None or previous == signature:
+            return False
+        self.stats['neighbor_changes'] += 1
+        logger.info(f"Changement de voisinage OSPF sur {router_name}, coûts à réconcilier")
+        self.invalidate(router_name)
+        return True
+
+    def next_cycle(self) -> bool:
+        """
+        Début d'un cycle d'optimisation
+
+        Returns:
+            True si une réconciliation complète est déclenchée
+        """
+        self.cycle += 1
+        if not self.reconcile_every or self.cycle % self.reconcile_every:
+            return False
+        self.stats['reconciliations'] += 1
+        self.invalidate()
+        return True
+
+    def get_stats(self) -> Dict:
+        """Compteurs du cache et taux de succès"""
+        lookups = self.stats['hits'] + self.stats['misses']
+        return {
+            **self.stats,
+            'entries': len(self.costs),
+            'hit_rate': round(self.stats['hits'] / lookups * 100, 1) if lookups else 0.0
+        }
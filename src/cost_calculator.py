@@ -3,17 +3,25 @@ Module de calcul et d'optimisation des coûts OSPF
 Implémente différents algorithmes pour calculer les coûts optimaux
 """
 
-from typing import Dict, List, Tuple, Optional
+from typing import Callable, Dict, List, Tuple, Optional, Union
 from dataclasses import dataclass
 from enum import Enum
+import sys
 import math
+import time
+from array import array
 import logging
 
-from .metrics_collector import LinkMetrics
+from .metrics_collector import LinkMetrics, LinkMetricsBatch
+from .ring_buffer import RingBuffer, COST_COLUMNS
 
 logger = logging.getLogger(__name__)
 
 
+# Entrées possibles du calcul des coûts (section 'smoothing', clé 'input')
+INPUT_MODES = ('raw', 'window', 'ewma')
+
+
 class OptimizationStrategy(Enum):
     """Stratégies d'optimisation disponibles"""
     BANDWIDTH_BASED = "bandwidth"      # Basé uniquement sur la bande passante
@@ -21,6 +29,35 @@ class OptimizationStrategy(Enum):
     COMPOSITE = "composite"            # Combinaison de plusieurs métriques
     LOAD_BALANCED = "load_balanced"    # Équilibrage de charge
     MINIMAL_DELAY = "minimal_delay"    # Minimiser le délai de bout en bout
+    LATENCY_P95 = "latency_p95"        # Basé sur le 95e centile de la latence (latence de queue)
+
+
+# Facteurs de coût par morceaux, partagés par le calcul unitaire et le calcul en
+# colonnes: métrique -> (seuils de CostThresholds, segments). Le segment i
+# s'applique sous le seuil i (le dernier au-delà du dernier seuil):
+# facteur = départ, plus (valeur - seuil précédent) / diviseur si un diviseur est donné
+FACTOR_TABLES: Dict[str, Tuple[Tuple[str, ...], Tuple[Tuple[float, Optional[float]], ...]]] = {
+    'bandwidth': (
+        ('bw_low', 'bw_medium', 'bw_high', 'bw_critical'),
+        ((1.0, None),     # Pas de pénalité
+         (1.0, 100),      # Augmentation linéaire légère
+         (1.5, 50),       # Augmentation modérée
+         (2.5, 20),       # Augmentation importante
+         (5.0, 10)),      # Pénalité maximale pour éviter le lien
+    ),
+    'latency': (
+        ('latency_low', 'latency_medium', 'latency_high', 'latency_critical'),
+        ((1.0, None), (1.0, 100), (1.5, 50), (2.5, 25), (5.0, 50)),
+    ),
+    'packet_loss': (
+        ('loss_low', 'loss_medium', 'loss_high', 'loss_critical'),
+        ((1.0, None),     # Pas de perte
+         (1.5, None),     # Perte légère mais notable
+         (3.0, None),     # Perte significative
+         (6.0, None),     # Perte importante
+         (10.0, None)),   # Lien très dégradé
+    ),
+}
 
 
 @dataclass
@@ -82,7 +119,16 @@ class CostCalculator:
         self.min_change_threshold = config.get('min_change_threshold', 5)
         
         # Historique des coûts pour détecter les oscillations
-        self.cost_history: Dict[str, List[int]] = {}
+        self.cost_history: Dict[str, RingBuffer] = {}
+        
+        # Entrées du calcul: dernière mesure ('raw') ou valeurs lissées ('window', 'ewma')
+        self.input_mode = config.get('input', 'raw')
+        if self.input_mode not in INPUT_MODES:
+            raise ValueError(f"Entrée de calcul inconnue: {self.input_mode} "
+                             f"(attendu: {', '.join(INPUT_MODES)})")
+        # Fonction (lien, mode) -> (utilisation, latence, perte, gigue) ou None
+        # (FRRMetricsCollector.smoothed_inputs), nécessaire hors mode 'raw'
+        self.smoothed_inputs: Optional[Callable[[str, str], Optional[Tuple[float, float, float, float]]]] = None
         
     def _load_thresholds(self, config: Dict) -> CostThresholds:
         """Charge les seuils depuis la configuration"""
@@ -105,6 +151,30 @@ class CostCalculator:
             loss_critical=loss.get('critical', 10)
         )
         
+    def _factor(self, metric: str, value: float) -> float:
+        """Facteur d'une métrique selon FACTOR_TABLES et les seuils configurés"""
+        names, segments = FACTOR_TABLES[metric]
+        bounds = [getattr(self.thresholds, name) for name in names]
+        index = len(bounds)
+        for position, bound in enumerate(bounds):
+            if value < bound:
+                index = position
+                break
+        start, divisor = segments[index]
+        if divisor is None:
+            return start
+        return start + (value - bounds[index - 1]) / divisor
+        
+    def _factor_column(self, np, metric: str, values):
+        """Version vectorisée de _factor (mêmes segments, mêmes opérations)"""
+        names, segments = FACTOR_TABLES[metric]
+        bounds = [getattr(self.thresholds, name) for name in names]
+        choices = [
+            start if divisor is None else start + (values - bounds[index - 1]) / divisor
+            for index, (start, divisor) in enumerate(segments)
+        ]
+        return np.select([values < bound for bound in bounds], choices[:-1], choices[-1])
+        
     def calculate_bandwidth_factor(self, utilization: float) -> float:
         """
         Calcule le facteur de coût basé sur l'utilisation de la bande passante
@@ -115,20 +185,7 @@ class CostCalculator:
         Returns:
             Facteur multiplicateur (1.0 = normal, >1.0 = pénalité)
         """
-        if utilization < self.thresholds.bw_low:
-            return 1.0  # Pas de pénalité
-        elif utilization < self.thresholds.bw_medium:
-            # Augmentation linéaire légère
-            return 1.0 + (utilization - self.thresholds.bw_low) / 100
-        elif utilization < self.thresholds.bw_high:
-            # Augmentation modérée
-            return 1.5 + (utilization - self.thresholds.bw_medium) / 50
-        elif utilization < self.thresholds.bw_critical:
-            # Augmentation importante
-            return 2.5 + (utilization - self.thresholds.bw_high) / 20
-        else:
-            # Pénalité maximale pour éviter le lien
-            return 5.0 + (utilization - self.thresholds.bw_critical) / 10
+        return self._factor('bandwidth', utilization)
             
     def calculate_latency_factor(self, latency_ms: float) -> float:
         """
@@ -140,16 +197,7 @@ class CostCalculator:
         Returns:
             Facteur multiplicateur
         """
-        if latency_ms < self.thresholds.latency_low:
-            return 1.0
-        elif latency_ms < self.thresholds.latency_medium:
-            return 1.0 + (latency_ms - self.thresholds.latency_low) / 100
-        elif latency_ms < self.thresholds.latency_high:
-            return 1.5 + (latency_ms - self.thresholds.latency_medium) / 50
-        elif latency_ms < self.thresholds.latency_critical:
-            return 2.5 + (latency_ms - self.thresholds.latency_high) / 25
-        else:
-            return 5.0 + (latency_ms - self.thresholds.latency_critical) / 50
+        return self._factor('latency', latency_ms)
             
     def calculate_packet_loss_factor(self, loss_percent: float) -> float:
         """
@@ -161,20 +209,7 @@ class CostCalculator:
         Returns:
             Facteur multiplicateur (perte = forte pénalité)
         """
-        if loss_percent < self.thresholds.loss_low:
-            return 1.0
-        elif loss_percent < self.thresholds.loss_medium:
-            # Perte légère mais notable
-            return 1.5
-        elif loss_percent < self.thresholds.loss_high:
-            # Perte significative
-            return 3.0
-        elif loss_percent < self.thresholds.loss_critical:
-            # Perte importante
-            return 6.0
-        else:
-            # Lien très dégradé
-            return 10.0
+        return self._factor('packet_loss', loss_percent)
             
     def calculate_composite_cost(self, metrics: LinkMetrics) -> int:
         """
@@ -188,10 +223,14 @@ class CostCalculator:
         Returns:
             Coût OSPF calculé
         """
+        return self._composite_cost(metrics.bandwidth_utilization, metrics.latency_ms,
+                                    metrics.packet_loss_percent)
+        
+    def _composite_cost(self, utilization: float, latency_ms: float, loss_percent: float) -> int:
         # Calculer les facteurs individuels
-        bw_factor = self.calculate_bandwidth_factor(metrics.bandwidth_utilization)
-        latency_factor = self.calculate_latency_factor(metrics.latency_ms)
-        loss_factor = self.calculate_packet_loss_factor(metrics.packet_loss_percent)
+        bw_factor = self.calculate_bandwidth_factor(utilization)
+        latency_factor = self.calculate_latency_factor(latency_ms)
+        loss_factor = self.calculate_packet_loss_factor(loss_percent)
         
         # Calculer le facteur composite pondéré
         composite_factor = (
@@ -210,13 +249,13 @@ class CostCalculator:
         
     def calculate_bandwidth_only_cost(self, metrics: LinkMetrics) -> int:
         """Calcule le coût basé uniquement sur la bande passante"""
-        factor = self.calculate_bandwidth_factor(metrics.bandwidth_utilization)
-        cost = int(self.base_cost * factor)
-        return max(self.min_cost, min(self.max_cost, cost))
+        return self._factor_cost(self.calculate_bandwidth_factor(metrics.bandwidth_utilization))
         
     def calculate_latency_only_cost(self, metrics: LinkMetrics) -> int:
         """Calcule le coût basé uniquement sur la latence"""
-        factor = self.calculate_latency_factor(metrics.latency_ms)
+        return self._factor_cost(self.calculate_latency_factor(metrics.latency_ms))
+        
+    def _factor_cost(self, factor: float) -> int:
         cost = int(self.base_cost * factor)
         return max(self.min_cost, min(self.max_cost, cost))
         
@@ -232,26 +271,109 @@ class CostCalculator:
         Returns:
             CostCalculationResult avec le coût recommandé
         """
+        return self._calculate(metrics.link_name, metrics.current_ospf_cost,
+                               metrics.bandwidth_utilization, metrics.latency_ms,
+                               metrics.packet_loss_percent, metrics.jitter_ms, strategy,
+                               metrics.latency_p95_ms)
+        
+    def calculate_batch(self, batch: LinkMetricsBatch,
+                        strategy: OptimizationStrategy = OptimizationStrategy.COMPOSITE
+                       ) -> List[CostCalculationResult]:
+        """
+        Calcule les coûts d'un lot de métriques, colonne par colonne
+        (sans reconstruire de LinkMetrics par lien)
+        """
+        return [
+            self._calculate(batch.link_names[index], batch.current_ospf_cost[index],
+                            batch.bandwidth_utilization[index], batch.latency_ms[index],
+                            batch.packet_loss_percent[index], batch.jitter_ms[index], strategy,
+                            batch.latency_p95_ms[index])
+            for index in range(len(batch))
+        ]
+        
+    def _strategy_cost(self, strategy: OptimizationStrategy, utilization: float,
+                       latency_ms: float, loss_percent: float, latency_p95_ms: float = 0.0) -> int:
+        if strategy == OptimizationStrategy.BANDWIDTH_BASED:
+            return self._factor_cost(self.calculate_bandwidth_factor(utilization))
+        if strategy == OptimizationStrategy.LATENCY_BASED:
+            return self._factor_cost(self.calculate_latency_factor(latency_ms))
+        if strategy == OptimizationStrategy.LATENCY_P95:
+            # Sans RTT dans la fenêtre des quantiles: latence moyenne
+            return self._factor_cost(self.calculate_latency_factor(latency_p95_ms or latency_ms))
+        return self._composite_cost(utilization, latency_ms, loss_percent)
+        
+    def calculate_cost_columns(self, utilization, latency_ms, loss_percent,
+                               strategy: OptimizationStrategy = OptimizationStrategy.COMPOSITE):
+        """
+        Coûts d'une série de mesures en colonnes (rejeu de l'historique)
+        Sans seuil de changement, détection d'oscillation ni historique des coûts
+        
+        Args:
+            utilization, latency_ms, loss_percent: Colonnes de même longueur
+                (tableaux NumPy: calcul vectorisé; autres séquences: élément par élément);
+                LATENCY_P95 s'applique à la colonne latency_ms fournie
+            strategy: Stratégie d'optimisation
+            
+        Returns:
+            Coûts calculés (numpy.ndarray int64 ou array('q'))
+        """
+        np = sys.modules.get('numpy')
+        if np is None or not isinstance(latency_ms, np.ndarray):
+            return array('q', (
+                self._strategy_cost(strategy, u, l, p)
+                for u, l, p in zip(utilization, latency_ms, loss_percent)
+            ))
+            
+        latency_only = strategy in (OptimizationStrategy.LATENCY_BASED, OptimizationStrategy.LATENCY_P95)
+        if not latency_only:
+            bw_factor = self._factor_column(np, 'bandwidth', np.asarray(utilization, dtype=np.float64))
+        if strategy != OptimizationStrategy.BANDWIDTH_BASED:
+            latency_factor = self._factor_column(np, 'latency', np.asarray(latency_ms, dtype=np.float64))
+            
+        if strategy == OptimizationStrategy.BANDWIDTH_BASED:
+            factor = bw_factor
+        elif latency_only:
+            factor = latency_factor
+        else:
+            loss_factor = self._factor_column(np, 'packet_loss', np.asarray(loss_percent, dtype=np.float64))
+            factor = (bw_factor * self.bw_weight + latency_factor * self.latency_weight +
+                      loss_factor * self.loss_weight)
+        # int() du calcul unitaire: troncature vers zéro
+        return np.clip(np.trunc(self.base_cost * factor), self.min_cost, self.max_cost).astype(np.int64)
+        
+    def _calculate(self, link_name: str, current_cost: int, utilization: float,
+                   latency_ms: float, loss_percent: float, jitter_ms: float,
+                   strategy: OptimizationStrategy, latency_p95_ms: float = 0.0) -> CostCalculationResult:
+        # Entrées lissées (mesure courante déjà intégrée par le collecteur)
+        input_mode = 'raw'
+        if self.input_mode != 'raw' and self.smoothed_inputs is not None:
+            smoothed = self.smoothed_inputs(link_name, self.input_mode)
+            if smoothed is not None:
+                utilization, latency_ms, loss_percent, jitter_ms = smoothed
+                input_mode = self.input_mode
+                
         # Calculer le coût selon la stratégie
+        new_cost = self._strategy_cost(strategy, utilization, latency_ms, loss_percent, latency_p95_ms)
         if strategy == OptimizationStrategy.BANDWIDTH_BASED:
-            new_cost = self.calculate_bandwidth_only_cost(metrics)
-            reason_detail = f"Utilisation BW: {metrics.bandwidth_utilization:.1f}%"
+            reason_detail = f"Utilisation BW: {utilization:.1f}%"
         elif strategy == OptimizationStrategy.LATENCY_BASED:
-            new_cost = self.calculate_latency_only_cost(metrics)
-            reason_detail = f"Latence: {metrics.latency_ms:.1f}ms"
+            reason_detail = f"Latence: {latency_ms:.1f}ms"
+        elif strategy == OptimizationStrategy.LATENCY_P95:
+            reason_detail = (f"Latence p95: {latency_p95_ms:.1f}ms" if latency_p95_ms
+                             else f"Latence: {latency_ms:.1f}ms (p95 indisponible)")
         else:  # COMPOSITE par défaut
-            new_cost = self.calculate_composite_cost(metrics)
-            reason_detail = (f"BW: {metrics.bandwidth_utilization:.1f}%, "
-                           f"Latence: {metrics.latency_ms:.1f}ms, "
-                           f"Perte: {metrics.packet_loss_percent:.2f}%")
+            reason_detail = (f"BW: {utilization:.1f}%, "
+                           f"Latence: {latency_ms:.1f}ms, "
+                           f"Perte: {loss_percent:.2f}%")
+        if input_mode != 'raw':
+            reason_detail += f", {input_mode}"
         
         # Vérifier si le changement est significatif
-        current_cost = metrics.current_ospf_cost
         cost_diff = abs(new_cost - current_cost)
         should_update = cost_diff >= self.min_change_threshold
         
         # Vérifier les oscillations
-        if should_update and self._detect_oscillation(metrics.link_name, new_cost):
+        if should_update and self._detect_oscillation(link_name, new_cost):
             should_update = False
             reason = f"Oscillation détectée, pas de changement"
         elif should_update:
@@ -260,23 +382,23 @@ class CostCalculator:
             reason = f"Changement insuffisant ({cost_diff} < {self.min_change_threshold})"
             
         # Enregistrer dans l'historique
-        if metrics.link_name not in self.cost_history:
-            self.cost_history[metrics.link_name] = []
-        self.cost_history[metrics.link_name].append(new_cost)
-        if len(self.cost_history[metrics.link_name]) > 10:
-            self.cost_history[metrics.link_name] = self.cost_history[metrics.link_name][-10:]
+        if link_name not in self.cost_history:
+            self.cost_history[link_name] = RingBuffer(10, COST_COLUMNS)
+        self.cost_history[link_name].append(cost=new_cost, timestamp=time.time())
             
         return CostCalculationResult(
-            link_name=metrics.link_name,
+            link_name=link_name,
             current_cost=current_cost,
             calculated_cost=new_cost,
             should_update=should_update,
             reason=reason,
             metrics_summary={
-                'bandwidth_utilization': metrics.bandwidth_utilization,
-                'latency_ms': metrics.latency_ms,
-                'packet_loss_percent': metrics.packet_loss_percent,
-                'jitter_ms': metrics.jitter_ms
+                'bandwidth_utilization': utilization,
+                'latency_ms': latency_ms,
+                'packet_loss_percent': loss_percent,
+                'jitter_ms': jitter_ms,
+                'latency_p95_ms': latency_p95_ms,
+                'input': input_mode
             }
         )
         
@@ -295,7 +417,7 @@ class CostCalculator:
         if link_name not in self.cost_history:
             return False
             
-        history = self.cost_history[link_name][-window:]
+        history = self.cost_history[link_name].window('cost', window)
         if len(history) < 4:
             return False
             
@@ -317,18 +439,20 @@ class CostCalculator:
                 
         return direction_changes >= 2
         
-    def calculate_all_costs(self, metrics_list: List[LinkMetrics],
+    def calculate_all_costs(self, metrics_list: Union[List[LinkMetrics], LinkMetricsBatch],
                            strategy: OptimizationStrategy = OptimizationStrategy.COMPOSITE) -> List[CostCalculationResult]:
         """
         Calcule les coûts pour tous les liens
         
         Args:
-            metrics_list: Liste des métriques de tous les liens
+            metrics_list: Liste des métriques de tous les liens (ou LinkMetricsBatch)
             strategy: Stratégie d'optimisation
             
         Returns:
             Liste des résultats de calcul
         """
+        if isinstance(metrics_list, LinkMetricsBatch):
+            return self.calculate_batch(metrics_list, strategy)
         results = []
         for metrics in metrics_list:
             result = self.calculate_cost(metrics, strategy)
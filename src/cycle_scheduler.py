@@ -0,0 +1,140 @@
+"""
+Ordonnancement à cadence fixe des cycles d'optimisation
+Les cycles démarrent sur des instants alignés sur l'horloge murale (multiples
+de l'intervalle), indépendamment de leur durée; un cycle qui déborde sur
+l'instant suivant est compté et, selon la politique, l'instant manqué est
+sauté ou le cycle suivant démarre aussitôt. L'attente est interruptible
+"""
+
+import math
+import time
+import threading
+import logging
+from datetime import datetime
+from typing import Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+OVERRUN_POLICIES = ('skip', 'catch_up')
+
+
+class FixedRateScheduler:
+    """
+    Appelle une fonction toutes les 'interval' secondes, à cadence fixe
+
+    - overrun='skip': après un débordement, reprise au prochain instant de la grille
+    - overrun='catch_up': le cycle suivant démarre immédiatement, puis la
+      grille d'origine reprend
+    """
+
+    def __init__(self, interval: float, overrun: str = 'skip', align: bool = True,
+                 stop_event: threading.Event = None):
+        """
+        Args:
+            interval: Période des cycles (secondes)
+            overrun: Politique de débordement ('skip' ou 'catch_up')
+            align: Aligne les instants sur les multiples de interval (horloge
+                   murale); le premier cycle démarre toujours immédiatement
+            stop_event: Événement d'arrêt partagé (un nouveau par défaut)
+        """
+        if overrun not in OVERRUN_POLICIES:
+            raise ValueError(f"Politique de débordement inconnue: {overrun} "
+                             f"(attendu: {', '.join(OVERRUN_POLICIES)})")
+        self.interval = max(0.001, float(interval))
+        self.overrun = overrun
+        self.align = align
+        self.stop_event = stop_event or threading.Event()
+
+        self.next_tick: Optional[float] = None
+        self._cycle_started: Optional[float] = None
+
+        # Statistiques
+        self.stats = {'cycles': 0, 'overruns': 0, 'skipped_ticks': 0,
+                      'last_lag_ms': 0.0, 'max_lag_ms': 0.0, 'last_duration_s': 0.0}
+
+    def wait(self) -> Optional[float]:
+        """
+        Attend l'instant du prochain cycle
+
+        Returns:
+            Retard du démarrage en secondes, None si l'arrêt a été demandé
+        """
+        now = time.time()
+        if self.next_tick is None:
+            # Premier cycle immédiat, les suivants sur la grille
+            self.next_tick = now
+        if self.stop_event.wait(max(0.0, self.next_tick - now)):
+            return None
+        lag = max(0.0, time.time() - self.next_tick)
+        self.stats['last_lag_ms'] = round(lag * 1000, 1)
+        self.stats['max_lag_ms'] = max(self.stats['max_lag_ms'], self.stats['last_lag_ms'])
+        return lag
+
+    def _tick_after(self, tick: float) -> float:
+        """Instant de la grille qui suit 'tick'"""
+        if not self.align:
+            return tick + self.interval
+        return (math.floor(tick / self.interval + 1e-9) + 1) * self.interval
+
+    def _advance(self, finished: float):
+        """Calcule l'instant suivant après un cycle terminé à 'finished'"""
+        scheduled = self._tick_after(self.next_tick)
+        if finished <= scheduled:
+            self.next_tick = scheduled
+            return
+        if self.stats['cycles'] == 1 and self.align:
+            # Premier cycle hors grille: rejoint simplement la grille, sans débordement
+            self.next_tick = self._tick_after(finished)
+            return
+
+        self.stats['overruns'] += 1
+        duration = self.stats['last_duration_s']
+        missed = math.floor((finished - scheduled) / self.interval) + 1
+        if self.overrun == 'catch_up':
+            # Démarrage immédiat sur le dernier instant manqué (retard mesuré par rapport à lui)
+            self.next_tick = scheduled + (missed - 1) * self.interval
+            logger.warning(f"Cycle de {duration:.2f}s plus long que l'intervalle "
+                           f"({self.interval}s), cycle suivant immédiat")
+            return
+
+        self.stats['skipped_ticks'] += missed
+        self.next_tick = scheduled + missed * self.interval
+        logger.warning(f"Cycle de {duration:.2f}s plus long que l'intervalle "
+                       f"({self.interval}s), {missed} instant(s) sauté(s)")
+
+    def run(self, cycle: Callable[[], None]):
+        """Exécute 'cycle' à cadence fixe jusqu'à stop()"""
+        while not self.stop_event.is_set():
+            if self.wait() is None:
+                return
+            self._cycle_started = time.time()
+            try:
+                cycle()
+            finally:
+                finished = time.time()
+                self.stats['cycles'] += 1
+                self.stats['last_duration_s'] = round(finished - self._cycle_started, 3)
+                self._cycle_started = None
+                self._advance(finished)
+            logger.info(f"Prochaine optimisation à "
+                        f"{datetime.fromtimestamp(self.next_tick).strftime('%H:%M:%S')}")
+
+    def stop(self):
+        """Interrompt l'attente en cours; le cycle en cours se termine normalement"""
+        self.stop_event.set()
+
+    def get_stats(self) -> Dict:
+        """Compteurs, retard du dernier démarrage et retard courant"""
+        now = time.time()
+        behind = 0.0
+        if self.next_tick is not None:
+            # Pendant un cycle, le retard se mesure par rapport à l'instant suivant
+            due = self._tick_after(self.next_tick) if self._cycle_started is not None else self.next_tick
+            behind = max(0.0, now - due)
+        return {
+            **self.stats,
+            'interval': self.interval,
+            'overrun_policy': self.overrun,
+            'current_lag_s': round(behind, 3),
+            'next_tick': datetime.fromtimestamp(self.next_tick).isoformat() if self.next_tick else None
+        }
@@ -0,0 +1,217 @@
+"""
+Client minimal de l'API Docker Engine via le socket unix
+Remplace les appels au binaire docker (un processus par commande) par des
+requêtes HTTP sur des connexions keep-alive réutilisées depuis un pool
+"""
+
+import http.client
+import json
+import queue
+import socket
+import struct
+import threading
+import logging
+from typing import Callable, Dict, List, Tuple
+from urllib.parse import quote
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SOCKET = '/var/run/docker.sock'
+
+
+class DockerAPIError(Exception):
+    """Erreur de communication avec le démon Docker"""
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    """Connexion HTTP/1.1 sur un socket unix"""
+
+    def __init__(self, socket_path: str, timeout: float = 30,
+                 on_connect: Callable[[], None] = None):
+        super().__init__('localhost', timeout=timeout)
+        self.socket_path = socket_path
+        self.on_connect = on_connect
+
+    def connect(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        sock.connect(self.socket_path)
+        self.sock = sock
+        if self.on_connect is not None:
+            self.on_connect()
+
+
+class DockerAPIClient:
+    """
+    Client de l'API Docker Engine avec pool de connexions keep-alive
+
+    Note: 'exec start' détourne la connexion HTTP (flux brut jusqu'à la fin de
+    la commande); cette connexion est fermée par le démon et rouverte au besoin.
+    Les autres requêtes (create, inspect, list) réutilisent les connexions du pool.
+    """
+
+    def __init__(self, socket_path: str = DEFAULT_SOCKET, pool_size: int = 8, timeout: float = 30):
+        """
+        Args:
+            socket_path: Chemin du socket du démon Docker
+            pool_size: Nombre max de connexions inactives conservées
+            timeout: Timeout par défaut des requêtes en secondes
+        """
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self._pool: queue.LifoQueue = queue.LifoQueue(maxsize=pool_size)
+
+        # Statistiques du pool, incrémentées depuis plusieurs threads sous _stats_lock
+        self.stats = {'requests': 0, 'connections_opened': 0, 'connections_reused': 0}
+        self._stats_lock = threading.Lock()
+
+    def _count(self, key: str):
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    def _connection_opened(self):
+        self._count('connections_opened')
+
+    def get_stats(self) -> Dict[str, int]:
+        """Copie cohérente des statistiques du pool"""
+        with self._stats_lock:
+            return dict(self.stats)
+
+    def _acquire(self) -> Tuple[UnixHTTPConnection, bool]:
+        """
+        Retourne une connexion du pool (ou une nouvelle) et si son socket est
+        déjà ouvert (réutilisation keep-alive)
+        """
+        try:
+            conn = self._pool.get_nowait()
+        except queue.Empty:
+            conn = UnixHTTPConnection(self.socket_path, self.timeout, self._connection_opened)
+        reused = conn.sock is not None
+        if reused:
+            self._count('connections_reused')
+        return conn, reused
+
+    def _release(self, conn: UnixHTTPConnection):
+        """Remet une connexion dans le pool, ou la ferme si le pool est plein"""
+        try:
+            self._pool.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def _request(self, method: str, path: str, body: Dict = None,
+                 timeout: float = None) -> Tuple[int, bytes]:
+        """
+        Envoie une requête à l'API Docker
+
+        Returns:
+            Tuple (code HTTP, corps de la réponse)
+        """
+        payload = json.dumps(body).encode() if body is not None else None
+        headers = {'Content-Type': 'application/json'} if payload is not None else {}
+        self._count('requests')
+
+        # Une connexion keep-alive peut avoir été fermée par le démon: un seul nouvel essai
+        for attempt in range(2):
+            conn, reused = self._acquire()
+            conn.timeout = timeout or self.timeout
+            if conn.sock is not None:
+                conn.sock.settimeout(conn.timeout)
+            try:
+                conn.request(method, path, body=payload, headers=headers)
+                response = conn.getresponse()
+                data = response.read()
+            except (http.client.HTTPException, ConnectionError) as e:
+                conn.close()
+                if reused and attempt == 0:
+                    continue
+                raise DockerAPIError(f"{method} {path}: {e}") from e
+            except OSError as e:
+                conn.close()
+                raise DockerAPIError(f"{method} {path}: {e}") from e
+
+            self._release(conn)
+            return response.status, data
+
+    def _json_request(self, method: str, path: str, body: Dict = None,
+                      expected: Tuple[int, ...] = (200,)):
+        """Envoie une requête et décode la réponse JSON"""
+        status, data = self._request(method, path, body)
+        if status not in expected:
+            raise DockerAPIError(f"{method} {path}: HTTP {status} {data[:200]!r}")
+        return json.loads(data) if data else {}
+
+    def list_containers(self) -> List[Dict]:
+        """Liste les conteneurs en cours d'exécution (équivalent de docker ps)"""
+        return self._json_request('GET', '/containers/json')
+
+    def inspect_container(self, container: str) -> Dict:
+        """Retourne la description d'un conteneur (équivalent de docker inspect)"""
+        return self._json_request('GET', f'/containers/{quote(container)}/json')
+
+    def exec_run(self, container: str, cmd: List[str],
+                 timeout: float = None) -> Tuple[int, str, str]:
+        """
+        Exécute une commande dans un conteneur (équivalent de docker exec)
+
+        Args:
+            container: Nom ou ID du conteneur
+            cmd: Commande et arguments
+            timeout: Timeout en secondes
+
+        Returns:
+            Tuple (code de retour, stdout, stderr)
+        """
+        created = self._json_request(
+            'POST', f'/containers/{quote(container)}/exec',
+            {'AttachStdout': True, 'AttachStderr': True, 'Cmd': cmd},
+            expected=(201,)
+        )
+        exec_id = created['Id']
+
+        status, stream = self._request(
+            'POST', f'/exec/{exec_id}/start', {'Detach': False, 'Tty': False}, timeout
+        )
+        if status != 200:
+            raise DockerAPIError(f"exec start {exec_id}: HTTP {status} {stream[:200]!r}")
+        stdout, stderr = self._demux(stream)
+
+        details = self._json_request('GET', f'/exec/{exec_id}/json')
+        exit_code = details.get('ExitCode')
+        return (exit_code if exit_code is not None else -1), stdout, stderr
+
+    @staticmethod
+    def _demux(stream: bytes) -> Tuple[str, str]:
+        """
+        Sépare le flux multiplexé de Docker (en-tête de 8 octets par trame:
+        type de flux, 3 octets nuls, taille big-endian)
+        """
+        outputs = {1: [], 2: []}
+        offset = 0
+        while offset + 8 <= len(stream):
+            stream_type, size = struct.unpack('>BxxxL', stream[offset:offset + 8])
+            offset += 8
+            outputs.setdefault(stream_type, []).append(stream[offset:offset + size])
+            offset += size
+        return (b''.join(outputs[1]).decode(errors='replace'),
+                b''.join(outputs[2]).decode(errors='replace'))
+
+    def close(self):
+        """Ferme toutes les connexions du pool"""
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+_clients: Dict[str, DockerAPIClient] = {}
+_clients_lock = threading.Lock()
+
+
+def get_client(socket_path: str = DEFAULT_SOCKET, pool_size: int = 8,
+               timeout: float = 30) -> DockerAPIClient:
+    """Retourne le client partagé pour un socket (un seul pool par socket)"""
+    with _clients_lock:
+        if socket_path not in _clients:
+            _clients[socket_path] = DockerAPIClient(socket_path, pool_size, timeout)
+        return _clients[socket_path]
@@ -0,0 +1,260 @@
+"""
+Déclencheurs d'optimisation sur événements réseau
+Un flux continu par routeur suit 'ip monitor link' et les changements
+d'adjacence OSPF du journal FRR; les liens touchés sont regroupés (anti-rebond)
+puis transmis pour une re-collecte et un recalcul ciblés, en plus du cycle
+périodique de run_continuous
+"""
+
+import re
+import time
+import threading
+import logging
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .router_connection import STREAM_PIDS_MARKER
+
+logger = logging.getLogger(__name__)
+
+# ip -o monitor link: "3: eth1@if12: <BROADCAST,MULTICAST,UP,LOWER_UP> mtu 1500 ... state UP ..."
+LINK_EVENT = re.compile(
+    r'^(Deleted\s+)?\d+:\s+([^:@\s]+)(?:@[^:\s]*)?:\s+<([^>]*)>(?:.*?\bstate\s+(\S+))?'
+)
+# FRR: "AdjChg: Nbr 2.2.2.2(default) on eth1:10.0.0.1: Full -> Deleted (InactivityTimer)"
+ADJACENCY_EVENT = re.compile(
+    r'AdjChg: Nbr ([\d.]+)(?:\([^)]*\))? on ([^:\s]+)(?::\S+)?: ([\w-]+) -> ([\w-]+)'
+)
+
+DEFAULT_LOG_FILE = '/var/log/frr/ospf_events.log'
+
+
+def parse_link_event(line: str) -> Optional[Tuple[str, bool]]:
+    """
+    Décode une ligne de 'ip -o monitor link'
+
+    Returns:
+        Tuple (interface, opérationnelle) ou None si la ligne n'est pas un événement de lien
+    """
+    match = LINK_EVENT.match(line.strip())
+    if not match:
+        return None
+    deleted, interface, flags, state = match.groups()
+    if deleted:
+        return interface, False
+    if state and state.upper() != 'UNKNOWN':
+        return interface, state.upper() == 'UP'
+    return interface, 'LOWER_UP' in flags.split(',')
+
+
+def parse_adjacency_event(line: str) -> Optional[Tuple[str, str, str, str]]:
+    """
+    Décode un changement d'adjacence OSPF du journal FRR
+
+    Returns:
+        Tuple (voisin, interface, ancien état, nouvel état) ou None
+    """
+    match = ADJACENCY_EVENT.search(line)
+    return match.groups() if match else None
+
+
+def build_event_command(log_file: str = DEFAULT_LOG_FILE) -> str:
+    """
+    Commande longue suivant les événements de lien et d'adjacence d'un routeur
+    Elle annonce d'abord ses processus (STREAM_PIDS_MARKER) pour que la
+    fermeture du flux les arrête dans le conteneur
+
+    Args:
+        log_file: Journal FRR contenant les changements d'adjacence
+    """
+    return (f"ip -o monitor link & p1=$!; tail -n 0 -F {log_file} 2>/dev/null & p2=$!; "
+            f"echo '{STREAM_PIDS_MARKER}'\"$p1 $p2 $$\"; wait")
+
+
+def logging_commands(log_file: str = DEFAULT_LOG_FILE) -> List[str]:
+    """Commandes vtysh activant la journalisation des adjacences OSPF dans log_file"""
+    return ['configure terminal', f'log file {log_file} informational',
+            'router ospf', 'log-adjacency-changes']
+
+
+class EventWatcher:
+    """
+    Surveille les flux d'événements de tous les routeurs
+
+    Chaque événement significatif (changement d'état opérationnel d'une
+    interface, adjacence qui entre en Full ou en sort) ajoute les liens de
+    l'interface aux liens en attente; 'on_trigger' est appelé quand aucun
+    événement n'est arrivé depuis 'debounce' secondes, ou au plus tard
+    'max_delay' secondes après le premier
+    """
+
+    def __init__(self, connection_handler, topology,
+                 on_trigger: Callable[[List[str], Dict[str, List[str]]], None],
+                 config: Dict = None):
+        """
+        Args:
+            connection_handler: Connexion synchrone (open_stream, invalidate_costs)
+            topology: TopologyIndex (liens d'une interface)
+            on_trigger: Fonction (noms de liens, {lien: raisons}) du cycle ciblé
+            config: Section 'events' de routers.yaml
+        """
+        config = config or {}
+        self.connection = connection_handler
+        self.topology = topology
+        self.on_trigger = on_trigger
+        self.debounce = float(config.get('debounce', 2))
+        self.max_delay = max(self.debounce, float(config.get('max_delay', 10)))
+        self.reconnect = float(config.get('reconnect', 5))
+        self.log_file = config.get('log_file', DEFAULT_LOG_FILE)
+        self.configure_logging = config.get('configure_logging', True)
+        self.command = build_event_command(self.log_file)
+        # Routeurs dont la journalisation FRR est déjà configurée (une fois, pas à chaque reconnexion)
+        self._logging_configured = set()
+
+        self.link_states: Dict[Tuple[str, str], bool] = {}
+        self._pending: Dict[str, List[str]] = {}
+        self._first_event = 0.0
+        self._last_event = 0.0
+        self._cond = threading.Condition()
+        self._stop = threading.Event()
+        self._streams: Dict[str, object] = {}
+        self._threads: List[threading.Thread] = []
+
+        # Statistiques
+        self.stats = {'events': 0, 'ignored': 0, 'triggers': 0, 'triggered_links': 0,
+                      'reconnects': 0}
+
+    def start(self, routers: List[str]):
+        """Ouvre un flux par routeur et démarre la répartition des déclenchements"""
+        for router in routers:
+            thread = threading.Thread(target=self._follow, args=(router,),
+                                      name=f'events-{router}', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        dispatcher = threading.Thread(target=self._dispatch, name='events-dispatch', daemon=True)
+        dispatcher.start()
+        self._threads.append(dispatcher)
+        logger.info(f"Surveillance des événements démarrée sur {len(routers)} routeurs "
+                    f"(anti-rebond {self.debounce}s)")
+
+    def _follow(self, router_name: str):
+        """Suit le flux d'un routeur, rouvert après une coupure (conteneur redémarré)"""
+        opened_once = False
+        while not self._stop.is_set():
+            self._configure_logging(router_name)
+            stream = self.connection.open_stream(router_name, self.command)
+            if stream is None:
+                self._stop.wait(self.reconnect)
+                continue
+            if opened_once:
+                # Routeur potentiellement redémarré: ses coûts sont à relire
+                self.connection.invalidate_costs(router_name)
+            opened_once = True
+            self._streams[router_name] = stream
+            try:
+                for line in stream:
+                    if self._stop.is_set():
+                        break
+                    self.handle_line(router_name, line)
+            except Exception as e:
+                logger.debug(f"Flux d'événements interrompu sur {router_name}: {e}")
+            finally:
+                self._streams.pop(router_name, None)
+                stream.close()
+            if not self._stop.is_set():
+                self.stats['reconnects'] += 1
+                logger.warning(f"Flux d'événements terminé sur {router_name}, "
+                               f"reconnexion dans {self.reconnect}s")
+                self._stop.wait(self.reconnect)
+
+    def _configure_logging(self, router_name: str):
+        """Active la journalisation des adjacences sur un routeur, une seule fois"""
+        if not self.configure_logging or router_name in self._logging_configured:
+            return
+        if self.connection.execute_vtysh(router_name, logging_commands(self.log_file)) is not None:
+            self._logging_configured.add(router_name)
+
+    def handle_line(self, router_name: str, line: str) -> List[str]:
+        """
+        Traite une ligne d'un flux
+
+        Returns:
+            Noms des liens mis en attente (vide si l'événement est ignoré)
+        """
+        link_event = parse_link_event(line)
+        if link_event is not None:
+            interface, is_up = link_event
+            key = (router_name, interface)
+            if self.link_states.get(key) == is_up:
+                # ip monitor signale aussi les changements de flags sans changement d'état
+                self.stats['ignored'] += 1
+                return []
+            self.link_states[key] = is_up
+            reason = f"{router_name}.{interface} {'up' if is_up else 'down'}"
+            return self._queue(router_name, interface, reason)
+
+        adjacency = parse_adjacency_event(line)
+        if adjacency is not None:
+            neighbor, interface, old_state, new_state = adjacency
+            if 'Full' not in (old_state, new_state) and new_state not in ('Deleted', 'Down'):
+                self.stats['ignored'] += 1
+                return []
+            self.connection.invalidate_costs(router_name)
+            reason = f"{router_name}.{interface} voisin {neighbor} {old_state} -> {new_state}"
+            return self._queue(router_name, interface, reason)
+
+        return []
+
+    def _queue(self, router_name: str, interface: str, reason: str) -> List[str]:
+        names = [link['name'] for link in self.topology.links_on(router_name, interface)]
+        self.stats['events'] += 1
+        if not names:
+            logger.debug(f"Événement sans lien surveillé: {reason}")
+            return []
+        logger.info(f"Événement: {reason} ({', '.join(names)})")
+        with self._cond:
+            now = time.monotonic()
+            if not self._pending:
+                self._first_event = now
+            self._last_event = now
+            for name in names:
+                self._pending.setdefault(name, []).append(reason)
+            self._cond.notify()
+        return names
+
+    def _dispatch(self):
+        """Appelle on_trigger une fois les événements d'une rafale regroupés"""
+        while not self._stop.is_set():
+            with self._cond:
+                while not self._pending and not self._stop.is_set():
+                    self._cond.wait()
+                while not self._stop.is_set():
+                    now = time.monotonic()
+                    fire_at = min(self._last_event + self.debounce, self._first_event + self.max_delay)
+                    if now >= fire_at:
+                        break
+                    self._cond.wait(fire_at - now)
+                if self._stop.is_set():
+                    return
+                pending, self._pending = self._pending, {}
+
+            self.stats['triggers'] += 1
+            self.stats['triggered_links'] += len(pending)
+            try:
+                self.on_trigger(list(pending), pending)
+            except Exception as e:
+                logger.error(f"Erreur du cycle déclenché par événement: {e}")
+
+    def stop(self):
+        """Ferme les flux et arrête les threads"""
+        self._stop.set()
+        with self._cond:
+            self._cond.notify_all()
+        for stream in list(self._streams.values()):
+            stream.close()
+        for thread in self._threads:
+            thread.join(timeout=3)
+        self._threads.clear()
+
+    def get_stats(self) -> Dict:
+        """Compteurs d'événements et flux ouverts"""
+        return {**self.stats, 'streams': sorted(self._streams), 'pending': len(self._pending)}
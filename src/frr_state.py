@@ -0,0 +1,190 @@
+"""
+Couche de données structurée basée sur la sortie JSON de vtysh
+Un seul appel vtysh par routeur et par cycle récupère les interfaces OSPF,
+les voisins OSPF et les interfaces zebra, décodés en enregistrements typés
+"""
+
+import json
+import time
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Commandes vtysh exécutées en une seule invocation (sorties JSON concaténées)
+STATE_COMMANDS = [
+    'show ip ospf interface json',
+    'show ip ospf neighbor json',
+    'show interface json',
+]
+
+
+@dataclass
+class OSPFInterfaceState:
+    """Interface OSPF (show ip ospf interface json)"""
+    name: str
+    up: bool
+    ip_address: str
+    prefix_length: int
+    area: str
+    cost: int
+    state: str
+    network_type: str
+    neighbor_count: int
+    adjacent_count: int
+
+
+@dataclass
+class OSPFNeighborState:
+    """Voisin OSPF (show ip ospf neighbor json)"""
+    neighbor_id: str
+    priority: int
+    state: str
+    dead_time_ms: int
+    address: str
+    interface: str
+
+
+@dataclass
+class InterfaceState:
+    """Interface zebra (show interface json)"""
+    name: str
+    admin_up: bool
+    oper_up: bool
+    mtu: int
+    ip_addresses: List[str] = field(default_factory=list)
+
+
+@dataclass
+class RouterState:
+    """État OSPF et interfaces d'un routeur, décodé une fois par cycle"""
+    ospf_interfaces: Dict[str, OSPFInterfaceState]
+    neighbors: List[OSPFNeighborState]
+    interfaces: Dict[str, InterfaceState]
+    timestamp: float = field(default_factory=time.time)
+
+    def ospf_costs(self) -> Dict[str, int]:
+        """Coûts OSPF par interface"""
+        return {name: iface.cost for name, iface in self.ospf_interfaces.items()}
+
+    def neighbors_on(self, interface: str) -> List[OSPFNeighborState]:
+        """Voisins vus sur une interface"""
+        return [n for n in self.neighbors if n.interface == interface]
+
+    def neighbors_as_dicts(self) -> List[Dict]:
+        """Voisins au format historique de FRRMetricsCollector.get_ospf_neighbors"""
+        return [
+            {
+                'neighbor_id': n.neighbor_id,
+                'priority': str(n.priority),
+                'state': n.state,
+                'dead_time': f"{n.dead_time_ms / 1000:.0f}s",
+                'address': n.address,
+                'interface': n.interface
+            }
+            for n in self.neighbors
+        ]
+
+
+def split_json_documents(output: str) -> List:
+    """Découpe une sortie contenant plusieurs documents JSON concaténés"""
+    decoder = json.JSONDecoder()
+    documents = []
+    index = 0
+    while True:
+        start = output.find('{', index)
+        if start < 0:
+            break
+        try:
+            document, index = decoder.raw_decode(output, start)
+        except json.JSONDecodeError as e:
+            logger.error(f"Erreur de parsing JSON vtysh: {e}")
+            break
+        documents.append(document)
+    return documents
+
+
+def parse_ospf_interfaces(document: Dict) -> Dict[str, OSPFInterfaceState]:
+    """Parse 'show ip ospf interface json' (avec ou sans la clé 'interfaces')"""
+    interfaces = document.get('interfaces', document)
+    result = {}
+    for name, data in interfaces.items():
+        if not isinstance(data, dict):
+            continue
+        result[name] = OSPFInterfaceState(
+            name=name,
+            up=bool(data.get('ifUp', False)),
+            ip_address=data.get('ipAddress', ''),
+            prefix_length=int(data.get('ipAddressPrefixlen', 0)),
+            area=str(data.get('area', '')),
+            cost=int(data.get('cost', 0)),
+            state=data.get('state', ''),
+            network_type=data.get('networkType', ''),
+            neighbor_count=int(data.get('nbrCount', 0)),
+            adjacent_count=int(data.get('nbrAdjacentCount', 0))
+        )
+    return result
+
+
+def parse_ospf_neighbors(document: Dict) -> List[OSPFNeighborState]:
+    """Parse 'show ip ospf neighbor json' (entrées en liste ou en objet selon la version)"""
+    neighbors = document.get('neighbors', document)
+    result = []
+    for neighbor_id, entries in neighbors.items():
+        if isinstance(entries, dict):
+            entries = [entries]
+        if not isinstance(entries, list):
+            continue
+        for data in entries:
+            result.append(OSPFNeighborState(
+                neighbor_id=neighbor_id,
+                priority=int(data.get('nbrPriority', data.get('priority', 0))),
+                state=data.get('nbrState', data.get('state', '')),
+                dead_time_ms=int(data.get('deadTimeMsecs',
+                                          data.get('routerDeadIntervalTimerDueMsec', 0))),
+                address=data.get('address', ''),
+                # "eth1:10.0.0.1" -> "eth1"
+                interface=data.get('ifaceName', '').split(':')[0]
+            ))
+    return result
+
+
+def parse_interfaces(document: Dict) -> Dict[str, InterfaceState]:
+    """Parse 'show interface json'"""
+    result = {}
+    for name, data in document.items():
+        if not isinstance(data, dict):
+            continue
+        result[name] = InterfaceState(
+            name=name,
+            admin_up=data.get('administrativeStatus') == 'up',
+            oper_up=data.get('operationalStatus') == 'up',
+            mtu=int(data.get('mtu', 0)),
+            ip_addresses=[
+                address.get('address', '').split('/')[0]
+                for address in data.get('ipAddresses', [])
+                if ':' not in address.get('address', '')
+            ]
+        )
+    return result
+
+
+def parse_router_state(output: str) -> Optional[RouterState]:
+    """
+    Parse la sortie de 'vtysh -c ... json' pour STATE_COMMANDS
+
+    Returns:
+        RouterState ou None si la sortie est incomplète
+    """
+    documents = split_json_documents(output or '')
+    if len(documents) != len(STATE_COMMANDS):
+        logger.error(f"Sortie JSON vtysh incomplète ({len(documents)}/{len(STATE_COMMANDS)} documents)")
+        return None
+
+    ospf_interfaces, neighbors, interfaces = documents
+    return RouterState(
+        ospf_interfaces=parse_ospf_interfaces(ospf_interfaces),
+        neighbors=parse_ospf_neighbors(neighbors),
+        interfaces=parse_interfaces(interfaces)
+    )
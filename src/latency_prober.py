@@ -0,0 +1,249 @@
+"""
+Moteur de mesure de latence concurrent et borné dans le temps
+Toutes les sondes d'un cycle sont lancées en même temps, par salves courtes
+(ping -i 0.2); une sonde s'arrête dès que le RTT est stable et aucune ne
+dépasse l'échéance globale du cycle
+
+Mode 'per_router': une seule exécution par routeur et par salve sonde tous
+ses voisins en parallèle dans le conteneur (ping_many)
+"""
+
+import re
+import math
+import time
+import asyncio
+import logging
+import statistics
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Résultat renvoyé quand aucune réponse n'a été reçue (même convention que measure_latency)
+UNREACHABLE = (999.0, 100.0, 0.0)
+
+
+def parse_ping_samples(output: str, requested: int = 0) -> Tuple[int, List[float]]:
+    """
+    Extrait les RTT individuels d'une sortie ping Linux
+
+    Args:
+        output: Sortie de ping
+        requested: Nombre de paquets demandés (si la ligne de statistiques manque)
+
+    Returns:
+        Tuple (paquets envoyés, liste des RTT en ms)
+    """
+    samples = [float(t) for t in re.findall(r'time[=<]([\d.]+)', output)]
+    sent_match = re.search(r'(\d+)\s*packets transmitted', output)
+    sent = int(sent_match.group(1)) if sent_match else max(requested, len(samples))
+    return sent, samples
+
+
+@dataclass
+class ProbeResult:
+    """Mesures accumulées pour une cible (routeur source -> IP destination)"""
+    router: str
+    dest_ip: str
+    sent: int = 0
+    samples: List[float] = field(default_factory=list)
+    rounds: int = 0
+    stable: bool = False
+
+    @property
+    def received(self) -> int:
+        return len(self.samples)
+
+    def as_tuple(self) -> Tuple[float, float, float]:
+        """
+        Tuple (latence_moyenne_ms, packet_loss_percent, jitter_ms)
+        Le jitter est l'écart moyen (mdev) comme dans la sortie de ping
+        """
+        if not self.sent or not self.samples:
+            return UNREACHABLE
+        loss = (self.sent - self.received) / self.sent * 100
+        return (
+            round(statistics.mean(self.samples), 3),
+            round(max(loss, 0.0), 2),
+            round(statistics.pstdev(self.samples), 3)
+        )
+
+
+class LatencyProber:
+    """
+    Lance les pings de tous les liens simultanément, par salves adaptatives
+
+    Chaque cible reçoit une première salve de min_count paquets; tant que le
+    RTT n'est pas stable (écart type <= max(stable_ratio * moyenne, stable_ms)),
+    une nouvelle salve est envoyée jusqu'à max_count paquets, dans la limite
+    de l'échéance globale (deadline) commune à toutes les sondes
+
+    En mode 'per_router', les cibles d'un même routeur partagent chaque salve
+    (une exécution de ping_many); en mode 'per_link', un ping par cible
+    """
+
+    def __init__(self, connection_handler, async_connection=None, config: Dict = None):
+        """
+        Args:
+            connection_handler: Connexion synchrone (méthode ping)
+            async_connection: Connexion asynchrone optionnelle
+            config: Section 'probing' de routers.yaml
+        """
+        config = config or {}
+        self.connection = connection_handler
+        self.async_connection = async_connection
+        self.interval = float(config.get('interval', 0.2))
+        self.min_count = max(2, int(config.get('min_count', 3)))
+        self.max_count = max(self.min_count, int(config.get('max_count', 10)))
+        self.stable_ratio = float(config.get('stable_ratio', 0.1))
+        self.stable_ms = float(config.get('stable_ms', 0.5))
+        self.deadline = float(config.get('deadline', 5))
+        self.max_workers = max(1, int(config.get('max_workers', 16)))
+        self.mode = config.get('mode', 'per_router')
+        # Fonction (routeur, ip, RTT reçus) appelée à chaque salve (quantiles de latence)
+        self.on_samples: Optional[Callable[[str, str, List[float]], None]] = None
+
+    def _is_stable(self, result: ProbeResult) -> bool:
+        """RTT stable: assez d'échantillons et faible dispersion"""
+        if result.received < self.min_count:
+            return False
+        mean = statistics.mean(result.samples)
+        return statistics.pstdev(result.samples) <= max(self.stable_ratio * mean, self.stable_ms)
+
+    def _next_round(self, result: ProbeResult, expires: float) -> Optional[Tuple[int, int]]:
+        """
+        Taille et durée max (-w) de la prochaine salve, None si la sonde est terminée
+        """
+        if result.rounds and (result.stable or result.sent >= self.max_count
+                              or result.received == 0):
+            return None
+        remaining = expires - time.monotonic()
+        count = min(self.min_count, self.max_count - result.sent)
+        # Une salve dure environ (count - 1) * interval + 1 RTT
+        if remaining < (count - 1) * self.interval + 0.1:
+            return None
+        return count, max(1, math.floor(remaining))
+
+    def _record(self, result: ProbeResult, output: Optional[str], count: int):
+        result.rounds += 1
+        if not output:
+            result.sent += count
+            return
+        sent, samples = parse_ping_samples(output, count)
+        result.sent += sent
+        result.samples.extend(samples)
+        if samples and self.on_samples is not None:
+            self.on_samples(result.router, result.dest_ip, samples)
+        result.stable = self._is_stable(result)
+
+    def _next_group_round(self, results: List[ProbeResult],
+                          expires: float) -> Optional[Tuple[List[ProbeResult], int, int]]:
+        """Cibles encore actives d'un groupe, taille et durée max de la salve commune"""
+        active = [(result, self._next_round(result, expires)) for result in results]
+        active = [(result, next_round) for result, next_round in active if next_round]
+        if not active:
+            return None
+        count = min(next_round[0] for _, next_round in active)
+        deadline = min(next_round[1] for _, next_round in active)
+        return [result for result, _ in active], count, deadline
+
+    def _groups(self, results: Dict[Tuple[str, str], ProbeResult]) -> List[List[ProbeResult]]:
+        """Unités de travail: toutes les cibles d'un routeur (per_router) ou une cible"""
+        if self.mode != 'per_router':
+            return [[result] for result in results.values()]
+        groups: Dict[str, List[ProbeResult]] = {}
+        for result in results.values():
+            groups.setdefault(result.router, []).append(result)
+        return list(groups.values())
+
+    def _probe(self, results: List[ProbeResult], expires: float):
+        """Salves successives pour un groupe de cibles (exécuté dans un worker)"""
+        while True:
+            next_round = self._next_group_round(results, expires)
+            if next_round is None:
+                return
+            active, count, deadline = next_round
+            if len(active) == 1:
+                result = active[0]
+                output = self.connection.ping(result.router, result.dest_ip, count,
+                                              interval=self.interval, deadline=deadline)
+                self._record(result, output, count)
+                continue
+            outputs = self.connection.ping_many(active[0].router, [r.dest_ip for r in active],
+                                                count, interval=self.interval, deadline=deadline)
+            for result in active:
+                self._record(result, outputs.get(result.dest_ip), count)
+
+    def probe_all(self, targets: List[Tuple[str, str]]) -> Dict[Tuple[str, str], Tuple[float, float, float]]:
+        """
+        Mesure toutes les cibles simultanément
+
+        Args:
+            targets: Liste de (routeur_source, ip_destination)
+
+        Returns:
+            Dict {(routeur, ip): (latence_ms, perte_%, jitter_ms)}; une sonde
+            encore en cours à l'échéance renvoie les échantillons déjà reçus
+        """
+        targets = list(dict.fromkeys(targets))
+        if not targets:
+            return {}
+
+        start = time.monotonic()
+        expires = start + self.deadline
+        results = {target: ProbeResult(*target) for target in targets}
+        groups = self._groups(results)
+
+        executor = ThreadPoolExecutor(max_workers=min(self.max_workers, len(groups)),
+                                      thread_name_prefix='probe')
+        try:
+            futures = [executor.submit(self._probe, group, expires) for group in groups]
+            _, pending = wait(futures, timeout=self.deadline + 1)
+            if pending:
+                logger.warning(f"{len(pending)} sondes encore en cours à l'échéance de {self.deadline}s")
+        finally:
+            executor.shutdown(wait=False)
+
+        logger.debug(f"{len(targets)} cibles sondées en {time.monotonic() - start:.2f}s "
+                     f"({sum(r.rounds for r in results.values())} salves, {len(groups)} groupes)")
+        return {target: result.as_tuple() for target, result in results.items()}
+
+    async def _probe_async(self, results: List[ProbeResult], expires: float):
+        """Version asynchrone de _probe"""
+        while True:
+            next_round = self._next_group_round(results, expires)
+            if next_round is None:
+                return
+            active, count, deadline = next_round
+            if len(active) == 1:
+                result = active[0]
+                output = await self.async_connection.ping(result.router, result.dest_ip, count,
+                                                          interval=self.interval, deadline=deadline)
+                self._record(result, output, count)
+                continue
+            outputs = await self.async_connection.ping_many(
+                active[0].router, [r.dest_ip for r in active],
+                count, interval=self.interval, deadline=deadline
+            )
+            for result in active:
+                self._record(result, outputs.get(result.dest_ip), count)
+
+    async def probe_all_async(self, targets: List[Tuple[str, str]]) -> Dict[Tuple[str, str], Tuple[float, float, float]]:
+        """Version asynchrone de probe_all (nécessite async_connection)"""
+        targets = list(dict.fromkeys(targets))
+        if not targets:
+            return {}
+
+        expires = time.monotonic() + self.deadline
+        results = {target: ProbeResult(*target) for target in targets}
+        tasks = [asyncio.ensure_future(self._probe_async(group, expires))
+                 for group in self._groups(results)]
+
+        _, pending = await asyncio.wait(tasks, timeout=self.deadline + 1)
+        for task in pending:
+            task.cancel()
+        if pending:
+            logger.warning(f"{len(pending)} sondes annulées à l'échéance de {self.deadline}s")
+
+        return {target: result.as_tuple() for target, result in results.items()}
@@ -0,0 +1,151 @@
+"""
+Quantiles de latence en mémoire fixe (histogramme à buckets logarithmiques)
+Chaque RTT est compté dans un bucket dont la largeur est proportionnelle à sa
+valeur: tout quantile est estimé à relative_accuracy près, quel que soit le
+nombre d'échantillons. Les histogrammes se fusionnent par simple addition;
+la fenêtre glissante est découpée en tranches de temps fusionnées à la lecture
+"""
+
+import math
+import time
+import threading
+from array import array
+from typing import Dict, Iterable, List, Optional, Sequence
+
+DEFAULT_QUANTILES = (0.5, 0.95, 0.99)
+
+
+class LatencySketch:
+    """Histogramme logarithmique de RTT (ms), fusionnable"""
+
+    __slots__ = ('relative_accuracy', 'min_value', 'max_value', '_gamma', '_log_gamma',
+                 'counts', 'count')
+
+    def __init__(self, relative_accuracy: float = 0.01, min_value: float = 0.01,
+                 max_value: float = 60000.0):
+        """
+        Args:
+            relative_accuracy: Erreur relative max des quantiles (0.01 = 1%)
+            min_value: Plus petit RTT distingué (ms), les valeurs inférieures y sont ramenées
+            max_value: Plus grand RTT distingué (ms), les valeurs supérieures y sont ramenées
+        """
+        self.relative_accuracy = relative_accuracy
+        self.min_value = min_value
+        self.max_value = max_value
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        buckets = self._index(max_value) + 1
+        self.counts = array('I', [0]) * buckets
+        self.count = 0
+
+    def _index(self, value: float) -> int:
+        if value <= self.min_value:
+            return 0
+        return math.ceil(math.log(value / self.min_value) / self._log_gamma)
+
+    def _value(self, index: int) -> float:
+        """Valeur représentative d'un bucket (erreur relative <= relative_accuracy)"""
+        if index == 0:
+            return self.min_value
+        return self.min_value * self._gamma ** index * 2 / (self._gamma + 1)
+
+    def add(self, value: float, weight: int = 1):
+        index = min(self._index(min(value, self.max_value)), len(self.counts) - 1)
+        self.counts[index] += weight
+        self.count += weight
+
+    def merge(self, other: 'LatencySketch'):
+        """Ajoute les comptes d'un histogramme de mêmes paramètres"""
+        if len(other.counts) != len(self.counts) or other.min_value != self.min_value:
+            raise ValueError("Histogrammes de paramètres différents")
+        counts = self.counts
+        for index, weight in enumerate(other.counts):
+            if weight:
+                counts[index] += weight
+        self.count += other.count
+
+    def quantiles(self, qs: Sequence[float] = DEFAULT_QUANTILES) -> List[Optional[float]]:
+        """
+        Quantiles estimés (un seul parcours des buckets)
+
+        Returns:
+            Valeurs en ms dans l'ordre de qs, None si l'histogramme est vide
+        """
+        if not self.count:
+            return [None] * len(qs)
+        order = sorted(range(len(qs)), key=lambda i: qs[i])
+        values: List[Optional[float]] = [None] * len(qs)
+        position = 0
+        cumulative = 0
+        for index, weight in enumerate(self.counts):
+            if not weight:
+                continue
+            cumulative += weight
+            while position < len(order) and cumulative > qs[order[position]] * (self.count - 1):
+                values[order[position]] = self._value(index)
+                position += 1
+            if position == len(order):
+                break
+        return values
+
+    def clear(self):
+        for index in range(len(self.counts)):
+            self.counts[index] = 0
+        self.count = 0
+
+
+class WindowedLatencySketch:
+    """
+    Quantiles sur une fenêtre glissante de 'window' secondes
+
+    La fenêtre est découpée en 'slices' tranches, chacune avec son
+    histogramme; une tranche expirée est remise à zéro et réutilisée
+    (mémoire constante: slices histogrammes)
+    """
+
+    def __init__(self, window: float = 300.0, slices: int = 5, relative_accuracy: float = 0.01):
+        """
+        Args:
+            window: Durée de la fenêtre (secondes)
+            slices: Nombre de tranches (précision de l'expiration: window / slices)
+            relative_accuracy: Erreur relative max des quantiles
+        """
+        self.window = float(window)
+        self.slices = max(1, int(slices))
+        self.slice_length = self.window / self.slices
+        self._sketches = [LatencySketch(relative_accuracy) for _ in range(self.slices)]
+        self._starts = [None] * self.slices
+        self._lock = threading.Lock()
+
+    def add_many(self, values: Iterable[float], now: float = None):
+        """Ajoute des RTT (ms) à la tranche courante"""
+        now = time.time() if now is None else now
+        number = int(now // self.slice_length)
+        slot = number % self.slices
+        with self._lock:
+            if self._starts[slot] != number:
+                self._sketches[slot].clear()
+                self._starts[slot] = number
+            sketch = self._sketches[slot]
+            for value in values:
+                sketch.add(value)
+
+    def merged(self, now: float = None) -> LatencySketch:
+        """Histogramme fusionné des tranches encore dans la fenêtre"""
+        now = time.time() if now is None else now
+        oldest = int(now // self.slice_length) - self.slices + 1
+        result = LatencySketch(self._sketches[0].relative_accuracy)
+        with self._lock:
+            for start, sketch in zip(self._starts, self._sketches):
+                if start is not None and start >= oldest:
+                    result.merge(sketch)
+        return result
+
+    def percentiles(self, now: float = None) -> Optional[Dict]:
+        """p50, p95, p99 (ms) et nombre d'échantillons, None si la fenêtre est vide"""
+        sketch = self.merged(now)
+        if not sketch.count:
+            return None
+        p50, p95, p99 = sketch.quantiles(DEFAULT_QUANTILES)
+        return {'p50': round(p50, 3), 'p95': round(p95, 3), 'p99': round(p99, 3),
+                'samples': sketch.count}
@@ -5,16 +5,28 @@ Adapté pour les conteneurs Docker FRR dans GNS3
 """
 
 import re
+import sys
+import math
 import time
+import asyncio
+import threading
 import statistics
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass, field
-from datetime import datetime
 import subprocess
 import platform
+from array import array
 
+from .latency_prober import LatencyProber, ProbeResult
+from .ring_buffer import RingBuffer
+from .rolling_stats import LinkRollingStats
+from .latency_sketch import WindowedLatencySketch
 
-@dataclass
+# Enregistrements sans __dict__ (slots=True disponible à partir de Python 3.10)
+_RECORD_OPTIONS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_RECORD_OPTIONS)
 class InterfaceMetrics:
     """Métriques d'une interface réseau"""
     interface_name: str
@@ -30,10 +42,10 @@ class InterfaceMetrics:
     rx_dropped: int
     tx_dropped: int
     utilization_percent: float = 0.0
-    timestamp: datetime = field(default_factory=datetime.now)
+    timestamp: float = field(default_factory=time.time)  # Époque (secondes)
 
 
-@dataclass
+@dataclass(**_RECORD_OPTIONS)
 class LinkMetrics:
     """Métriques d'un lien entre deux routeurs"""
     link_name: str
@@ -45,24 +57,276 @@ class LinkMetrics:
     bandwidth_utilization: float
     current_ospf_cost: int
     recommended_cost: int
-    timestamp: datetime = field(default_factory=datetime.now)
+    latency_p95_ms: float = 0.0  # 95e centile sur la fenêtre des quantiles (0 = aucun RTT)
+    timestamp: float = field(default_factory=time.time)  # Époque (secondes)
+
+
+class LinkMetricsBatch:
+    """
+    Métriques d'un cycle en colonnes parallèles
+    
+    Une array typée par champ numérique et une liste par champ texte: le
+    calcul des coûts et l'historique lisent les colonnes sans construire de
+    LinkMetrics par lien; row() reconstruit un LinkMetrics à la demande
+    """
+    
+    # Champs numériques de LinkMetrics -> code de type array
+    COLUMNS = {
+        'latency_ms': 'd',
+        'packet_loss_percent': 'd',
+        'jitter_ms': 'd',
+        'bandwidth_utilization': 'd',
+        'current_ospf_cost': 'q',
+        'recommended_cost': 'q',
+        'latency_p95_ms': 'd',
+        'timestamp': 'd',
+    }
+    
+    __slots__ = ('link_names', 'source_routers', 'dest_routers') + tuple(COLUMNS)
+    
+    def __init__(self):
+        self.link_names: List[str] = []
+        self.source_routers: List[str] = []
+        self.dest_routers: List[str] = []
+        for name, code in self.COLUMNS.items():
+            setattr(self, name, array(code))
+            
+    @classmethod
+    def from_metrics(cls, metrics_list: List[LinkMetrics]) -> 'LinkMetricsBatch':
+        """Construit un lot à partir de LinkMetrics déjà collectés"""
+        batch = cls()
+        for metrics in metrics_list:
+            batch.append(metrics)
+        return batch
+        
+    def __len__(self) -> int:
+        return len(self.link_names)
+        
+    def __iter__(self):
+        return (self.row(index) for index in range(len(self)))
+        
+    def add(self, link_name: str, source_router: str, dest_router: str,
+            latency_ms: float, packet_loss_percent: float, jitter_ms: float,
+            bandwidth_utilization: float, current_ospf_cost: int,
+            recommended_cost: int = None, timestamp: float = None,
+            latency_p95_ms: float = 0.0):
+        """Ajoute les mesures d'un lien (mêmes champs que LinkMetrics)"""
+        self.link_names.append(link_name)
+        self.source_routers.append(source_router)
+        self.dest_routers.append(dest_router)
+        self.latency_ms.append(latency_ms)
+        self.packet_loss_percent.append(packet_loss_percent)
+        self.jitter_ms.append(jitter_ms)
+        self.bandwidth_utilization.append(bandwidth_utilization)
+        self.current_ospf_cost.append(current_ospf_cost)
+        self.recommended_cost.append(current_ospf_cost if recommended_cost is None else recommended_cost)
+        self.timestamp.append(time.time() if timestamp is None else timestamp)
+        self.latency_p95_ms.append(latency_p95_ms)
+        
+    def append(self, metrics: LinkMetrics):
+        """Ajoute un LinkMetrics au lot"""
+        self.add(metrics.link_name, metrics.source_router, metrics.dest_router,
+                 metrics.latency_ms, metrics.packet_loss_percent, metrics.jitter_ms,
+                 metrics.bandwidth_utilization, metrics.current_ospf_cost,
+                 metrics.recommended_cost, metrics.timestamp, metrics.latency_p95_ms)
+        
+    def row(self, index: int) -> LinkMetrics:
+        """LinkMetrics de la ligne 'index'"""
+        return LinkMetrics(
+            link_name=self.link_names[index],
+            source_router=self.source_routers[index],
+            dest_router=self.dest_routers[index],
+            latency_ms=self.latency_ms[index],
+            packet_loss_percent=self.packet_loss_percent[index],
+            jitter_ms=self.jitter_ms[index],
+            bandwidth_utilization=self.bandwidth_utilization[index],
+            current_ospf_cost=self.current_ospf_cost[index],
+            recommended_cost=self.recommended_cost[index],
+            latency_p95_ms=self.latency_p95_ms[index],
+            timestamp=self.timestamp[index]
+        )
 
 
 class FRRMetricsCollector:
     """Collecteur de métriques réseau pour FRRouting via Docker"""
+
+    HISTORY_SIZE = 100
     
-    def __init__(self, connection_handler):
+    def __init__(self, connection_handler, async_connection=None, probe_config: Dict = None,
+                 telemetry_config: Dict = None, smoothing_config: Dict = None,
+                 percentile_config: Dict = None):
         """
         Args:
             connection_handler: Instance de FRRRouterConnection
+            async_connection: Instance optionnelle de AsyncFRRRouterConnection
+                              (utilisée par les méthodes *_async)
+            probe_config: Section 'probing' de routers.yaml (None ou enabled: false = ping par lien)
+            telemetry_config: Section 'telemetry' de routers.yaml (max_age)
+            smoothing_config: Section 'smoothing' de routers.yaml (window, half_life)
+            percentile_config: Section 'latency_percentiles' de routers.yaml
+                               (window, slices, relative_accuracy)
         """
         self.connection = connection_handler
-        self.metrics_history: Dict[str, List[LinkMetrics]] = {}
+        self.async_connection = async_connection
+        self.prober = (LatencyProber(connection_handler, async_connection, probe_config)
+                       if probe_config and probe_config.get('enabled', False) else None)
+        # Historique par lien: colonnes préallouées (HISTORY_SIZE dernières mesures)
+        self.metrics_history: Dict[str, RingBuffer] = {}
+        self.link_routers: Dict[str, Tuple[str, str]] = {}
+        
+        # Statistiques glissantes par lien, mises à jour à chaque mesure (lectures O(1))
+        smoothing_config = smoothing_config or {}
+        self.smoothing_window = max(1, min(self.HISTORY_SIZE, int(smoothing_config.get('window', 10))))
+        self.smoothing_half_life = float(smoothing_config.get('half_life', 60))
+        self.rolling_stats: Dict[str, LinkRollingStats] = {}
+        
+        # Quantiles de latence par cible (routeur, IP), alimentés par chaque RTT reçu
+        percentile_config = percentile_config or {}
+        self.percentile_window = float(percentile_config.get('window', 300))
+        self.percentile_slices = int(percentile_config.get('slices', 5))
+        self.percentile_accuracy = float(percentile_config.get('relative_accuracy', 0.01))
+        self.latency_sketches: Dict[Tuple[str, str], WindowedLatencySketch] = {}
+        self.link_targets: Dict[str, Tuple[str, str]] = {}
+        self._sketch_lock = threading.Lock()
+        if self.prober is not None:
+            self.prober.on_samples = self.record_rtts
         
         # Cache pour calculer le débit (besoin de 2 mesures)
         self.traffic_cache: Dict[str, Dict] = {}
         self.last_measurement_time: Dict[str, float] = {}
         
+        # Snapshots par routeur pour le cycle en cours (une exécution par routeur)
+        self.snapshots: Dict[str, Dict] = {}
+        
+        # États JSON vtysh (RouterState) par routeur pour le cycle en cours
+        self.router_states: Dict[str, object] = {}
+        
+        # Latences mesurées en parallèle pour le cycle en cours: {(routeur, ip): tuple}
+        self.latency_results: Dict[Tuple[str, str], Tuple[float, float, float]] = {}
+        
+        # Télémétrie poussée par les agents (voir telemetry.py), servie tant qu'elle est récente
+        self.telemetry_max_age = float((telemetry_config or {}).get('max_age', 15))
+        self.telemetry_interfaces: Dict[Tuple[str, str], InterfaceMetrics] = {}
+        self.telemetry_latency: Dict[Tuple[str, str], Tuple[float, Tuple[float, float, float]]] = {}
+        # Dernier (époque, horloge, décalage vers l'heure locale) reçu de chaque agent
+        self._telemetry_clock: Dict[str, Tuple[int, float, float]] = {}
+        self._telemetry_lock = threading.Lock()
+        
+    def take_snapshot(self, router_name: str) -> bool:
+        """
+        Récupère le snapshot d'un routeur pour le cycle en cours
+        Les liens de ce routeur sont ensuite servis depuis le snapshot
+        
+        Returns:
+            True si le snapshot a été récupéré
+        """
+        snapshot = self.connection.get_router_snapshot(router_name)
+        return self._store_snapshot(router_name, snapshot)
+        
+    def _store_snapshot(self, router_name: str, snapshot: Optional[Dict]) -> bool:
+        """Enregistre un snapshot (et l'état JSON qu'il contient) pour le cycle"""
+        if not snapshot:
+            self.snapshots.pop(router_name, None)
+            return False
+        self.snapshots[router_name] = snapshot
+        if snapshot.get('state'):
+            self.router_states[router_name] = snapshot['state']
+        return True
+        
+    def load_router_state(self, router_name: str) -> bool:
+        """
+        Récupère l'état JSON vtysh d'un routeur pour le cycle en cours
+        (coûts OSPF, voisins, état et adresses des interfaces)
+        
+        Returns:
+            True si l'état a été récupéré
+        """
+        return self._store_router_state(router_name, self.connection.get_router_state(router_name))
+        
+    def prefetch_latency(self, targets: List[Tuple[str, str]]) -> bool:
+        """
+        Mesure la latence de toutes les cibles en même temps (LatencyProber)
+        measure_latency sert ensuite ces résultats jusqu'à la fin du cycle
+        
+        Args:
+            targets: Liste de (routeur_source, ip_destination)
+            
+        Returns:
+            False si le moteur de sondes n'est pas configuré
+        """
+        if self.prober is None:
+            return False
+        targets = [target for target in targets if self._telemetry_latency_stats(*target) is None]
+        self.latency_results.update(self.prober.probe_all(targets))
+        return True
+        
+    def _store_router_state(self, router_name: str, state) -> bool:
+        if state is None:
+            self.router_states.pop(router_name, None)
+            return False
+        self.router_states[router_name] = state
+        return True
+        
+    def ingest_telemetry(self, record) -> bool:
+        """
+        Intègre un enregistrement d'agent (appelé par TelemetryIngestServer)
+        L'utilisation est calculée dès la réception, sur l'horloge de l'agent
+        
+        Returns:
+            False si l'enregistrement n'est pas plus récent que le dernier reçu
+            (dupliqué, désordonné ou émis par une exécution précédente de l'agent)
+        """
+        with self._telemetry_lock:
+            last = self._telemetry_clock.get(record.router)
+            if last is not None and (record.epoch, record.clock) <= last[:2]:
+                return False
+            # Horloge de l'agent ramenée à l'heure locale avec un décalage fixe par
+            # exécution de l'agent (recalculé si l'agent a redémarré: nouvelle époque)
+            if last is not None and last[0] == record.epoch:
+                offset = last[2]
+            else:
+                offset = record.received - record.clock
+            self._telemetry_clock[record.router] = (record.epoch, record.clock, offset)
+            sampled_at = record.clock + offset
+            for interface, traffic in record.interfaces.items():
+                utilization = self._calculate_utilization(record.router, interface, traffic, sampled_at)
+                metrics = self._build_interface_metrics(
+                    interface, traffic['ip'], traffic['status'], traffic, utilization
+                )
+                metrics.timestamp = record.received
+                self.telemetry_interfaces[(record.router, interface)] = metrics
+                
+            for dest_ip, (sent, samples) in record.probes.items():
+                stats = ProbeResult(record.router, dest_ip, sent, samples).as_tuple()
+                self.telemetry_latency[(record.router, dest_ip)] = (record.received, stats)
+                self.record_rtts(record.router, dest_ip, samples)
+        return True
+        
+    def has_fresh_telemetry(self, router_name: str) -> bool:
+        """True si l'agent du routeur a envoyé un enregistrement récent"""
+        last = self._telemetry_clock.get(router_name)
+        return last is not None and time.time() - (last[1] + last[2]) <= self.telemetry_max_age
+        
+    def _telemetry_interface(self, router_name: str, interface: str) -> Optional[InterfaceMetrics]:
+        """InterfaceMetrics poussées par l'agent, None si absentes ou trop anciennes"""
+        metrics = self.telemetry_interfaces.get((router_name, interface))
+        if metrics is None or time.time() - metrics.timestamp > self.telemetry_max_age:
+            return None
+        return metrics
+        
+    def _telemetry_latency_stats(self, router_name: str, dest_ip: str) -> Optional[Tuple[float, float, float]]:
+        """Latence mesurée par l'agent, None si absente ou trop ancienne"""
+        entry = self.telemetry_latency.get((router_name, dest_ip))
+        if entry is None or time.time() - entry[0] > self.telemetry_max_age:
+            return None
+        return entry[1]
+        
+    def clear_cycle_cache(self):
+        """Invalide les snapshots et états routeur à la fin d'un cycle"""
+        self.snapshots.clear()
+        self.router_states.clear()
+        self.latency_results.clear()
+        
     def collect_interface_stats(self, router_name: str, interface: str) -> Optional[InterfaceMetrics]:
         """
         Collecte les statistiques d'une interface via /proc/net/dev
@@ -74,29 +338,71 @@ class FRRMetricsCollector:
         Returns:
             InterfaceMetrics ou None
         """
+        pushed = self._telemetry_interface(router_name, interface)
+        if pushed is not None:
+            return pushed
+            
+        snapshot = self.snapshots.get(router_name)
+        if snapshot:
+            return self._interface_stats_from_snapshot(router_name, interface, snapshot)
+            
         # Obtenir les stats de trafic
         traffic = self.connection.get_interface_traffic(router_name, interface)
         
         if not traffic:
             return None
             
-        # Obtenir le statut de l'interface
-        status_output = self.connection.execute_command(
-            router_name, 
-            f"ip link show {interface} | grep -o 'state [A-Z]*'"
-        )
-        status = "up" if status_output and "UP" in status_output else "down"
-        
-        # Obtenir l'adresse IP
-        ip_output = self.connection.execute_command(
-            router_name,
-            f"ip addr show {interface} | grep 'inet ' | awk '{{print $2}}' | cut -d'/' -f1"
-        )
-        ip_address = ip_output.strip() if ip_output else "N/A"
+        state = self.router_states.get(router_name)
+        if state and interface in state.interfaces:
+            # Statut et adresse depuis l'état JSON déjà récupéré pour ce cycle
+            status, ip_address = self._status_from_state(state, interface)
+        else:
+            # Obtenir le statut de l'interface
+            status_output = self.connection.execute_command(
+                router_name, 
+                f"ip link show {interface} | grep -o 'state [A-Z]*'"
+            )
+            status = "up" if status_output and "UP" in status_output else "down"
+            
+            # Obtenir l'adresse IP
+            ip_output = self.connection.execute_command(
+                router_name,
+                f"ip addr show {interface} | grep 'inet ' | awk '{{print $2}}' | cut -d'/' -f1"
+            )
+            ip_address = ip_output.strip() if ip_output else "N/A"
         
         # Calculer l'utilisation basée sur le delta de trafic
         utilization = self._calculate_utilization(router_name, interface, traffic)
         
+        return self._build_interface_metrics(interface, ip_address, status, traffic, utilization)
+        
+    @staticmethod
+    def _status_from_state(state, interface: str) -> Tuple[str, str]:
+        """Statut (up/down) et première adresse IPv4 d'une interface depuis un RouterState"""
+        iface = state.interfaces[interface]
+        status = "up" if iface.oper_up else "down"
+        ip_address = iface.ip_addresses[0] if iface.ip_addresses else "N/A"
+        return status, ip_address
+        
+    def _interface_stats_from_snapshot(self, router_name: str, interface: str,
+                                       snapshot: Dict) -> Optional[InterfaceMetrics]:
+        """Construit les InterfaceMetrics d'une interface depuis le snapshot du routeur"""
+        traffic = snapshot['traffic'].get(interface)
+        
+        if not traffic:
+            return None
+            
+        status = "up" if "UP" in snapshot['link_state'].get(interface, '') else "down"
+        ip_address = snapshot['addresses'].get(interface, "N/A")
+        utilization = self._calculate_utilization(
+            router_name, interface, traffic, snapshot['timestamp']
+        )
+        
+        return self._build_interface_metrics(interface, ip_address, status, traffic, utilization)
+        
+    def _build_interface_metrics(self, interface: str, ip_address: str, status: str,
+                                 traffic: Dict, utilization: float) -> InterfaceMetrics:
+        """Assemble un InterfaceMetrics à partir des compteurs /proc/net/dev"""
         return InterfaceMetrics(
             interface_name=interface,
             ip_address=ip_address,
@@ -114,14 +420,14 @@ class FRRMetricsCollector:
         )
         
     def _calculate_utilization(self, router_name: str, interface: str, 
-                               current_traffic: Dict) -> float:
+                               current_traffic: Dict, current_time: float = None) -> float:
         """
         Calcule l'utilisation de bande passante basée sur le delta de trafic
         
         Nécessite deux mesures pour calculer le débit
         """
         cache_key = f"{router_name}:{interface}"
-        current_time = time.time()
+        current_time = current_time or time.time()
         
         if cache_key not in self.traffic_cache:
             # Première mesure, stocker et retourner 0
@@ -177,21 +483,36 @@ class FRRMetricsCollector:
         Returns:
             Tuple (latence_moyenne_ms, packet_loss_percent, jitter_ms)
         """
+        cached = self.latency_results.get((source_router, dest_ip))
+        if cached is None:
+            cached = self._telemetry_latency_stats(source_router, dest_ip)
+        if cached is not None:
+            return cached
+            
         output = self.connection.ping(source_router, dest_ip, count)
         
         if not output:
             return (999.0, 100.0, 0.0)
             
-        return self._parse_ping_output(output)
+        return self._parse_ping_output(output, (source_router, dest_ip))
         
-    def _parse_ping_output(self, output: str) -> Tuple[float, float, float]:
+    def _parse_ping_output(self, output: str,
+                           target: Tuple[str, str] = None) -> Tuple[float, float, float]:
         """
         Parse la sortie de ping Linux
         
         Formats supportés:
         - "rtt min/avg/max/mdev = 1.234/2.345/3.456/0.567 ms"
         - "X packets transmitted, Y received, Z% packet loss"
+        
+        Args:
+            output: Sortie de ping
+            target: (routeur, ip) dont les RTT individuels alimentent les quantiles
         """
+        times = re.findall(r'time[=<]([\d.]+)', output)
+        if target is not None and times:
+            self.record_rtts(target[0], target[1], [float(t) for t in times])
+            
         # Extraire les stats RTT
         rtt_match = re.search(
             r'rtt min/avg/max/mdev\s*=\s*([\d.]+)/([\d.]+)/([\d.]+)/([\d.]+)', 
@@ -205,7 +526,6 @@ class FRRMetricsCollector:
             mdev = float(rtt_match.group(4))  # jitter approximatif
         else:
             # Essayer de parser les temps individuels
-            times = re.findall(r'time[=<]([\d.]+)', output)
             if times:
                 times_float = [float(t) for t in times]
                 avg_rtt = statistics.mean(times_float)
@@ -233,9 +553,23 @@ class FRRMetricsCollector:
     def get_ospf_cost(self, router_name: str, interface: str) -> int:
         """
         Récupère le coût OSPF actuel d'une interface
+        Servi depuis le snapshot ou l'état JSON du cycle s'ils sont disponibles
         """
+        cached = self._cycle_ospf_cost(router_name, interface)
+        if cached is not None:
+            return cached
         return self.connection.get_ospf_cost(router_name, interface)
         
+    def _cycle_ospf_cost(self, router_name: str, interface: str) -> Optional[int]:
+        """Coût OSPF depuis le cache du cycle (snapshot ou état JSON), None si absent"""
+        snapshot = self.snapshots.get(router_name)
+        if snapshot and interface in snapshot['ospf_costs']:
+            return snapshot['ospf_costs'][interface]
+        state = self.router_states.get(router_name)
+        if state and interface in state.ospf_interfaces:
+            return state.ospf_interfaces[interface].cost
+        return None
+        
     def get_ospf_neighbors(self, router_name: str) -> List[Dict]:
         """
         Récupère la liste des voisins OSPF
@@ -243,6 +577,10 @@ class FRRMetricsCollector:
         Returns:
             Liste des voisins avec leurs états
         """
+        state = self.router_states.get(router_name)
+        if state:
+            return state.neighbors_as_dicts()
+            
         neighbors = []
         output = self.connection.get_ospf_neighbors(router_name)
         
@@ -266,9 +604,11 @@ class FRRMetricsCollector:
                     'state': parts[2],
                     'dead_time': parts[3],
                     'address': parts[4],
-                    'interface': parts[5] if len(parts) > 5 else 'N/A'
+                    'interface': parts[5].split(':')[0] if len(parts) > 5 else 'N/A'
                 })
                 
+        # Un changement de voisinage déclenche la réconciliation des coûts en cache
+        self.connection.observe_neighbors(router_name, neighbors)
         return neighbors
         
     def collect_link_metrics(self, link_config: Dict) -> LinkMetrics:
@@ -304,18 +644,142 @@ class FRRMetricsCollector:
         # Obtenir le coût OSPF actuel
         current_cost = self.get_ospf_cost(source_router, source_interface)
         
+        return self._build_link_metrics(
+            link_config, bandwidth_util, (latency, packet_loss, jitter), current_cost
+        )
+        
+    def _build_link_metrics(self, link_config: Dict, bandwidth_util: float,
+                            latency_stats: Tuple[float, float, float],
+                            current_cost: int) -> LinkMetrics:
+        """Assemble le LinkMetrics d'un lien à partir des mesures collectées"""
+        latency, packet_loss, jitter = latency_stats
+        
+        latency_p95 = 0.0
+        dest_ip = link_config.get('dest_ip')
+        if dest_ip:
+            target = (link_config['source_router'], dest_ip)
+            self.link_targets[link_config['name']] = target
+            percentiles = self._target_percentiles(target)
+            if percentiles is not None:
+                latency_p95 = percentiles['p95']
+        
         return LinkMetrics(
             link_name=link_config['name'],
-            source_router=source_router,
-            dest_router=dest_router,
+            source_router=link_config['source_router'],
+            dest_router=link_config['dest_router'],
             latency_ms=latency,
             packet_loss_percent=packet_loss,
             jitter_ms=jitter,
             bandwidth_utilization=bandwidth_util,
             current_ospf_cost=current_cost,
-            recommended_cost=current_cost  # Sera calculé par l'optimiseur
+            recommended_cost=current_cost,  # Sera calculé par l'optimiseur
+            latency_p95_ms=latency_p95
+        )
+        
+    async def take_snapshot_async(self, router_name: str) -> bool:
+        """Version asynchrone de take_snapshot"""
+        snapshot = await self.async_connection.get_router_snapshot(router_name)
+        return self._store_snapshot(router_name, snapshot)
+        
+    async def load_router_state_async(self, router_name: str) -> bool:
+        """Version asynchrone de load_router_state"""
+        state = await self.async_connection.get_router_state(router_name)
+        return self._store_router_state(router_name, state)
+        
+    async def prefetch_latency_async(self, targets: List[Tuple[str, str]]) -> bool:
+        """Version asynchrone de prefetch_latency"""
+        if self.prober is None:
+            return False
+        targets = [target for target in targets if self._telemetry_latency_stats(*target) is None]
+        self.latency_results.update(await self.prober.probe_all_async(targets))
+        return True
+        
+    async def collect_interface_stats_async(self, router_name: str,
+                                            interface: str) -> Optional[InterfaceMetrics]:
+        """Version asynchrone de collect_interface_stats"""
+        pushed = self._telemetry_interface(router_name, interface)
+        if pushed is not None:
+            return pushed
+            
+        snapshot = self.snapshots.get(router_name)
+        if snapshot:
+            return self._interface_stats_from_snapshot(router_name, interface, snapshot)
+            
+        state = self.router_states.get(router_name)
+        if state and interface in state.interfaces:
+            traffic = await self.async_connection.get_interface_traffic(router_name, interface)
+            if not traffic:
+                return None
+            status, ip_address = self._status_from_state(state, interface)
+            utilization = self._calculate_utilization(router_name, interface, traffic)
+            return self._build_interface_metrics(interface, ip_address, status, traffic, utilization)
+            
+        traffic, status_output, ip_output = await asyncio.gather(
+            self.async_connection.get_interface_traffic(router_name, interface),
+            self.async_connection.execute_command(
+                router_name,
+                f"ip link show {interface} | grep -o 'state [A-Z]*'"
+            ),
+            self.async_connection.execute_command(
+                router_name,
+                f"ip addr show {interface} | grep 'inet ' | awk '{{print $2}}' | cut -d'/' -f1"
+            )
         )
         
+        if not traffic:
+            return None
+            
+        status = "up" if status_output and "UP" in status_output else "down"
+        ip_address = ip_output.strip() if ip_output else "N/A"
+        utilization = self._calculate_utilization(router_name, interface, traffic)
+        
+        return self._build_interface_metrics(interface, ip_address, status, traffic, utilization)
+        
+    async def measure_latency_async(self, source_router: str, dest_ip: str,
+                                    count: int = 5) -> Tuple[float, float, float]:
+        """Version asynchrone de measure_latency"""
+        cached = self.latency_results.get((source_router, dest_ip))
+        if cached is None:
+            cached = self._telemetry_latency_stats(source_router, dest_ip)
+        if cached is not None:
+            return cached
+            
+        output = await self.async_connection.ping(source_router, dest_ip, count)
+        
+        if not output:
+            return (999.0, 100.0, 0.0)
+            
+        return self._parse_ping_output(output, (source_router, dest_ip))
+        
+    async def get_ospf_cost_async(self, router_name: str, interface: str) -> int:
+        """Version asynchrone de get_ospf_cost"""
+        cached = self._cycle_ospf_cost(router_name, interface)
+        if cached is not None:
+            return cached
+        return await self.async_connection.get_ospf_cost(router_name, interface)
+        
+    async def collect_link_metrics_async(self, link_config: Dict) -> LinkMetrics:
+        """
+        Version asynchrone de collect_link_metrics
+        Les stats d'interface, le ping et le coût OSPF sont lancés simultanément
+        """
+        source_router = link_config['source_router']
+        source_interface = link_config['source_interface']
+        dest_ip = link_config.get('dest_ip', '')
+        
+        async def no_latency():
+            return (0.0, 0.0, 0.0)
+            
+        interface_stats, latency_stats, current_cost = await asyncio.gather(
+            self.collect_interface_stats_async(source_router, source_interface),
+            self.measure_latency_async(source_router, dest_ip) if dest_ip else no_latency(),
+            self.get_ospf_cost_async(source_router, source_interface)
+        )
+        
+        bandwidth_util = interface_stats.utilization_percent if interface_stats else 0.0
+        
+        return self._build_link_metrics(link_config, bandwidth_util, latency_stats, current_cost)
+        
     def collect_all_metrics(self, monitored_links: List[Dict]) -> List[LinkMetrics]:
         """
         Collecte les métriques pour tous les liens surveillés
@@ -333,42 +797,121 @@ class FRRMetricsCollector:
                 metrics = self.collect_link_metrics(link)
                 all_metrics.append(metrics)
                 
-                # Stocker dans l'historique
-                if link['name'] not in self.metrics_history:
-                    self.metrics_history[link['name']] = []
-                self.metrics_history[link['name']].append(metrics)
-                
-                # Garder seulement les 100 dernières mesures
-                if len(self.metrics_history[link['name']]) > 100:
-                    self.metrics_history[link['name']] = self.metrics_history[link['name']][-100:]
+                self.record_history(metrics)
                     
             except Exception as e:
                 print(f"Erreur lors de la collecte des métriques pour {link['name']}: {e}")
                 
         return all_metrics
         
+    def record_history(self, metrics: LinkMetrics):
+        """Ajoute une mesure à l'historique du lien (O(1), la plus ancienne est écrasée)"""
+        self._append_history(metrics.link_name, metrics.source_router, metrics.dest_router,
+                             metrics.latency_ms, metrics.packet_loss_percent, metrics.jitter_ms,
+                             metrics.bandwidth_utilization, metrics.current_ospf_cost,
+                             metrics.timestamp)
+        
+    def record_batch(self, batch: LinkMetricsBatch):
+        """Ajoute les mesures d'un cycle à l'historique, directement depuis les colonnes"""
+        for index in range(len(batch)):
+            self._append_history(batch.link_names[index], batch.source_routers[index],
+                                 batch.dest_routers[index], batch.latency_ms[index],
+                                 batch.packet_loss_percent[index], batch.jitter_ms[index],
+                                 batch.bandwidth_utilization[index],
+                                 batch.current_ospf_cost[index], batch.timestamp[index])
+        
+    def _append_history(self, link_name: str, source_router: str, dest_router: str,
+                        latency_ms: float, packet_loss_percent: float, jitter_ms: float,
+                        bandwidth_utilization: float, cost: int, timestamp: float):
+        history = self.metrics_history.get(link_name)
+        if history is None:
+            history = self.metrics_history.setdefault(link_name, RingBuffer(self.HISTORY_SIZE))
+            self.link_routers[link_name] = (source_router, dest_router)
+            self.rolling_stats[link_name] = LinkRollingStats(self.smoothing_window, self.smoothing_half_life)
+        history.append(latency_ms=latency_ms, packet_loss_percent=packet_loss_percent,
+                       jitter_ms=jitter_ms, bandwidth_utilization=bandwidth_utilization,
+                       cost=cost, timestamp=timestamp)
+        self.rolling_stats[link_name].update(timestamp, latency_ms, packet_loss_percent,
+                                             jitter_ms, bandwidth_utilization)
+        
+    def smoothed_inputs(self, link_name: str, mode: str) -> Optional[Tuple[float, float, float, float]]:
+        """
+        Entrées lissées du calcul des coûts
+        
+        Args:
+            link_name: Nom du lien
+            mode: 'raw' (dernière mesure), 'window' (moyenne glissante) ou 'ewma'
+            
+        Returns:
+            Tuple (utilisation, latence, perte, gigue), None sans mesure
+        """
+        stats = self.rolling_stats.get(link_name)
+        return stats.values(mode) if stats is not None and stats.count else None
+
     def get_average_metrics(self, link_name: str, window: int = 10) -> Optional[LinkMetrics]:
         """
         Calcule les métriques moyennes sur une fenêtre glissante
+        Fenêtre de la section 'smoothing': lecture O(1) des statistiques
+        glissantes; autre fenêtre: somme sur l'historique
         """
-        if link_name not in self.metrics_history:
-            return None
-            
-        history = self.metrics_history[link_name][-window:]
+        history = self.metrics_history.get(link_name)
         if not history:
             return None
             
+        if window == self.smoothing_window:
+            utilization, latency, loss, jitter = self.rolling_stats[link_name].values('window')
+        else:
+            def mean(column: str) -> float:
+                values = history.window(column, window if window > 0 else None)
+                return math.fsum(values) / len(values)
+            utilization, latency = mean('bandwidth_utilization'), mean('latency_ms')
+            loss, jitter = mean('packet_loss_percent'), mean('jitter_ms')
+            
+        source_router, dest_router = self.link_routers[link_name]
+        current_cost = history.latest('cost')
         return LinkMetrics(
             link_name=link_name,
-            source_router=history[-1].source_router,
-            dest_router=history[-1].dest_router,
-            latency_ms=statistics.mean([m.latency_ms for m in history]),
-            packet_loss_percent=statistics.mean([m.packet_loss_percent for m in history]),
-            jitter_ms=statistics.mean([m.jitter_ms for m in history]),
-            bandwidth_utilization=statistics.mean([m.bandwidth_utilization for m in history]),
-            current_ospf_cost=history[-1].current_ospf_cost,
-            recommended_cost=history[-1].recommended_cost
+            source_router=source_router,
+            dest_router=dest_router,
+            latency_ms=latency,
+            packet_loss_percent=loss,
+            jitter_ms=jitter,
+            bandwidth_utilization=utilization,
+            current_ospf_cost=current_cost,
+            recommended_cost=current_cost
         )
+        
+    def record_rtts(self, router_name: str, dest_ip: str, samples: List[float]):
+        """Ajoute des RTT individuels (ms) aux quantiles de la cible"""
+        if not samples:
+            return
+        key = (router_name, dest_ip)
+        sketch = self.latency_sketches.get(key)
+        if sketch is None:
+            with self._sketch_lock:
+                sketch = self.latency_sketches.setdefault(key, WindowedLatencySketch(
+                    self.percentile_window, self.percentile_slices, self.percentile_accuracy
+                ))
+        sketch.add_many(samples)
+        
+    def _target_percentiles(self, target: Tuple[str, str]) -> Optional[Dict]:
+        sketch = self.latency_sketches.get(target)
+        return sketch.percentiles() if sketch is not None else None
+        
+    def get_latency_percentiles(self, link_name: str) -> Optional[Dict]:
+        """
+        p50, p95 et p99 de la latence d'un lien sur la fenêtre glissante
+        
+        Returns:
+            Dict {'p50', 'p95', 'p99', 'samples'}, None sans RTT dans la fenêtre
+        """
+        target = self.link_targets.get(link_name)
+        return self._target_percentiles(target) if target is not None else None
+        
+    def get_rolling_stats(self, link_name: str) -> Optional[Dict]:
+        """Moyennes et écarts types (fenêtre, exponentielle, depuis le démarrage) d'un lien"""
+        stats = self.rolling_stats.get(link_name)
+        return stats.summary() if stats is not None else None
 
 
 class LocalMetricsCollector:
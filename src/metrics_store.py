@@ -0,0 +1,365 @@
+"""
+Historique persistant des métriques de liens (SQLite en mode WAL)
+Les mesures sont écrites par lots depuis un thread dédié; chaque lot met aussi
+à jour les agrégats par minute, heure et jour. Chaque niveau a sa propre durée
+de conservation, et les requêtes par plage choisissent le niveau adapté à la
+période demandée
+"""
+
+import os
+import time
+import queue
+import sqlite3
+import threading
+import logging
+from typing import Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Niveaux d'agrégation: nom -> durée d'un intervalle (secondes)
+TIERS: Dict[str, int] = {'1m': 60, '1h': 3600, '1d': 86400}
+RESOLUTIONS = ('raw',) + tuple(TIERS)
+
+# Conservation par défaut (jours)
+DEFAULT_RETENTION = {'raw': 2, '1m': 14, '1h': 180, '1d': 1825}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS samples (
+    link TEXT NOT NULL,
+    ts REAL NOT NULL,
+    latency_ms REAL,
+    packet_loss_percent REAL,
+    jitter_ms REAL,
+    bandwidth_utilization REAL,
+    cost INTEGER
+);
+CREATE INDEX IF NOT EXISTS samples_link_ts ON samples (link, ts);
+CREATE TABLE IF NOT EXISTS rollups (
+    tier TEXT NOT NULL,
+    link TEXT NOT NULL,
+    bucket INTEGER NOT NULL,
+    samples INTEGER NOT NULL,
+    latency_sum REAL,
+    latency_max REAL,
+    loss_sum REAL,
+    loss_max REAL,
+    jitter_sum REAL,
+    utilization_sum REAL,
+    utilization_max REAL,
+    cost_last INTEGER,
+    ts_last REAL,
+    PRIMARY KEY (tier, link, bucket)
+) WITHOUT ROWID;
+"""
+
+# Fusion d'un agrégat partiel (lot courant) avec l'agrégat déjà stocké
+UPSERT_ROLLUP = """
+INSERT INTO rollups VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (tier, link, bucket) DO UPDATE SET
+    samples = samples + excluded.samples,
+    latency_sum = latency_sum + excluded.latency_sum,
+    latency_max = max(latency_max, excluded.latency_max),
+    loss_sum = loss_sum + excluded.loss_sum,
+    loss_max = max(loss_max, excluded.loss_max),
+    jitter_sum = jitter_sum + excluded.jitter_sum,
+    utilization_sum = utilization_sum + excluded.utilization_sum,
+    utilization_max = max(utilization_max, excluded.utilization_max),
+    cost_last = CASE WHEN excluded.ts_last >= ts_last THEN excluded.cost_last ELSE cost_last END,
+    ts_last = max(ts_last, excluded.ts_last)
+"""
+
+_STOP = object()
+
+
+class MetricsStore:
+    """
+    Base SQLite des métriques de liens, alimentée en arrière-plan
+
+    record()/record_batch() ne bloquent pas le cycle: les mesures passent par
+    une file bornée (mesures ignorées et comptées si elle est pleine) vidée par
+    le thread d'écriture, une transaction par lot
+    """
+
+    def __init__(self, path: str, config: Dict = None):
+        """
+        Args:
+            path: Fichier de la base (répertoire créé si besoin)
+            config: Section 'storage' de routers.yaml (batch_size, flush_interval,
+                    queue_size, retention, prune_interval, max_points)
+        """
+        config = config or {}
+        self.path = path
+        self.batch_size = max(1, int(config.get('batch_size', 500)))
+        self.flush_interval = float(config.get('flush_interval', 2))
+        self.prune_interval = float(config.get('prune_interval', 600))
+        self.max_points = max(1, int(config.get('max_points', 1500)))
+        retention = {**DEFAULT_RETENTION, **(config.get('retention') or {})}
+        self.retention = {tier: float(days) * 86400 for tier, days in retention.items()}
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._reader = self._connect()
+        self._reader.executescript(SCHEMA)
+        self._read_lock = threading.Lock()
+
+        self._queue: queue.Queue = queue.Queue(maxsize=max(1, int(config.get('queue_size', 10000))))
+        self._last_prune = 0.0
+
+        # Statistiques
+        self.stats = {'queued': 0, 'written': 0, 'dropped': 0, 'rejected': 0, 'batches': 0,
+                      'errors': 0, 'pruned': 0, 'last_batch_ms': 0.0}
+
+        self._writer = threading.Thread(target=self._run, name='metrics-store', daemon=True)
+        self._writer.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path, timeout=10, check_same_thread=False)
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute('PRAGMA synchronous=NORMAL')
+        return connection
+
+    def record(self, link_name: str, timestamp: float, latency_ms: float,
+               packet_loss_percent: float, jitter_ms: float,
+               bandwidth_utilization: float, cost: int) -> bool:
+        """
+        Met une mesure en file d'écriture
+
+        Returns:
+            False si la file est pleine (mesure ignorée)
+        """
+        try:
+            self._queue.put_nowait((link_name, timestamp, latency_ms, packet_loss_percent,
+                                    jitter_ms, bandwidth_utilization, cost))
+        except queue.Full:
+            self.stats['dropped'] += 1
+            return False
+        self.stats['queued'] += 1
+        return True
+
+    def record_batch(self, batch) -> int:
+        """
+        Met en file les mesures d'un LinkMetricsBatch
+
+        Returns:
+            Nombre de mesures acceptées
+        """
+        accepted = 0
+        for index in range(len(batch)):
+            accepted += self.record(
+                batch.link_names[index], batch.timestamp[index], batch.latency_ms[index],
+                batch.packet_loss_percent[index], batch.jitter_ms[index],
+                batch.bandwidth_utilization[index], batch.current_ospf_cost[index]
+            )
+        return accepted
+
+    def _run(self):
+        """Thread d'écriture: vide la file par lots (au plus flush_interval d'attente)"""
+        connection = self._connect()
+        try:
+            while True:
+                try:
+                    item = self._queue.get(timeout=self.flush_interval)
+                except queue.Empty:
+                    item = None
+                rows = []
+                stopping = item is _STOP
+                if item is not None and not stopping:
+                    rows.append(item)
+                while item is not None and not stopping and len(rows) < self.batch_size:
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if item is _STOP:
+                        stopping = True
+                    else:
+                        rows.append(item)
+                try:
+                    if rows:
+                        self._write_rows(connection, rows)
+                    self._prune_if_due(connection)
+                except Exception as e:
+                    # Le thread d'écriture ne doit jamais s'arrêter sur une erreur imprévue
+                    self.stats['errors'] += 1
+                    logger.exception(f"Erreur inattendue du thread d'écriture de {self.path}: {e}")
+                finally:
+                    for _ in range(len(rows) + stopping):
+                        self._queue.task_done()
+                if stopping:
+                    return
+        finally:
+            connection.close()
+
+    def _write_rows(self, connection: sqlite3.Connection, rows: List[Tuple]):
+        """Écrit un lot après conversion des valeurs; les mesures invalides sont rejetées"""
+        valid = []
+        for row in rows:
+            try:
+                link, ts, latency, loss, jitter, utilization, cost = row
+                valid.append((str(link), float(ts), float(latency), float(loss), float(jitter),
+                              float(utilization), int(cost)))
+            except (TypeError, ValueError, OverflowError) as e:
+                self.stats['rejected'] += 1
+                logger.error(f"Mesure invalide ignorée dans l'historique: {row!r} ({e})")
+        if valid:
+            self._write(connection, valid)
+
+    def _write(self, connection: sqlite3.Connection, rows: List[Tuple]):
+        """Insère un lot de mesures et met à jour les agrégats, en une transaction"""
+        started = time.monotonic()
+        rollups: Dict[Tuple[str, str, int], List] = {}
+        for link, ts, latency, loss, jitter, utilization, cost in rows:
+            for tier, step in TIERS.items():
+                key = (tier, link, int(ts // step) * step)
+                entry = rollups.get(key)
+                if entry is None:
+                    rollups[key] = [1, latency, latency, loss, loss, jitter,
+                                    utilization, utilization, cost, ts]
+                    continue
+                entry[0] += 1
+                entry[1] += latency
+                entry[2] = max(entry[2], latency)
+                entry[3] += loss
+                entry[4] = max(entry[4], loss)
+                entry[5] += jitter
+                entry[6] += utilization
+                entry[7] = max(entry[7], utilization)
+                if ts >= entry[9]:
+                    entry[8], entry[9] = cost, ts
+        try:
+            with connection:
+                connection.executemany('INSERT INTO samples VALUES (?, ?, ?, ?, ?, ?, ?)', rows)
+                connection.executemany(UPSERT_ROLLUP, [key + tuple(entry) for key, entry in rollups.items()])
+        except sqlite3.Error as e:
+            self.stats['errors'] += 1
+            logger.error(f"Écriture de {len(rows)} mesures impossible dans {self.path}: {e}")
+            return
+        self.stats['written'] += len(rows)
+        self.stats['batches'] += 1
+        self.stats['last_batch_ms'] = round((time.monotonic() - started) * 1000, 1)
+
+    def _prune_if_due(self, connection: sqlite3.Connection):
+        """Supprime les mesures et agrégats plus anciens que leur durée de conservation"""
+        now = time.time()
+        if now - self._last_prune < self.prune_interval:
+            return
+        self._last_prune = now
+        try:
+            with connection:
+                deleted = connection.execute(
+                    'DELETE FROM samples WHERE ts < ?', (now - self.retention['raw'],)
+                ).rowcount
+                for tier in TIERS:
+                    deleted += connection.execute(
+                        'DELETE FROM rollups WHERE tier = ? AND bucket < ?',
+                        (tier, now - self.retention[tier])
+                    ).rowcount
+        except sqlite3.Error as e:
+            self.stats['errors'] += 1
+            logger.error(f"Purge de l'historique impossible: {e}")
+            return
+        if deleted:
+            self.stats['pruned'] += deleted
+            logger.debug(f"Historique: {deleted} lignes expirées supprimées")
+
+    def resolve_resolution(self, link_name: str, start: float, end: float) -> str:
+        """
+        Niveau le plus fin couvrant la plage: encore conservé pour 'start' et
+        donnant au plus max_points points
+        """
+        now = time.time()
+        for resolution in RESOLUTIONS:
+            if now - start > self.retention[resolution]:
+                continue
+            if resolution == 'raw':
+                # Espacement des mesures brutes inconnu (cadence des cycles): comptage indexé
+                with self._read_lock:
+                    count = self._reader.execute(
+                        'SELECT count(*) FROM samples WHERE link = ? AND ts >= ? AND ts <= ?',
+                        (link_name, start, end)
+                    ).fetchone()[0]
+                if count <= self.max_points:
+                    return resolution
+            elif (end - start) / TIERS[resolution] <= self.max_points:
+                return resolution
+        return RESOLUTIONS[-1]
+
+    def query(self, link_name: str, start: float, end: float = None,
+              resolution: str = 'auto') -> List[Dict]:
+        """
+        Mesures d'un lien sur une plage
+
+        Args:
+            link_name: Nom du lien
+            start: Début de la plage (époque, secondes)
+            end: Fin de la plage (maintenant par défaut)
+            resolution: 'raw', '1m', '1h', '1d' ou 'auto'
+
+        Returns:
+            Points dans l'ordre chronologique; pour les agrégats, moyennes,
+            maxima et nombre d'échantillons de chaque intervalle
+
+        Raises:
+            ValueError: Résolution inconnue
+        """
+        end = time.time() if end is None else end
+        if resolution == 'auto':
+            resolution = self.resolve_resolution(link_name, start, end)
+        if resolution not in RESOLUTIONS:
+            raise ValueError(f"Résolution inconnue: {resolution} "
+                             f"(attendu: auto, {', '.join(RESOLUTIONS)})")
+
+        with self._read_lock:
+            if resolution == 'raw':
+                rows = self._reader.execute(
+                    'SELECT ts, latency_ms, packet_loss_percent, jitter_ms, bandwidth_utilization, cost '
+                    'FROM samples WHERE link = ? AND ts >= ? AND ts <= ? ORDER BY ts',
+                    (link_name, start, end)
+                ).fetchall()
+                return [
+                    {'timestamp': ts, 'latency_ms': latency, 'packet_loss_percent': loss,
+                     'jitter_ms': jitter, 'bandwidth_utilization': utilization, 'cost': cost}
+                    for ts, latency, loss, jitter, utilization, cost in rows
+                ]
+            step = TIERS[resolution]
+            rows = self._reader.execute(
+                'SELECT bucket, samples, latency_sum, latency_max, loss_sum, loss_max, jitter_sum, '
+                'utilization_sum, utilization_max, cost_last FROM rollups '
+                'WHERE tier = ? AND link = ? AND bucket >= ? AND bucket <= ? ORDER BY bucket',
+                (resolution, link_name, (start // step) * step, end)
+            ).fetchall()
+        return [
+            {'timestamp': bucket, 'resolution': resolution, 'samples': count,
+             'latency_ms': latency_sum / count, 'latency_max_ms': latency_max,
+             'packet_loss_percent': loss_sum / count, 'packet_loss_max_percent': loss_max,
+             'jitter_ms': jitter_sum / count,
+             'bandwidth_utilization': utilization_sum / count,
+             'bandwidth_utilization_max': utilization_max, 'cost': cost}
+            for (bucket, count, latency_sum, latency_max, loss_sum, loss_max, jitter_sum,
+                 utilization_sum, utilization_max, cost) in rows
+        ]
+
+    def links(self) -> List[str]:
+        """Liens présents dans l'historique (agrégats journaliers)"""
+        with self._read_lock:
+            rows = self._reader.execute(
+                "SELECT DISTINCT link FROM rollups WHERE tier = '1d' ORDER BY link"
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def flush(self):
+        """Attend l'écriture de toutes les mesures en file"""
+        if self._writer.is_alive():
+            self._queue.join()
+
+    def close(self):
+        """Écrit les mesures en attente puis arrête le thread d'écriture"""
+        if self._writer.is_alive():
+            self._queue.put(_STOP)
+            self._writer.join()
+        self._reader.close()
+
+    def get_stats(self) -> Dict:
+        """Compteurs d'écriture et taille de la file"""
+        return {**self.stats, 'path': self.path, 'pending': self._queue.qsize(),
+                'writer_alive': self._writer.is_alive()}
@@ -0,0 +1,177 @@
+"""
+Lecture des compteurs d'interface des conteneurs depuis l'hôte
+Le PID init de chaque conteneur est résolu une fois puis mis en cache avec
+sa date de démarrage, vérifiée avant chaque lecture (PID réutilisé par un
+autre processus après un redémarrage du conteneur); /proc/<pid>/net/dev (vue du namespace réseau du conteneur) est lu directement,
+sans docker exec. Si l'accès est refusé, l'appelant repasse par exec.
+"""
+
+import os
+import subprocess
+import threading
+import time
+import logging
+from typing import Callable, Dict, Optional
+
+from .docker_api import DockerAPIError, DEFAULT_SOCKET, get_client
+
+logger = logging.getLogger(__name__)
+
+
+def resolve_container_pid(container: str, socket_path: str = DEFAULT_SOCKET) -> Optional[int]:
+    """
+    PID (vu de l'hôte) du processus init d'un conteneur
+
+    Utilise l'API Docker si le socket est accessible, sinon docker inspect
+
+    Returns:
+        PID ou None si le conteneur est introuvable ou arrêté
+    """
+    if os.path.exists(socket_path):
+        try:
+            pid = get_client(socket_path).inspect_container(container).get('State', {}).get('Pid')
+            return pid or None
+        except DockerAPIError as e:
+            logger.debug(f"API Docker indisponible pour {container}: {e}")
+
+    try:
+        result = subprocess.run(
+            ['docker', 'inspect', '-f', '{{.State.Pid}}', container],
+            capture_output=True, text=True, timeout=10
+        )
+    except (FileNotFoundError, subprocess.TimeoutExpired) as e:
+        logger.error(f"docker inspect impossible pour {container}: {e}")
+        return None
+
+    if result.returncode != 0 or not result.stdout.strip().isdigit():
+        return None
+    return int(result.stdout.strip()) or None
+
+
+def parse_start_time(stat: str) -> Optional[int]:
+    """
+    Date de démarrage d'un processus (champ 22 de /proc/<pid>/stat, en ticks
+    depuis le boot). Le nom du processus peut contenir espaces et parenthèses:
+    les champs sont comptés après la dernière ')'
+
+    Returns:
+        Date de démarrage ou None si le contenu est illisible
+    """
+    fields = stat.rpartition(')')[2].split()
+    if len(fields) < 20 or not fields[19].isdigit():
+        return None
+    return int(fields[19])
+
+
+class HostCounterReader:
+    """
+    Lecteur de /proc/<pid>/net/dev des conteneurs, avec cache des PID
+
+    Un routeur dont la lecture est refusée (PermissionError) est marqué
+    'exec_only' et n'est plus tenté; un PID disparu ou dont la date de
+    démarrage a changé (conteneur redémarré) est résolu de nouveau
+    """
+
+    def __init__(self, parse: Callable[[str], Dict[str, Dict]],
+                 resolver: Callable[[str], Optional[int]] = None,
+                 proc_root: str = '/proc', max_age: float = 0.5, retry_after: float = 60):
+        """
+        Args:
+            parse: Parseur du contenu de /proc/net/dev ({iface: compteurs})
+            resolver: Fonction nom_conteneur -> PID (resolve_container_pid par défaut)
+            proc_root: Racine du procfs de l'hôte
+            max_age: Durée de réutilisation d'une lecture pour les autres
+                     interfaces du même routeur (secondes)
+            retry_after: Délai avant de résoudre à nouveau un PID introuvable (secondes)
+        """
+        self.parse = parse
+        self.resolver = resolver or resolve_container_pid
+        self.proc_root = proc_root
+        self.max_age = max_age
+        self.retry_after = retry_after
+
+        self.pids: Dict[str, int] = {}
+        self._start_times: Dict[str, Optional[int]] = {}
+        self.exec_only: Dict[str, str] = {}
+        self._readings: Dict[str, tuple] = {}
+        self._unresolved: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+        # Statistiques
+        self.stats = {'reads': 0, 'cached': 0, 'resolutions': 0, 'fallbacks': 0, 'stale_pids': 0}
+
+    def _start_time(self, pid: int) -> Optional[int]:
+        try:
+            with open(os.path.join(self.proc_root, str(pid), 'stat'), 'r') as f:
+                return parse_start_time(f.read())
+        except OSError:
+            return None
+
+    def _pid(self, container: str, refresh: bool = False) -> Optional[int]:
+        with self._lock:
+            cached = None if refresh else self.pids.get(container)
+            started = self._start_times.get(container)
+            failed_at = self._unresolved.get(container)
+        if cached is not None:
+            # Le PID en cache n'est fiable que s'il désigne toujours le même processus
+            if self._start_time(cached) == started:
+                return cached
+            self.stats['stale_pids'] += 1
+            logger.info(f"PID {cached} de {container} réutilisé ou disparu, nouvelle résolution")
+        elif failed_at is not None and time.monotonic() - failed_at < self.retry_after:
+            return None
+        pid = self.resolver(container)
+        self.stats['resolutions'] += 1
+        started = self._start_time(pid) if pid else None
+        with self._lock:
+            if pid:
+                self.pids[container] = pid
+                self._start_times[container] = started
+                self._unresolved.pop(container, None)
+            else:
+                self.pids.pop(container, None)
+                self._start_times.pop(container, None)
+                self._unresolved[container] = time.monotonic()
+        return pid
+
+    def _read_file(self, pid: int) -> str:
+        with open(os.path.join(self.proc_root, str(pid), 'net', 'dev'), 'r') as f:
+            return f.read()
+
+    def read(self, container: str) -> Optional[Dict[str, Dict]]:
+        """
+        Compteurs de toutes les interfaces d'un conteneur, en une lecture
+
+        Returns:
+            Dict {interface: compteurs} ou None si l'appelant doit passer par exec
+        """
+        if container in self.exec_only:
+            self.stats['fallbacks'] += 1
+            return None
+
+        reading = self._readings.get(container)
+        if reading and time.monotonic() - reading[0] < self.max_age:
+            self.stats['cached'] += 1
+            return reading[1]
+
+        for refresh in (False, True):
+            pid = self._pid(container, refresh)
+            if pid is None:
+                break
+            try:
+                content = self._read_file(pid)
+            except FileNotFoundError:
+                # Conteneur redémarré: le PID en cache n'existe plus
+                continue
+            except PermissionError as e:
+                self.exec_only[container] = str(e)
+                logger.warning(f"Lecture de /proc/{pid}/net/dev refusée pour {container}, "
+                               f"compteurs via exec")
+                break
+            counters = self.parse(content)
+            self.stats['reads'] += 1
+            self._readings[container] = (time.monotonic(), counters)
+            return counters
+
+        self.stats['fallbacks'] += 1
+        return None
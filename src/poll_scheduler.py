@@ -0,0 +1,166 @@
+"""
+Ordonnanceur adaptatif de la collecte, lien par lien
+Chaque lien reçoit sa propre période de mesure: courte si ses métriques
+varient ou sont proches d'un seuil de calcul des coûts, longue si elles sont
+stables et loin des seuils; le nombre de liens mesurés par seconde est borné
+par un budget global
+"""
+
+import math
+import time
+import threading
+import statistics
+import logging
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, List, Tuple
+
+from .cost_calculator import CostThresholds
+from .metrics_collector import LinkMetrics
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class LinkSchedule:
+    """État d'ordonnancement d'un lien"""
+    period: float
+    next_due: float = 0.0
+    urgency: float = 1.0
+    polls: int = 0
+    samples: Deque[Tuple[float, float, float]] = field(default_factory=deque)
+
+
+class AdaptivePollScheduler:
+    """
+    Période de mesure par lien entre min_period et max_period
+
+    L'urgence d'un lien (0 à 1) est le maximum, sur la latence, la perte et
+    l'utilisation, de:
+    - la proximité de la dernière valeur au seuil le plus proche
+      (1 sur le seuil, 0 au-delà de margin * seuil)
+    - la dispersion des dernières mesures rapportée à ce même seuil
+    La période est interpolée géométriquement: min_period pour une urgence
+    de 1, max_period pour 0
+    """
+
+    def __init__(self, thresholds: CostThresholds, config: Dict = None):
+        """
+        Args:
+            thresholds: Seuils du calculateur de coûts (CostCalculator.thresholds)
+            config: Section 'polling' de routers.yaml
+        """
+        config = config or {}
+        self.min_period = max(0.1, float(config.get('min_period', 5)))
+        self.max_period = max(self.min_period, float(config.get('max_period', 120)))
+        self.budget = float(config.get('budget', 2))
+        self.window = max(2, int(config.get('window', 6)))
+        self.margin = float(config.get('margin', 0.5))
+
+        # Seuils (frontières des facteurs de coût) par métrique, dans l'ordre des échantillons
+        self.boundaries = (
+            (thresholds.latency_low, thresholds.latency_medium,
+             thresholds.latency_high, thresholds.latency_critical),
+            (thresholds.loss_low, thresholds.loss_medium,
+             thresholds.loss_high, thresholds.loss_critical),
+            (thresholds.bw_low, thresholds.bw_medium,
+             thresholds.bw_high, thresholds.bw_critical),
+        )
+
+        self.links: Dict[str, LinkSchedule] = {}
+        self._tokens = self._capacity
+        self._refilled = time.monotonic()
+        self._lock = threading.Lock()
+
+        # Statistiques
+        self.stats = {'polls': 0, 'deferred': 0}
+
+    @property
+    def _capacity(self) -> float:
+        """Jetons accumulables: une seconde de budget (au moins un lien)"""
+        return max(1.0, self.budget)
+
+    def register(self, link_names: List[str]):
+        """Ajoute des liens, dus immédiatement"""
+        with self._lock:
+            for name in link_names:
+                self.links.setdefault(name, LinkSchedule(period=self.min_period))
+
+    def _urgency(self, samples: Deque[Tuple[float, float, float]]) -> float:
+        latest = samples[-1]
+        urgency = 0.0
+        for index, boundaries in enumerate(self.boundaries):
+            value = latest[index]
+            nearest = min(boundaries, key=lambda boundary: abs(value - boundary))
+            scale = max(self.margin * nearest, 1e-6)
+            urgency = max(urgency, 1 - min(1.0, abs(value - nearest) / scale))
+            if len(samples) > 1:
+                spread = statistics.pstdev(sample[index] for sample in samples)
+                urgency = max(urgency, min(1.0, spread / scale))
+        return urgency
+
+    def _period(self, urgency: float) -> float:
+        ratio = self.max_period / self.min_period
+        return self.min_period * math.pow(ratio, 1 - urgency)
+
+    def observe(self, metrics: List[LinkMetrics]):
+        """Met à jour la période des liens mesurés et reporte leur prochaine échéance"""
+        now = time.monotonic()
+        with self._lock:
+            for m in metrics:
+                schedule = self.links.setdefault(m.link_name, LinkSchedule(period=self.min_period))
+                schedule.samples.append((m.latency_ms, m.packet_loss_percent, m.bandwidth_utilization))
+                while len(schedule.samples) > self.window:
+                    schedule.samples.popleft()
+                schedule.urgency = self._urgency(schedule.samples)
+                schedule.period = self._period(schedule.urgency)
+                schedule.next_due = now + schedule.period
+                schedule.polls += 1
+
+    def due(self) -> List[str]:
+        """
+        Liens à mesurer maintenant, dans la limite du budget
+
+        Les liens les plus en retard (rapporté à leur période) passent en
+        premier; les autres restent dus et sont repris au prochain appel
+        """
+        now = time.monotonic()
+        with self._lock:
+            self._tokens = min(self._capacity, self._tokens + (now - self._refilled) * self.budget)
+            self._refilled = now
+
+            overdue = sorted(
+                (name for name, schedule in self.links.items() if schedule.next_due <= now),
+                key=lambda name: (now - self.links[name].next_due) / self.links[name].period,
+                reverse=True
+            )
+            admitted = overdue[:int(self._tokens)]
+            self._tokens -= len(admitted)
+            # Un lien admis n'est plus dû jusqu'à sa mesure (observe fixe l'échéance suivante)
+            for name in admitted:
+                self.links[name].next_due = now + self.links[name].period
+            self.stats['polls'] += len(admitted)
+            self.stats['deferred'] += len(overdue) - len(admitted)
+        return admitted
+
+    def next_wakeup(self) -> float:
+        """Secondes avant la prochaine échéance (au plus min_period)"""
+        with self._lock:
+            if not self.links:
+                return self.min_period
+            earliest = min(schedule.next_due for schedule in self.links.values())
+        return max(0.0, min(self.min_period, earliest - time.monotonic()))
+
+    def get_stats(self) -> Dict:
+        """Période et urgence courantes de chaque lien"""
+        with self._lock:
+            return {
+                **self.stats,
+                'budget_per_second': self.budget,
+                'links': {
+                    name: {'period': round(schedule.period, 1),
+                           'urgency': round(schedule.urgency, 2),
+                           'polls': schedule.polls}
+                    for name, schedule in self.links.items()
+                }
+            }
@@ -0,0 +1,92 @@
+"""
+Tampon circulaire préalloué à colonnes typées (module array)
+Historique par lien: ajout en O(1) sans réallocation ni copie, fenêtres des
+N dernières valeurs servies comme vues memoryview contiguës (sans copie)
+"""
+
+from array import array
+from typing import Dict, Iterator, Tuple
+
+# Colonnes de l'historique d'un lien: nom -> code de type array
+LINK_COLUMNS: Dict[str, str] = {
+    'latency_ms': 'd',
+    'packet_loss_percent': 'd',
+    'jitter_ms': 'd',
+    'bandwidth_utilization': 'd',
+    'cost': 'q',
+    'timestamp': 'd',
+}
+
+# Colonnes de l'historique des coûts calculés (CostCalculator)
+COST_COLUMNS: Dict[str, str] = {
+    'cost': 'q',
+    'timestamp': 'd',
+}
+
+
+class RingBuffer:
+    """
+    Tampon circulaire de capacité fixe, une colonne array par métrique
+
+    Chaque valeur est écrite deux fois (position i et i + capacité): les N
+    dernières valeurs occupent toujours une plage contiguë, renvoyée par
+    window() comme une tranche de memoryview, dans l'ordre chronologique.
+    Une vue reflète le tampon en place: elle est à consommer avant les
+    ajouts suivants
+    """
+
+    def __init__(self, capacity: int, columns: Dict[str, str] = None):
+        """
+        Args:
+            capacity: Nombre max de valeurs conservées par colonne
+            columns: Dict {colonne: code de type array} (LINK_COLUMNS par défaut)
+        """
+        if capacity < 1:
+            raise ValueError(f"Capacité invalide: {capacity}")
+        self.capacity = capacity
+        self.columns = dict(columns or LINK_COLUMNS)
+        self._arrays = {name: array(code, [0]) * (2 * capacity)
+                        for name, code in self.columns.items()}
+        self._views = {name: memoryview(data).toreadonly() for name, data in self._arrays.items()}
+        self._next = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append(self, **values):
+        """Ajoute une ligne (colonnes absentes = 0), écrase la plus ancienne si plein"""
+        position = self._next
+        mirror = position + self.capacity
+        for name, data in self._arrays.items():
+            value = values.get(name, 0)
+            data[position] = value
+            data[mirror] = value
+        self._next = (position + 1) % self.capacity
+        if self._count < self.capacity:
+            self._count += 1
+
+    def window(self, column: str, n: int = None) -> memoryview:
+        """
+        Vue des n dernières valeurs d'une colonne (toutes par défaut), sans copie
+
+        Raises:
+            KeyError: Colonne inconnue
+        """
+        n = self._count if n is None else max(0, min(n, self._count))
+        end = self._next + self.capacity
+        return self._views[column][end - n:end]
+
+    def latest(self, column: str):
+        """Dernière valeur d'une colonne, None si le tampon est vide"""
+        if not self._count:
+            return None
+        return self._arrays[column][self._next + self.capacity - 1]
+
+    def rows(self, n: int = None) -> Iterator[Tuple]:
+        """Lignes des n dernières entrées, dans l'ordre des colonnes"""
+        return zip(*(self.window(name, n) for name in self.columns))
+
+    def clear(self):
+        self._next = 0
+        self._count = 0
@@ -0,0 +1,145 @@
+"""
+Statistiques glissantes incrémentales par lien
+Mises à jour à chaque mesure en O(1): moyenne et écart type sur les N
+dernières mesures (Welford avec retrait de la valeur sortante), moyenne
+mobile exponentielle à demi-vie en secondes, et moyenne/écart type depuis
+le démarrage (Welford). Les lectures sont en O(1)
+"""
+
+import math
+from array import array
+from typing import Dict, Optional, Tuple
+
+# Métriques suivies pour chaque lien (champs de LinkMetrics)
+TRACKED_METRICS = ('latency_ms', 'packet_loss_percent', 'jitter_ms', 'bandwidth_utilization')
+
+
+class MetricStats:
+    """Agrégats incrémentaux d'une métrique"""
+
+    __slots__ = ('window', 'half_life', '_values', '_next', 'count', 'window_mean', '_window_m2',
+                 'total', 'total_mean', '_total_m2', 'ewma', '_ewm_var', 'last', 'last_timestamp')
+
+    def __init__(self, window: int, half_life: float):
+        """
+        Args:
+            window: Nombre de mesures de la fenêtre glissante
+            half_life: Demi-vie de la moyenne exponentielle (secondes)
+        """
+        self.window = window
+        self.half_life = half_life
+        self._values = array('d', [0.0]) * window
+        self._next = 0
+        self.count = 0
+        self.window_mean = 0.0
+        self._window_m2 = 0.0
+        self.total = 0
+        self.total_mean = 0.0
+        self._total_m2 = 0.0
+        self.ewma: Optional[float] = None
+        self._ewm_var = 0.0
+        self.last = 0.0
+        self.last_timestamp: Optional[float] = None
+
+    def update(self, value: float, timestamp: float):
+        """Intègre une mesure"""
+        # Fenêtre glissante: retrait de la valeur la plus ancienne puis ajout (Welford)
+        if self.count == self.window:
+            old = self._values[self._next]
+            self.count -= 1
+            if self.count:
+                delta = old - self.window_mean
+                self.window_mean -= delta / self.count
+                self._window_m2 -= delta * (old - self.window_mean)
+            else:
+                self.window_mean = self._window_m2 = 0.0
+        self._values[self._next] = value
+        self._next = (self._next + 1) % self.window
+        self.count += 1
+        delta = value - self.window_mean
+        self.window_mean += delta / self.count
+        self._window_m2 = max(0.0, self._window_m2 + delta * (value - self.window_mean))
+
+        # Depuis le démarrage (Welford)
+        self.total += 1
+        delta = value - self.total_mean
+        self.total_mean += delta / self.total
+        self._total_m2 += delta * (value - self.total_mean)
+
+        # Moyenne exponentielle: poids d'une mesure divisé par 2 toutes les half_life secondes
+        if self.ewma is None:
+            self.ewma = value
+        else:
+            elapsed = max(0.0, timestamp - self.last_timestamp)
+            alpha = 1.0 - 0.5 ** (elapsed / self.half_life) if self.half_life > 0 else 1.0
+            delta = value - self.ewma
+            self.ewma += alpha * delta
+            self._ewm_var = (1.0 - alpha) * (self._ewm_var + alpha * delta * delta)
+        self.last = value
+        self.last_timestamp = timestamp
+
+    @property
+    def window_std(self) -> float:
+        return math.sqrt(self._window_m2 / self.count) if self.count else 0.0
+
+    @property
+    def total_std(self) -> float:
+        return math.sqrt(self._total_m2 / self.total) if self.total else 0.0
+
+    @property
+    def ewm_std(self) -> float:
+        return math.sqrt(self._ewm_var)
+
+    def value(self, mode: str) -> float:
+        """Valeur selon le mode: 'raw' (dernière mesure), 'window' ou 'ewma'"""
+        if mode == 'window':
+            return self.window_mean
+        if mode == 'ewma':
+            return self.ewma if self.ewma is not None else self.last
+        return self.last
+
+
+class LinkRollingStats:
+    """Agrégats incrémentaux de toutes les métriques suivies d'un lien"""
+
+    __slots__ = ('metrics',)
+
+    def __init__(self, window: int = 10, half_life: float = 60.0):
+        self.metrics: Dict[str, MetricStats] = {
+            name: MetricStats(window, half_life) for name in TRACKED_METRICS
+        }
+
+    def update(self, timestamp: float, latency_ms: float, packet_loss_percent: float,
+               jitter_ms: float, bandwidth_utilization: float):
+        """Intègre une mesure du lien"""
+        metrics = self.metrics
+        metrics['latency_ms'].update(latency_ms, timestamp)
+        metrics['packet_loss_percent'].update(packet_loss_percent, timestamp)
+        metrics['jitter_ms'].update(jitter_ms, timestamp)
+        metrics['bandwidth_utilization'].update(bandwidth_utilization, timestamp)
+
+    @property
+    def count(self) -> int:
+        """Mesures dans la fenêtre glissante"""
+        return self.metrics['latency_ms'].count
+
+    def values(self, mode: str) -> Tuple[float, float, float, float]:
+        """(utilisation, latence, perte, gigue) selon le mode ('raw', 'window', 'ewma')"""
+        metrics = self.metrics
+        return (metrics['bandwidth_utilization'].value(mode), metrics['latency_ms'].value(mode),
+                metrics['packet_loss_percent'].value(mode), metrics['jitter_ms'].value(mode))
+
+    def summary(self) -> Dict:
+        """Moyennes et écarts types de chaque métrique"""
+        return {
+            name: {
+                'last': stats.last,
+                'window_mean': round(stats.window_mean, 3),
+                'window_std': round(stats.window_std, 3),
+                'ewma': round(stats.value('ewma'), 3),
+                'ewm_std': round(stats.ewm_std, 3),
+                'mean': round(stats.total_mean, 3),
+                'std': round(stats.total_std, 3),
+            }
+            for name, stats in self.metrics.items()
+        }
@@ -6,15 +6,213 @@ Supporte les conteneurs Docker FRR dans GNS3
 import subprocess
 import time
 import re
+import queue
 from typing import Dict, Optional, List
 from dataclasses import dataclass
+import threading
 import logging
 
+from .shell_session import DockerShellSession
+from .docker_api import DockerAPIError, DEFAULT_SOCKET, get_client
+from .ssh_pool import SSHConnectionPool
+from .frr_state import (
+    STATE_COMMANDS, RouterState, parse_router_state, parse_ospf_interfaces, split_json_documents
+)
+from .netns_counters import HostCounterReader, resolve_container_pid
+from .cost_cache import OSPFCostCache
+
 # Configuration du logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+# Sections du snapshot routeur: (nom, commande shell)
+# Une seule exécution par routeur et par cycle, sorties séparées par SNAPSHOT_MARKER
+SNAPSHOT_MARKER = '@@SNAPSHOT:'
+SNAPSHOT_SECTIONS = [
+    ('proc_net_dev', 'cat /proc/net/dev'),
+    ('ip_link', 'ip -o link show'),
+    ('ip_addr', 'ip -o -4 addr show'),
+    ('frr_state', 'vtysh ' + ' '.join(f'-c "{cmd}"' for cmd in STATE_COMMANDS)),
+]
+SNAPSHOT_COMMAND = '; '.join(
+    f"echo '{SNAPSHOT_MARKER}{name}'; {command} 2>/dev/null"
+    for name, command in SNAPSHOT_SECTIONS
+)
+
+
+def parse_proc_net_dev(output: str) -> Dict[str, Dict]:
+    """
+    Parse le contenu de /proc/net/dev
+    
+    Format: iface: rx_bytes rx_packets rx_errs rx_drop ... tx_bytes tx_packets tx_errs tx_drop ...
+    
+    Returns:
+        Dict {interface: {rx_bytes, tx_bytes, rx_packets, ...}}
+    """
+    traffic = {}
+    for line in output.splitlines():
+        if ':' not in line:
+            continue
+        name, _, counters = line.partition(':')
+        parts = counters.split()
+        if len(parts) < 16:
+            continue
+        try:
+            traffic[name.strip()] = {
+                'rx_bytes': int(parts[0]),
+                'rx_packets': int(parts[1]),
+                'rx_errors': int(parts[2]),
+                'rx_dropped': int(parts[3]),
+                'tx_bytes': int(parts[8]),
+                'tx_packets': int(parts[9]),
+                'tx_errors': int(parts[10]),
+                'tx_dropped': int(parts[11])
+            }
+        except ValueError as e:
+            logger.error(f"Erreur parsing traffic stats: {e}")
+    return traffic
+
+
+def parse_router_snapshot(output: str) -> Dict:
+    """
+    Parse la sortie de SNAPSHOT_COMMAND
+    
+    Returns:
+        Dict avec timestamp, traffic, link_state, addresses et ospf_costs
+        (indexés par nom d'interface) et state (RouterState ou None)
+    """
+    sections: Dict[str, List[str]] = {}
+    current = None
+    for line in output.splitlines():
+        if line.startswith(SNAPSHOT_MARKER):
+            current = line[len(SNAPSHOT_MARKER):].strip()
+            sections[current] = []
+        elif current is not None:
+            sections[current].append(line)
+            
+    # ip -o link show: "3: eth1@if4: <...> mtu 1500 ... state UP mode DEFAULT ..."
+    link_state = {}
+    for line in sections.get('ip_link', []):
+        parts = line.split(': ', 2)
+        if len(parts) < 3:
+            continue
+        state_match = re.search(r'state (\S+)', parts[2])
+        link_state[parts[1].split('@')[0]] = state_match.group(1) if state_match else 'UNKNOWN'
+        
+    # ip -o -4 addr show: "3: eth1    inet 10.0.0.1/30 brd 10.0.0.3 scope global eth1"
+    addresses = {}
+    for line in sections.get('ip_addr', []):
+        parts = line.split()
+        if len(parts) >= 4 and parts[2] == 'inet':
+            addresses.setdefault(parts[1], parts[3].split('/')[0])
+            
+    # Sortie JSON de vtysh: interfaces OSPF, voisins et interfaces zebra
+    state = parse_router_state('\n'.join(sections.get('frr_state', [])))
+    
+    return {
+        'timestamp': time.time(),
+        'traffic': parse_proc_net_dev('\n'.join(sections.get('proc_net_dev', []))),
+        'link_state': link_state,
+        'addresses': addresses,
+        'ospf_costs': state.ospf_costs() if state else {},
+        'state': state
+    }
+
+
+def build_ping_command(dest_ip: str, count: int = 5, interval: float = None,
+                       deadline: int = None) -> str:
+    """Construit la commande ping (-i intervalle entre paquets, -w durée max)"""
+    cmd = f"ping -c {count} -W 2"
+    if interval:
+        cmd += f" -i {interval:g}"
+    if deadline:
+        cmd += f" -w {int(deadline)}"
+    return f"{cmd} {dest_ip}"
+
+
+# Sonde multi-cibles: un script par routeur lance un ping par voisin en parallèle
+# dans le conteneur, puis restitue chaque sortie précédée de PROBE_MARKER<ip>
+PROBE_MARKER = '@@PROBE:'
+
+
+def build_multi_ping_command(dest_ips: List[str], count: int = 5, interval: float = None,
+                             deadline: int = None) -> str:
+    """Construit le script de sonde multi-cibles (une seule exécution par routeur)"""
+    ips = ' '.join(dest_ips)
+    ping = build_ping_command('"$ip"', count, interval, deadline)
+    return (
+        f'd=$(mktemp -d); '
+        f'for ip in {ips}; do {ping} > "$d/$ip" 2>&1 & done; wait; '
+        f"for ip in {ips}; do echo '{PROBE_MARKER}'\"$ip\"; cat \"$d/$ip\"; done; "
+        f'rm -rf "$d"'
+    )
+
+
+def parse_multi_ping_output(output: str) -> Dict[str, str]:
+    """
+    Parse la sortie du script de sonde multi-cibles
+    
+    Returns:
+        Dict {ip: sortie ping}
+    """
+    outputs: Dict[str, List[str]] = {}
+    current = None
+    for line in output.splitlines():
+        if line.startswith(PROBE_MARKER):
+            current = line[len(PROBE_MARKER):].strip()
+            outputs[current] = []
+        elif current is not None:
+            outputs[current].append(line)
+    return {ip: '\n'.join(lines) for ip, lines in outputs.items()}
+
+
+# Application groupée des coûts: une session 'configure terminal' par routeur,
+# suivie dans la même exécution d'une relecture des coûts (après COST_MARKER)
+COST_MARKER = '@@COSTS:'
+
+
+def build_cost_batch_command(changes: Dict[str, int]) -> str:
+    """Construit la commande appliquant tous les coûts d'un routeur puis les relisant"""
+    commands = ['configure terminal']
+    for interface, cost in changes.items():
+        commands += [f'interface {interface}', f'ip ospf cost {cost}', 'exit']
+    commands.append('end')
+    apply_cmd = 'vtysh ' + ' '.join(f'-c "{cmd}"' for cmd in commands)
+    return f"{apply_cmd}; echo '{COST_MARKER}'$?; vtysh -c \"show ip ospf interface json\""
+
+
+def parse_cost_batch_output(output: Optional[str], changes: Dict[str, int]) -> Dict[str, bool]:
+    """
+    Détermine le succès de chaque interface d'un lot de coûts
+    
+    Une interface est réussie si le coût relu est celui demandé. Sans relecture
+    exploitable, le code de retour de vtysh fait foi pour tout le lot.
+    
+    Returns:
+        Dict {interface: succès}
+    """
+    if not output or COST_MARKER not in output:
+        return {interface: False for interface in changes}
+        
+    _, _, tail = output.partition(COST_MARKER)
+    status, _, readback = tail.partition('\n')
+    documents = split_json_documents(readback)
+    if documents:
+        costs = {name: iface.cost for name, iface in parse_ospf_interfaces(documents[0]).items()}
+        return {interface: costs.get(interface) == cost for interface, cost in changes.items()}
+        
+    applied = status.strip() == '0'
+    return {interface: applied for interface in changes}
+
+
+def ping_timeout(count: int = 5, interval: float = None, deadline: int = None) -> float:
+    """Timeout d'exécution couvrant le ping complet (count paquets, -W 2 par paquet)"""
+    if deadline:
+        return deadline + 2
+    return count * max(interval or 1.0, 2.0) + 5
+
+
 @dataclass
 class RouterCredentials:
     """Informations de connexion pour un routeur FRR"""
@@ -26,10 +224,56 @@ class RouterCredentials:
     port: int = 22
 
 
+# Première ligne d'un flux: PID des processus à arrêter dans le conteneur à sa fermeture
+# (l'arrêt du client docker exec ne termine pas les commandes du conteneur)
+STREAM_PIDS_MARKER = '@@PIDS:'
+
+
+class CommandStream:
+    """
+    Sortie ligne à ligne d'une commande longue (docker exec) dans un conteneur
+    L'itération se termine quand la commande s'arrête ou que le flux est fermé.
+    Si la commande annonce ses processus (ligne STREAM_PIDS_MARKER), ils sont
+    arrêtés dans le conteneur à la fermeture
+    """
+    
+    def __init__(self, process: subprocess.Popen, container: str = None):
+        self.process = process
+        self.container = container
+        self.pids: List[str] = []
+        
+    def __iter__(self):
+        for line in self.process.stdout:
+            line = line.rstrip('\n')
+            if line.startswith(STREAM_PIDS_MARKER):
+                self.pids = [pid for pid in line[len(STREAM_PIDS_MARKER):].split() if pid.isdigit()]
+                continue
+            yield line
+            
+    def close(self):
+        """Arrête les processus annoncés dans le conteneur puis le client docker exec"""
+        if self.pids and self.container:
+            pids, self.pids = self.pids, []
+            try:
+                subprocess.run(['docker', 'exec', self.container, 'kill', '-TERM', *pids],
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=5)
+            except (subprocess.TimeoutExpired, OSError) as e:
+                logger.warning(f"Arrêt du flux impossible dans {self.container}: {e}")
+        if self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=2)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+        if self.process.stdout:
+            self.process.stdout.close()
+
+
 class FRRRouterConnection:
     """
     Gestionnaire de connexions vers les routeurs FRRouting
-    Supporte docker exec (recommandé pour GNS3) et SSH
+    Supporte docker exec (recommandé pour GNS3), des sessions shell
+    persistantes (docker_session), l'API Docker Engine (docker_api) et SSH
     """
     
     def __init__(self, global_config: Dict):
@@ -45,8 +289,37 @@ class FRRRouterConnection:
         # Cache des routeurs configurés
         self.routers: Dict[str, RouterCredentials] = {}
         
-        # Pour SSH (optionnel)
-        self.ssh_connections = {}
+        # Pour SSH (optionnel): sessions multiplexées partagées par routeur
+        ssh_pool_config = global_config.get('ssh_pool', {}) or {}
+        self.ssh_pool = SSHConnectionPool(
+            max_channels=ssh_pool_config.get('max_channels', 4),
+            keepalive=ssh_pool_config.get('keepalive', 30),
+            idle_timeout=ssh_pool_config.get('idle_timeout', 300),
+            timeout=self.timeout
+        )
+        
+        # Pour docker_session: un shell persistant par routeur
+        self.sessions: Dict[str, DockerShellSession] = {}
+        self._sessions_lock = threading.Lock()
+        
+        # Pour docker_api: client partagé (pool de connexions sur le socket Docker)
+        self.docker_socket = global_config.get('docker_socket', DEFAULT_SOCKET)
+        self.docker_api_pool_size = global_config.get('docker_api_pool_size', 8)
+        
+        # Compteurs d'interface lus depuis l'hôte (/proc/<pid>/net/dev), sans exec
+        self.host_counters = None
+        if global_config.get('host_counters', False) and self.connection_method != 'ssh':
+            self.host_counters = HostCounterReader(
+                parse_proc_net_dev,
+                resolver=lambda container: resolve_container_pid(container, self.docker_socket)
+            )
+            
+        # Cache write-through des coûts OSPF, réconcilié périodiquement
+        cost_cache_config = global_config.get('cost_cache', {}) or {}
+        self.cost_cache = OSPFCostCache(
+            reconcile_every=cost_cache_config.get('reconcile_every', 10),
+            enabled=cost_cache_config.get('enabled', False)
+        )
         
     def add_router(self, name: str, config: Dict):
         """
@@ -60,7 +333,8 @@ class FRRRouterConnection:
             hostname=config.get('hostname', name),
             container_name=config.get('container_name', name),
             username=config.get('username', self.default_username),
-            password=config.get('password', self.default_password)
+            password=config.get('password', self.default_password),
+            port=config.get('port', 22)
         )
         logger.debug(f"Routeur {name} ajouté (container: {config.get('container_name', name)})")
         
@@ -83,23 +357,28 @@ class FRRRouterConnection:
             # Vérifier que le conteneur répond
             result = self._docker_exec(router_name, "echo ok", timeout=5)
             return result is not None and "ok" in result
+        elif self.connection_method == 'docker_session':
+            result = self._session_exec(router_name, "echo ok", timeout=5)
+            return result is not None and "ok" in result
+        elif self.connection_method == 'docker_api':
+            result = self._api_exec(router_name, "echo ok", timeout=5)
+            return result is not None and "ok" in result
         else:
-            # SSH - à implémenter si nécessaire
             return self._ssh_connect(router_name)
             
     def disconnect(self, router_name: str):
-        """Ferme la connexion à un routeur (principalement pour SSH)"""
-        if router_name in self.ssh_connections:
-            try:
-                self.ssh_connections[router_name].disconnect()
-            except:
-                pass
-            del self.ssh_connections[router_name]
+        """Ferme la connexion à un routeur (SSH ou session shell)"""
+        session = self.sessions.pop(router_name, None)
+        if session:
+            session.close()
+            
+        self.ssh_pool.close(router_name)
             
     def disconnect_all(self):
-        """Ferme toutes les connexions SSH"""
-        for router_name in list(self.ssh_connections.keys()):
+        """Ferme toutes les connexions SSH et sessions shell"""
+        for router_name in list(self.sessions.keys()):
             self.disconnect(router_name)
+        self.ssh_pool.close_all()
             
     def _docker_exec(self, router_name: str, command: str, timeout: int = None) -> Optional[str]:
         """
@@ -145,48 +424,188 @@ class FRRRouterConnection:
             logger.error(f"Erreur docker exec sur {router_name}: {e}")
             return None
             
-    def _ssh_connect(self, router_name: str) -> bool:
-        """Connexion SSH (fallback si docker exec non disponible)"""
+    def _session_exec(self, router_name: str, command: str, timeout: int = None) -> Optional[str]:
+        """
+        Exécute une commande dans la session shell persistante du routeur
+        La session est créée au premier appel et relancée si elle meurt
+        
+        Args:
+            router_name: Nom du routeur
+            command: Commande à exécuter
+            timeout: Timeout en secondes
+            
+        Returns:
+            Sortie de la commande ou None en cas d'erreur
+        """
+        if router_name not in self.routers:
+            return None
+            
+        with self._sessions_lock:
+            session = self.sessions.get(router_name)
+            if session is None:
+                session = DockerShellSession(self.routers[router_name].container_name, self.timeout)
+                self.sessions[router_name] = session
+                
+        result = session.run(command, timeout or self.timeout)
+        if result is None:
+            return None
+            
+        return_code, output = result
+        if return_code != 0:
+            logger.warning(f"Commande échouée sur {router_name} (code {return_code})")
+            
+        return output
+        
+    def _api_exec(self, router_name: str, command: str, timeout: int = None) -> Optional[str]:
+        """
+        Exécute une commande via l'API Docker Engine (socket unix, sans binaire docker)
+        
+        Args:
+            router_name: Nom du routeur
+            command: Commande à exécuter
+            timeout: Timeout en secondes
+            
+        Returns:
+            Sortie de la commande ou None en cas d'erreur
+        """
+        if router_name not in self.routers:
+            return None
+            
+        client = get_client(self.docker_socket, self.docker_api_pool_size, self.timeout)
+        container = self.routers[router_name].container_name
+        
         try:
-            from netmiko import ConnectHandler
-            
-            creds = self.routers[router_name]
-            device_params = {
-                'device_type': 'linux',
-                'host': creds.hostname,
-                'username': creds.username,
-                'password': creds.password,
-                'port': creds.port,
-                'timeout': self.timeout,
-            }
+            return_code, stdout, stderr = client.exec_run(
+                container, ['sh', '-c', command], timeout or self.timeout
+            )
+        except DockerAPIError as e:
+            logger.error(f"Erreur API Docker sur {router_name}: {e}")
+            return None
             
-            connection = ConnectHandler(**device_params)
-            self.ssh_connections[router_name] = connection
-            return True
+        if return_code != 0:
+            logger.warning(f"Commande échouée sur {router_name}: {stderr}")
             
+        return stdout
+        
+    def _ssh_connect(self, router_name: str) -> bool:
+        """Ouvre (ou vérifie) la session SSH partagée d'un routeur"""
+        try:
+            self.ssh_pool.get_session(router_name, self.routers[router_name])
+            return True
         except Exception as e:
             logger.error(f"Erreur SSH vers {router_name}: {e}")
             return False
             
-    def execute_command(self, router_name: str, command: str) -> Optional[str]:
+    def _ssh_exec(self, router_name: str, command: str, timeout: int = None) -> Optional[str]:
+        """
+        Exécute une commande sur un canal de la session SSH partagée du routeur
+        
+        Returns:
+            Sortie de la commande ou None en cas d'erreur
+        """
+        if router_name not in self.routers:
+            return None
+            
+        result = self.ssh_pool.execute(router_name, self.routers[router_name], command, timeout)
+        if result is None:
+            return None
+            
+        return_code, stdout, stderr = result
+        if return_code != 0:
+            logger.warning(f"Commande échouée sur {router_name}: {stderr}")
+            
+        return stdout
+        
+    def execute_command(self, router_name: str, command: str, timeout: int = None) -> Optional[str]:
         """
         Exécute une commande sur un routeur FRR
         
         Args:
             router_name: Nom du routeur
             command: Commande à exécuter (shell ou vtysh)
+            timeout: Timeout en secondes (global.timeout par défaut)
             
         Returns:
             Sortie de la commande ou None en cas d'erreur
         """
         if self.connection_method == 'docker_exec':
-            return self._docker_exec(router_name, command)
+            return self._docker_exec(router_name, command, timeout)
+        elif self.connection_method == 'docker_session':
+            return self._session_exec(router_name, command, timeout)
+        elif self.connection_method == 'docker_api':
+            return self._api_exec(router_name, command, timeout)
         else:
-            if router_name not in self.ssh_connections:
-                if not self._ssh_connect(router_name):
-                    return None
-            return self.ssh_connections[router_name].send_command(command)
+            return self._ssh_exec(router_name, command, timeout)
+            
+    def open_stream(self, router_name: str, command: str) -> Optional[CommandStream]:
+        """
+        Lance une commande longue dans le conteneur d'un routeur et renvoie sa
+        sortie ligne à ligne (docker exec, quelle que soit la méthode de connexion
+        des commandes courtes; non disponible en ssh)
+        
+        Returns:
+            CommandStream ou None en cas d'erreur
+        """
+        if router_name not in self.routers:
+            return None
+        if self.connection_method == 'ssh':
+            logger.warning(f"Flux d'événements non disponible en ssh ({router_name})")
+            return None
+            
+        container = self.routers[router_name].container_name
+        try:
+            process = subprocess.Popen(
+                ['docker', 'exec', container, 'sh', '-c', command],
+                stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, bufsize=1
+            )
+        except (FileNotFoundError, OSError) as e:
+            logger.error(f"Flux d'événements impossible sur {router_name}: {e}")
+            return None
+        return CommandStream(process, container)
+        
+    def get_pool_stats(self) -> Dict:
+        """Statistiques des connexions réutilisées selon la méthode de connexion"""
+        if self.connection_method == 'ssh':
+            return self.ssh_pool.get_stats()
+        elif self.connection_method == 'docker_api':
+            return get_client(self.docker_socket, self.docker_api_pool_size, self.timeout).get_stats()
+        elif self.connection_method == 'docker_session':
+            return {
+                name: {'alive': session.is_alive(), 'spawns': session.spawn_count}
+                for name, session in self.sessions.items()
+            }
+        return {}
+        
+    def begin_cycle(self):
+        """Début d'un cycle: déclenche la réconciliation du cache des coûts si due"""
+        if self.cost_cache.next_cycle():
+            logger.info("Réconciliation des coûts OSPF: relecture sur les routeurs")
             
+    def observe_neighbors(self, router_name: str, neighbors) -> bool:
+        """Signale les voisins OSPF vus sur un routeur (réconciliation si changement)"""
+        return self.cost_cache.observe_neighbors(router_name, neighbors)
+        
+    def invalidate_costs(self, router_name: str):
+        """Marque les coûts en cache d'un routeur comme à relire (événement d'adjacence)"""
+        self.cost_cache.invalidate(router_name)
+        
+    def _observe_state(self, router_name: str, state: Optional[RouterState]):
+        """Alimente le cache des coûts avec un état JSON fraîchement relu"""
+        if state is None:
+            return
+        self.cost_cache.observe_neighbors(router_name, state.neighbors)
+        self.cost_cache.store_router(router_name, state.ospf_costs())
+        
+    def get_cost_cache_stats(self) -> Dict:
+        """Compteurs du cache des coûts OSPF (hits, misses, réconciliations...)"""
+        return self.cost_cache.get_stats()
+        
+    def get_counter_stats(self) -> Dict:
+        """Statistiques de lecture des compteurs depuis l'hôte (vide si désactivée)"""
+        if self.host_counters is None:
+            return {}
+        return {**self.host_counters.stats, 'exec_only': sorted(self.host_counters.exec_only)}
+        
     def execute_vtysh(self, router_name: str, commands: List[str]) -> Optional[str]:
         """
         Exécute des commandes vtysh sur un routeur FRR
@@ -234,36 +653,88 @@ class FRRRouterConnection:
         Returns:
             Dict avec rx_bytes, tx_bytes, rx_packets, tx_packets, etc.
         """
+        if self.host_counters is not None and router_name in self.routers:
+            counters = self.host_counters.read(self.routers[router_name].container_name)
+            if counters is not None:
+                return counters.get(interface, {})
+                
         cmd = f"cat /proc/net/dev | grep {interface}"
         output = self.execute_command(router_name, cmd)
         
         if not output:
             return {}
             
-        # Parser la sortie de /proc/net/dev
-        # Format: iface: rx_bytes rx_packets rx_errs rx_drop ... tx_bytes tx_packets tx_errs tx_drop ...
-        try:
-            parts = output.split()
-            if len(parts) >= 17:
-                return {
-                    'rx_bytes': int(parts[1]),
-                    'rx_packets': int(parts[2]),
-                    'rx_errors': int(parts[3]),
-                    'rx_dropped': int(parts[4]),
-                    'tx_bytes': int(parts[9]),
-                    'tx_packets': int(parts[10]),
-                    'tx_errors': int(parts[11]),
-                    'tx_dropped': int(parts[12])
-                }
-        except (IndexError, ValueError) as e:
-            logger.error(f"Erreur parsing traffic stats: {e}")
+        return parse_proc_net_dev(output).get(interface, {})
+        
+    def get_router_snapshot(self, router_name: str) -> Optional[Dict]:
+        """
+        Récupère en une seule exécution les compteurs de toutes les interfaces,
+        leur état, leurs adresses et la table des interfaces OSPF
+        
+        Returns:
+            Snapshot parsé (voir parse_router_snapshot) ou None en cas d'erreur
+        """
+        output = self.execute_command(router_name, SNAPSHOT_COMMAND)
+        
+        if not output:
+            return None
             
-        return {}
+        snapshot = parse_router_snapshot(output)
+        self._observe_state(router_name, snapshot['state'])
+        return snapshot
         
-    def ping(self, router_name: str, dest_ip: str, count: int = 5) -> Optional[str]:
-        """Exécute un ping depuis un routeur"""
-        cmd = f"ping -c {count} -W 2 {dest_ip}"
-        return self.execute_command(router_name, cmd)
+    def get_router_state(self, router_name: str) -> Optional[RouterState]:
+        """
+        Récupère l'état OSPF et interfaces d'un routeur via la sortie JSON de vtysh
+        (interfaces OSPF, voisins, interfaces zebra) en une seule invocation
+        
+        Returns:
+            RouterState ou None en cas d'erreur
+        """
+        output = self.execute_vtysh(router_name, STATE_COMMANDS)
+        
+        if not output:
+            return None
+            
+        state = parse_router_state(output)
+        self._observe_state(router_name, state)
+        return state
+        
+    def ping(self, router_name: str, dest_ip: str, count: int = 5,
+             interval: float = None, deadline: int = None) -> Optional[str]:
+        """
+        Exécute un ping depuis un routeur
+        
+        Args:
+            router_name: Routeur source
+            dest_ip: IP de destination
+            count: Nombre de paquets
+            interval: Intervalle entre paquets en secondes (ping -i)
+            deadline: Durée max du ping en secondes (ping -w)
+        """
+        return self.execute_command(
+            router_name, build_ping_command(dest_ip, count, interval, deadline),
+            timeout=ping_timeout(count, interval, deadline)
+        )
+        
+    def ping_many(self, router_name: str, dest_ips: List[str], count: int = 5,
+                  interval: float = None, deadline: int = None) -> Dict[str, str]:
+        """
+        Ping de plusieurs destinations en parallèle depuis un routeur,
+        en une seule exécution (voir build_multi_ping_command)
+        
+        Returns:
+            Dict {ip: sortie ping}, vide en cas d'erreur
+        """
+        output = self.execute_command(
+            router_name, build_multi_ping_command(dest_ips, count, interval, deadline),
+            timeout=ping_timeout(count, interval, deadline)
+        )
+        
+        if not output:
+            return {}
+            
+        return parse_multi_ping_output(output)
         
     def set_ospf_cost(self, router_name: str, interface: str, cost: int) -> bool:
         """
@@ -288,15 +759,43 @@ class FRRRouterConnection:
         result = self.execute_vtysh(router_name, commands)
         
         if result is not None:
+            self.cost_cache.set(router_name, interface, cost)
             logger.info(f"✓ Coût OSPF de {interface} sur {router_name} modifié à {cost}")
             return True
         else:
             logger.error(f"✗ Échec modification coût OSPF sur {router_name}.{interface}")
             return False
             
+    def set_ospf_costs(self, router_name: str, changes: Dict[str, int]) -> Dict[str, bool]:
+        """
+        Modifie les coûts OSPF de plusieurs interfaces d'un routeur en une seule
+        session 'configure terminal' (un seul recalcul SPF), puis les relit
+        
+        Args:
+            router_name: Nom du routeur
+            changes: Dict {interface: nouveau coût}
+            
+        Returns:
+            Dict {interface: succès}
+        """
+        output = self.execute_command(router_name, build_cost_batch_command(changes))
+        outcomes = parse_cost_batch_output(output, changes)
+        
+        for interface, success in outcomes.items():
+            if success:
+                self.cost_cache.set(router_name, interface, changes[interface])
+                
+        applied = sum(outcomes.values())
+        if applied == len(changes):
+            logger.info(f"✓ {applied} coûts OSPF modifiés sur {router_name} en une session")
+        else:
+            logger.error(f"✗ {len(changes) - applied}/{len(changes)} coûts OSPF non appliqués sur {router_name}")
+        return outcomes
+        
     def get_ospf_cost(self, router_name: str, interface: str) -> int:
         """
         Récupère le coût OSPF actuel d'une interface
+        Servi depuis le cache des coûts, relu sur le routeur en cas d'absence
         
         Args:
             router_name: Nom du routeur
@@ -305,6 +804,10 @@ class FRRRouterConnection:
         Returns:
             Coût OSPF actuel ou 0 si non trouvé
         """
+        cached = self.cost_cache.get(router_name, interface)
+        if cached is not None:
+            return cached
+            
         output = self.get_ospf_interface(router_name, interface)
         
         if not output:
@@ -314,7 +817,9 @@ class FRRRouterConnection:
         # Format FRR: "Cost: 10"
         cost_match = re.search(r'Cost:\s*(\d+)', output)
         if cost_match:
-            return int(cost_match.group(1))
+            cost = int(cost_match.group(1))
+            self.cost_cache.store(router_name, interface, cost)
+            return cost
             
         return 0
         
@@ -334,6 +839,29 @@ class FRRRouterConnection:
         return False
 
 
+class MockEventStream:
+    """
+    Flux d'événements simulé: les lignes sont injectées par push()
+    (mêmes formats que ip monitor link et les journaux FRR)
+    """
+    
+    def __init__(self):
+        self.lines: queue.Queue = queue.Queue()
+        
+    def push(self, line: str):
+        self.lines.put(line)
+        
+    def __iter__(self):
+        while True:
+            line = self.lines.get()
+            if line is None:
+                return
+            yield line
+            
+    def close(self):
+        self.lines.put(None)
+
+
 class MockFRRConnection:
     """
     Connexion simulée pour les tests sans routeurs réels
@@ -344,6 +872,7 @@ class MockFRRConnection:
         self.routers = {}
         self.interface_stats = {}
         self.ospf_costs = {}
+        self.event_streams: Dict[str, MockEventStream] = {}
         self._init_mock_data()
         
     def _init_mock_data(self):
@@ -375,11 +904,39 @@ class MockFRRConnection:
     def disconnect_all(self):
         pass
         
-    def execute_command(self, router_name: str, command: str) -> Optional[str]:
+    def get_pool_stats(self) -> Dict:
+        return {}
+        
+    def open_stream(self, router_name: str, command: str) -> Optional[MockEventStream]:
+        if router_name not in self.routers:
+            return None
+        self.event_streams[router_name] = MockEventStream()
+        return self.event_streams[router_name]
+        
+    def get_counter_stats(self) -> Dict:
+        return {}
+        
+    def begin_cycle(self):
+        pass
+        
+    def observe_neighbors(self, router_name: str, neighbors) -> bool:
+        return False
+        
+    def invalidate_costs(self, router_name: str):
+        pass
+        
+    def get_cost_cache_stats(self) -> Dict:
+        return {}
+        
+    def execute_command(self, router_name: str, command: str, timeout: int = None) -> Optional[str]:
         """Retourne des données simulées selon la commande"""
         import random
         
-        if 'ip -s link show' in command:
+        if SNAPSHOT_MARKER in command:
+            return self._mock_snapshot(router_name)
+        elif PROBE_MARKER in command:
+            return self._mock_multi_ping(command)
+        elif 'ip -s link show' in command:
             return self._mock_interface_stats(command)
         elif 'proc/net/dev' in command:
             return self._mock_proc_net_dev(command)
@@ -398,7 +955,9 @@ class MockFRRConnection:
         """Simule l'exécution vtysh"""
         cmd_str = ' '.join(commands)
         
-        if 'show ip ospf neighbor' in cmd_str:
+        if 'json' in cmd_str:
+            return self._mock_state_json(router_name)
+        elif 'show ip ospf neighbor' in cmd_str:
             return self._mock_ospf_neighbor()
         elif 'show ip ospf interface' in cmd_str:
             return self._mock_ospf_interface(cmd_str)
@@ -433,21 +992,97 @@ class MockFRRConnection:
         
         return f"  {iface}: {rx_bytes} {random.randint(10000, 100000)} 0 0 0 0 0 0 {tx_bytes} {random.randint(10000, 100000)} 0 0 0 0 0 0"
         
-    def _mock_ping(self) -> str:
+    def _mock_snapshot(self, router_name: str) -> str:
+        import random
+        interfaces = self.routers.get(router_name, {}).get('interfaces', [])
+        
+        sections = {name: [] for name, _ in SNAPSHOT_SECTIONS}
+        for index, iface in enumerate(interfaces, start=2):
+            name = iface['name']
+            sections['proc_net_dev'].append(
+                f"  {name}: {random.randint(10000000, 500000000)} {random.randint(10000, 100000)} 0 0 0 0 0 0 "
+                f"{random.randint(10000000, 500000000)} {random.randint(10000, 100000)} 0 0 0 0 0 0"
+            )
+            sections['ip_link'].append(
+                f"{index}: {name}@if{index + 10}: <BROADCAST,MULTICAST,UP,LOWER_UP> mtu 1500 "
+                f"qdisc noqueue state UP mode DEFAULT group default qlen 1000"
+            )
+            sections['ip_addr'].append(
+                f"{index}: {name}    inet {iface.get('ip', '0.0.0.0')}/30 scope global {name}"
+            )
+            
+        sections['frr_state'].append(self._mock_state_json(router_name))
+        
+        return '\n'.join(
+            f"{SNAPSHOT_MARKER}{name}\n" + '\n'.join(lines)
+            for name, lines in sections.items()
+        )
+        
+    def _mock_state_json(self, router_name: str) -> str:
+        """Simule la sortie JSON de STATE_COMMANDS (trois documents concaténés)"""
+        import json
+        interfaces = self.routers.get(router_name, {}).get('interfaces', [])
+        
+        ospf_interfaces = {
+            iface['name']: {
+                'ifUp': True,
+                'ipAddress': iface.get('ip', ''),
+                'ipAddressPrefixlen': 30,
+                'area': f"0.0.0.{iface.get('area', 0)}",
+                'networkType': 'BROADCAST',
+                'cost': self.ospf_costs.get(iface['name'], 10),
+                'state': 'DR',
+                'nbrCount': 1,
+                'nbrAdjacentCount': 1
+            }
+            for iface in interfaces
+        }
+        neighbors = {
+            f"9.9.9.{index}": [{
+                'nbrPriority': 1,
+                'nbrState': 'Full/Backup',
+                'deadTimeMsecs': 35000,
+                'address': '.'.join(iface.get('ip', '0.0.0.0').split('.')[:3] + ['254']),
+                'ifaceName': f"{iface['name']}:{iface.get('ip', '')}"
+            }]
+            for index, iface in enumerate(interfaces, start=1)
+        }
+        zebra_interfaces = {
+            iface['name']: {
+                'administrativeStatus': 'up',
+                'operationalStatus': 'up',
+                'mtu': 1500,
+                'ipAddresses': [{'address': f"{iface.get('ip', '')}/30", 'secondary': False}]
+            }
+            for iface in interfaces
+        }
+        
+        return '\n'.join(json.dumps(document) for document in (
+            {'interfaces': ospf_interfaces}, {'neighbors': neighbors}, zebra_interfaces
+        ))
+        
+    def _mock_ping(self, count: int = 5) -> str:
         import random
-        success = random.randint(4, 5)
         avg_time = random.uniform(1, 30)
+        lost = 1 if count >= 5 and random.random() < 0.5 else 0
         
+        times = [max(0.1, avg_time + random.uniform(-1, 2)) for _ in range(count - lost)]
+        replies = '\n'.join(
+            f"64 bytes from 10.0.0.2: icmp_seq={seq} ttl=64 time={rtt:.1f} ms"
+            for seq, rtt in enumerate(times, 1)
+        )
         return f"""PING 10.0.0.2 (10.0.0.2) 56(84) bytes of data.
-64 bytes from 10.0.0.2: icmp_seq=1 ttl=64 time={avg_time:.1f} ms
-64 bytes from 10.0.0.2: icmp_seq=2 ttl=64 time={avg_time+1:.1f} ms
-64 bytes from 10.0.0.2: icmp_seq=3 ttl=64 time={avg_time-0.5:.1f} ms
-64 bytes from 10.0.0.2: icmp_seq=4 ttl=64 time={avg_time+0.3:.1f} ms
-64 bytes from 10.0.0.2: icmp_seq=5 ttl=64 time={avg_time:.1f} ms
+{replies}
 
 --- 10.0.0.2 ping statistics ---
-5 packets transmitted, {success} received, {(5-success)*20}% packet loss, time 4005ms
-rtt min/avg/max/mdev = {avg_time-1:.3f}/{avg_time:.3f}/{avg_time+2:.3f}/0.{random.randint(100,999)} ms"""
+{count} packets transmitted, {len(times)} received, {lost * 100 // count}% packet loss, time {count - 1}005ms
+rtt min/avg/max/mdev = {min(times):.3f}/{sum(times) / len(times):.3f}/{max(times):.3f}/0.{random.randint(100,999)} ms"""
+        
+    def _mock_multi_ping(self, command: str) -> str:
+        count_match = re.search(r'-c (\d+)', command)
+        count = int(count_match.group(1)) if count_match else 5
+        dest_ips = re.search(r'for ip in ([^;]*); do', command).group(1).split()
+        return '\n'.join(f"{PROBE_MARKER}{ip}\n{self._mock_ping(count)}" for ip in dest_ips)
         
     def _mock_ospf_neighbor(self) -> str:
         return """
@@ -504,14 +1139,32 @@ O   192.168.3.0/24 [110/40] via 10.0.1.2, eth2, weight 1, 00:05:18"""
             'tx_dropped': 0
         }
         
-    def ping(self, router_name: str, dest_ip: str, count: int = 5) -> Optional[str]:
-        return self._mock_ping()
+    def get_router_snapshot(self, router_name: str) -> Optional[Dict]:
+        return parse_router_snapshot(self._mock_snapshot(router_name))
+        
+    def get_router_state(self, router_name: str) -> Optional[RouterState]:
+        return parse_router_state(self._mock_state_json(router_name))
+        
+    def ping(self, router_name: str, dest_ip: str, count: int = 5,
+             interval: float = None, deadline: int = None) -> Optional[str]:
+        return self._mock_ping(count)
+        
+    def ping_many(self, router_name: str, dest_ips: List[str], count: int = 5,
+                  interval: float = None, deadline: int = None) -> Dict[str, str]:
+        return parse_multi_ping_output(
+            self.execute_command(router_name, build_multi_ping_command(dest_ips, count, interval, deadline))
+        )
         
     def set_ospf_cost(self, router_name: str, interface: str, cost: int) -> bool:
         self.ospf_costs[interface] = cost
         logger.info(f"[MOCK] ✓ Coût OSPF de {interface} sur {router_name} modifié à {cost}")
         return True
         
+    def set_ospf_costs(self, router_name: str, changes: Dict[str, int]) -> Dict[str, bool]:
+        self.ospf_costs.update(changes)
+        logger.info(f"[MOCK] ✓ {len(changes)} coûts OSPF modifiés sur {router_name} en une session")
+        return {interface: True for interface in changes}
+        
     def get_ospf_cost(self, router_name: str, interface: str) -> int:
         return self.ospf_costs.get(interface, 10)
         
@@ -0,0 +1,151 @@
+"""
+Sessions shell persistantes dans les conteneurs FRR
+Un seul 'docker exec -i <conteneur> sh' reste ouvert par routeur; les commandes
+sont envoyées sur stdin et la fin de chaque sortie est repérée par une sentinelle
+"""
+
+import subprocess
+import threading
+import queue
+import time
+import uuid
+import logging
+from typing import Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class DockerShellSession:
+    """
+    Session shell longue durée dans un conteneur Docker
+    Relancée automatiquement si le processus meurt ou si une commande expire
+    """
+
+    def __init__(self, container_name: str, timeout: float = 30):
+        """
+        Args:
+            container_name: Nom du conteneur Docker
+            timeout: Timeout par défaut d'une commande en secondes
+        """
+        self.container_name = container_name
+        self.timeout = timeout
+        self.process: Optional[subprocess.Popen] = None
+        self.spawn_count = 0
+
+        self._lines: queue.Queue = queue.Queue()
+        self._lock = threading.Lock()
+
+    def is_alive(self) -> bool:
+        """True si le processus docker exec est toujours actif"""
+        return self.process is not None and self.process.poll() is None
+
+    def _spawn(self):
+        """Démarre (ou redémarre) le shell dans le conteneur"""
+        self.close()
+
+        self.process = subprocess.Popen(
+            ['docker', 'exec', '-i', self.container_name, 'sh'],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            bufsize=1
+        )
+        self._lines = queue.Queue()
+        threading.Thread(
+            target=self._read_output,
+            args=(self.process, self._lines),
+            daemon=True
+        ).start()
+
+        self.spawn_count += 1
+        if self.spawn_count > 1:
+            logger.info(f"Session shell relancée sur {self.container_name}")
+
+    @staticmethod
+    def _read_output(process: subprocess.Popen, lines: queue.Queue):
+        """Transfère la sortie du shell ligne par ligne (None = fin de flux)"""
+        try:
+            for line in process.stdout:
+                lines.put(line)
+        except (OSError, ValueError):
+            pass
+        lines.put(None)
+
+    def _send(self, command: str, sentinel: str):
+        """Écrit la commande et l'affichage de la sentinelle sur stdin"""
+        # Sous-shell: un 'exit' ou un 'cd' dans la commande n'affecte pas la session
+        # Le '\n' avant la sentinelle garantit qu'elle est seule sur sa ligne
+        self.process.stdin.write(
+            f"( {command}\n) </dev/null\nprintf '\\n{sentinel} %d\\n' $?\n"
+        )
+        self.process.stdin.flush()
+
+    def run(self, command: str, timeout: float = None) -> Optional[Tuple[int, str]]:
+        """
+        Exécute une commande dans la session
+
+        Args:
+            command: Commande shell
+            timeout: Timeout en secondes (défaut: celui de la session)
+
+        Returns:
+            Tuple (code de retour, sortie) ou None en cas d'erreur/timeout
+        """
+        timeout = timeout or self.timeout
+        sentinel = f"__OSPF_OPTIMIZER_{uuid.uuid4().hex}__"
+
+        with self._lock:
+            try:
+                if not self.is_alive():
+                    self._spawn()
+                try:
+                    self._send(command, sentinel)
+                except (BrokenPipeError, OSError):
+                    # La session est morte entre deux commandes: une seule relance
+                    self._spawn()
+                    self._send(command, sentinel)
+            except FileNotFoundError:
+                logger.error("Docker n'est pas installé ou pas dans le PATH")
+                return None
+            except Exception as e:
+                logger.error(f"Erreur de session shell sur {self.container_name}: {e}")
+                self.close()
+                return None
+
+            deadline = time.monotonic() + timeout
+            output = []
+            while True:
+                remaining = deadline - time.monotonic()
+                try:
+                    line = self._lines.get(timeout=max(remaining, 0))
+                except queue.Empty:
+                    # La sortie restante désynchroniserait la session: on la tue
+                    logger.error(f"Timeout de session sur {self.container_name}")
+                    self.close()
+                    return None
+
+                if line is None:
+                    logger.error(f"Session shell terminée sur {self.container_name}")
+                    self.close()
+                    return None
+
+                if line.startswith(sentinel):
+                    return_code = int(line.split()[1])
+                    # Retirer le '\n' ajouté avant la sentinelle
+                    return return_code, ''.join(output)[:-1]
+
+                output.append(line)
+
+    def close(self):
+        """Termine le processus docker exec de la session"""
+        if self.process is None:
+            return
+        try:
+            if self.process.poll() is None:
+                self.process.stdin.close()
+                self.process.kill()
+            self.process.wait(timeout=5)
+        except Exception:
+            pass
+        self.process = None
@@ -0,0 +1,273 @@
+"""
+Pool de connexions SSH multiplexées pour la méthode de connexion 'ssh'
+Une seule session authentifiée (transport paramiko) par routeur, partagée par
+plusieurs canaux simultanés, avec keepalive et éviction des sessions inactives
+"""
+
+import select
+import threading
+import time
+import logging
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Taille des lectures sur un canal SSH
+READ_SIZE = 32768
+
+
+def read_channel(channel, timeout: float) -> Tuple[bytes, bytes]:
+    """
+    Lit stdout et stderr d'un canal ensemble jusqu'à EOF
+
+    Les deux flux partagent la fenêtre SSH du canal: lire stdout jusqu'à EOF
+    avant stderr bloque la commande dès que stderr remplit la fenêtre.
+
+    Args:
+        channel: Canal paramiko après exec_command
+        timeout: Délai max en secondes pour l'ensemble de la lecture
+
+    Returns:
+        Tuple (stdout, stderr) en octets
+
+    Raises:
+        TimeoutError: Pas d'EOF dans le délai imparti
+    """
+    stdout, stderr = [], []
+    deadline = time.monotonic() + timeout
+    while True:
+        received = False
+        if channel.recv_ready():
+            stdout.append(channel.recv(READ_SIZE))
+            received = True
+        if channel.recv_stderr_ready():
+            stderr.append(channel.recv_stderr(READ_SIZE))
+            received = True
+        if received:
+            continue
+        if channel.eof_received or channel.closed:
+            break
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise TimeoutError(f"pas de fin de sortie après {timeout}s")
+        # fileno() d'un canal paramiko devient lisible sur stdout, stderr ou EOF
+        select.select([channel], [], [], remaining)
+    return b''.join(stdout), b''.join(stderr)
+
+
+class PooledSSHSession:
+    """Transport SSH authentifié d'un routeur et ses canaux en cours"""
+
+    def __init__(self, client, max_channels: int):
+        """
+        Args:
+            client: paramiko.SSHClient connecté
+            max_channels: Nombre max de canaux simultanés sur ce transport
+        """
+        self.client = client
+        self.transport = client.get_transport()
+        self.channel_slots = threading.BoundedSemaphore(max_channels)
+        self.active_channels = 0
+        self.commands = 0
+        self.last_used = time.monotonic()
+
+    def is_alive(self) -> bool:
+        """True si le transport SSH est toujours actif"""
+        return self.transport is not None and self.transport.is_active()
+
+    def close(self):
+        try:
+            self.client.close()
+        except Exception:
+            pass
+
+
+class SSHConnectionPool:
+    """
+    Pool de sessions SSH par routeur
+    Les appels concurrents vers un même routeur ouvrent chacun un canal sur la
+    session partagée au lieu de refaire une poignée de main SSH
+    """
+
+    def __init__(self, max_channels: int = 4, keepalive: int = 30,
+                 idle_timeout: int = 300, timeout: int = 30):
+        """
+        Args:
+            max_channels: Canaux simultanés max par routeur
+            keepalive: Intervalle des keepalives SSH en secondes (0 = désactivé)
+            idle_timeout: Durée d'inactivité avant fermeture d'une session (secondes)
+            timeout: Timeout de connexion et de commande par défaut (secondes)
+        """
+        self.max_channels = max_channels
+        self.keepalive = keepalive
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+
+        self.sessions: Dict[str, PooledSSHSession] = {}
+        self._lock = threading.Lock()
+        self._router_locks: Dict[str, threading.Lock] = {}
+
+        # Statistiques par routeur
+        self.stats: Dict[str, Dict[str, int]] = {}
+
+    def _router_stats(self, router_name: str) -> Dict[str, int]:
+        return self.stats.setdefault(router_name, {
+            'sessions_opened': 0,
+            'commands': 0,
+            'channel_reuses': 0,
+            'errors': 0,
+            'evictions': 0
+        })
+
+    def _open(self, router_name: str, credentials) -> PooledSSHSession:
+        """Ouvre et authentifie une nouvelle session SSH"""
+        import paramiko
+
+        client = paramiko.SSHClient()
+        client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+        client.connect(
+            hostname=credentials.hostname,
+            port=credentials.port,
+            username=credentials.username,
+            password=credentials.password or None,
+            timeout=self.timeout,
+            allow_agent=not credentials.password,
+            look_for_keys=not credentials.password
+        )
+        if self.keepalive:
+            client.get_transport().set_keepalive(self.keepalive)
+
+        self._router_stats(router_name)['sessions_opened'] += 1
+        logger.debug(f"Session SSH ouverte vers {router_name}")
+        return PooledSSHSession(client, self.max_channels)
+
+    def _checkout(self, router_name: str, credentials) -> PooledSSHSession:
+        """
+        Retourne la session active d'un routeur, en l'ouvrant si nécessaire,
+        réservée pour l'appelant (active_channels + 1) jusqu'à _release()
+
+        La réservation et l'enregistrement se font sous self._lock, comme
+        l'éviction: une session retournée ne peut plus être fermée par
+        evict_idle() avant l'ouverture de son canal.
+
+        Raises:
+            Exception: Erreur de connexion ou d'authentification SSH
+        """
+        self.evict_idle()
+
+        with self._lock:
+            router_lock = self._router_locks.setdefault(router_name, threading.Lock())
+
+        # Verrou par routeur: une seule poignée de main à la fois, sans bloquer les autres routeurs
+        with router_lock:
+            with self._lock:
+                session = self.sessions.get(router_name)
+                if session is not None and session.is_alive():
+                    session.active_channels += 1
+                    session.last_used = time.monotonic()
+                    return session
+                stale = self.sessions.pop(router_name, None)
+            if stale is not None:
+                stale.close()
+            session = self._open(router_name, credentials)
+            with self._lock:
+                session.active_channels += 1
+                self.sessions[router_name] = session
+            return session
+
+    def _release(self, session: PooledSSHSession):
+        """Libère une réservation prise par _checkout()"""
+        with self._lock:
+            session.active_channels -= 1
+            session.last_used = time.monotonic()
+
+    def get_session(self, router_name: str, credentials) -> PooledSSHSession:
+        """
+        Retourne la session active d'un routeur, en l'ouvrant si nécessaire
+
+        Raises:
+            Exception: Erreur de connexion ou d'authentification SSH
+        """
+        session = self._checkout(router_name, credentials)
+        self._release(session)
+        return session
+
+    def execute(self, router_name: str, credentials, command: str,
+                timeout: int = None) -> Optional[Tuple[int, str, str]]:
+        """
+        Exécute une commande sur un canal de la session partagée du routeur
+
+        Returns:
+            Tuple (code de retour, stdout, stderr) ou None en cas d'erreur
+        """
+        timeout = timeout or self.timeout
+        stats = self._router_stats(router_name)
+
+        try:
+            session = self._checkout(router_name, credentials)
+        except Exception as e:
+            stats['errors'] += 1
+            logger.error(f"Erreur SSH vers {router_name}: {e}")
+            return None
+
+        try:
+            with session.channel_slots:
+                if session.commands:
+                    stats['channel_reuses'] += 1
+                session.commands += 1
+                stats['commands'] += 1
+                try:
+                    channel = session.transport.open_session(timeout=timeout)
+                    channel.settimeout(timeout)
+                    channel.exec_command(command)
+                    stdout, stderr = read_channel(channel, timeout)
+                    return_code = channel.recv_exit_status()
+                    channel.close()
+                    return return_code, stdout.decode(errors='replace'), stderr.decode(errors='replace')
+                except Exception as e:
+                    stats['errors'] += 1
+                    logger.error(f"Erreur de canal SSH sur {router_name}: {e}")
+                    # Session potentiellement corrompue: elle sera rouverte au prochain appel
+                    if not session.is_alive():
+                        self.close(router_name)
+                    return None
+        finally:
+            self._release(session)
+
+    def evict_idle(self):
+        """Ferme les sessions non réservées inactives depuis plus de idle_timeout"""
+        if not self.idle_timeout:
+            return
+        now = time.monotonic()
+        with self._lock:
+            idle = [
+                name for name, session in self.sessions.items()
+                if session.active_channels == 0 and now - session.last_used > self.idle_timeout
+            ]
+            for name in idle:
+                self.sessions.pop(name).close()
+                self._router_stats(name)['evictions'] += 1
+                logger.debug(f"Session SSH inactive fermée: {name}")
+
+    def close(self, router_name: str):
+        """Ferme la session d'un routeur"""
+        with self._lock:
+            session = self.sessions.pop(router_name, None)
+        if session:
+            session.close()
+
+    def close_all(self):
+        """Ferme toutes les sessions"""
+        for router_name in list(self.sessions.keys()):
+            self.close(router_name)
+
+    def get_stats(self) -> Dict:
+        """Statistiques du pool, par routeur"""
+        return {
+            name: {
+                **stats,
+                'connected': name in self.sessions and self.sessions[name].is_alive(),
+                'active_channels': self.sessions[name].active_channels if name in self.sessions else 0
+            }
+            for name, stats in self.stats.items()
+        }
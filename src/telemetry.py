@@ -0,0 +1,280 @@
+"""
+Télémétrie poussée par des agents installés dans les conteneurs FRR
+Chaque agent (scripts/telemetry_agent.sh) échantillonne lui-même ses compteurs
+d'interface et sonde ses voisins, puis envoie un enregistrement compact par
+datagramme (UDP ou socket unix) au serveur d'ingestion de l'optimiseur, qui
+alimente FRRMetricsCollector sans aucun docker exec
+
+Format d'un enregistrement (texte, une ligne par élément):
+    ospft1 <routeur> <époque_agent> <horloge_agent>
+    c <interface> <up|down> <ip|-> <rx_bytes> <rx_packets> <rx_errors> <rx_dropped> <tx_bytes> <tx_packets> <tx_errors> <tx_dropped>
+    p <ip_voisin> <paquets_envoyés> <rtt_ms,rtt_ms,...|->
+
+L'époque identifie une exécution de l'agent (heure de démarrage, secondes
+depuis 1970) et croît à chaque redémarrage; l'horloge est monotone au sein
+d'une époque (/proc/uptime dans le conteneur). Le couple (époque, horloge)
+sert aux deltas de débit et à écarter les datagrammes dupliqués, désordonnés
+ou émis par une exécution précédente de l'agent
+"""
+
+import os
+import socket
+import threading
+import time
+import logging
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+from .latency_prober import parse_ping_samples
+
+logger = logging.getLogger(__name__)
+
+RECORD_VERSION = 'ospft1'
+DEFAULT_PORT = 5515
+MAX_DATAGRAM = 65507
+
+# Ordre des compteurs sur une ligne 'c' (même ordre que /proc/net/dev)
+COUNTER_FIELDS = ('rx_bytes', 'rx_packets', 'rx_errors', 'rx_dropped',
+                  'tx_bytes', 'tx_packets', 'tx_errors', 'tx_dropped')
+
+
+@dataclass
+class TelemetryRecord:
+    """Échantillon envoyé par l'agent d'un routeur"""
+    router: str
+    clock: float
+    epoch: int = 0
+    interfaces: Dict[str, Dict] = field(default_factory=dict)
+    probes: Dict[str, Tuple[int, List[float]]] = field(default_factory=dict)
+    received: float = field(default_factory=time.time)
+
+
+def encode_record(record: TelemetryRecord) -> bytes:
+    """Sérialise un enregistrement au format des agents"""
+    lines = [f"{RECORD_VERSION} {record.router} {record.epoch} {record.clock:.2f}"]
+    for name, iface in record.interfaces.items():
+        counters = ' '.join(str(int(iface.get(key, 0))) for key in COUNTER_FIELDS)
+        lines.append(f"c {name} {iface.get('status', 'up')} {iface.get('ip') or '-'} {counters}")
+    for dest_ip, (sent, samples) in record.probes.items():
+        rtts = ','.join(f"{rtt:.3f}" for rtt in samples) or '-'
+        lines.append(f"p {dest_ip} {sent} {rtts}")
+    return ('\n'.join(lines) + '\n').encode()
+
+
+def parse_record(data: bytes) -> Optional[TelemetryRecord]:
+    """
+    Décode un datagramme d'agent
+
+    Returns:
+        TelemetryRecord ou None si le datagramme est invalide
+    """
+    try:
+        lines = data.decode('ascii', errors='replace').strip().splitlines()
+        header = lines[0].split()
+        if len(header) != 4 or header[0] != RECORD_VERSION:
+            return None
+        record = TelemetryRecord(router=header[1], clock=float(header[3]), epoch=int(header[2]))
+
+        for line in lines[1:]:
+            parts = line.split()
+            if not parts:
+                continue
+            if parts[0] == 'c' and len(parts) == 4 + len(COUNTER_FIELDS):
+                iface = dict(zip(COUNTER_FIELDS, map(int, parts[4:])))
+                iface['status'] = 'up' if parts[2].lower() in ('up', 'unknown') else 'down'
+                iface['ip'] = parts[3] if parts[3] != '-' else 'N/A'
+                record.interfaces[parts[1]] = iface
+            elif parts[0] == 'p' and len(parts) == 4:
+                samples = [float(rtt) for rtt in parts[3].split(',')] if parts[3] != '-' else []
+                record.probes[parts[1]] = (int(parts[2]), samples)
+        return record
+    except (IndexError, ValueError):
+        return None
+
+
+class TelemetryIngestServer:
+    """
+    Serveur d'ingestion des enregistrements d'agents (UDP et/ou socket unix)
+
+    Chaque socket est lu par un thread dédié; les enregistrements valides sont
+    transmis à 'sink' (FRRMetricsCollector.ingest_telemetry)
+    """
+
+    def __init__(self, sink: Callable[[TelemetryRecord], bool],
+                 udp: Optional[Tuple[str, int]] = None, unix_path: Optional[str] = None):
+        """
+        Args:
+            sink: Fonction appelée pour chaque enregistrement (False = écarté)
+            udp: Adresse (hôte, port) d'écoute UDP, None pour désactiver
+            unix_path: Chemin du socket unix datagramme, None pour désactiver
+        """
+        self.sink = sink
+        self.udp = udp
+        self.unix_path = unix_path
+
+        self._sockets: List[socket.socket] = []
+        self._threads: List[threading.Thread] = []
+        self._stop = threading.Event()
+
+        # Statistiques
+        self.stats = {'received': 0, 'ingested': 0, 'invalid': 0, 'discarded': 0}
+        self.last_seen: Dict[str, float] = {}
+
+    @property
+    def address(self) -> Optional[Tuple[str, int]]:
+        """Adresse UDP effective (port attribué si 0 a été demandé)"""
+        for sock in self._sockets:
+            if sock.family == socket.AF_INET:
+                return sock.getsockname()
+        return None
+
+    def start(self):
+        """Ouvre les sockets et démarre les threads de réception"""
+        if self.udp:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            sock.bind(tuple(self.udp))
+            self._sockets.append(sock)
+        if self.unix_path:
+            if os.path.exists(self.unix_path):
+                os.unlink(self.unix_path)
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+            sock.bind(self.unix_path)
+            self._sockets.append(sock)
+
+        for sock in self._sockets:
+            sock.settimeout(0.5)
+            thread = threading.Thread(target=self._serve, args=(sock,),
+                                      name='telemetry-ingest', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        logger.info(f"Serveur de télémétrie démarré "
+                    f"(udp: {self.address or '-'}, unix: {self.unix_path or '-'})")
+
+    def _serve(self, sock: socket.socket):
+        while not self._stop.is_set():
+            try:
+                data = sock.recv(MAX_DATAGRAM)
+            except socket.timeout:
+                continue
+            except OSError:
+                return
+            self.handle(data)
+
+    def handle(self, data: bytes) -> bool:
+        """Décode et transmet un datagramme (utilisable sans socket)"""
+        self.stats['received'] += 1
+        record = parse_record(data)
+        if record is None:
+            self.stats['invalid'] += 1
+            logger.debug(f"Datagramme de télémétrie invalide ignoré ({len(data)} octets)")
+            return False
+        try:
+            accepted = self.sink(record)
+        except Exception as e:
+            logger.error(f"Erreur d'ingestion de la télémétrie de {record.router}: {e}")
+            accepted = False
+        self.stats['ingested' if accepted else 'discarded'] += 1
+        if accepted:
+            self.last_seen[record.router] = record.received
+        return accepted
+
+    def stop(self):
+        """Arrête les threads et ferme les sockets"""
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout=2)
+        for sock in self._sockets:
+            sock.close()
+        if self.unix_path and os.path.exists(self.unix_path):
+            os.unlink(self.unix_path)
+        self._sockets.clear()
+        self._threads.clear()
+
+    def get_stats(self) -> Dict:
+        """Compteurs d'ingestion et âge du dernier enregistrement par routeur"""
+        now = time.time()
+        return {
+            **self.stats,
+            'routers': {router: round(now - seen, 1) for router, seen in self.last_seen.items()}
+        }
+
+
+class LocalTelemetryAgent:
+    """
+    Agent de remplacement exécuté dans le processus de l'optimiseur
+
+    Échantillonne un routeur au travers d'une connexion (MockFRRConnection en
+    simulation) et envoie des enregistrements au même format et par le même
+    transport que scripts/telemetry_agent.sh: toute la chaîne (encodage,
+    socket, serveur, collecteur) est ainsi testable sur une seule machine
+    """
+
+    def __init__(self, router_name: str, interfaces: Dict[str, str], targets: List[str],
+                 address: Union[Tuple[str, int], str], connection_handler,
+                 interval: float = 5, probe_count: int = 3):
+        """
+        Args:
+            router_name: Routeur représenté par l'agent
+            interfaces: Dict {interface: ip} à échantillonner
+            targets: IPs des voisins à sonder
+            address: (hôte, port) UDP ou chemin du socket unix du serveur
+            connection_handler: Connexion utilisée pour échantillonner
+            interval: Période d'envoi (secondes)
+            probe_count: Paquets par sonde
+        """
+        self.router_name = router_name
+        self.interfaces = interfaces
+        self.targets = targets
+        self.address = address
+        self.connection = connection_handler
+        self.interval = interval
+        self.probe_count = probe_count
+
+        family = socket.AF_UNIX if isinstance(address, str) else socket.AF_INET
+        self._socket = socket.socket(family, socket.SOCK_DGRAM)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.sent = 0
+        # Époque de cette exécution (comme EPOCH dans telemetry_agent.sh)
+        self.epoch = int(time.time())
+
+    def sample(self) -> TelemetryRecord:
+        """Échantillonne les compteurs puis sonde les voisins"""
+        record = TelemetryRecord(router=self.router_name, clock=time.monotonic(), epoch=self.epoch)
+        for name, ip_address in self.interfaces.items():
+            traffic = self.connection.get_interface_traffic(self.router_name, name)
+            if traffic:
+                record.interfaces[name] = {**traffic, 'status': 'up', 'ip': ip_address}
+
+        if self.targets:
+            outputs = self.connection.ping_many(self.router_name, self.targets, self.probe_count)
+            for dest_ip in self.targets:
+                record.probes[dest_ip] = parse_ping_samples(outputs.get(dest_ip) or '', self.probe_count)
+        return record
+
+    def send_once(self) -> bool:
+        """Échantillonne et envoie un enregistrement"""
+        try:
+            self._socket.sendto(encode_record(self.sample()), self.address)
+        except OSError as e:
+            logger.warning(f"Envoi de télémétrie impossible pour {self.router_name}: {e}")
+            return False
+        self.sent += 1
+        return True
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.send_once()
+            self._stop.wait(self.interval)
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name=f'agent-{self.router_name}',
+                                        daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval + 1)
+        self._socket.close()
@@ -0,0 +1,100 @@
+"""
+Modèle de topologie compilé une fois au chargement de la configuration
+Index par nom de lien, par (routeur, interface) et par IP, IP de destination
+précalculées et groupes de liens par routeur: le chemin critique d'un cycle
+n'effectue plus aucun parcours linéaire de la configuration
+"""
+
+import logging
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class TopologyIndex:
+    """
+    Index de la topologie (routeurs et liens surveillés)
+
+    Les liens sont conservés dans l'ordre de monitored_links, enrichis de
+    dest_ip; les index renvoient des positions dans cette liste
+    """
+
+    def __init__(self, routers: Dict, monitored_links: List[Dict]):
+        """
+        Args:
+            routers: Section 'routers' de routers.yaml
+            monitored_links: Section 'monitored_links' de routers.yaml
+        """
+        routers = routers or {}
+
+        # Interfaces configurées: (routeur, interface) -> config, et IP -> (routeur, interface)
+        self.interfaces: Dict[Tuple[str, str], Dict] = {}
+        self.by_ip: Dict[str, Tuple[str, str]] = {}
+        for router_name, router_config in routers.items():
+            for iface in (router_config or {}).get('interfaces', []) or []:
+                key = (router_name, iface['name'])
+                self.interfaces[key] = iface
+                if iface.get('ip'):
+                    self.by_ip[iface['ip']] = key
+
+        # Liens enrichis (dest_ip précalculée), dans l'ordre de la configuration
+        self.links: List[Dict] = []
+        self.by_name: Dict[str, int] = {}
+        self.by_interface: Dict[Tuple[str, str], List[int]] = {}
+        self.router_links: Dict[str, List[int]] = {}
+        self.interface_groups: Dict[str, List[int]] = {}
+
+        for link in monitored_links or []:
+            enriched = link.copy()
+            dest = self.interfaces.get((link.get('dest_router'), link.get('dest_interface')))
+            if dest is not None:
+                enriched['dest_ip'] = dest.get('ip', '')
+
+            index = len(self.links)
+            self.links.append(enriched)
+            if link['name'] in self.by_name:
+                logger.warning(f"Lien {link['name']} défini plusieurs fois, seule la première définition est indexée")
+            else:
+                self.by_name[link['name']] = index
+
+            source = (link['source_router'], link['source_interface'])
+            self.by_interface.setdefault(source, []).append(index)
+            self.router_links.setdefault(link['source_router'], []).append(index)
+            # Clé identique à traffic_cache: les liens d'une même interface restent ordonnés
+            self.interface_groups.setdefault(f"{source[0]}:{source[1]}", []).append(index)
+            dest_key = (link.get('dest_router'), link.get('dest_interface'))
+            if dest_key != source:
+                self.by_interface.setdefault(dest_key, []).append(index)
+
+        # Tableaux alignés sur self.links
+        self.dest_ips: List[str] = [link.get('dest_ip', '') for link in self.links]
+        self.source_routers: List[str] = list(self.router_links)
+        self.probe_targets: List[Tuple[str, str]] = list(dict.fromkeys(
+            (link['source_router'], dest_ip)
+            for link, dest_ip in zip(self.links, self.dest_ips) if dest_ip
+        ))
+
+    def __len__(self) -> int:
+        return len(self.links)
+
+    def link(self, name: str) -> Optional[Dict]:
+        """Configuration enrichie d'un lien, None si inconnu"""
+        index = self.by_name.get(name)
+        return self.links[index] if index is not None else None
+
+    def source_of(self, name: str) -> Optional[Tuple[str, str]]:
+        """(routeur, interface) source d'un lien, None si inconnu"""
+        link = self.link(name)
+        return (link['source_router'], link['source_interface']) if link else None
+
+    def links_on(self, router_name: str, interface: str = None) -> List[Dict]:
+        """Liens touchant un routeur (source) ou une interface (source ou destination)"""
+        if interface is None:
+            indexes = self.router_links.get(router_name, [])
+        else:
+            indexes = self.by_interface.get((router_name, interface), [])
+        return [self.links[index] for index in indexes]
+
+    def lookup_ip(self, ip: str) -> Optional[Tuple[str, str]]:
+        """(routeur, interface) portant une IP configurée"""
+        return self.by_ip.get(ip)
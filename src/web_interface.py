@@ -5,6 +5,7 @@ API REST + Dashboard simple
 
 from flask import Flask, jsonify, request, render_template_string
 import threading
+import time
 import os
 import sys
 from pathlib import Path
@@ -385,7 +386,8 @@ def optimize():
     strategy_map = {
         'composite': OptimizationStrategy.COMPOSITE,
         'bandwidth': OptimizationStrategy.BANDWIDTH_BASED,
-        'latency': OptimizationStrategy.LATENCY_BASED
+        'latency': OptimizationStrategy.LATENCY_BASED,
+        'latency_p95': OptimizationStrategy.LATENCY_P95
     }
     
     result = optimizer.optimize_once(strategy_map.get(strategy, OptimizationStrategy.COMPOSITE), dry_run)
@@ -430,6 +432,49 @@ def get_config():
     return jsonify(optimizer.config)
 
 
+@app.route('/api/history')
+def get_history_links():
+    """Liens présents dans l'historique persistant"""
+    if optimizer is None:
+        return jsonify({'error': 'Optimizer not initialized'}), 500
+    if optimizer.metrics_store is None:
+        return jsonify({'error': 'Metrics storage disabled'}), 404
+    return jsonify({'links': optimizer.metrics_store.links()})
+
+
+@app.route('/api/history/<link_name>')
+def get_history(link_name):
+    """
+    Métriques d'un lien sur une plage
+
+    Paramètres: start, end (époque en secondes, négatif = relatif à maintenant;
+    par défaut la dernière heure), resolution (auto, raw, 1m, 1h, 1d)
+    """
+    if optimizer is None:
+        return jsonify({'error': 'Optimizer not initialized'}), 500
+    if optimizer.metrics_store is None:
+        return jsonify({'error': 'Metrics storage disabled'}), 404
+
+    now = time.time()
+    try:
+        end = float(request.args.get('end', now))
+        start = float(request.args.get('start', -3600))
+    except ValueError:
+        return jsonify({'error': 'start/end must be numbers'}), 400
+    end = now + end if end < 0 else end
+    start = now + start if start < 0 else start
+    resolution = request.args.get('resolution', 'auto')
+    if resolution == 'auto':
+        resolution = optimizer.metrics_store.resolve_resolution(link_name, start, end)
+
+    try:
+        points = optimizer.metrics_store.query(link_name, start, end, resolution)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    return jsonify({'link': link_name, 'start': start, 'end': end,
+                    'resolution': resolution, 'points': points})
+
+
 def run_web_server(host: str = '0.0.0.0', port: int = 5000, 
                    config_path: str = None, simulation: bool = True):
     """
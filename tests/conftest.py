@@ -0,0 +1,42 @@
+"""
+Fixtures partagées: optimiseur en mode simulation construit depuis
+config/routers.yaml, avec des sections remplacées par test
+"""
+
+import copy
+from pathlib import Path
+
+import pytest
+import yaml
+
+CONFIG_PATH = Path(__file__).resolve().parent.parent / 'config' / 'routers.yaml'
+
+
+@pytest.fixture
+def make_optimizer(tmp_path):
+    """
+    Fabrique d'OSPFOptimizer simulés
+
+    Les arguments nommés remplacent des clés des sections de routers.yaml,
+    ex: make_optimizer(apply={'transactional': True})
+    """
+    from ospf_optimizer import OSPFOptimizer
+
+    created = []
+
+    def factory(**sections):
+        config = yaml.safe_load(CONFIG_PATH.read_text())
+        for section, values in sections.items():
+            if isinstance(values, dict):
+                config[section] = {**copy.deepcopy(config.get(section) or {}), **values}
+            else:
+                config[section] = values
+        path = tmp_path / f'routers-{len(created)}.yaml'
+        path.write_text(yaml.safe_dump(config))
+        optimizer = OSPFOptimizer(str(path), simulation_mode=True)
+        created.append(optimizer)
+        return optimizer
+
+    yield factory
+    for optimizer in created:
+        optimizer.stop()
@@ -0,0 +1,160 @@
+"""
+Démon Docker simulé pour les tests du transport docker_api
+"""
+
+import http.server
+import json
+import os
+import socket
+import socketserver
+import struct
+import subprocess
+import threading
+import uuid
+from typing import Callable, Dict, List, Tuple
+
+
+class FakeDockerAPIServer:
+    """
+    Démon Docker simulé sur un socket unix local
+    Implémente le sous-ensemble de l'API utilisé par DockerAPIClient, pour tester
+    le transport sans Docker. Les commandes exec sont confiées à 'handler'
+    (par défaut exécutées localement).
+    """
+
+    def __init__(self, socket_path: str, containers: Dict[str, str] = None,
+                 handler: Callable[[str, List[str]], Tuple[int, str, str]] = None,
+                 frame_size: int = 4096):
+        """
+        Args:
+            socket_path: Chemin du socket à créer
+            containers: Dict {nom_conteneur: image}
+            handler: Fonction (conteneur, cmd) -> (code, stdout, stderr)
+            frame_size: Taille max d'une trame du flux multiplexé
+        """
+        self.socket_path = socket_path
+        self.containers = containers or {}
+        self.handler = handler or self._run_locally
+        self.frame_size = frame_size
+        self.execs: Dict[str, Dict] = {}
+        self._server = None
+        self._thread = None
+        self._connections = set()
+        self._connections_lock = threading.Lock()
+
+    @staticmethod
+    def _run_locally(container: str, cmd: List[str]) -> Tuple[int, str, str]:
+        result = subprocess.run(cmd, capture_output=True, text=True)
+        return result.returncode, result.stdout, result.stderr
+
+    def start(self):
+        """Démarre le serveur dans un thread en arrière-plan"""
+        fake = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def setup(self):
+                super().setup()
+                with fake._connections_lock:
+                    fake._connections.add(self.connection)
+
+            def finish(self):
+                with fake._connections_lock:
+                    fake._connections.discard(self.connection)
+                super().finish()
+
+            def log_message(self, format, *args):
+                pass
+
+            def _reply(self, status: int, body=None):
+                data = json.dumps(body).encode() if body is not None else b''
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _body(self) -> Dict:
+                length = int(self.headers.get('Content-Length', 0))
+                return json.loads(self.rfile.read(length)) if length else {}
+
+            def do_GET(self):
+                parts = self.path.strip('/').split('/')
+                if parts == ['containers', 'json']:
+                    self._reply(200, [
+                        {'Id': name, 'Names': [f'/{name}'], 'Image': image, 'State': 'running'}
+                        for name, image in fake.containers.items()
+                    ])
+                elif len(parts) == 3 and parts[0] == 'containers' and parts[2] == 'json':
+                    if parts[1] not in fake.containers:
+                        self._reply(404, {'message': f'No such container: {parts[1]}'})
+                    else:
+                        self._reply(200, {'Id': parts[1], 'Name': f'/{parts[1]}',
+                                          'State': {'Running': True, 'Pid': os.getpid()}})
+                elif len(parts) == 3 and parts[0] == 'exec' and parts[2] == 'json':
+                    exec_info = fake.execs.get(parts[1], {})
+                    self._reply(200, {'Running': False, 'ExitCode': exec_info.get('exit_code')})
+                else:
+                    self._reply(404, {'message': 'page not found'})
+
+            def do_POST(self):
+                parts = self.path.strip('/').split('/')
+                body = self._body()
+                if len(parts) == 3 and parts[0] == 'containers' and parts[2] == 'exec':
+                    if parts[1] not in fake.containers:
+                        self._reply(404, {'message': f'No such container: {parts[1]}'})
+                        return
+                    exec_id = uuid.uuid4().hex
+                    fake.execs[exec_id] = {'container': parts[1], 'cmd': body.get('Cmd', [])}
+                    self._reply(201, {'Id': exec_id})
+                elif len(parts) == 3 and parts[0] == 'exec' and parts[2] == 'start':
+                    exec_info = fake.execs.get(parts[1])
+                    if exec_info is None:
+                        self._reply(404, {'message': 'No such exec instance'})
+                        return
+                    code, stdout, stderr = fake.handler(exec_info['container'], exec_info['cmd'])
+                    exec_info['exit_code'] = code
+                    # Comme le démon réel: flux brut multiplexé puis fermeture de la connexion
+                    self.send_response(200)
+                    self.send_header('Content-Type', 'application/vnd.docker.raw-stream')
+                    self.send_header('Connection', 'close')
+                    self.end_headers()
+                    for stream_type, text in ((1, stdout), (2, stderr)):
+                        data = text.encode()
+                        for offset in range(0, len(data), fake.frame_size):
+                            frame = data[offset:offset + fake.frame_size]
+                            self.wfile.write(struct.pack('>BxxxL', stream_type, len(frame)) + frame)
+                    self.close_connection = True
+                else:
+                    self._reply(404, {'message': 'page not found'})
+
+        class Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+            daemon_threads = True
+
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+        self._server = Server(self.socket_path, Handler)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def drop_connections(self):
+        """Ferme les connexions keep-alive ouvertes (comme un démon redémarré)"""
+        with self._connections_lock:
+            connections = list(self._connections)
+        for connection in connections:
+            try:
+                connection.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def stop(self):
+        """Arrête le serveur, ferme ses connexions et supprime le socket"""
+        self.drop_connections()
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
@@ -0,0 +1,81 @@
+"""
+Sorties de routeurs FRR utilisées par les tests des parseurs
+(vtysh JSON, /proc/net/dev, ip -o link/addr, ping)
+"""
+
+import json
+
+OSPF_INTERFACES = {
+    'interfaces': {
+        'eth1': {'ifUp': True, 'ipAddress': '10.0.0.1', 'ipAddressPrefixlen': 30,
+                 'area': '0.0.0.0', 'networkType': 'BROADCAST', 'cost': 10, 'state': 'DR',
+                 'nbrCount': 1, 'nbrAdjacentCount': 1},
+        'eth3': {'ifUp': False, 'ipAddress': '10.0.1.1', 'ipAddressPrefixlen': 30,
+                 'area': '0.0.0.0', 'networkType': 'POINTOPOINT', 'cost': 25, 'state': 'Down',
+                 'nbrCount': 0, 'nbrAdjacentCount': 0},
+    }
+}
+
+# FRR >= 7.5: une liste d'entrées par voisin
+OSPF_NEIGHBORS = {
+    'neighbors': {
+        '2.2.2.2': [{'nbrPriority': 1, 'nbrState': 'Full/DR', 'deadTimeMsecs': 35000,
+                     'address': '10.0.0.2', 'ifaceName': 'eth1:10.0.0.1'}],
+        '3.3.3.3': [{'nbrPriority': 0, 'nbrState': '2-Way/DROther', 'deadTimeMsecs': 31000,
+                     'address': '10.0.1.2', 'ifaceName': 'eth3:10.0.1.1'}],
+    }
+}
+
+# FRR plus ancien: un objet par voisin, autres noms de champs
+OSPF_NEIGHBORS_LEGACY = {
+    'neighbors': {
+        '2.2.2.2': {'priority': 1, 'state': 'Full/DR', 'routerDeadIntervalTimerDueMsec': 34000,
+                    'address': '10.0.0.2', 'ifaceName': 'eth1:10.0.0.1'},
+    }
+}
+
+INTERFACES = {
+    'eth1': {'administrativeStatus': 'up', 'operationalStatus': 'up', 'mtu': 1500,
+             'ipAddresses': [{'address': '10.0.0.1/30'}, {'address': 'fe80::42:aff:fe00:1/64'}]},
+    'eth3': {'administrativeStatus': 'up', 'operationalStatus': 'down', 'mtu': 1500,
+             'ipAddresses': [{'address': '10.0.1.1/30'}]},
+}
+
+
+def state_output(neighbors=None) -> str:
+    """Sortie de vtysh pour STATE_COMMANDS (documents concaténés, indentés comme vtysh)"""
+    documents = [OSPF_INTERFACES, neighbors or OSPF_NEIGHBORS, INTERFACES]
+    return '\n'.join(json.dumps(document, indent=2) for document in documents)
+
+
+PROC_NET_DEV = """Inter-|   Receive                                                |  Transmit
+ face |bytes    packets errs drop fifo frame compressed multicast|bytes    packets errs drop fifo colls carrier compressed
+    lo:    1200      12    0    0    0     0          0         0     1200      12    0    0    0     0       0          0
+  eth1: 5000000    4000    1    2    0     0          0         0  7000000    5000    3    4    0     0       0          0
+  eth3:  100000     900    0    0    0     0          0         0   200000    1000    0    0    0     0       0          0"""
+
+IP_LINK = """1: lo: <LOOPBACK,UP,LOWER_UP> mtu 65536 qdisc noqueue state UNKNOWN mode DEFAULT group default qlen 1000\\    link/loopback 00:00:00:00:00:00 brd 00:00:00:00:00:00
+12: eth1@if13: <BROADCAST,MULTICAST,UP,LOWER_UP> mtu 1500 qdisc noqueue state UP mode DEFAULT group default \\    link/ether 02:42:0a:00:00:01 brd ff:ff:ff:ff:ff:ff link-netnsid 0
+14: eth3@if15: <NO-CARRIER,BROADCAST,MULTICAST,UP> mtu 1500 qdisc noqueue state DOWN mode DEFAULT group default \\    link/ether 02:42:0a:00:01:01 brd ff:ff:ff:ff:ff:ff link-netnsid 0"""
+
+IP_ADDR = """1: lo    inet 127.0.0.1/8 scope host lo\\       valid_lft forever preferred_lft forever
+12: eth1    inet 10.0.0.1/30 brd 10.0.0.3 scope global eth1\\       valid_lft forever preferred_lft forever
+12: eth1    inet 192.168.5.1/24 brd 192.168.5.255 scope global secondary eth1\\       valid_lft forever preferred_lft forever
+14: eth3    inet 10.0.1.1/30 brd 10.0.1.3 scope global eth3\\       valid_lft forever preferred_lft forever"""
+
+PING_OK = """PING 10.0.0.2 (10.0.0.2) 56(84) bytes of data.
+64 bytes from 10.0.0.2: icmp_seq=1 ttl=64 time=1.20 ms
+64 bytes from 10.0.0.2: icmp_seq=2 ttl=64 time=1.60 ms
+64 bytes from 10.0.0.2: icmp_seq=3 ttl=64 time=1.40 ms
+
+--- 10.0.0.2 ping statistics ---
+3 packets transmitted, 3 received, 0% packet loss, time 402ms
+rtt min/avg/max/mdev = 1.200/1.400/1.600/0.163 ms"""
+
+PING_UNREACHABLE = """PING 10.0.1.2 (10.0.1.2) 56(84) bytes of data.
+From 10.0.1.1 icmp_seq=1 Destination Host Unreachable
+From 10.0.1.1 icmp_seq=2 Destination Host Unreachable
+
+--- 10.0.1.2 ping statistics ---
+3 packets transmitted, 0 received, +2 errors, 100% packet loss, time 2043ms
+"""
@@ -0,0 +1,142 @@
+"""
+Tests de l'application des coûts: relecture d'un lot par routeur et
+résultat journalisé de chaque interface (chemins direct et transactionnel)
+"""
+
+import json
+import logging
+
+import pytest
+
+from src.cost_calculator import CostCalculationResult
+from src.router_connection import COST_MARKER, build_cost_batch_command, parse_cost_batch_output
+
+CHANGES = {'eth1': 25, 'eth3': 40}
+
+
+def readback(costs):
+    return json.dumps({'interfaces': {name: {'ifUp': True, 'cost': cost}
+                                      for name, cost in costs.items()}})
+
+
+def test_batch_command_applies_then_reads_back():
+    command = build_cost_batch_command(CHANGES)
+    assert command.index('interface eth1') < command.index('ip ospf cost 25') < command.index('end')
+    assert f"echo '{COST_MARKER}'$?" in command
+    assert command.endswith('vtysh -c "show ip ospf interface json"')
+
+
+def test_parse_readback_per_interface():
+    output = f"{COST_MARKER}0\n" + readback({'eth1': 25, 'eth3': 10, 'eth0': 5})
+    assert parse_cost_batch_output(output, CHANGES) == {'eth1': True, 'eth3': False}
+
+    # Interface absente de la relecture
+    output = f"{COST_MARKER}0\n" + readback({'eth1': 25})
+    assert parse_cost_batch_output(output, CHANGES) == {'eth1': True, 'eth3': False}
+
+    # Sortie de vtysh (avertissements) avant le marqueur
+    output = "% Unknown command\n" + f"{COST_MARKER}1\n" + readback({'eth1': 25, 'eth3': 40})
+    assert parse_cost_batch_output(output, CHANGES) == {'eth1': True, 'eth3': True}
+
+
+@pytest.mark.parametrize('status, expected', [('0', True), ('1', False), ('', False)])
+def test_parse_falls_back_to_exit_status(status, expected):
+    # Relecture vide ou JSON illisible: le code de retour vaut pour tout le lot
+    for tail in ('', '\n', '\n{"interfaces": '):
+        output = f"{COST_MARKER}{status}{tail}"
+        assert parse_cost_batch_output(output, CHANGES) == {'eth1': expected, 'eth3': expected}
+
+
+def test_parse_without_marker_fails_every_interface():
+    assert parse_cost_batch_output(None, CHANGES) == {'eth1': False, 'eth3': False}
+    assert parse_cost_batch_output('', CHANGES) == {'eth1': False, 'eth3': False}
+    assert parse_cost_batch_output('Error response from daemon', CHANGES) == {
+        'eth1': False, 'eth3': False}
+
+
+def result(link, cost):
+    return CostCalculationResult(link, 10, cost, True, 'test', {})
+
+
+RESULTS = [result('ABR1-ABR2', 21), result('ABR1-ABR3', 22), result('ABR1-R1', 23),
+           result('ABR2-ABR3', 24), CostCalculationResult('ABR2-R3', 10, 10, False, '', {})]
+
+
+def fail_interfaces(connection, failing, unreadable=()):
+    """Fait échouer des interfaces (routeur, interface) de la connexion simulée"""
+    set_ospf_costs = connection.set_ospf_costs
+    get_router_state = connection.get_router_state
+
+    def patched_set(router, changes):
+        outcomes = set_ospf_costs(router, changes)
+        return {interface: ok and (router, interface) not in failing
+                for interface, ok in outcomes.items()}
+
+    connection.set_ospf_costs = patched_set
+    connection.get_router_state = lambda router: (
+        None if router in unreadable else get_router_state(router))
+
+
+def failures(caplog):
+    return [record.getMessage() for record in caplog.records
+            if record.levelno >= logging.ERROR and 'Échec de modification' in record.getMessage()]
+
+
+def test_apply_reports_each_interface(make_optimizer, caplog):
+    optimizer = make_optimizer()
+    fail_interfaces(optimizer.connection, {('ABR1', 'eth3')})
+
+    with caplog.at_level(logging.INFO):
+        applied = optimizer.apply_cost_changes(RESULTS)
+
+    assert applied == 3
+    assert optimizer.apply_stats == {'applied': 3, 'failed': 1}
+    assert failures(caplog) == ['✗ Échec de modification du coût sur ABR1.eth3']
+    messages = caplog.text
+    for change in ('ABR1.eth1: coût modifié à 21', 'ABR1.eth0: coût modifié à 23',
+                   'ABR2.eth3: coût modifié à 24'):
+        assert change in messages
+    assert optimizer.get_status()['apply'] == {'applied': 3, 'failed': 1}
+
+
+def test_dry_run_applies_nothing(make_optimizer):
+    optimizer = make_optimizer()
+    assert optimizer.apply_cost_changes(RESULTS, dry_run=True) == 0
+    assert optimizer.apply_stats == {'applied': 0, 'failed': 0}
+
+
+def test_transactional_failure_reports_reasons(make_optimizer, caplog):
+    optimizer = make_optimizer(apply={'transactional': True})
+    fail_interfaces(optimizer.connection, {('ABR2', 'eth3')})
+
+    with caplog.at_level(logging.INFO):
+        applied = optimizer.apply_cost_changes(RESULTS)
+
+    assert applied == 0
+    assert optimizer.apply_stats == {'applied': 0, 'failed': 4}
+    reported = failures(caplog)
+    assert ('✗ Échec de modification du coût sur ABR2.eth3 '
+            '(échec sur ce routeur, lot annulé, restauration incomplète)') in reported
+    for interface in ('eth1', 'eth3', 'eth0'):
+        assert (f'✗ Échec de modification du coût sur ABR1.{interface} '
+                f"(lot annulé après l'échec sur ABR2, coûts initiaux restaurés)") in reported
+
+
+def test_transactional_unreadable_state_reports_abort(make_optimizer, caplog):
+    optimizer = make_optimizer(apply={'transactional': True})
+    fail_interfaces(optimizer.connection, set(), unreadable={'ABR1'})
+
+    with caplog.at_level(logging.INFO):
+        applied = optimizer.apply_cost_changes(RESULTS)
+
+    assert applied == 0
+    assert optimizer.apply_stats == {'applied': 0, 'failed': 4}
+    assert all('(lot abandonné, coûts actuels illisibles sur ABR1)' in message
+               for message in failures(caplog))
+
+
+def test_transactional_success(make_optimizer):
+    optimizer = make_optimizer(apply={'transactional': True})
+    assert optimizer.apply_cost_changes(RESULTS) == 4
+    assert optimizer.apply_stats == {'applied': 4, 'failed': 0}
+    assert optimizer.commit_engine.last_result.committed
@@ -0,0 +1,114 @@
+"""
+Tests du chemin asynchrone: cycle complet sur AsyncMockFRRConnection et
+délégation au transport synchrone hors docker_exec
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from src.async_connection import AsyncFRRRouterConnection, AsyncMockFRRConnection
+from src.cost_cache import OSPFCostCache
+from src.cost_calculator import OptimizationStrategy
+from src.router_connection import MockFRRConnection
+
+
+class RecordingSyncConnection:
+    """Transport synchrone factice: enregistre les commandes et leur thread"""
+
+    def __init__(self, delay=0.0):
+        self.cost_cache = OSPFCostCache(enabled=True)
+        self.host_counters = object()
+        self.delay = delay
+        self.calls = []
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def execute_command(self, router_name, command, timeout=None):
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+            self.calls.append((router_name, command, timeout, threading.current_thread()))
+        time.sleep(self.delay)
+        with self._lock:
+            self.active -= 1
+        return f"{router_name}: {command}"
+
+
+def test_optimize_once_async_on_mock(make_optimizer):
+    optimizer = make_optimizer()
+    assert isinstance(optimizer.async_connection, AsyncMockFRRConnection)
+
+    result = asyncio.run(optimizer.optimize_once_async(OptimizationStrategy.COMPOSITE))
+
+    assert result['success']
+    summary = result['summary']
+    assert summary['total_links'] == len(optimizer.config['monitored_links'])
+    assert result['changes_applied'] == summary['links_to_update']
+    assert optimizer.apply_stats == {'applied': summary['links_to_update'], 'failed': 0}
+    assert optimizer.optimization_count == 1
+
+
+def test_optimize_once_async_transactional(make_optimizer):
+    optimizer = make_optimizer(apply={'transactional': True})
+    result = asyncio.run(optimizer.optimize_once_async(OptimizationStrategy.COMPOSITE))
+
+    assert result['success']
+    assert optimizer.commit_engine.stats['commits'] == (1 if result['changes_applied'] else 0)
+    assert optimizer.apply_stats['failed'] == 0
+
+
+def test_async_mock_shares_sync_state():
+    mock = MockFRRConnection({})
+    mock.add_router('R1', {})
+    connection = AsyncMockFRRConnection(mock)
+    outcomes = asyncio.run(connection.set_ospf_costs('R1', {'eth1': 42}))
+    assert outcomes == {'eth1': True}
+    assert mock.ospf_costs['eth1'] == 42
+    assert asyncio.run(connection.get_ospf_cost('R1', 'eth1')) == 42
+
+
+def test_non_exec_method_requires_sync_connection():
+    for method in ('docker_session', 'docker_api', 'ssh'):
+        with pytest.raises(ValueError):
+            AsyncFRRRouterConnection({'connection_method': method})
+    # docker_exec: sous-processus asyncio, pas de transport synchrone nécessaire
+    assert AsyncFRRRouterConnection({'connection_method': 'docker_exec'}).sync_connection is None
+
+
+def test_delegates_to_sync_transport():
+    sync = RecordingSyncConnection()
+    connection = AsyncFRRRouterConnection({'connection_method': 'docker_api'}, sync_connection=sync)
+    connection.add_router('R1', {'container_name': 'ctr-r1'})
+
+    assert connection.cost_cache is sync.cost_cache
+    assert connection.host_counters is sync.host_counters
+
+    output = asyncio.run(connection.execute_vtysh('R1', ['show ip ospf neighbor'], timeout=7))
+    assert output == 'R1: vtysh -c "show ip ospf neighbor"'
+    router, command, timeout, thread = sync.calls[0]
+    assert (router, timeout) == ('R1', 7)
+    assert thread is not threading.main_thread()
+
+    # Routeur inconnu: pas d'appel au transport
+    assert asyncio.run(connection.execute_command('R9', 'true')) is None
+    assert len(sync.calls) == 1
+
+
+def test_delegation_respects_max_inflight():
+    sync = RecordingSyncConnection(delay=0.05)
+    connection = AsyncFRRRouterConnection(
+        {'connection_method': 'ssh', 'async_max_inflight': 2}, sync_connection=sync
+    )
+    connection.add_router('R1', {})
+
+    async def run():
+        return await asyncio.gather(*(connection.execute_command('R1', f'echo {i}')
+                                      for i in range(6)))
+
+    outputs = asyncio.run(run())
+    assert outputs == [f'R1: echo {i}' for i in range(6)]
+    assert sync.max_active == 2
@@ -0,0 +1,110 @@
+"""
+Tests de l'historique en fichiers colonnes (mmap): écriture, réouverture,
+lecture par plage et rejeu des coûts
+"""
+
+import pytest
+
+from src.column_history import ColumnHistoryReader, ColumnHistoryWriter
+from src.cost_calculator import CostCalculationResult, CostCalculator, OptimizationStrategy
+from src.metrics_collector import LinkMetrics, LinkMetricsBatch
+
+BASE = 1700000000.0
+
+
+def write_rows(writer, link, count, first=0):
+    for index in range(first, first + count):
+        writer.append(link, BASE + index, 5.0 + index % 120, (index % 13) * 0.9, 0.1,
+                      (index * 7) % 100, 10 + index, 20 + index)
+
+
+@pytest.fixture(params=[True, False], ids=['numpy', 'memoryview'])
+def use_numpy(request):
+    if request.param:
+        pytest.importorskip('numpy')
+    return request.param
+
+
+def test_append_grows_by_chunks_and_reopens(tmp_path, use_numpy):
+    root = str(tmp_path / 'columns')
+    writer = ColumnHistoryWriter(root, chunk_rows=4)
+    write_rows(writer, 'L1', 10)
+    write_rows(writer, 'L2', 3)
+
+    # Lecture pendant l'écriture: seules les lignes complètes sont visibles
+    reader = ColumnHistoryReader(root, use_numpy)
+    assert reader.links() == ['L1', 'L2']
+    assert reader.rows('L1') == 10
+    writer.close()
+
+    # Réouverture: les lignes suivantes s'ajoutent après les existantes
+    writer = ColumnHistoryWriter(root, chunk_rows=4)
+    write_rows(writer, 'L1', 5, first=10)
+    writer.close()
+
+    columns = reader.columns('L1')
+    assert list(columns['timestamp']) == [BASE + index for index in range(15)]
+    assert list(columns['calculated_cost']) == [20 + index for index in range(15)]
+    assert reader.rows('unknown') == 0 and reader.columns('unknown') == {}
+
+
+def test_time_range(tmp_path, use_numpy):
+    writer = ColumnHistoryWriter(str(tmp_path))
+    write_rows(writer, 'L1', 20)
+    writer.close()
+
+    reader = ColumnHistoryReader(str(tmp_path), use_numpy)
+    columns = reader.columns('L1', start=BASE + 5, end=BASE + 9)
+    assert list(columns['current_cost']) == [15, 16, 17, 18, 19]
+    assert len(reader.columns('L1', start=BASE + 100)['timestamp']) == 0
+    assert len(reader.columns('L1', end=BASE + 0.5)['timestamp']) == 1
+
+
+def test_append_cycle(tmp_path):
+    writer = ColumnHistoryWriter(str(tmp_path))
+    batch = LinkMetricsBatch.from_metrics([
+        LinkMetrics('L1', 'A', 'B', 1.0, 0.0, 0.1, 5.0, 10, 10, timestamp=BASE),
+        LinkMetrics('L2', 'B', 'C', 2.0, 0.0, 0.1, 5.0, 30, 30, timestamp=BASE),
+    ])
+    results = [CostCalculationResult('L1', 10, 12, True, '', {}), None]
+    assert writer.append_cycle(batch, results) == 2
+    writer.close()
+
+    reader = ColumnHistoryReader(str(tmp_path), use_numpy=False)
+    assert list(reader.columns('L1')['calculated_cost']) == [12]
+    # Lien sans résultat: coût actuel conservé
+    assert list(reader.columns('L2')['calculated_cost']) == [30]
+
+
+@pytest.mark.parametrize('strategy', list(OptimizationStrategy))
+def test_replay_matches_calculate_cost(tmp_path, use_numpy, strategy):
+    writer = ColumnHistoryWriter(str(tmp_path), chunk_rows=64)
+    write_rows(writer, 'L1', 300)
+    writer.close()
+
+    calculator = CostCalculator({'thresholds': {'latency': {'high': 50}}})
+    replay = ColumnHistoryReader(str(tmp_path), use_numpy).replay('L1', calculator, strategy)
+
+    assert len(replay['replayed_cost']) == 300
+    expected = []
+    for index in range(300):
+        metrics = LinkMetrics('L1', 'A', 'B', 5.0 + index % 120, (index % 13) * 0.9, 0.1,
+                              (index * 7) % 100, 10 + index, 10 + index)
+        expected.append(calculator.calculate_cost(metrics, strategy).calculated_cost)
+    assert list(replay['replayed_cost']) == expected
+    assert ColumnHistoryReader(str(tmp_path), use_numpy).replay('unknown', calculator) == {}
+
+
+def test_optimizer_stop_closes_files(make_optimizer, tmp_path):
+    root = tmp_path / 'history'
+    optimizer = make_optimizer(column_history={'enabled': True, 'path': str(root), 'chunk_rows': 8})
+    optimizer.optimize_once(OptimizationStrategy.COMPOSITE, dry_run=True)
+    writer = optimizer.column_history
+    assert writer.get_stats()['links']
+
+    optimizer.stop()
+    assert writer.get_stats()['links'] == {}
+
+    reader = ColumnHistoryReader(str(root), use_numpy=False)
+    assert reader.links() == sorted(link['name'] for link in optimizer.config['monitored_links'])
+    assert all(reader.rows(link) == 1 for link in reader.links())
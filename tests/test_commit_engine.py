@@ -0,0 +1,204 @@
+"""
+Tests du commit transactionnel des coûts OSPF: relecture, application,
+restauration de tous les routeurs touchés en cas d'échec ou de délai dépassé
+"""
+
+import asyncio
+import threading
+import time
+
+from src.commit_engine import CostCommitEngine
+
+
+class FakeState:
+    def __init__(self, costs):
+        self._costs = dict(costs)
+
+    def ospf_costs(self):
+        return dict(self._costs)
+
+
+class FakeCostConnection:
+    """Routeurs simulés: coûts en mémoire, échecs et lenteurs configurables"""
+
+    def __init__(self, costs):
+        self.costs = {router: dict(interfaces) for router, interfaces in costs.items()}
+        self.unreadable = set()
+        self.failing = set()           # premier set_ospf_costs en échec (vérification négative)
+        self.failing_after = {}        # routeur -> nombre d'appels réussis avant échec
+        self.raising = set()
+        self.slow = {}                 # routeur -> durée du premier set_ospf_costs
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def get_router_state(self, router):
+        if router in self.unreadable:
+            return None
+        return FakeState(self.costs[router])
+
+    def set_ospf_costs(self, router, changes):
+        with self._lock:
+            self.calls.append(('start', router, dict(changes)))
+            count = sum(1 for call in self.calls if call[0] == 'start' and call[1] == router)
+        delay = self.slow.pop(router, 0)
+        if delay:
+            time.sleep(delay)
+        if router in self.raising:
+            raise RuntimeError('connexion perdue')
+        failed = (router in self.failing and count == 1) or (
+            router in self.failing_after and count > self.failing_after[router])
+        with self._lock:
+            if not failed:
+                self.costs[router].update(changes)
+            self.calls.append(('end', router, dict(changes)))
+        return {interface: not failed for interface in changes}
+
+
+class AsyncFakeCostConnection:
+    """Variante asynchrone de FakeCostConnection"""
+
+    def __init__(self, sync):
+        self.sync = sync
+
+    async def get_router_state(self, router):
+        await asyncio.sleep(0)
+        return self.sync.get_router_state(router)
+
+    async def set_ospf_costs(self, router, changes):
+        delay = self.sync.slow.pop(router, 0)
+        if delay:
+            await asyncio.sleep(delay)
+        return self.sync.set_ospf_costs(router, changes)
+
+
+INITIAL = {
+    'R1': {'eth0': 10, 'eth1': 10},
+    'R2': {'eth0': 20},
+    'R3': {'eth0': 30},
+}
+BATCHES = {'R1': {'eth0': 15, 'eth1': 16}, 'R2': {'eth0': 25}, 'R3': {'eth0': 35}}
+
+
+def test_commit_applies_all_routers():
+    connection = FakeCostConnection(INITIAL)
+    engine = CostCommitEngine(connection, timeout=2)
+
+    result = engine.commit(BATCHES)
+
+    assert result.committed and result.applied == 4
+    assert connection.costs == {'R1': {'eth0': 15, 'eth1': 16}, 'R2': {'eth0': 25},
+                                'R3': {'eth0': 35}}
+    assert engine.get_stats()['last']['committed'] is True
+    assert engine.stats['rollbacks'] == 0
+
+
+def test_partial_failure_rolls_back_every_router():
+    connection = FakeCostConnection(INITIAL)
+    connection.failing.add('R2')
+    engine = CostCommitEngine(connection, timeout=2)
+
+    result = engine.commit(BATCHES)
+
+    assert not result.committed and result.applied == 0
+    assert result.failed_routers == ['R2']
+    assert sorted(result.rolled_back) == ['R1', 'R2', 'R3']
+    assert result.rollback_failed == []
+    assert connection.costs == INITIAL
+    assert engine.stats['rollbacks'] == 1
+
+
+def test_exception_counts_as_failure():
+    connection = FakeCostConnection(INITIAL)
+    connection.raising.add('R3')
+    result = CostCommitEngine(connection, timeout=2).commit(BATCHES)
+
+    assert not result.committed
+    assert result.failed_routers == ['R3']
+    assert result.outcomes['R3'] == {'eth0': False}
+    assert connection.costs['R1'] == INITIAL['R1']
+    assert result.rollback_failed == ['R3']
+
+
+def test_timeout_restore_waits_for_in_flight_apply():
+    connection = FakeCostConnection(INITIAL)
+    connection.slow['R2'] = 0.4
+    engine = CostCommitEngine(connection, timeout=0.2)
+
+    result = engine.commit(BATCHES)
+
+    assert not result.committed and result.failed_routers == ['R2']
+    # La restauration de R2 ne démarre qu'après la fin de l'application hors délai
+    r2_calls = [(kind, changes) for kind, router, changes in connection.calls if router == 'R2']
+    assert r2_calls == [('start', {'eth0': 25}), ('end', {'eth0': 25}),
+                        ('start', {'eth0': 20}), ('end', {'eth0': 20})]
+    assert connection.costs == INITIAL
+    assert 'R2' in result.rolled_back
+
+
+def test_unreadable_state_aborts_without_applying():
+    connection = FakeCostConnection(INITIAL)
+    connection.unreadable.add('R3')
+    engine = CostCommitEngine(connection, timeout=2)
+
+    result = engine.commit(BATCHES)
+
+    assert not result.committed
+    assert result.failed_routers == ['R3']
+    assert connection.calls == []
+    assert connection.costs == INITIAL
+    assert engine.stats['aborted'] == 1
+
+
+def test_unknown_interface_aborts():
+    connection = FakeCostConnection(INITIAL)
+    result = CostCommitEngine(connection, timeout=2).commit({'R1': {'eth9': 5}})
+    assert not result.committed and result.failed_routers == ['R1']
+    assert connection.calls == []
+
+
+def test_failed_rollback_is_recorded():
+    connection = FakeCostConnection(INITIAL)
+    connection.failing.add('R2')
+    connection.failing_after['R1'] = 1     # R1: application réussie, restauration refusée
+    engine = CostCommitEngine(connection, timeout=2)
+
+    result = engine.commit(BATCHES)
+
+    assert not result.committed
+    assert result.rollback_failed == ['R1']
+    assert sorted(result.rolled_back) == ['R2', 'R3']
+    assert connection.costs['R1'] == {'eth0': 15, 'eth1': 16}
+    assert engine.stats['rollback_failures'] == 1
+    assert engine.get_stats()['last']['rollback_failed'] == result.rollback_failed
+
+
+def test_commit_async_applies_and_rolls_back():
+    connection = FakeCostConnection(INITIAL)
+    engine = CostCommitEngine(connection, AsyncFakeCostConnection(connection), timeout=2)
+    result = asyncio.run(engine.commit_async(BATCHES))
+    assert result.committed and result.applied == 4
+
+    connection = FakeCostConnection(INITIAL)
+    connection.failing.add('R1')
+    engine = CostCommitEngine(connection, AsyncFakeCostConnection(connection), timeout=2)
+    result = asyncio.run(engine.commit_async(BATCHES))
+    assert not result.committed and result.failed_routers == ['R1']
+    assert sorted(result.rolled_back) == ['R1', 'R2', 'R3']
+    assert connection.costs == INITIAL
+
+
+def test_commit_async_timeout_and_unreadable():
+    connection = FakeCostConnection(INITIAL)
+    connection.slow['R3'] = 0.5
+    engine = CostCommitEngine(connection, AsyncFakeCostConnection(connection), timeout=0.1)
+    result = asyncio.run(engine.commit_async(BATCHES))
+    # L'application annulée sur R3 n'a rien écrit; les autres sont restaurés
+    assert not result.committed and result.failed_routers == ['R3']
+    assert connection.costs == INITIAL
+
+    connection = FakeCostConnection(INITIAL)
+    connection.unreadable.add('R1')
+    engine = CostCommitEngine(connection, AsyncFakeCostConnection(connection), timeout=2)
+    result = asyncio.run(engine.commit_async(BATCHES))
+    assert not result.committed and connection.calls == []
+    assert engine.stats['aborted'] == 1
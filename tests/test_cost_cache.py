@@ -0,0 +1,126 @@
+"""
+Tests du cache write-through des coûts OSPF: lectures, invalidation,
+détection des modifications hors optimiseur et cadence de réconciliation
+"""
+
+import logging
+
+from src.cost_cache import OSPFCostCache
+from src.frr_state import OSPFNeighborState
+
+
+def neighbor(neighbor_id='2.2.2.2', state='Full/DR', interface='eth1'):
+    return {'neighbor_id': neighbor_id, 'state': state, 'interface': interface}
+
+
+def test_disabled_cache_always_misses():
+    cache = OSPFCostCache()
+    cache.set('R1', 'eth1', 10)
+    assert cache.get('R1', 'eth1') is None
+    assert cache.get_stats()['misses'] == 1 and cache.get_stats()['entries'] == 1
+
+
+def test_set_then_get_hits():
+    cache = OSPFCostCache(enabled=True)
+    assert cache.get('R1', 'eth1') is None
+    cache.set('R1', 'eth1', 10)
+    assert cache.get('R1', 'eth1') == 10
+    assert cache.get('R2', 'eth1') is None
+    stats = cache.get_stats()
+    assert (stats['hits'], stats['misses'], stats['writes']) == (1, 2, 1)
+    assert stats['hit_rate'] == 33.3
+
+
+def test_invalidate_router_or_all():
+    cache = OSPFCostCache(enabled=True)
+    cache.store_router('R1', {'eth1': 10, 'eth2': 20})
+    cache.store_router('R2', {'eth1': 30})
+
+    cache.invalidate('R1')
+    assert cache.get('R1', 'eth1') is None and cache.get('R1', 'eth2') is None
+    assert cache.get('R2', 'eth1') == 30
+
+    cache.invalidate()
+    assert cache.get('R2', 'eth1') is None
+    assert cache.get_stats()['entries'] == 0
+
+
+def test_drift_detected_on_reread(caplog):
+    cache = OSPFCostCache(enabled=True)
+    cache.set('R1', 'eth1', 10)
+    cache.set('R1', 'eth2', 20)
+    cache.invalidate('R1')
+
+    with caplog.at_level(logging.WARNING):
+        cache.store_router('R1', {'eth1': 10, 'eth2': 99})
+
+    assert cache.stats['drift'] == 1
+    assert 'R1.eth2: 20 → 99' in caplog.text
+    assert cache.get('R1', 'eth2') == 99
+    # Valeur attendue consommée: une nouvelle relecture identique n'est pas un écart
+    cache.store('R1', 'eth2', 99)
+    assert cache.stats['drift'] == 1
+
+
+def test_drift_against_cached_value_without_invalidation():
+    cache = OSPFCostCache(enabled=True)
+    cache.set('R1', 'eth1', 10)
+    cache.store('R1', 'eth1', 12)
+    assert cache.stats['drift'] == 1
+    # Première lecture d'une interface inconnue: pas d'écart
+    cache.store('R1', 'eth9', 5)
+    assert cache.stats['drift'] == 1
+
+
+def test_set_clears_expected_value():
+    cache = OSPFCostCache(enabled=True)
+    cache.set('R1', 'eth1', 10)
+    cache.invalidate('R1')
+    # L'optimiseur modifie le coût avant la relecture: la nouvelle valeur fait foi
+    cache.set('R1', 'eth1', 15)
+    cache.store('R1', 'eth1', 15)
+    assert cache.stats['drift'] == 0
+
+
+def test_observe_neighbors_invalidates_on_change():
+    cache = OSPFCostCache(enabled=True)
+    cache.store_router('R1', {'eth1': 10})
+    cache.store_router('R2', {'eth1': 20})
+
+    assert cache.observe_neighbors('R1', [neighbor()]) is False      # première observation
+    assert cache.observe_neighbors('R1', [neighbor()]) is False      # inchangé
+    assert cache.get('R1', 'eth1') == 10
+
+    assert cache.observe_neighbors('R1', [neighbor(state='Init/DROther')]) is True
+    assert cache.get('R1', 'eth1') is None
+    assert cache.get('R2', 'eth1') == 20
+    assert cache.stats['neighbor_changes'] == 1
+
+
+def test_observe_neighbors_accepts_records_in_any_order():
+    cache = OSPFCostCache(enabled=True)
+    records = [OSPFNeighborState('2.2.2.2', 1, 'Full/DR', 30000, '10.0.0.2', 'eth1'),
+               OSPFNeighborState('3.3.3.3', 1, 'Full/DR', 30000, '10.0.1.2', 'eth3')]
+    assert cache.observe_neighbors('R1', records) is False
+    # Même voisinage, format dict et ordre différent
+    dicts = [neighbor('3.3.3.3', interface='eth3'), neighbor('2.2.2.2')]
+    assert cache.observe_neighbors('R1', dicts) is False
+    # Voisin disparu
+    assert cache.observe_neighbors('R1', dicts[:1]) is True
+
+
+def test_next_cycle_cadence():
+    cache = OSPFCostCache(reconcile_every=3, enabled=True)
+    cache.set('R1', 'eth1', 10)
+
+    reconciled = [cache.next_cycle() for _ in range(7)]
+    assert reconciled == [False, False, True, False, False, True, False]
+    assert cache.stats['reconciliations'] == 2
+    assert cache.get('R1', 'eth1') is None
+
+
+def test_next_cycle_never_reconciles_when_disabled():
+    cache = OSPFCostCache(reconcile_every=0, enabled=True)
+    cache.set('R1', 'eth1', 10)
+    assert not any(cache.next_cycle() for _ in range(50))
+    assert cache.get('R1', 'eth1') == 10
@@ -0,0 +1,83 @@
+"""
+Tests du calcul des coûts: facteurs par morceaux et concordance du calcul en
+colonnes (rejeu de l'historique) avec le calcul unitaire
+"""
+
+import random
+from array import array
+
+import pytest
+
+from src.cost_calculator import CostCalculator, OptimizationStrategy
+from src.metrics_collector import LinkMetrics
+
+CONFIG = {
+    'base_cost': 15, 'min_cost': 1, 'max_cost': 500,
+    'multipliers': {'bandwidth_weight': 0.2, 'latency_weight': 0.3, 'packet_loss_weight': 0.5},
+    'thresholds': {'latency': {'high': 50}, 'bandwidth': {'high': 80}, 'packet_loss': {'high': 5}},
+}
+
+
+@pytest.fixture
+def calculator():
+    return CostCalculator(CONFIG)
+
+
+def sample_columns(count: int = 2000, seed: int = 7):
+    rng = random.Random(seed)
+    # Valeurs aléatoires plus chaque seuil exact (bornes des segments)
+    edges = [0.0, 0.1, 1.0, 5.0, 10.0, 30.0, 50.0, 60.0, 80.0, 90.0, 100.0, 200.0, 250.0]
+    utilization = [rng.uniform(0, 100) for _ in range(count)] + [min(e, 100.0) for e in edges]
+    latency = [rng.uniform(0, 300) for _ in range(count)] + edges
+    loss = [rng.choice((0.0, rng.uniform(0, 15))) for _ in range(count)] + edges
+    return utilization, latency, loss
+
+
+@pytest.mark.parametrize('method, value, expected', [
+    ('calculate_bandwidth_factor', 10, 1.0),
+    ('calculate_bandwidth_factor', 30, 1.0),
+    ('calculate_bandwidth_factor', 45, 1.15),
+    ('calculate_bandwidth_factor', 70, 1.7),
+    ('calculate_bandwidth_factor', 85, 2.75),
+    ('calculate_bandwidth_factor', 95, 5.5),
+    ('calculate_latency_factor', 5, 1.0),
+    ('calculate_latency_factor', 30, 1.2),
+    ('calculate_latency_factor', 75, 3.5),       # high (50) = medium: segment 'high'
+    ('calculate_latency_factor', 250, 6.0),
+    ('calculate_packet_loss_factor', 0.0, 1.0),
+    ('calculate_packet_loss_factor', 0.5, 1.5),
+    ('calculate_packet_loss_factor', 2.0, 3.0),
+    ('calculate_packet_loss_factor', 5.0, 6.0),
+    ('calculate_packet_loss_factor', 10.0, 10.0),
+])
+def test_factor_segments(calculator, method, value, expected):
+    assert getattr(calculator, method)(value) == pytest.approx(expected)
+
+
+def expected_costs(calculator, strategy, utilization, latency, loss):
+    """Coûts de calculate_cost, ligne par ligne"""
+    costs = []
+    for index, (u, l, p) in enumerate(zip(utilization, latency, loss)):
+        metrics = LinkMetrics(f'link{index}', 'A', 'B', l, p, 0.0, u, 10, 10)
+        costs.append(calculator.calculate_cost(metrics, strategy).calculated_cost)
+    return costs
+
+
+@pytest.mark.parametrize('strategy', list(OptimizationStrategy))
+def test_cost_columns_match_calculate_cost(calculator, strategy):
+    utilization, latency, loss = sample_columns()
+    columns = calculator.calculate_cost_columns(
+        array('d', utilization), array('d', latency), array('d', loss), strategy
+    )
+    assert list(columns) == expected_costs(calculator, strategy, utilization, latency, loss)
+
+
+@pytest.mark.parametrize('strategy', list(OptimizationStrategy))
+def test_vectorized_cost_columns_match_calculate_cost(calculator, strategy):
+    np = pytest.importorskip('numpy')
+    utilization, latency, loss = sample_columns()
+    columns = calculator.calculate_cost_columns(
+        np.array(utilization), np.array(latency), np.array(loss), strategy
+    )
+    assert columns.dtype == np.int64
+    assert columns.tolist() == expected_costs(calculator, strategy, utilization, latency, loss)
@@ -0,0 +1,137 @@
+"""
+Tests de l'ordonnancement à cadence fixe sur une horloge simulée:
+alignement, débordements (skip, catch_up) et retard courant
+"""
+
+import pytest
+
+from src import cycle_scheduler
+from src.cycle_scheduler import FixedRateScheduler
+
+
+class FakeClock:
+    """Horloge simulée: time() et une attente qui avance le temps au lieu de dormir"""
+
+    def __init__(self, now: float):
+        self.now = now
+        self.stopped = False
+
+    def time(self) -> float:
+        return self.now
+
+    # Interface de threading.Event utilisée par FixedRateScheduler
+    def wait(self, timeout: float) -> bool:
+        if not self.stopped:
+            self.now += timeout
+        return self.stopped
+
+    def is_set(self) -> bool:
+        return self.stopped
+
+    def set(self):
+        self.stopped = True
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock(1000.0)
+    monkeypatch.setattr(cycle_scheduler, 'time', fake)
+    return fake
+
+
+def run(scheduler, clock, durations, during=None):
+    """Exécute un cycle par durée; retourne les instants de démarrage"""
+    starts = []
+    durations = list(durations)
+
+    def cycle():
+        starts.append(clock.now)
+        clock.now += durations.pop(0)
+        if during is not None:
+            during(scheduler)
+        if not durations:
+            scheduler.stop()
+
+    scheduler.run(cycle)
+    return starts
+
+
+def test_first_cycle_immediate_then_aligned(clock):
+    clock.now = 1003.0
+    scheduler = FixedRateScheduler(10, stop_event=clock)
+    assert run(scheduler, clock, [1, 2, 2, 2]) == [1003.0, 1010.0, 1020.0, 1030.0]
+    assert scheduler.stats['overruns'] == 0
+    assert scheduler.stats['cycles'] == 4
+
+
+def test_long_first_cycle_joins_grid_without_overrun(clock):
+    clock.now = 1003.0
+    scheduler = FixedRateScheduler(10, stop_event=clock)
+    assert run(scheduler, clock, [15, 1]) == [1003.0, 1020.0]
+    assert scheduler.stats['overruns'] == 0 and scheduler.stats['skipped_ticks'] == 0
+
+
+def test_unaligned_grid_starts_at_first_cycle(clock):
+    clock.now = 1003.0
+    scheduler = FixedRateScheduler(10, align=False, stop_event=clock)
+    assert run(scheduler, clock, [1, 1, 1]) == [1003.0, 1013.0, 1023.0]
+
+
+@pytest.mark.parametrize('duration, missed', [(10.5, 1), (15, 1), (25, 2), (31, 3)])
+def test_skip_counts_missed_ticks(clock, duration, missed):
+    scheduler = FixedRateScheduler(10, overrun='skip', stop_event=clock)
+    starts = run(scheduler, clock, [1, duration, 1])
+
+    # Cycle 2 démarré à 1010: instants manqués à partir de 1020
+    assert starts[:2] == [1000.0, 1010.0]
+    assert starts[2] == 1020.0 + missed * 10
+    assert scheduler.stats['overruns'] == 1
+    assert scheduler.stats['skipped_ticks'] == missed
+    assert scheduler.stats['last_lag_ms'] == 0.0
+
+
+def test_catch_up_starts_next_cycle_immediately(clock):
+    scheduler = FixedRateScheduler(10, overrun='catch_up', stop_event=clock)
+    starts = run(scheduler, clock, [1, 25, 1, 1])
+
+    # Fin du cycle 2 à 1035: démarrage immédiat, puis retour sur la grille d'origine
+    assert starts == [1000.0, 1010.0, 1035.0, 1040.0]
+    assert scheduler.stats['overruns'] == 1
+    assert scheduler.stats['skipped_ticks'] == 0
+    # Retard mesuré par rapport au dernier instant manqué (1030)
+    assert scheduler.stats['max_lag_ms'] == 5000.0
+
+
+def test_cycle_ending_on_tick_is_not_an_overrun(clock):
+    scheduler = FixedRateScheduler(10, stop_event=clock)
+    assert run(scheduler, clock, [1, 10, 1]) == [1000.0, 1010.0, 1020.0]
+    assert scheduler.stats['overruns'] == 0
+
+
+def test_current_lag_during_and_between_cycles(clock):
+    lags = []
+
+    def during(scheduler):
+        lags.append(scheduler.get_stats()['current_lag_s'])
+
+    scheduler = FixedRateScheduler(10, stop_event=clock)
+    run(scheduler, clock, [1, 17, 3], during)
+
+    # Pendant le cycle 2 (1010 -> 1027), retard par rapport à l'instant suivant 1020
+    assert lags == [0.0, 7.0, 0.0]
+    # Hors cycle: retard par rapport au prochain instant prévu
+    clock.now = scheduler.next_tick + 4
+    assert scheduler.get_stats()['current_lag_s'] == 4.0
+
+
+def test_stop_interrupts_wait(clock):
+    scheduler = FixedRateScheduler(10, stop_event=clock)
+    scheduler.stop()
+    assert scheduler.wait() is None
+    # Arrêt demandé avant run: aucun cycle
+    assert run(scheduler, clock, [1]) == []
+
+
+def test_invalid_overrun_policy():
+    with pytest.raises(ValueError):
+        FixedRateScheduler(10, overrun='queue')
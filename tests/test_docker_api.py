@@ -0,0 +1,124 @@
+"""
+Tests du client de l'API Docker Engine (pool keep-alive, exec, flux multiplexé)
+"""
+
+import struct
+import threading
+
+import pytest
+
+from src.docker_api import DockerAPIClient, DockerAPIError
+from src.router_connection import FRRRouterConnection
+from tests.fake_docker import FakeDockerAPIServer
+
+
+def echo_handler(container, cmd):
+    """Renvoie la commande reçue sur stdout et le conteneur sur stderr"""
+    if cmd[-1] == 'fail':
+        return 3, '', 'boom'
+    return 0, ' '.join(cmd), container
+
+
+@pytest.fixture
+def socket_path(tmp_path):
+    return str(tmp_path / 'docker.sock')
+
+
+@pytest.fixture
+def server(socket_path):
+    fake = FakeDockerAPIServer(socket_path, {'R1': 'frr', 'R2': 'frr'}, echo_handler).start()
+    yield fake
+    fake.stop()
+
+
+@pytest.fixture
+def client(server):
+    api = DockerAPIClient(server.socket_path, pool_size=2, timeout=5)
+    yield api
+    api.close()
+
+
+def test_exec_run_returns_exit_code_and_both_streams(client):
+    assert client.exec_run('R1', ['sh', '-c', 'echo ok']) == (0, 'sh -c echo ok', 'R1')
+    assert client.exec_run('R2', ['fail']) == (3, '', 'boom')
+
+
+def test_exec_run_unknown_container_raises(client):
+    with pytest.raises(DockerAPIError):
+        client.exec_run('R9', ['true'])
+
+
+def test_stream_split_over_many_frames(server, client):
+    server.frame_size = 7
+    payload = 'x' * 1000 + 'é' * 50
+    server.handler = lambda container, cmd: (0, payload, 'err' * 10)
+    assert client.exec_run('R1', ['cat']) == (0, payload, 'err' * 10)
+
+
+def test_demux_interleaved_frames():
+    frames = [(1, b'out1 '), (2, b'err1 '), (1, b'out2'), (2, b'err2')]
+    stream = b''.join(struct.pack('>BxxxL', kind, len(data)) + data for kind, data in frames)
+    assert DockerAPIClient._demux(stream) == ('out1 out2', 'err1 err2')
+    # Trame tronquée (connexion coupée): seules les trames complètes comptent
+    assert DockerAPIClient._demux(stream + b'\x01\x00\x00') == ('out1 out2', 'err1 err2')
+
+
+def test_pool_reuses_keep_alive_connections(client):
+    for _ in range(5):
+        assert [c['Id'] for c in client.list_containers()] == ['R1', 'R2']
+    assert client.stats['connections_opened'] == 1
+    assert client.stats['connections_reused'] == 4
+
+
+def test_stats_are_exact_under_concurrent_requests(client):
+    threads = [threading.Thread(target=lambda: [client.list_containers() for _ in range(25)])
+               for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    stats = client.get_stats()
+    assert stats['requests'] == 200
+    # Chaque requête prend une connexion, nouvelle ou réutilisée
+    assert stats['connections_opened'] + stats['connections_reused'] == 200
+
+
+def test_exec_start_connection_is_reopened(client):
+    for _ in range(3):
+        assert client.exec_run('R1', ['true'])[0] == 0
+    # Chaque 'exec start' ferme sa connexion: les requêtes suivantes en ouvrent une autre
+    assert client.inspect_container('R1')['Id'] == 'R1'
+    assert client.stats['connections_opened'] >= 3
+
+
+def test_reconnects_after_daemon_closed_connection(server, client):
+    client.list_containers()
+    opened = client.stats['connections_opened']
+
+    # Le démon ferme la connexion conservée dans le pool: un seul nouvel essai
+    server.drop_connections()
+
+    assert client.inspect_container('R2')['Id'] == 'R2'
+    assert client.stats['connections_opened'] == opened + 1
+
+
+def test_reconnects_after_daemon_restart(server, client):
+    client.list_containers()
+    server.stop()
+    server.start()
+    assert [c['Id'] for c in client.list_containers()] == ['R1', 'R2']
+
+
+def test_daemon_down_raises(socket_path):
+    api = DockerAPIClient(socket_path, timeout=1)
+    with pytest.raises(DockerAPIError):
+        api.list_containers()
+
+
+def test_router_connection_over_docker_api(server):
+    connection = FRRRouterConnection({'connection_method': 'docker_api',
+                                      'docker_socket': server.socket_path})
+    connection.add_router('ABR1', {'container_name': 'R1'})
+    assert connection.execute_command('ABR1', 'echo ok') == 'sh -c echo ok'
+    assert connection.get_pool_stats()['requests'] >= 3
@@ -0,0 +1,187 @@
+"""
+Tests des déclencheurs sur événements: décodage des lignes ip monitor et
+FRR, regroupement anti-rebond, flux et arrêt des processus du conteneur
+"""
+
+import subprocess
+import threading
+import time
+
+from src import router_connection
+from src.event_watcher import (
+    EventWatcher,
+    build_event_command,
+    logging_commands,
+    parse_adjacency_event,
+    parse_link_event,
+)
+from src.router_connection import STREAM_PIDS_MARKER, CommandStream, MockFRRConnection
+from src.topology import TopologyIndex
+
+ROUTERS = {
+    'ABR1': {'interfaces': [{'name': 'eth1', 'ip': '10.0.0.1'}, {'name': 'eth3', 'ip': '10.0.1.1'}]},
+    'ABR2': {'interfaces': [{'name': 'eth1', 'ip': '10.0.0.2'}]},
+    'ABR3': {'interfaces': [{'name': 'eth0', 'ip': '10.0.1.2'}]},
+}
+LINKS = [
+    {'name': 'ABR1-ABR2', 'source_router': 'ABR1', 'source_interface': 'eth1',
+     'dest_router': 'ABR2', 'dest_interface': 'eth1'},
+    {'name': 'ABR1-ABR3', 'source_router': 'ABR1', 'source_interface': 'eth3',
+     'dest_router': 'ABR3', 'dest_interface': 'eth0'},
+]
+
+LINK_DOWN = '3: eth1@if12: <NO-CARRIER,BROADCAST,MULTICAST,UP> mtu 1500 qdisc noqueue state DOWN'
+LINK_UP = '3: eth1@if12: <BROADCAST,MULTICAST,UP,LOWER_UP> mtu 1500 qdisc noqueue state UP'
+ADJ_DOWN = ('2024/01/01 10:00:00 OSPF: AdjChg: Nbr 2.2.2.2(default) on eth1:10.0.0.1: '
+            'Full -> Deleted (InactivityTimer)')
+
+
+class Triggers:
+    def __init__(self):
+        self.calls = []
+        self.event = threading.Event()
+
+    def __call__(self, names, reasons):
+        self.calls.append((time.monotonic(), sorted(names), reasons))
+        self.event.set()
+
+
+def make_watcher(config, connection=None):
+    connection = connection or MockFRRConnection({})
+    for name in ROUTERS:
+        connection.add_router(name, {})
+    triggers = Triggers()
+    watcher = EventWatcher(connection, TopologyIndex(ROUTERS, LINKS), triggers, config)
+    return watcher, triggers, connection
+
+
+def test_parse_link_event():
+    assert parse_link_event(LINK_DOWN) == ('eth1', False)
+    assert parse_link_event(LINK_UP) == ('eth1', True)
+    assert parse_link_event('Deleted 3: eth1@if12: <BROADCAST,UP> mtu 1500') == ('eth1', False)
+    # État UNKNOWN: décidé par LOWER_UP
+    assert parse_link_event('4: lo: <LOOPBACK,UP,LOWER_UP> mtu 65536 state UNKNOWN') == ('lo', True)
+    assert parse_link_event('5: eth2: <BROADCAST,UP> mtu 1500') == ('eth2', False)
+    assert parse_link_event('link/ether 02:42:0a:01:01:01 brd ff:ff:ff:ff:ff:ff') is None
+    assert parse_link_event('') is None
+
+
+def test_parse_adjacency_event():
+    assert parse_adjacency_event(ADJ_DOWN) == ('2.2.2.2', 'eth1', 'Full', 'Deleted')
+    assert parse_adjacency_event(
+        'OSPF: AdjChg: Nbr 3.3.3.3 on eth0: Loading -> Full (LoadingDone)'
+    ) == ('3.3.3.3', 'eth0', 'Loading', 'Full')
+    assert parse_adjacency_event('OSPF: Hello received from 2.2.2.2') is None
+
+
+def test_event_command_announces_pids_without_reconfiguring():
+    command = build_event_command('/var/log/frr/x.log')
+    assert STREAM_PIDS_MARKER in command and 'tail -n 0 -F /var/log/frr/x.log' in command
+    assert 'vtysh' not in command
+    assert 'log-adjacency-changes' in logging_commands()
+
+
+def test_handle_line_filters_events():
+    watcher, _, _ = make_watcher({})
+    assert watcher.handle_line('ABR1', LINK_DOWN) == ['ABR1-ABR2']
+    # Même état: changement de flags seulement
+    assert watcher.handle_line('ABR1', LINK_DOWN) == []
+    assert watcher.handle_line('ABR1', LINK_UP) == ['ABR1-ABR2']
+    assert watcher.handle_line('ABR1', 'OSPF: AdjChg: Nbr 2.2.2.2 on eth1: Init -> 2-Way') == []
+    assert watcher.handle_line('ABR1', ADJ_DOWN) == ['ABR1-ABR2']
+    assert watcher.handle_line('ABR1', 'bruit') == []
+    assert watcher.stats['ignored'] == 2 and watcher.stats['events'] == 3
+
+
+def test_debounce_groups_a_burst():
+    watcher, triggers, _ = make_watcher({'debounce': 0.2, 'max_delay': 5})
+    watcher.start([])
+    try:
+        watcher.handle_line('ABR1', LINK_DOWN)
+        time.sleep(0.05)
+        watcher.handle_line('ABR3', '2: eth0: <BROADCAST,UP> mtu 1500 state DOWN')
+        last_event = time.monotonic()
+        assert triggers.event.wait(2)
+        time.sleep(0.3)
+    finally:
+        watcher.stop()
+
+    assert len(triggers.calls) == 1
+    fired_at, names, reasons = triggers.calls[0]
+    assert names == ['ABR1-ABR2', 'ABR1-ABR3']
+    assert len(reasons['ABR1-ABR3']) == 1
+    assert fired_at - last_event >= 0.19
+    assert watcher.stats['triggers'] == 1 and watcher.stats['triggered_links'] == 2
+
+
+def test_max_delay_bounds_a_continuous_burst():
+    watcher, triggers, _ = make_watcher({'debounce': 0.2, 'max_delay': 0.5})
+    watcher.start([])
+    try:
+        first_event = time.monotonic()
+        up = False
+        while time.monotonic() - first_event < 1.0:
+            watcher.handle_line('ABR1', LINK_UP if up else LINK_DOWN)
+            up = not up
+            time.sleep(0.05)
+    finally:
+        watcher.stop()
+
+    # Événements toutes les 50 ms: sans max_delay, aucun déclenchement avant la fin de la rafale
+    assert triggers.calls
+    assert 0.45 <= triggers.calls[0][0] - first_event < 0.8
+
+
+def test_streams_reconnect_and_configure_logging_once():
+    connection = MockFRRConnection({})
+    vtysh_calls = []
+    execute_vtysh = connection.execute_vtysh
+    connection.execute_vtysh = lambda router, commands: (
+        vtysh_calls.append(router) or execute_vtysh(router, commands))
+    watcher, triggers, _ = make_watcher({'debounce': 0.05, 'reconnect': 0.05}, connection)
+    invalidated = []
+    connection.invalidate_costs = invalidated.append
+
+    watcher.start(['ABR1'])
+    try:
+        deadline = time.monotonic() + 2
+        while 'ABR1' not in connection.event_streams and time.monotonic() < deadline:
+            time.sleep(0.01)
+        first = connection.event_streams['ABR1']
+        first.close()
+        while connection.event_streams['ABR1'] is first and time.monotonic() < deadline:
+            time.sleep(0.01)
+        connection.event_streams['ABR1'].push(LINK_DOWN)
+        assert triggers.event.wait(2)
+    finally:
+        watcher.stop()
+
+    assert vtysh_calls == ['ABR1']
+    assert watcher.stats['reconnects'] >= 1
+    assert invalidated[0] == 'ABR1'
+    assert triggers.calls[0][1] == ['ABR1-ABR2']
+
+
+def test_command_stream_kills_announced_processes(monkeypatch):
+    process = subprocess.Popen(
+        ['sh', '-c', f"echo '{STREAM_PIDS_MARKER}'\"11 22 $$\"; echo ligne; sleep 10"],
+        stdout=subprocess.PIPE, text=True, bufsize=1
+    )
+    stream = CommandStream(process, 'ctr')
+    runs = []
+    monkeypatch.setattr(router_connection.subprocess, 'run',
+                        lambda args, **kwargs: runs.append(args))
+
+    lines = iter(stream)
+    assert next(lines) == 'ligne'
+    assert stream.pids[:2] == ['11', '22'] and len(stream.pids) == 3
+    stream.close()
+
+    assert len(runs) == 1
+    assert runs[0][:5] == ['docker', 'exec', 'ctr', 'kill', '-TERM']
+    assert runs[0][5:7] == ['11', '22'] and runs[0][7].isdigit()
+    assert process.poll() is not None
+    # Fermeture répétée (stop après la fin du flux): pas de nouvel arrêt
+    stream.close()
+    assert len(runs) == 1
+
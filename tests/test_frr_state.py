@@ -0,0 +1,95 @@
+"""
+Tests du décodage de la sortie JSON de vtysh (interfaces OSPF, voisins,
+interfaces zebra), y compris les formats d'anciennes versions de FRR
+"""
+
+import json
+
+from src.frr_state import (
+    STATE_COMMANDS,
+    parse_interfaces,
+    parse_ospf_interfaces,
+    parse_ospf_neighbors,
+    parse_router_state,
+    split_json_documents,
+)
+from tests.frr_fixtures import (
+    INTERFACES,
+    OSPF_INTERFACES,
+    OSPF_NEIGHBORS,
+    OSPF_NEIGHBORS_LEGACY,
+    state_output,
+)
+
+
+def test_split_concatenated_documents():
+    output = '{"a": {"b": 1}}\n{"c": [1, 2]}{"d": "}"}'
+    assert split_json_documents(output) == [{'a': {'b': 1}}, {'c': [1, 2]}, {'d': '}'}]
+    # Texte parasite entre les documents (avertissements vtysh)
+    assert split_json_documents('% Warning\n{"a": 1}\nfoo\n{"b": 2}') == [{'a': 1}, {'b': 2}]
+    assert split_json_documents('') == []
+
+
+def test_split_stops_at_truncated_document():
+    output = '{"a": 1}\n{"b": {"c": '
+    assert split_json_documents(output) == [{'a': 1}]
+
+
+def test_parse_router_state():
+    state = parse_router_state(state_output())
+
+    assert state.ospf_costs() == {'eth1': 10, 'eth3': 25}
+    eth1 = state.ospf_interfaces['eth1']
+    assert (eth1.up, eth1.ip_address, eth1.prefix_length, eth1.area) == (True, '10.0.0.1', 30, '0.0.0.0')
+    assert state.ospf_interfaces['eth3'].up is False
+
+    neighbor = state.neighbors_on('eth1')[0]
+    assert (neighbor.neighbor_id, neighbor.state, neighbor.dead_time_ms, neighbor.address) == (
+        '2.2.2.2', 'Full/DR', 35000, '10.0.0.2')
+    assert [n.neighbor_id for n in state.neighbors_on('eth3')] == ['3.3.3.3']
+
+    # IPv6 ignorées
+    assert state.interfaces['eth1'].ip_addresses == ['10.0.0.1']
+    assert state.interfaces['eth3'].oper_up is False and state.interfaces['eth3'].admin_up
+
+
+def test_legacy_neighbor_layout():
+    neighbors = parse_ospf_neighbors(OSPF_NEIGHBORS_LEGACY)
+    assert len(neighbors) == 1
+    neighbor = neighbors[0]
+    assert (neighbor.neighbor_id, neighbor.priority, neighbor.state, neighbor.dead_time_ms,
+            neighbor.interface) == ('2.2.2.2', 1, 'Full/DR', 34000, 'eth1')
+
+    state = parse_router_state(state_output(OSPF_NEIGHBORS_LEGACY))
+    assert state.neighbors_as_dicts() == [{
+        'neighbor_id': '2.2.2.2', 'priority': '1', 'state': 'Full/DR', 'dead_time': '34s',
+        'address': '10.0.0.2', 'interface': 'eth1'
+    }]
+
+
+def test_neighbors_without_wrapper_and_bad_entries():
+    document = {'2.2.2.2': OSPF_NEIGHBORS['neighbors']['2.2.2.2'], 'bogus': 'x'}
+    assert [n.neighbor_id for n in parse_ospf_neighbors(document)] == ['2.2.2.2']
+    assert parse_ospf_neighbors({'neighbors': {}}) == []
+
+
+def test_ospf_interfaces_without_wrapper():
+    interfaces = parse_ospf_interfaces(OSPF_INTERFACES['interfaces'])
+    assert {name: iface.cost for name, iface in interfaces.items()} == {'eth1': 10, 'eth3': 25}
+    # Champs absents: valeurs par défaut
+    assert parse_ospf_interfaces({'interfaces': {'eth5': {}}})['eth5'].cost == 0
+
+
+def test_interfaces_skip_non_objects():
+    document = dict(INTERFACES, vrfName='default')
+    assert set(parse_interfaces(document)) == {'eth1', 'eth3'}
+
+
+def test_incomplete_output_returns_none():
+    documents = [OSPF_INTERFACES, OSPF_NEIGHBORS]
+    assert len(documents) < len(STATE_COMMANDS)
+    assert parse_router_state('\n'.join(json.dumps(d) for d in documents)) is None
+    output = state_output()
+    assert parse_router_state(output[:len(output) - 20]) is None
+    assert parse_router_state('') is None
+    assert parse_router_state(None) is None
@@ -0,0 +1,115 @@
+"""
+Tests des histogrammes logarithmiques de latence: erreur relative des
+quantiles, fusion, bornes et expiration de la fenêtre glissante
+"""
+
+import math
+import random
+
+import pytest
+
+from src.latency_sketch import LatencySketch, WindowedLatencySketch
+
+QUANTILES = (0.0, 0.1, 0.5, 0.9, 0.95, 0.99, 1.0)
+
+
+def exact(data, q):
+    ordered = sorted(data)
+    return ordered[math.floor(q * (len(ordered) - 1))]
+
+
+def samples(count, seed):
+    rng = random.Random(seed)
+    # Distribution à longue traîne, comme des RTT réels
+    return [rng.lognormvariate(1.5, 1.2) + 0.05 for _ in range(count)]
+
+
+@pytest.mark.parametrize('accuracy', [0.01, 0.02, 0.05])
+@pytest.mark.parametrize('seed', [1, 2, 3])
+def test_quantiles_within_relative_accuracy(accuracy, seed):
+    data = samples(5000, seed)
+    sketch = LatencySketch(relative_accuracy=accuracy)
+    for value in data:
+        sketch.add(value)
+
+    assert sketch.count == len(data)
+    for q, estimate in zip(QUANTILES, sketch.quantiles(QUANTILES)):
+        expected = exact(data, q)
+        assert abs(estimate - expected) <= accuracy * expected + 1e-12, q
+
+
+def test_quantiles_order_and_empty():
+    sketch = LatencySketch()
+    assert sketch.quantiles() == [None, None, None]
+    for value in (1.0, 2.0, 3.0, 100.0):
+        sketch.add(value)
+    p99, p50 = sketch.quantiles((0.99, 0.5))
+    assert p99 == pytest.approx(3.0, rel=0.01)
+    assert p50 == pytest.approx(2.0, rel=0.01)
+
+
+def test_clamping():
+    sketch = LatencySketch(min_value=0.01, max_value=1000.0)
+    sketch.add(0.0)
+    sketch.add(0.001)
+    sketch.add(5000.0)
+    low, high = sketch.quantiles((0.0, 1.0))
+    assert low == 0.01
+    assert high == pytest.approx(1000.0, rel=0.01)
+
+
+def test_merge_matches_single_sketch():
+    data = samples(3000, seed=9)
+    whole, first, second = LatencySketch(), LatencySketch(), LatencySketch()
+    for index, value in enumerate(data):
+        whole.add(value)
+        (first if index % 2 else second).add(value)
+
+    first.merge(second)
+    assert first.count == whole.count
+    assert list(first.counts) == list(whole.counts)
+    assert first.quantiles(QUANTILES) == whole.quantiles(QUANTILES)
+
+
+def test_merge_rejects_other_parameters():
+    with pytest.raises(ValueError):
+        LatencySketch(relative_accuracy=0.01).merge(LatencySketch(relative_accuracy=0.02))
+    with pytest.raises(ValueError):
+        LatencySketch(min_value=0.01).merge(LatencySketch(min_value=0.1))
+
+
+def test_clear():
+    sketch = LatencySketch()
+    sketch.add(12.0, weight=3)
+    assert sketch.count == 3
+    sketch.clear()
+    assert sketch.count == 0 and not any(sketch.counts)
+
+
+def test_window_expires_slices():
+    window = WindowedLatencySketch(window=100, slices=5)
+    assert window.percentiles(now=0.0) is None
+
+    window.add_many([10.0] * 10, now=5.0)      # tranche [0, 20)
+    window.add_many([200.0] * 10, now=45.0)    # tranche [40, 60)
+    result = window.percentiles(now=90.0)
+    assert result['samples'] == 20
+    assert result['p50'] == pytest.approx(10.0, rel=0.01)
+    assert result['p99'] == pytest.approx(200.0, rel=0.01)
+
+    # La tranche [0, 20) sort de la fenêtre à t=100
+    result = window.percentiles(now=100.0)
+    assert result['samples'] == 10
+    assert result['p50'] == pytest.approx(200.0, rel=0.01)
+
+    assert window.percentiles(now=160.0) is None
+
+
+def test_window_reuses_slot():
+    window = WindowedLatencySketch(window=100, slices=5)
+    window.add_many([10.0] * 4, now=5.0)
+    # Même emplacement, tranche suivante: les anciens comptes sont effacés
+    window.add_many([50.0], now=105.0)
+    result = window.percentiles(now=105.0)
+    assert result['samples'] == 1
+    assert result['p50'] == pytest.approx(50.0, rel=0.01)
@@ -0,0 +1,71 @@
+"""
+Tests du lot de métriques en colonnes (LinkMetricsBatch) et de ses consommateurs
+"""
+
+import sys
+
+import pytest
+
+from src.cost_calculator import CostCalculator, OptimizationStrategy
+from src.metrics_collector import FRRMetricsCollector, LinkMetrics, LinkMetricsBatch
+from src.router_connection import MockFRRConnection
+
+
+def sample_metrics(count: int = 6):
+    return [
+        LinkMetrics(f'L{index}', f'R{index}', f'R{index + 1}', latency_ms=5.0 + 20 * index,
+                    packet_loss_percent=index * 1.5, jitter_ms=0.5 * index,
+                    bandwidth_utilization=15.0 * index, current_ospf_cost=10 + index,
+                    recommended_cost=20 + index, latency_p95_ms=8.0 + 25 * index,
+                    timestamp=1700000000.0 + index)
+        for index in range(count)
+    ]
+
+
+def test_batch_round_trip():
+    metrics = sample_metrics()
+    batch = LinkMetricsBatch.from_metrics(metrics)
+
+    assert len(batch) == len(metrics)
+    assert list(batch) == metrics
+    assert batch.row(2) == metrics[2]
+    assert list(batch.latency_ms) == [m.latency_ms for m in metrics]
+    assert batch.current_ospf_cost.typecode == 'q'
+
+
+def test_add_defaults():
+    batch = LinkMetricsBatch()
+    batch.add('L', 'A', 'B', 1.0, 0.0, 0.1, 5.0, current_ospf_cost=12)
+    row = batch.row(0)
+    assert row.recommended_cost == 12
+    assert row.latency_p95_ms == 0.0
+    assert row.timestamp > 0
+
+
+@pytest.mark.skipif(sys.version_info < (3, 10), reason="slots=True à partir de Python 3.10")
+def test_metric_records_are_slotted():
+    assert not hasattr(sample_metrics(1)[0], '__dict__')
+
+
+@pytest.mark.parametrize('strategy', list(OptimizationStrategy))
+def test_batch_costs_match_per_link_costs(strategy):
+    metrics = sample_metrics()
+    by_link = CostCalculator({}).calculate_all_costs(metrics, strategy)
+    by_batch = CostCalculator({}).calculate_all_costs(LinkMetricsBatch.from_metrics(metrics), strategy)
+    assert by_batch == by_link
+
+
+def test_record_batch_matches_record_history():
+    metrics = sample_metrics()
+    one_by_one = FRRMetricsCollector(MockFRRConnection({}))
+    batched = FRRMetricsCollector(MockFRRConnection({}))
+    for item in metrics:
+        one_by_one.record_history(item)
+    batched.record_batch(LinkMetricsBatch.from_metrics(metrics))
+
+    for item in metrics:
+        expected = one_by_one.metrics_history[item.link_name]
+        history = batched.metrics_history[item.link_name]
+        assert list(history.rows()) == list(expected.rows())
+        assert batched.link_routers[item.link_name] == (item.source_router, item.dest_router)
+        assert batched.get_rolling_stats(item.link_name) == one_by_one.get_rolling_stats(item.link_name)
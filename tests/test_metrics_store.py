@@ -0,0 +1,174 @@
+"""
+Tests de la base SQLite des métriques: agrégats, choix de la résolution,
+purge et écriture par lots
+"""
+
+import time
+
+import pytest
+
+from src.metrics_collector import LinkMetricsBatch
+from src.metrics_store import MetricsStore
+
+# Début de la veille (UTC): intervalles minute/heure/jour alignés, mesures brutes conservées
+DAY = int(time.time() // 86400) * 86400 - 86400
+
+
+@pytest.fixture
+def make_store(tmp_path):
+    stores = []
+
+    def make(**config):
+        store = MetricsStore(str(tmp_path / 'db' / 'metrics.db'),
+                             {'flush_interval': 0.05, **config})
+        stores.append(store)
+        return store
+
+    yield make
+    for store in stores:
+        store.close()
+
+
+def record(store, link, ts, latency, loss=0.0, jitter=0.0, utilization=0.0, cost=10):
+    assert store.record(link, ts, latency, loss, jitter, utilization, cost)
+
+
+@pytest.mark.parametrize('batch_size', [1, 2, 500])
+def test_rollups_aggregate_each_tier(make_store, batch_size):
+    store = make_store(batch_size=batch_size)
+    # Deux minutes de la première heure, puis une mesure une heure plus tard
+    record(store, 'L1', DAY + 10, 10.0, loss=1.0, utilization=20.0, cost=11)
+    record(store, 'L1', DAY + 50, 30.0, loss=3.0, utilization=40.0, cost=12)
+    record(store, 'L1', DAY + 70, 50.0, loss=0.0, utilization=60.0, cost=13)
+    record(store, 'L1', DAY + 3600 + 5, 70.0, loss=2.0, utilization=80.0, cost=14)
+    record(store, 'L2', DAY + 20, 999.0)
+    store.flush()
+
+    minutes = store.query('L1', DAY, DAY + 7200, '1m')
+    assert [(p['timestamp'], p['samples']) for p in minutes] == [(DAY, 2), (DAY + 60, 1), (DAY + 3600, 1)]
+    first = minutes[0]
+    assert first['latency_ms'] == pytest.approx(20.0)
+    assert first['latency_max_ms'] == 30.0
+    assert first['packet_loss_percent'] == pytest.approx(2.0)
+    assert first['bandwidth_utilization_max'] == 40.0
+    assert first['cost'] == 12
+
+    hours = store.query('L1', DAY, DAY + 7200, '1h')
+    assert [(p['timestamp'], p['samples'], p['cost']) for p in hours] == [(DAY, 3, 13), (DAY + 3600, 1, 14)]
+    assert hours[0]['latency_ms'] == pytest.approx(30.0)
+
+    (day,) = store.query('L1', DAY, DAY + 86399, '1d')
+    assert (day['samples'], day['latency_max_ms'], day['cost']) == (4, 70.0, 14)
+    assert day['latency_ms'] == pytest.approx(40.0)
+    assert store.links() == ['L1', 'L2']
+    assert store.get_stats()['written'] == 5
+
+
+def test_out_of_order_samples(make_store):
+    store = make_store()
+    record(store, 'L1', DAY + 30, 2.0, cost=20)
+    record(store, 'L1', DAY + 10, 1.0, cost=10)
+    store.flush()
+
+    assert [p['latency_ms'] for p in store.query('L1', DAY, DAY + 60, 'raw')] == [1.0, 2.0]
+    # Dernier coût de l'intervalle: celui de la mesure la plus récente, pas de la dernière écrite
+    assert store.query('L1', DAY, DAY + 60, '1m')[0]['cost'] == 20
+
+
+def test_record_batch(make_store):
+    store = make_store()
+    batch = LinkMetricsBatch()
+    batch.add('L1', 'A', 'B', 1.0, 0.0, 0.1, 5.0, 10, timestamp=DAY + 1)
+    batch.add('L2', 'B', 'C', 2.0, 0.5, 0.2, 6.0, 20, timestamp=DAY + 2)
+    assert store.record_batch(batch) == 2
+    store.flush()
+    assert store.query('L2', DAY, DAY + 10, 'raw') == [
+        {'timestamp': DAY + 2, 'latency_ms': 2.0, 'packet_loss_percent': 0.5,
+         'jitter_ms': 0.2, 'bandwidth_utilization': 6.0, 'cost': 20}
+    ]
+
+
+def test_resolution_choice(make_store):
+    store = make_store(max_points=100)
+    now = time.time()
+    for index in range(150):
+        record(store, 'L1', now - 150 + index, 1.0)
+    store.flush()
+
+    # Peu de mesures brutes dans la plage: brutes
+    assert store.resolve_resolution('L1', now - 50, now) == 'raw'
+    # Plus de max_points mesures brutes: minute
+    assert store.resolve_resolution('L1', now - 200, now) == '1m'
+    # Plage de 3 jours: au-delà de la conservation des brutes, 4320 minutes > 100: heure
+    assert store.resolve_resolution('L1', now - 3 * 86400, now) == '1h'
+    # Plage de 30 jours: minutes expirées (14 jours), 720 heures > 100: jour
+    assert store.resolve_resolution('L1', now - 30 * 86400, now) == '1d'
+    assert store.query('L1', now - 50, now)[0].keys() >= {'timestamp', 'latency_ms', 'cost'}
+
+    with pytest.raises(ValueError):
+        store.query('L1', now - 50, now, '5m')
+
+
+def test_prune_expired_rows(make_store):
+    store = make_store(prune_interval=0, retention={'raw': 1, '1m': 1, '1h': 1, '1d': 30})
+    old = time.time() - 3 * 86400
+    record(store, 'L1', old, 1.0)
+    record(store, 'L1', time.time(), 2.0)
+    store.flush()
+    # La purge suit l'écriture du lot suivant
+    record(store, 'L1', time.time(), 3.0)
+    store.flush()
+
+    assert [p['latency_ms'] for p in store.query('L1', old - 1, time.time() + 1, 'raw')] == [2.0, 3.0]
+    assert [p['samples'] for p in store.query('L1', old - 86400, time.time() + 1, '1d')][0] == 1
+    # Mesure brute et agrégats minute et heure de l'ancienne mesure (jour conservé)
+    assert store.get_stats()['pruned'] == 3
+
+
+def test_close_writes_pending_samples(tmp_path):
+    path = str(tmp_path / 'metrics.db')
+    store = MetricsStore(path, {'flush_interval': 10})
+    record(store, 'L1', DAY + 1, 1.0)
+    store.close()
+
+    reopened = MetricsStore(path)
+    try:
+        assert len(reopened.query('L1', DAY, DAY + 10, 'raw')) == 1
+    finally:
+        reopened.close()
+
+
+def test_invalid_rows_are_rejected_and_writer_survives(make_store):
+    store = make_store(batch_size=500)
+    record(store, 'L1', DAY + 10, 10.0)
+    assert store.record('L1', DAY + 20, 'n/a', 0.0, 0.0, 0.0, 10)
+    assert store.record('L1', DAY + 30, {'ms': 1}, 0.0, 0.0, 0.0, 10)
+    record(store, 'L1', DAY + 40, 30.0)
+    store.flush()
+
+    stats = store.get_stats()
+    assert stats['rejected'] == 2 and stats['written'] == 2
+    assert stats['writer_alive']
+    assert store.query('L1', DAY, DAY + 59, '1m')[0]['samples'] == 2
+
+
+def test_unexpected_error_keeps_writer_alive(make_store, monkeypatch):
+    store = make_store()
+    write = store._write
+    calls = []
+
+    def failing_write(connection, rows):
+        calls.append(len(rows))
+        if len(calls) == 1:
+            raise RuntimeError('panne simulée')
+        write(connection, rows)
+
+    monkeypatch.setattr(store, '_write', failing_write)
+    record(store, 'L1', DAY + 10, 10.0)
+    store.flush()
+    record(store, 'L1', DAY + 20, 20.0)
+    store.flush()
+
+    stats = store.get_stats()
+    assert stats['errors'] == 1 and stats['written'] == 1
+    assert stats['writer_alive'] and stats['pending'] == 0
@@ -0,0 +1,75 @@
+"""
+Tests de la sonde multi-cibles (un script par routeur): construction de la
+commande, découpage de la sortie et cibles injoignables
+"""
+
+from src.latency_prober import UNREACHABLE, LatencyProber, parse_ping_samples
+from src.router_connection import PROBE_MARKER, build_multi_ping_command, parse_multi_ping_output
+from tests.frr_fixtures import PING_OK, PING_UNREACHABLE
+
+OUTPUT = (f"{PROBE_MARKER}10.0.0.2\n{PING_OK}\n"
+          f"{PROBE_MARKER}10.0.1.2\n{PING_UNREACHABLE}")
+
+
+def test_command_pings_every_target_in_parallel():
+    command = build_multi_ping_command(['10.0.0.2', '10.0.1.2'], count=3, interval=0.2, deadline=4)
+    assert 'for ip in 10.0.0.2 10.0.1.2; do ping -c 3 -W 2 -i 0.2 -w 4 "$ip"' in command
+    assert '& done; wait;' in command
+    assert f"echo '{PROBE_MARKER}'\"$ip\"" in command
+
+
+def test_parse_sections_per_target():
+    outputs = parse_multi_ping_output(OUTPUT)
+    assert list(outputs) == ['10.0.0.2', '10.0.1.2']
+    assert outputs['10.0.0.2'].startswith('PING 10.0.0.2') and 'rtt min/avg' in outputs['10.0.0.2']
+    assert '100% packet loss' in outputs['10.0.1.2']
+
+
+def test_unreachable_target_has_no_samples():
+    outputs = parse_multi_ping_output(OUTPUT)
+    assert parse_ping_samples(outputs['10.0.0.2']) == (3, [1.2, 1.6, 1.4])
+    assert parse_ping_samples(outputs['10.0.1.2']) == (3, [])
+
+
+def test_parse_truncated_or_empty_output():
+    # Sortie interrompue: la dernière cible n'a pas de résultat
+    outputs = parse_multi_ping_output(f"mktemp: noise\n{PROBE_MARKER}10.0.0.2\n{PING_OK}\n"
+                                      f"{PROBE_MARKER}10.0.1.2")
+    assert outputs['10.0.1.2'] == ''
+    assert parse_ping_samples(outputs['10.0.1.2'], requested=3) == (3, [])
+    assert parse_multi_ping_output('') == {}
+
+
+class FakePingConnection:
+    def __init__(self, output):
+        self.output = output
+        self.calls = []
+
+    def ping_many(self, router, dest_ips, count, interval=None, deadline=None):
+        self.calls.append((router, list(dest_ips), count))
+        return parse_multi_ping_output(self.output)
+
+    def ping(self, router, dest_ip, count, interval=None, deadline=None):
+        self.calls.append((router, [dest_ip], count))
+        return parse_multi_ping_output(self.output).get(dest_ip)
+
+
+def test_prober_maps_unreachable_target():
+    connection = FakePingConnection(OUTPUT)
+    prober = LatencyProber(connection, config={'mode': 'per_router', 'deadline': 5})
+
+    results = prober.probe_all([('ABR1', '10.0.0.2'), ('ABR1', '10.0.1.2')])
+
+    # Une exécution pour les deux voisins; RTT stable et cible injoignable: pas de nouvelle salve
+    assert connection.calls == [('ABR1', ['10.0.0.2', '10.0.1.2'], 3)]
+    assert results[('ABR1', '10.0.1.2')] == UNREACHABLE
+    latency, loss, jitter = results[('ABR1', '10.0.0.2')]
+    assert (latency, loss, jitter) == (1.4, 0.0, 0.163)
+
+
+def test_prober_missing_section_counts_as_loss():
+    connection = FakePingConnection(f"{PROBE_MARKER}10.0.0.2\n{PING_OK}")
+    prober = LatencyProber(connection, config={'mode': 'per_router', 'deadline': 5})
+    results = prober.probe_all([('ABR1', '10.0.0.2'), ('ABR1', '10.0.1.2')])
+    assert results[('ABR1', '10.0.1.2')] == UNREACHABLE
+    assert results[('ABR1', '10.0.0.2')][1] == 0.0
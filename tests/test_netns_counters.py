@@ -0,0 +1,104 @@
+"""
+Tests du lecteur de compteurs depuis l'hôte: cache des PID, validation par
+la date de démarrage (PID réutilisé après redémarrage) et repli sur exec
+"""
+
+import os
+
+from src.netns_counters import HostCounterReader, parse_start_time
+
+
+def stat_line(pid, start, comm='bash'):
+    # Champs 3 à 21 sans importance, champ 22 = date de démarrage
+    return f"{pid} ({comm}) S " + ' '.join(['0'] * 18) + f" {start} 0 0\n"
+
+
+def write_process(proc_root, pid, start, net_dev='eth1'):
+    directory = proc_root / str(pid)
+    (directory / 'net').mkdir(parents=True, exist_ok=True)
+    (directory / 'stat').write_text(stat_line(pid, start))
+    (directory / 'net' / 'dev').write_text(net_dev)
+
+
+class Resolver:
+    def __init__(self, *pids):
+        self.pids = list(pids)
+        self.calls = 0
+
+    def __call__(self, container):
+        self.calls += 1
+        return self.pids.pop(0) if self.pids else None
+
+
+def make_reader(proc_root, resolver, **kwargs):
+    return HostCounterReader(parse=lambda content: {'content': content},
+                             resolver=resolver, proc_root=str(proc_root), max_age=0, **kwargs)
+
+
+def test_parse_start_time_handles_odd_process_names():
+    assert parse_start_time(stat_line(42, 123456)) == 123456
+    assert parse_start_time(stat_line(42, 99, comm='a) b (c')) == 99
+    assert parse_start_time('42 (bash) S 1 2') is None
+
+
+def test_cached_pid_is_reused_while_process_unchanged(tmp_path):
+    write_process(tmp_path, 100, start=5000, net_dev='routeur R1')
+    resolver = Resolver(100)
+    reader = make_reader(tmp_path, resolver)
+
+    assert reader.read('clab-R1') == {'content': 'routeur R1'}
+    assert reader.read('clab-R1') == {'content': 'routeur R1'}
+    assert resolver.calls == 1
+    assert reader.stats['reads'] == 2 and reader.stats['stale_pids'] == 0
+
+
+def test_reused_pid_is_detected_and_resolved_again(tmp_path):
+    write_process(tmp_path, 100, start=5000, net_dev='routeur R1')
+    resolver = Resolver(100, 200)
+    reader = make_reader(tmp_path, resolver)
+    assert reader.read('clab-R1') == {'content': 'routeur R1'}
+
+    # Conteneur redémarré sous le PID 200, PID 100 repris par un autre processus
+    write_process(tmp_path, 100, start=9000, net_dev='autre namespace')
+    write_process(tmp_path, 200, start=8000, net_dev='routeur R1 redémarré')
+
+    assert reader.read('clab-R1') == {'content': 'routeur R1 redémarré'}
+    assert reader.pids['clab-R1'] == 200
+    assert reader.stats['stale_pids'] == 1 and resolver.calls == 2
+
+
+def test_vanished_pid_is_resolved_again(tmp_path):
+    write_process(tmp_path, 100, start=5000)
+    resolver = Resolver(100, 200)
+    reader = make_reader(tmp_path, resolver)
+    reader.read('clab-R1')
+
+    for name in ('stat', 'net/dev'):
+        os.remove(tmp_path / '100' / name)
+    write_process(tmp_path, 200, start=8000, net_dev='nouveau')
+
+    assert reader.read('clab-R1') == {'content': 'nouveau'}
+    assert reader.stats['stale_pids'] == 1
+
+
+def test_unresolved_container_falls_back_until_retry(tmp_path):
+    resolver = Resolver()
+    reader = make_reader(tmp_path, resolver, retry_after=60)
+
+    assert reader.read('clab-R1') is None
+    assert reader.read('clab-R1') is None
+    assert resolver.calls == 1 and reader.stats['fallbacks'] == 2
+
+
+def test_permission_error_marks_exec_only(tmp_path, monkeypatch):
+    write_process(tmp_path, 100, start=5000)
+    reader = make_reader(tmp_path, Resolver(100))
+
+    def denied(pid):
+        raise PermissionError('refusé')
+
+    monkeypatch.setattr(reader, '_read_file', denied)
+    assert reader.read('clab-R1') is None
+    assert 'clab-R1' in reader.exec_only
+    assert reader.read('clab-R1') is None
+    assert reader.stats['fallbacks'] == 2
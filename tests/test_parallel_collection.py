@@ -0,0 +1,64 @@
+"""
+Tests de la collecte parallèle: ordre des résultats, regroupement par
+interface source et limite d'exécutions simultanées par routeur
+"""
+
+import random
+import threading
+import time
+
+
+def slow_collector(optimizer, fail=()):
+    """Collecte simulée à durée aléatoire, enregistrant la concurrence par routeur"""
+    collect = optimizer.metrics_collector.collect_link_metrics
+    active, peak, lock = {}, {}, threading.Lock()
+    rng = random.Random(4)
+
+    def collect_link_metrics(link):
+        router = link['source_router']
+        with lock:
+            active[router] = active.get(router, 0) + 1
+            peak[router] = max(peak.get(router, 0), active[router])
+            delay = rng.uniform(0.0, 0.03)
+        time.sleep(delay)
+        with lock:
+            active[router] -= 1
+        if link['name'] in fail:
+            raise RuntimeError('exec échoué')
+        return collect(link)
+
+    optimizer.metrics_collector.collect_link_metrics = collect_link_metrics
+    return peak
+
+
+def test_default_collection_is_sequential(make_optimizer):
+    assert make_optimizer().max_workers == 1
+
+
+def test_parallel_collection_keeps_monitored_order(make_optimizer):
+    optimizer = make_optimizer(collection={'max_workers': 8, 'max_per_router': 2})
+    peak = slow_collector(optimizer)
+    expected = [link['name'] for link in optimizer.config['monitored_links']]
+
+    for _ in range(3):
+        metrics = optimizer.collect_metrics()
+        assert [m.link_name for m in metrics] == expected
+
+    assert max(peak.values()) <= 2
+
+
+def test_parallel_collection_skips_failed_links(make_optimizer):
+    optimizer = make_optimizer(collection={'max_workers': 4, 'max_per_router': 1})
+    peak = slow_collector(optimizer, fail={'ABR1-ABR3', 'ABR2-R4'})
+    expected = [link['name'] for link in optimizer.config['monitored_links']
+                if link['name'] not in ('ABR1-ABR3', 'ABR2-R4')]
+
+    assert [m.link_name for m in optimizer.collect_metrics()] == expected
+    assert max(peak.values()) == 1
+
+
+def test_subset_collection_keeps_given_order(make_optimizer):
+    optimizer = make_optimizer(collection={'max_workers': 8})
+    slow_collector(optimizer)
+    links = list(reversed(optimizer.topology.links))[:4]
+    assert [m.link_name for m in optimizer.collect_metrics(links)] == [l['name'] for l in links]
@@ -0,0 +1,140 @@
+"""
+Tests de l'ordonnanceur adaptatif: urgence et période bornées, budget de
+mesures, et cadence de réconciliation du cache des coûts en mode adaptatif
+"""
+
+import threading
+import time
+from collections import deque
+
+import pytest
+
+from src import poll_scheduler
+from src.cost_calculator import CostThresholds
+from src.metrics_collector import LinkMetrics
+from src.poll_scheduler import AdaptivePollScheduler
+
+CONFIG = {'min_period': 5, 'max_period': 120, 'budget': 2, 'window': 4, 'margin': 0.5}
+
+
+class FakeMonotonic:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeMonotonic()
+    monkeypatch.setattr(poll_scheduler, 'time', fake)
+    return fake
+
+
+def scheduler(**config):
+    return AdaptivePollScheduler(CostThresholds(), {**CONFIG, **config})
+
+
+def metrics(name, latency=1.0, loss=0.0, util=1.0):
+    return LinkMetrics(name, 'A', 'B', latency, loss, 0.1, util, 10, 10)
+
+
+def test_urgency_bounds():
+    s = scheduler()
+    t = CostThresholds()
+    # Sur un seuil: urgence maximale
+    assert s._urgency(deque([(t.latency_high, 0.0, 1.0)])) == pytest.approx(1.0)
+    # Loin de tout seuil (au-delà de margin * seuil), mesures identiques: urgence nulle
+    far = (t.latency_critical * 3, t.loss_critical * 3, t.bw_critical * 3)
+    assert s._urgency(deque([far, far, far])) == 0.0
+    # Mesures dispersées loin des seuils: urgence plafonnée à 1
+    spread = deque([(t.latency_critical * 3, 0.0, 1.0), (t.latency_critical * 30, 0.0, 1.0)])
+    assert 0.0 < s._urgency(spread) <= 1.0
+
+
+@pytest.mark.parametrize('urgency', [0.0, 0.25, 0.5, 0.75, 1.0])
+def test_period_interpolates_between_bounds(urgency):
+    s = scheduler()
+    period = s._period(urgency)
+    assert s.min_period <= period <= s.max_period
+    assert s._period(1.0) == pytest.approx(5.0)
+    assert s._period(0.0) == pytest.approx(120.0)
+    # Interpolation géométrique: moyenne géométrique des bornes à mi-chemin
+    assert s._period(0.5) == pytest.approx((5.0 * 120.0) ** 0.5)
+
+
+def test_period_bounds_from_config():
+    s = scheduler(min_period=0, max_period=1)
+    assert s.min_period == 0.1 and s.max_period == 1.0
+    s = scheduler(min_period=10, max_period=2)
+    assert s.max_period == 10.0
+
+
+def test_observe_sets_period_and_next_due(clock):
+    s = scheduler()
+    t = CostThresholds()
+    s.observe([metrics('near', latency=t.latency_high),
+               metrics('far', latency=t.latency_critical * 3, loss=t.loss_critical * 3,
+                       util=t.bw_critical * 3)])
+    assert s.links['near'].period == pytest.approx(5.0)
+    assert s.links['far'].period == pytest.approx(120.0)
+    assert s.links['near'].next_due == pytest.approx(1005.0)
+    assert s.get_stats()['links']['far']['polls'] == 1
+
+
+def test_due_respects_token_budget(clock):
+    s = scheduler(budget=2)
+    s.register([f'L{i}' for i in range(5)])
+
+    assert len(s.due()) == 2
+    # Aucun jeton regagné sans temps écoulé
+    assert s.due() == []
+    clock.now += 0.5
+    assert len(s.due()) == 1
+    clock.now += 10
+    # Jetons plafonnés à une seconde de budget; les liens admis à t=0 sont de nouveau dus
+    assert len(s.due()) == 2
+    assert s.stats['polls'] == 5
+    assert s.stats['deferred'] == 3 + 3 + 2 + 3
+
+
+def test_due_serves_most_overdue_first(clock):
+    s = scheduler(budget=1)
+    s.register(['a', 'b'])
+    s.links['a'].next_due, s.links['a'].period = 990.0, 100.0     # 10% de retard
+    s.links['b'].next_due, s.links['b'].period = 995.0, 5.0       # 100% de retard
+    assert s.due() == ['b']
+    # Le lien admis n'est plus dû avant sa période
+    assert s.links['b'].next_due == pytest.approx(1005.0)
+
+
+def test_next_wakeup_capped_by_min_period(clock):
+    s = scheduler()
+    assert s.next_wakeup() == 5.0
+    s.register(['a'])
+    assert s.next_wakeup() == 0.0
+    s.links['a'].next_due = clock.now + 60
+    assert s.next_wakeup() == 5.0
+
+
+def test_adaptive_loop_reconciles_per_interval(make_optimizer):
+    optimizer = make_optimizer(polling={'adaptive': True, 'tick': 0.01, 'min_period': 0.1})
+    begins, passes = [], []
+    optimizer.connection.begin_cycle = lambda: begins.append(time.monotonic())
+    optimizer.optimize_links = lambda names, strategy, dry_run: passes.append(list(names))
+    optimizer.poll_scheduler.due = lambda: ['ABR1-ABR2']
+    optimizer.poll_scheduler.next_wakeup = lambda: 0.0
+
+    optimizer.running = True
+    thread = threading.Thread(target=optimizer._run_adaptive, args=(None, True, 0.2))
+    thread.start()
+    time.sleep(0.5)
+    optimizer.running = False
+    optimizer._stop_event.set()
+    thread.join(2)
+
+    # Un passage toutes les 10 ms, mais un cycle du cache toutes les 200 ms
+    assert len(passes) >= 10
+    assert 2 <= len(begins) <= 3
+    assert all(b - a >= 0.2 for a, b in zip(begins, begins[1:]))
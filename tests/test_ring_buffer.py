@@ -0,0 +1,65 @@
+"""
+Tests du tampon circulaire à colonnes typées
+"""
+
+import pytest
+
+from src.ring_buffer import COST_COLUMNS, RingBuffer
+
+
+def filled(capacity: int, count: int) -> RingBuffer:
+    buffer = RingBuffer(capacity, COST_COLUMNS)
+    for index in range(count):
+        buffer.append(cost=index, timestamp=index + 0.5)
+    return buffer
+
+
+@pytest.mark.parametrize('count', [0, 1, 3, 5, 6, 13, 50])
+def test_window_is_chronological(count):
+    buffer = filled(5, count)
+    expected = list(range(max(0, count - 5), count))
+
+    assert len(buffer) == len(expected)
+    assert list(buffer.window('cost')) == expected
+    assert list(buffer.window('timestamp')) == [value + 0.5 for value in expected]
+    for n in range(0, 7):
+        assert list(buffer.window('cost', n)) == expected[len(expected) - min(n, len(expected)):]
+
+
+def test_latest_and_rows():
+    buffer = filled(4, 7)
+    assert buffer.latest('cost') == 6
+    assert list(buffer.rows(2)) == [(5, 5.5), (6, 6.5)]
+    assert RingBuffer(3, COST_COLUMNS).latest('cost') is None
+
+
+def test_window_is_read_only_view_without_copy():
+    buffer = filled(3, 2)
+    view = buffer.window('cost')
+    assert isinstance(view, memoryview) and view.readonly
+    with pytest.raises(TypeError):
+        view[0] = 9
+
+    # La vue reflète le tampon en place
+    buffer.append(cost=42, timestamp=0.0)
+    assert view.obj is buffer.window('cost').obj
+
+
+def test_missing_columns_default_to_zero():
+    buffer = RingBuffer(2)
+    buffer.append(latency_ms=1.5)
+    assert buffer.latest('latency_ms') == 1.5
+    assert buffer.latest('cost') == 0
+
+
+def test_clear_and_invalid_arguments():
+    buffer = filled(3, 5)
+    buffer.clear()
+    assert len(buffer) == 0 and list(buffer.window('cost')) == []
+    buffer.append(cost=1)
+    assert list(buffer.window('cost')) == [1]
+
+    with pytest.raises(ValueError):
+        RingBuffer(0)
+    with pytest.raises(KeyError):
+        buffer.window('unknown')
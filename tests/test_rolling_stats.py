@@ -0,0 +1,115 @@
+"""
+Tests des statistiques glissantes incrémentales (Welford sur fenêtre,
+moyenne exponentielle à demi-vie), comparées au module statistics
+"""
+
+import random
+import statistics
+
+import pytest
+
+from src.rolling_stats import LinkRollingStats, MetricStats
+
+
+def values(count, seed=7):
+    rng = random.Random(seed)
+    return [rng.uniform(0.5, 200.0) for _ in range(count)]
+
+
+@pytest.mark.parametrize('count', [1, 5, 10, 11, 37, 1000])
+def test_window_matches_statistics(count):
+    stats = MetricStats(window=10, half_life=60)
+    data = values(count)
+    for index, value in enumerate(data):
+        stats.update(value, float(index))
+
+    recent = data[-10:]
+    assert stats.count == len(recent)
+    assert stats.window_mean == pytest.approx(statistics.fmean(recent), rel=1e-9)
+    assert stats.window_std == pytest.approx(statistics.pstdev(recent), rel=1e-6, abs=1e-9)
+
+
+def test_window_after_each_update():
+    stats = MetricStats(window=4, half_life=60)
+    data = values(50, seed=3)
+    for index, value in enumerate(data):
+        stats.update(value, float(index))
+        recent = data[max(0, index - 3):index + 1]
+        assert stats.window_mean == pytest.approx(statistics.fmean(recent), rel=1e-9)
+        assert stats.window_std == pytest.approx(statistics.pstdev(recent), rel=1e-6, abs=1e-9)
+
+
+def test_window_of_one_and_constant_values():
+    stats = MetricStats(window=1, half_life=60)
+    for index, value in enumerate([3.0, 8.0, 2.5]):
+        stats.update(value, float(index))
+    assert stats.window_mean == 2.5 and stats.window_std == 0.0
+
+    stats = MetricStats(window=5, half_life=60)
+    for index in range(20):
+        stats.update(42.0, float(index))
+    assert stats.window_mean == pytest.approx(42.0)
+    assert stats.window_std == pytest.approx(0.0, abs=1e-9)
+
+
+def test_totals_match_statistics():
+    stats = MetricStats(window=10, half_life=60)
+    data = values(500, seed=11)
+    for index, value in enumerate(data):
+        stats.update(value, float(index))
+    assert stats.total == 500
+    assert stats.total_mean == pytest.approx(statistics.fmean(data), rel=1e-9)
+    assert stats.total_std == pytest.approx(statistics.pstdev(data), rel=1e-9)
+
+
+def test_ewma_half_life():
+    stats = MetricStats(window=10, half_life=30)
+    rng = random.Random(5)
+    timestamp, expected = 0.0, None
+    for _ in range(200):
+        timestamp += rng.uniform(0.5, 20.0)
+        value = rng.uniform(0.0, 100.0)
+        stats.update(value, timestamp)
+        if expected is None:
+            expected, previous = value, timestamp
+            continue
+        alpha = 1.0 - 0.5 ** ((timestamp - previous) / 30)
+        expected = alpha * value + (1.0 - alpha) * expected
+        previous = timestamp
+    assert stats.ewma == pytest.approx(expected, rel=1e-9)
+
+    # Après une demi-vie, l'écart à la nouvelle valeur est divisé par 2
+    stats = MetricStats(window=10, half_life=30)
+    stats.update(0.0, 0.0)
+    stats.update(100.0, 30.0)
+    assert stats.ewma == pytest.approx(50.0)
+
+
+def test_ewma_without_half_life_follows_last_value():
+    stats = MetricStats(window=10, half_life=0)
+    for index, value in enumerate([10.0, 20.0, 5.0]):
+        stats.update(value, float(index))
+    assert stats.ewma == 5.0 and stats.ewm_std == 0.0
+
+
+def test_value_modes():
+    stats = MetricStats(window=2, half_life=60)
+    assert stats.value('ewma') == 0.0
+    stats.update(10.0, 0.0)
+    stats.update(20.0, 60.0)
+    stats.update(40.0, 120.0)
+    assert stats.value('raw') == 40.0
+    assert stats.value('window') == pytest.approx(30.0)
+    assert stats.value('ewma') == pytest.approx(27.5)
+
+
+def test_link_values_order():
+    link = LinkRollingStats(window=3, half_life=60)
+    link.update(0.0, latency_ms=12.0, packet_loss_percent=1.5,
+                jitter_ms=0.4, bandwidth_utilization=55.0)
+    assert link.count == 1
+    assert link.values('raw') == (55.0, 12.0, 1.5, 0.4)
+
+    summary = link.summary()
+    assert set(summary) == {'latency_ms', 'packet_loss_percent', 'jitter_ms', 'bandwidth_utilization'}
+    assert summary['latency_ms']['window_mean'] == 12.0
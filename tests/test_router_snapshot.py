@@ -0,0 +1,82 @@
+"""
+Tests du snapshot routeur (une exécution par routeur et par cycle):
+découpage en sections, sections manquantes ou tronquées
+"""
+
+from src.router_connection import (
+    SNAPSHOT_COMMAND,
+    SNAPSHOT_MARKER,
+    SNAPSHOT_SECTIONS,
+    parse_proc_net_dev,
+    parse_router_snapshot,
+)
+from tests.frr_fixtures import IP_ADDR, IP_LINK, PROC_NET_DEV, state_output
+
+SECTIONS = {
+    'proc_net_dev': PROC_NET_DEV,
+    'ip_link': IP_LINK,
+    'ip_addr': IP_ADDR,
+    'frr_state': state_output(),
+}
+
+
+def snapshot_output(sections=SECTIONS) -> str:
+    return '\n'.join(f"{SNAPSHOT_MARKER}{name}\n{body}" for name, body in sections.items())
+
+
+def test_command_contains_every_section_in_order():
+    positions = [SNAPSHOT_COMMAND.index(f"{SNAPSHOT_MARKER}{name}") for name, _ in SNAPSHOT_SECTIONS]
+    assert positions == sorted(positions)
+    assert [name for name, _ in SNAPSHOT_SECTIONS] == list(SECTIONS)
+
+
+def test_parse_full_snapshot():
+    snapshot = parse_router_snapshot(snapshot_output())
+
+    assert snapshot['traffic']['eth1'] == {
+        'rx_bytes': 5000000, 'rx_packets': 4000, 'rx_errors': 1, 'rx_dropped': 2,
+        'tx_bytes': 7000000, 'tx_packets': 5000, 'tx_errors': 3, 'tx_dropped': 4
+    }
+    assert set(snapshot['traffic']) == {'lo', 'eth1', 'eth3'}
+    assert snapshot['link_state'] == {'lo': 'UNKNOWN', 'eth1': 'UP', 'eth3': 'DOWN'}
+    # Adresse principale seulement (la secondaire est ignorée)
+    assert snapshot['addresses'] == {'lo': '127.0.0.1', 'eth1': '10.0.0.1', 'eth3': '10.0.1.1'}
+    assert snapshot['ospf_costs'] == {'eth1': 10, 'eth3': 25}
+    assert snapshot['state'] is not None and len(snapshot['state'].neighbors) == 2
+    assert snapshot['timestamp'] > 0
+
+
+def test_missing_sections_are_empty():
+    sections = {name: body for name, body in SECTIONS.items() if name in ('proc_net_dev', 'ip_link')}
+    snapshot = parse_router_snapshot(snapshot_output(sections))
+    assert snapshot['traffic'] and snapshot['link_state']
+    assert snapshot['addresses'] == {}
+    assert snapshot['ospf_costs'] == {} and snapshot['state'] is None
+
+
+def test_truncated_state_keeps_other_sections():
+    output = snapshot_output()
+    truncated = output[:output.index('"neighbors"') + 40]
+    snapshot = parse_router_snapshot(truncated)
+    assert snapshot['traffic']['eth1']['rx_bytes'] == 5000000
+    assert snapshot['addresses']['eth3'] == '10.0.1.1'
+    assert snapshot['state'] is None and snapshot['ospf_costs'] == {}
+
+
+def test_truncated_counters_skip_incomplete_lines():
+    sections = dict(SECTIONS, proc_net_dev=PROC_NET_DEV[:PROC_NET_DEV.rindex('eth3:') + 30])
+    snapshot = parse_router_snapshot(snapshot_output(sections))
+    assert set(snapshot['traffic']) == {'lo', 'eth1'}
+
+
+def test_empty_or_unmarked_output():
+    for output in ('', 'Error: No such container: GNS3.R1', PROC_NET_DEV):
+        snapshot = parse_router_snapshot(output)
+        assert snapshot['traffic'] == {} and snapshot['link_state'] == {}
+        assert snapshot['addresses'] == {} and snapshot['state'] is None
+
+
+def test_proc_net_dev_ignores_headers_and_bad_values():
+    traffic = parse_proc_net_dev(PROC_NET_DEV + '\n  eth9: x y z' + ' 0' * 14)
+    assert set(traffic) == {'lo', 'eth1', 'eth3'}
+    assert traffic['eth3']['tx_packets'] == 1000
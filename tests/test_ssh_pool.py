@@ -0,0 +1,219 @@
+"""
+Tests du pool SSH multiplexé: lecture conjointe de stdout et stderr sous une
+fenêtre de canal partagée, réservation des sessions face à l'éviction et
+statistiques (transport paramiko simulé)
+"""
+
+import os
+import time
+from types import SimpleNamespace
+
+from src.ssh_pool import PooledSSHSession, SSHConnectionPool, read_channel
+
+CREDENTIALS = SimpleNamespace(hostname='10.0.0.1', port=22, username='root', password='x')
+
+
+class FakeChannel:
+    """
+    Canal dont la sortie (liste de (flux, octets)) n'est émise que si les
+    octets non lus des deux flux tiennent dans la fenêtre, comme en SSH
+    """
+
+    def __init__(self, output, window=1024, exit_status=0, finishes=True):
+        self.pending = list(output)
+        self.window = window
+        self.exit_status = exit_status
+        self.finishes = finishes
+        self.stdout = b''
+        self.stderr = b''
+        self.eof_received = False
+        self.closed = False
+        self.command = None
+        self._read_fd, write_fd = os.pipe()
+        os.write(write_fd, b'x')
+        os.close(write_fd)
+
+    def _produce(self):
+        while self.pending:
+            stream, data = self.pending[0]
+            if len(self.stdout) + len(self.stderr) + len(data) > self.window:
+                return
+            self.pending.pop(0)
+            if stream == 'stdout':
+                self.stdout += data
+            else:
+                self.stderr += data
+        if self.finishes:
+            self.eof_received = True
+
+    def settimeout(self, timeout):
+        pass
+
+    def exec_command(self, command):
+        self.command = command
+        self._produce()
+
+    def fileno(self):
+        return self._read_fd
+
+    def recv_ready(self):
+        return bool(self.stdout)
+
+    def recv_stderr_ready(self):
+        return bool(self.stderr)
+
+    def recv(self, size):
+        data, self.stdout = self.stdout[:size], self.stdout[size:]
+        self._produce()
+        return data
+
+    def recv_stderr(self, size):
+        data, self.stderr = self.stderr[:size], self.stderr[size:]
+        self._produce()
+        return data
+
+    def recv_exit_status(self):
+        return self.exit_status
+
+    def close(self):
+        if not self.closed:
+            os.close(self._read_fd)
+        self.closed = True
+
+
+class FakeTransport:
+    def __init__(self, channels):
+        self.channels = list(channels)
+        self.active = True
+
+    def is_active(self):
+        return self.active
+
+    def open_session(self, timeout=None):
+        return self.channels.pop(0)
+
+
+class FakeClient:
+    def __init__(self, transport):
+        self.transport = transport
+        self.closed = False
+
+    def get_transport(self):
+        return self.transport
+
+    def close(self):
+        self.closed = True
+        self.transport.active = False
+
+
+def make_pool(channels, **kwargs):
+    pool = SSHConnectionPool(**kwargs)
+    opened = []
+
+    def fake_open(router_name, credentials):
+        pool._router_stats(router_name)['sessions_opened'] += 1
+        session = PooledSSHSession(FakeClient(FakeTransport(channels)), pool.max_channels)
+        opened.append(session)
+        return session
+
+    pool._open = fake_open
+    return pool, opened
+
+
+def test_noisy_stderr_does_not_stall_stdout():
+    # 4 Ko de stderr avant la sortie utile, fenêtre de 1 Ko
+    output = [('stderr', b'w' * 256)] * 16 + [('stdout', b'cost 10\n')]
+    channel = FakeChannel(output, window=1024)
+    channel.exec_command('vtysh')
+
+    stdout, stderr = read_channel(channel, timeout=1)
+    assert stdout == b'cost 10\n'
+    assert stderr == b'w' * 4096
+    channel.close()
+
+
+def test_interleaved_streams_are_kept_apart():
+    output = [('stdout', b'a'), ('stderr', b'1'), ('stdout', b'b'), ('stderr', b'2')]
+    channel = FakeChannel(output, window=1)
+    channel.exec_command('cmd')
+
+    assert read_channel(channel, timeout=1) == (b'ab', b'12')
+    channel.close()
+
+
+def test_read_times_out_without_eof():
+    channel = FakeChannel([('stdout', b'partial')], finishes=False)
+    channel.exec_command('cmd')
+    started = time.monotonic()
+    try:
+        read_channel(channel, timeout=0.05)
+    except TimeoutError:
+        pass
+    else:
+        raise AssertionError("TimeoutError attendu")
+    assert time.monotonic() - started < 1
+    channel.close()
+
+
+def test_execute_returns_both_streams_and_counts_reuse():
+    channels = [
+        FakeChannel([('stderr', b'warn' * 64)] * 8 + [('stdout', b'ok')], window=512, exit_status=1),
+        FakeChannel([('stdout', b'second')])
+    ]
+    pool, opened = make_pool(channels, timeout=1)
+
+    assert pool.execute('R1', CREDENTIALS, 'first') == (1, 'ok', 'warn' * 512)
+    assert pool.execute('R1', CREDENTIALS, 'second') == (0, 'second', '')
+
+    stats = pool.get_stats()['R1']
+    assert (stats['sessions_opened'], stats['commands'], stats['channel_reuses']) == (1, 2, 1)
+    assert stats['errors'] == 0 and stats['active_channels'] == 0
+    assert len(opened) == 1
+
+
+def test_execute_timeout_counts_error_and_keeps_live_session():
+    channel = FakeChannel([('stdout', b'partial')], finishes=False)
+    pool, opened = make_pool([channel], timeout=1)
+
+    assert pool.execute('R1', CREDENTIALS, 'hang', timeout=0.05) is None
+    stats = pool.get_stats()['R1']
+    assert stats['errors'] == 1 and stats['connected']
+    assert stats['active_channels'] == 0
+    channel.close()
+
+
+def test_checked_out_session_is_not_evicted():
+    pool, opened = make_pool([], idle_timeout=10)
+
+    session = pool._checkout('R1', CREDENTIALS)
+    # Inactive depuis longtemps mais réservée: evict_idle() ne doit pas la fermer
+    session.last_used -= 100
+    pool.evict_idle()
+    assert 'R1' in pool.sessions and not session.client.closed
+
+    pool._release(session)
+    session.last_used -= 100
+    pool.evict_idle()
+    assert 'R1' not in pool.sessions and session.client.closed
+    assert pool.get_stats()['R1']['evictions'] == 1
+
+
+def test_get_session_does_not_leave_a_reservation():
+    pool, opened = make_pool([], idle_timeout=10)
+
+    session = pool.get_session('R1', CREDENTIALS)
+    assert session.active_channels == 0
+    assert pool.get_session('R1', CREDENTIALS) is session
+    assert pool.get_stats()['R1']['sessions_opened'] == 1
+
+
+def test_dead_session_is_replaced():
+    pool, opened = make_pool([], idle_timeout=10)
+
+    first = pool.get_session('R1', CREDENTIALS)
+    first.transport.active = False
+    second = pool.get_session('R1', CREDENTIALS)
+
+    assert second is not first and first.client.closed
+    assert pool.sessions['R1'] is second
+    assert pool.get_stats()['R1']['sessions_opened'] == 2
@@ -0,0 +1,160 @@
+"""
+Tests de la télémétrie poussée: format des enregistrements, serveur
+d'ingestion et intégration dans FRRMetricsCollector
+"""
+
+import time
+
+import pytest
+
+from src.metrics_collector import FRRMetricsCollector
+from src.router_connection import MockFRRConnection
+from src.telemetry import (
+    LocalTelemetryAgent,
+    TelemetryIngestServer,
+    TelemetryRecord,
+    encode_record,
+    parse_record,
+)
+
+EPOCH = 1700000000
+
+
+def traffic(rx_bytes: int, tx_bytes: int = 0) -> dict:
+    return {'rx_bytes': rx_bytes, 'rx_packets': 10, 'rx_errors': 0, 'rx_dropped': 0,
+            'tx_bytes': tx_bytes, 'tx_packets': 10, 'tx_errors': 1, 'tx_dropped': 2,
+            'status': 'up', 'ip': '10.0.0.1'}
+
+
+def record(clock: float, rx_bytes: int = 0, epoch: int = EPOCH, received: float = None,
+           probes: dict = None) -> TelemetryRecord:
+    return TelemetryRecord(router='ABR1', clock=clock, epoch=epoch,
+                           interfaces={'eth1': traffic(rx_bytes)}, probes=probes or {},
+                           received=received if received is not None else time.time())
+
+
+@pytest.fixture
+def collector():
+    return FRRMetricsCollector(MockFRRConnection({}), telemetry_config={'max_age': 15})
+
+
+def test_encode_parse_round_trip():
+    original = record(1234.5, rx_bytes=987654,
+                      probes={'10.0.0.2': (3, [1.25, 1.5, 2.0]), '10.0.1.2': (3, [])})
+    parsed = parse_record(encode_record(original))
+
+    assert (parsed.router, parsed.epoch, parsed.clock) == ('ABR1', EPOCH, 1234.5)
+    assert parsed.interfaces == original.interfaces
+    assert parsed.probes == original.probes
+
+
+@pytest.mark.parametrize('data', [
+    b'',
+    b'ospft0 ABR1 1700000000 12.5\n',
+    b'ospft1 ABR1 12.5\n',                     # en-tête sans époque
+    b'ospft1 ABR1 x 12.5\n',
+    b'ospft1 ABR1 1700000000 12.5\np 10.0.0.2 3 1.0,abc\n',
+])
+def test_parse_rejects_invalid_datagrams(data):
+    assert parse_record(data) is None
+
+
+def test_parse_skips_malformed_lines():
+    data = b'ospft1 ABR1 1700000000 12.5\nc eth1 up\nz what\np 10.0.0.2 3 -\n'
+    parsed = parse_record(data)
+    assert parsed.interfaces == {}
+    assert parsed.probes == {'10.0.0.2': (3, [])}
+
+
+def test_ingest_computes_utilization_on_agent_clock(collector):
+    now = time.time()
+    assert collector.ingest_telemetry(record(100.0, 0, received=now))
+    # 1 250 000 octets en 1 s d'horloge agent = 10 Mbit/s = 10% de 100 Mbit/s,
+    # quel que soit le délai de réception
+    assert collector.ingest_telemetry(record(101.0, 1250000, received=now + 3))
+
+    metrics = collector.collect_interface_stats('ABR1', 'eth1')
+    assert metrics.utilization_percent == pytest.approx(10.0)
+    assert (metrics.tx_errors, metrics.tx_dropped) == (1, 2)
+    assert collector.has_fresh_telemetry('ABR1')
+
+
+@pytest.mark.parametrize('clock', [101.0, 100.5, 96.0, 50.0])
+def test_ingest_drops_duplicate_and_reordered_records(collector, clock):
+    now = time.time()
+    collector.ingest_telemetry(record(100.0, 0, received=now))
+    collector.ingest_telemetry(record(101.0, 1250000, received=now + 1))
+
+    # Dupliqué, ou désordonné d'une fraction de seconde ou de plusieurs intervalles
+    assert not collector.ingest_telemetry(record(clock, 999, received=now + 2))
+
+    # Les compteurs retenus et le delta suivant ne sont pas affectés
+    assert collector.ingest_telemetry(record(102.0, 2500000, received=now + 2))
+    assert collector.collect_interface_stats('ABR1', 'eth1').utilization_percent == pytest.approx(10.0)
+
+
+def test_ingest_accepts_agent_restart(collector):
+    now = time.time()
+    collector.ingest_telemetry(record(5000.0, 0, received=now - 5))
+
+    # Nouvelle exécution de l'agent: horloge plus petite mais époque plus récente
+    assert collector.ingest_telemetry(record(3.0, 100, epoch=EPOCH + 60, received=now))
+    assert collector._telemetry_clock['ABR1'] == (EPOCH + 60, 3.0, pytest.approx(now - 3.0))
+    assert collector.has_fresh_telemetry('ABR1')
+
+    # Un datagramme retardé de l'exécution précédente est écarté
+    assert not collector.ingest_telemetry(record(5005.0, 50, received=now + 1))
+    assert collector.telemetry_interfaces[('ABR1', 'eth1')].rx_bytes == 100
+
+
+def test_stale_telemetry_falls_back(collector):
+    old = time.time() - 60
+    collector.ingest_telemetry(record(100.0, 0, received=old,
+                                      probes={'10.0.0.2': (3, [1.0, 2.0, 3.0])}))
+
+    assert not collector.has_fresh_telemetry('ABR1')
+    assert collector._telemetry_interface('ABR1', 'eth1') is None
+    assert collector._telemetry_latency_stats('ABR1', '10.0.0.2') is None
+
+
+def test_ingest_probe_results(collector):
+    collector.ingest_telemetry(record(100.0, probes={'10.0.0.2': (4, [1.0, 2.0, 3.0])}))
+    latency, loss, jitter = collector._telemetry_latency_stats('ABR1', '10.0.0.2')
+    assert latency == pytest.approx(2.0)
+    assert loss == pytest.approx(25.0)
+    assert jitter > 0
+
+
+def test_server_handle_counts_outcomes(collector):
+    server = TelemetryIngestServer(collector.ingest_telemetry)
+
+    assert server.handle(encode_record(record(100.0)))
+    assert not server.handle(encode_record(record(99.0)))
+    assert not server.handle(b'garbage')
+
+    stats = server.get_stats()
+    assert (stats['received'], stats['ingested'], stats['discarded'], stats['invalid']) == (3, 1, 1, 1)
+    assert 'ABR1' in stats['routers']
+
+
+def test_local_agent_over_udp(collector):
+    server = TelemetryIngestServer(collector.ingest_telemetry, udp=('127.0.0.1', 0))
+    server.start()
+    connection = MockFRRConnection({})
+    agent = LocalTelemetryAgent('ABR1', {'eth1': '10.0.0.1'}, ['10.0.0.2'],
+                                server.address, connection, probe_count=3)
+    try:
+        assert agent.send_once()
+        # Horloge encodée au centième: deux envois espacés pour ne pas être des doublons
+        time.sleep(0.05)
+        assert agent.send_once()
+        deadline = time.monotonic() + 5
+        while server.stats['ingested'] < 2 and time.monotonic() < deadline:
+            time.sleep(0.02)
+    finally:
+        agent.stop()
+        server.stop()
+
+    assert server.stats['ingested'] == 2
+    assert collector.collect_interface_stats('ABR1', 'eth1').ip_address == '10.0.0.1'
+    assert collector._telemetry_latency_stats('ABR1', '10.0.0.2') is not None